@@ -0,0 +1,106 @@
+# advanced_earning_bot/api/rate_limiter.py
+
+import math
+import time
+from collections import OrderedDict
+from fastapi import Request, HTTPException
+from config import RATE_LIMIT_MAX_BUCKETS
+from metrics import Counter
+from modules import bot_settings
+
+"""
+API-এর জন্য প্রতি-ব্যবহারকারী token bucket রেট লিমিটার।
+প্রতিটি user_id এর একটি বাকেট থাকে যাতে সর্বোচ্চ `burst` টি টোকেন জমা থাকে এবং
+প্রতি মিনিটে `per_minute` টি টোকেন যোগ হয়। প্রতিটি অনুরোধে একটি টোকেন খরচ হয়;
+টোকেন না থাকলে অনুরোধটি কোনো ম্যানেজার বা ডাটাবেস কলের আগেই 429 দিয়ে ফেরত যায়।
+
+সীমাগুলো `bot_settings` (`api_rate_limit_per_minute`, `api_rate_limit_burst`) থেকে আসে
+এবং শুধু অনুমোদিত অনুরোধের পর কিছুক্ষণ পরপর রিফ্রেশ হয়, তাই বাতিল অনুরোধ কখনও ডাটাবেসে যায় না।
+মেমোরি সীমিত রাখতে সবচেয়ে পুরনো অব্যবহৃত বাকেটগুলো (LRU) বাদ দেওয়া হয়।
+"""
+
+# সেটিংস থেকে সীমা কত সেকেন্ড পরপর নতুন করে পড়া হবে
+LIMITS_REFRESH_INTERVAL = 5
+
+rate_limited_requests = Counter(
+    'api_rate_limited_requests_total', 'রেট লিমিটের কারণে বাতিল হওয়া অনুরোধ', ('route',))
+
+
+class TokenBucketLimiter:
+
+    def __init__(self, per_minute=60, burst=10, max_buckets=RATE_LIMIT_MAX_BUCKETS):
+        self.per_minute = per_minute
+        self.burst = burst
+        self.enabled = True
+        self.max_buckets = max_buckets
+        # {user_id: [জমা টোকেন, শেষ আপডেটের সময়]}; সবচেয়ে সম্প্রতি ব্যবহৃতটি শেষে থাকে
+        self._buckets = OrderedDict()
+        self._limits_checked_at = 0.0
+
+    def allow(self, key, now=None):
+        """
+        একটি টোকেন খরচ করার চেষ্টা করে।
+        রিটার্ন: (অনুমোদিত কিনা, আবার চেষ্টা করার আগে কত সেকেন্ড অপেক্ষা করতে হবে)
+        """
+        if not self.enabled:
+            return True, 0
+        now = time.monotonic() if now is None else now
+        rate = self.per_minute / 60
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return True, 0
+        retry_after = (1 - bucket[0]) / rate if rate > 0 else 60
+        return False, retry_after
+
+    def refresh_limits(self):
+        """
+        নির্দিষ্ট সময় পরপর `bot_settings` থেকে সীমাগুলো নতুন করে পড়ে।
+        সেটিংস শুধু মেমোরি ক্যাশ থেকে আসে (ভার্সন চেক ব্যাকগ্রাউন্ড থ্রেডে হয়), তাই এটি লুপ আটকায় না।
+        """
+        now = time.monotonic()
+        if now - self._limits_checked_at < LIMITS_REFRESH_INTERVAL:
+            return
+        self._limits_checked_at = now
+        _, is_active = bot_settings.get_setting('api_rate_limit_per_minute')
+        self.enabled = bool(is_active)
+        self.per_minute = bot_settings.get_int_setting('api_rate_limit_per_minute', self.per_minute)
+        self.burst = max(1, bot_settings.get_int_setting('api_rate_limit_burst', self.burst))
+
+
+# পুরো API একটি লিমিটার ব্যবহার করে (ইভেন্ট লুপ থেকে কল হয়, তাই লকের প্রয়োজন নেই)
+limiter = TokenBucketLimiter()
+
+
+async def enforce_rate_limit(request: Request):
+    """
+    FastAPI ডিপেন্ডেন্সি: অনুরোধের বডি থেকে user_id নিয়ে রেট লিমিট চেক করে।
+    বডিটি Starlette ক্যাশ করে রাখে, তাই রাউট আবার `request.json()` পড়লে খরচ হয় না।
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        return # অবৈধ JSON রাউট নিজেই সামলাবে
+    user_id = data.get('user_id') if isinstance(data, dict) else None
+    if not user_id:
+        return
+
+    allowed, retry_after = limiter.allow(str(user_id))
+    if not allowed:
+        rate_limited_requests.inc(request.url.path)
+        raise HTTPException(
+            status_code=429,
+            detail="অনেক বেশি অনুরোধ পাঠানো হয়েছে। কিছুক্ষণ পর আবার চেষ্টা করুন।",
+            headers={'Retry-After': str(math.ceil(retry_after))}
+        )
+    limiter.refresh_limits()
@@ -1,16 +1,27 @@
 # advanced_earning_bot/api/routes.py
 
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
+from telegram import Update
+import asyncio
+import hmac
 import json
+import threading
+import time
 
 # আমাদের মডিউলগুলো ইম্পোর্ট করুন
-from modules import user_manager, ad_manager, bonus_manager, wallet_manager, bot_settings
+from config import WEBHOOK_SECRET_TOKEN, EXPORT_API_TOKEN
+from database import run_db
+from metrics import http_request_duration, http_requests_total, render_metrics
+from api.rate_limiter import enforce_rate_limit
+from modules import user_manager, ad_manager, bonus_manager, wallet_manager, bot_settings, ad_ticket, ad_pricing, export_manager, webapp_auth
 
 """
 এই ফাইলটি মিনি অ্যাপ (ফ্রন্টএন্ড) এবং বট (ব্যাকএন্ড) এর মধ্যে যোগাযোগের জন্য
 API এন্ডপয়েন্ট (রাউট) তৈরি করে।
+সকল ডাটাবেস কাজ `run_db` দিয়ে থ্রেড পুলে চালানো হয়, যাতে ইভেন্ট লুপ (এবং বট) আটকে না যায়।
 """
 
 # FastAPI অ্যাপ তৈরি করুন
@@ -26,8 +37,137 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """প্রতিটি অনুরোধের লেটেন্সি রাউটের টেমপ্লেট (যেমন `/get_user_data`) অনুযায়ী রেকর্ড করে।"""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get('route')
+        # অজানা পাথ আলাদা লেবেলে রাখা হয়, যাতে মেট্রিকের সংখ্যা সীমিত থাকে
+        route_path = getattr(route, 'path', 'unmatched')
+        http_request_duration.observe(time.perf_counter() - started, request.method, route_path)
+        http_requests_total.inc(request.method, route_path, str(status))
+
+# webhook মোডে main.py টেলিগ্রাম অ্যাপ্লিকেশনটি এখানে সেট করে
+telegram_application = None
+
+def set_telegram_application(application):
+    """webhook রাউটের জন্য টেলিগ্রাম `Application` সেট করে।"""
+    global telegram_application
+    telegram_application = application
+
+
+@app.post("/telegram/webhook")
+async def telegram_webhook(request: Request):
+    """
+    টেলিগ্রাম থেকে আসা আপডেট গ্রহণ করে সরাসরি `Application.update_queue`-তে পাঠায়।
+    আপডেট প্রসেস হওয়ার জন্য অপেক্ষা না করেই সাথে সাথে উত্তর দেওয়া হয়।
+    """
+    if telegram_application is None:
+        return JSONResponse(status_code=503, content={'ok': False, 'message': 'Webhook mode is not enabled'})
+
+    if WEBHOOK_SECRET_TOKEN:
+        received_token = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+        if not hmac.compare_digest(received_token, WEBHOOK_SECRET_TOKEN):
+            return JSONResponse(status_code=403, content={'ok': False})
+
+    try:
+        data = await request.json()
+        update = Update.de_json(data, telegram_application.bot)
+    except Exception as e:
+        print(f"webhook আপডেট পড়তে ত্রুটি: {e}")
+        return JSONResponse(status_code=400, content={'ok': False})
+
+    await telegram_application.update_queue.put(update)
+    return JSONResponse(content={'ok': True})
+
+
+@app.get("/metrics")
+async def metrics_route():
+    """সকল মেট্রিক Prometheus টেক্সট ফরম্যাটে পাঠায়।"""
+    return PlainTextResponse(render_metrics(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+async def require_export_token(request: Request):
+    """
+    FastAPI ডিপেন্ডেন্সি: শুধু এডমিনদের জন্য এক্সপোর্ট রাউটে `Authorization: Bearer <EXPORT_API_TOKEN>` যাচাই করে।
+    টোকেন সেট করা না থাকলে রাউটগুলো বন্ধ থাকে।
+    """
+    if not EXPORT_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Export API is disabled")
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(token.strip().encode(), EXPORT_API_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+def _with_lock(lock, func, *args):
+    with lock:
+        return func(*args)
+
+
+async def _close_export(chunks, lock):
+    """
+    এক্সপোর্ট জেনারেটরটি ডাটাবেস থ্রেডে বন্ধ করে, ফলে তার রিড সংযোগও বন্ধ হয়। লকের কারণে কোনো থ্রেডে
+    `next()` চলতে থাকলে সেটি শেষ হওয়া পর্যন্ত অপেক্ষা করে। একাধিকবার কল করলে সমস্যা নেই।
+    `shield`: বাতিল হওয়া টাস্ক থেকে কল হলেও বন্ধ করার কাজটি শেষ পর্যন্ত চলে।
+    """
+    await asyncio.shield(run_db(_with_lock, lock, chunks.close))
+
+
+async def _stream_export(export, chunks, lock):
+    """
+    এক্সপোর্টের প্রতিটি টুকরো ডাটাবেস থ্রেড পুলে তৈরি করে রেসপন্সে পাঠায়, যাতে ইভেন্ট লুপ আটকে না যায়।
+    স্ট্রিম শেষ হলে, ত্রুটি হলে বা বাতিল হলে `finally` তে জেনারেটরটি বন্ধ হয়। ক্লায়েন্ট মাঝপথে চলে গেলে
+    এই জেনারেটরটি `yield` এ আটকে থাকতে পারে, তাই রাউটটি রেসপন্সের BackgroundTask হিসেবেও বন্ধ করে।
+    """
+    try:
+        while True:
+            chunk = await run_db(_with_lock, lock, next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+    except Exception as e:
+        # হেডার আগেই চলে গেছে, তাই শুধু সংযোগ ভেঙে দেওয়া যায় (ক্লায়েন্ট অসম্পূর্ণ ফাইল পাবে)
+        print(f"{export.table} এক্সপোর্ট স্ট্রিম করতে ত্রুটি: {e}")
+        raise
+    finally:
+        await _close_export(chunks, lock)
+
+
+@app.get("/admin/export/{table}", dependencies=[Depends(require_export_token)])
+async def export_route(table: str, request: Request):
+    """
+    `users` বা `transactions` টেবিলের সম্পূর্ণ ডাম্প স্ট্রিম করে পাঠায়।
+    কুয়েরি প্যারামিটার: format=csv|jsonl, gzip=1, এবং শুধু transactions এর জন্য
+    type, status, from, to (YYYY-MM-DD; `to` এর দিনটিও অন্তর্ভুক্ত)।
+    উদাহরণ: `curl -H "Authorization: Bearer $TOKEN" "/admin/export/transactions?type=withdrawal&from=2024-01-01&gzip=1"`
+    """
+    params = request.query_params
+    try:
+        export = export_manager.build_export(
+            table, params.get('format', 'csv'), params.get('gzip', '').lower() in ('1', 'true', 'yes'),
+            trans_type=params.get('type'), status=params.get('status'),
+            date_from=params.get('from'), date_to=params.get('to')
+        )
+    except export_manager.ExportError as e:
+        return JSONResponse(status_code=400, content={'success': False, 'message': str(e)})
+
+    chunks = export_manager.iter_export(export)
+    lock = threading.Lock()
+    return StreamingResponse(
+        _stream_export(export, chunks, lock), media_type=export.media_type,
+        headers={'Content-Disposition': f'attachment; filename="{export.filename}"'},
+        # Starlette এটি ক্লায়েন্ট সংযোগ ছিন্ন করলেও চালায়
+        background=BackgroundTask(_close_export, chunks, lock)
+    )
 
-@app.post("/get_user_data")
+
+@app.post("/get_user_data", dependencies=[Depends(enforce_rate_limit)])
 async def get_user_data(request: Request):
     """
     মিনি অ্যাপ চালু হলে ব্যবহারকারীর প্রাথমিক তথ্য পাঠানোর জন্য এই এন্ডপয়েন্ট ব্যবহৃত হয়।
@@ -38,7 +178,7 @@ async def get_user_data(request: Request):
         if not user_id:
             raise HTTPException(status_code=400, detail="User ID is required")
 
-        user_data = user_manager.get_user_by_id(user_id)
+        user_data = await run_db(user_manager.get_user_by_id, user_id)
         if not user_data:
             raise HTTPException(status_code=404, detail="User not found")
             
@@ -55,7 +195,7 @@ async def get_user_data(request: Request):
         return JSONResponse(status_code=500, content={'success': False, 'message': str(e)})
 
 
-@app.post("/claim_daily_bonus")
+@app.post("/claim_daily_bonus", dependencies=[Depends(enforce_rate_limit)])
 async def claim_daily_bonus_route(request: Request):
     """দৈনিক বোনাস দাবি করার অনুরোধ প্রক্রিয়া করে।"""
     try:
@@ -64,35 +204,42 @@ async def claim_daily_bonus_route(request: Request):
         if not user_id:
             raise HTTPException(status_code=400, detail="User ID is required")
             
-        result = bonus_manager.claim_daily_bonus(user_id)
+        result = await run_db(bonus_manager.claim_daily_bonus, user_id)
         return JSONResponse(content=result)
 
     except Exception as e:
         return JSONResponse(status_code=500, content={'success': False, 'message': str(e)})
 
 
-@app.post("/get_ad_for_view")
+@app.post("/get_ad_for_view", dependencies=[Depends(enforce_rate_limit)])
 async def get_ad_for_view_route(request: Request):
-    """ব্যবহারকারীর জন্য একটি বিজ্ঞাপন খুঁজে বের করে।"""
+    """
+    ব্যবহারকারীর জন্য একটি বিজ্ঞাপন খুঁজে বের করে এবং একটি স্বাক্ষরিত ভিউ টিকিট দেয়।
+    বিজ্ঞাপন দেখা শেষে মিনি অ্যাপ এই টিকিটটি `/record_ad_view` এ পাঠাবে।
+    """
     try:
         data = await request.json()
         user_id = data.get('user_id')
         if not user_id:
              raise HTTPException(status_code=400, detail="User ID is required")
         
-        ad = ad_manager.get_ad_for_user(user_id)
+        ad = await run_db(ad_manager.get_ad_for_user, user_id)
         if ad:
             # ব্লগার পেজের URL সেটিংস থেকে নিন
             blogger_url, _ = bot_settings.get_setting('blogger_page_url')
             
+            # বিজ্ঞাপনের নিজস্ব দাম অথবা মেমোরির প্রাইস টেবিল থেকে; কোনো ডাটাবেস কল নেই
+            reward = ad_pricing.get_reward(ad)
+
             # মিনি অ্যাপকে দেখানোর জন্য ডেটা প্রস্তুত করুন
             response_data = {
                 'ad_id': ad['ad_id'],
                 'duration': ad['view_duration_seconds'],
-                'reward': 10, # উদাহরণ, এটি ডাইনামিক করা যেতে পারে
+                'reward': reward,
                 'ad_type': ad['ad_type'],
                 'ad_content': ad['ad_content'],
-                'blogger_base_url': blogger_url # ব্লগার পেজের URL
+                'blogger_base_url': blogger_url, # ব্লগার পেজের URL
+                'ticket': ad_ticket.issue_ticket(user_id, ad['ad_id'], reward, ad['view_duration_seconds'])
             }
             return JSONResponse(content={'success': True, 'ad': response_data})
         else:
@@ -101,28 +248,96 @@ async def get_ad_for_view_route(request: Request):
     except Exception as e:
         return JSONResponse(status_code=500, content={'success': False, 'message': str(e)})
 
-@app.post("/record_ad_view")
+@app.post("/record_ad_view", dependencies=[Depends(enforce_rate_limit)])
 async def record_ad_view_route(request: Request):
-    """বিজ্ঞাপন দেখা সফল হলে তা রেকর্ড করে।"""
+    """
+    বিজ্ঞাপন দেখা সফল হলে তা রেকর্ড করে।
+    বিজ্ঞাপন এবং পুরস্কার ক্লায়েন্টের কাছ থেকে নয়, `/get_ad_for_view` এর দেওয়া টিকিট থেকে নেওয়া হয়।
+    """
     try:
         data = await request.json()
         user_id = data.get('user_id')
-        ad_id = data.get('ad_id')
-        reward = data.get('reward')
-        
-        if not all([user_id, ad_id, reward]):
-            raise HTTPException(status_code=400, detail="User ID, Ad ID, and Reward are required")
+        ticket = data.get('ticket')
         
-        result = ad_manager.record_ad_view(user_id, ad_id, reward)
+        if not all([user_id, ticket]):
+            raise HTTPException(status_code=400, detail="User ID and Ticket are required")
+
+        # টিকিট যাচাই শুধু মেমোরিতে হয় (HMAC), ডাটাবেস পড়ার প্রয়োজন নেই
+        try:
+            view = ad_ticket.verify_ticket(ticket, user_id)
+        except ad_ticket.TicketError as e:
+            return JSONResponse(content={'success': False, 'message': str(e)})
+
+        try:
+            result = await run_db(ad_manager.record_ad_view, user_id, view['ad_id'], view['reward'])
+        except Exception:
+            ad_ticket.release_ticket(view['signature'])
+            raise
+        if not result.get('success'):
+            # ভিউ রেকর্ড না হলে টিকিটটি আবার ব্যবহারযোগ্য থাকুক (যেমন ডাটাবেস ত্রুটির পর)
+            ad_ticket.release_ticket(view['signature'])
         return JSONResponse(content=result)
         
     except Exception as e:
         return JSONResponse(status_code=500, content={'success': False, 'message': str(e)})
 
 
-# এখানে অন্যান্য এন্ডপয়েন্ট যোগ করা হবে (যেমন, ব্যালেন্স ট্রান্সফার, উইথড্র ইত্যাদি)
-# @app.post("/transfer_balance")
-# ...
+@app.post("/get_transactions", dependencies=[Depends(enforce_rate_limit)])
+async def get_transactions_route(request: Request):
+    """
+    ব্যবহারকারীর লেনদেনের ইতিহাস পেজ আকারে পাঠায়।
+    পরের পেজের জন্য আগের রেসপন্সের `next_cursor` মানটি `cursor` হিসেবে পাঠাতে হবে।
+    """
+    try:
+        data = await request.json()
+        user_id = data.get('user_id')
+        if not user_id:
+            raise HTTPException(status_code=400, detail="User ID is required")
+
+        cursor = data.get('cursor')
+        limit = min(max(int(data.get('limit', 20)), 1), 100)
+
+        result = await run_db(wallet_manager.get_user_transactions_page, user_id, limit, cursor)
+        return JSONResponse(content=result)
+
+    except Exception as e:
+        return JSONResponse(status_code=500, content={'success': False, 'message': str(e)})
+
+
+@app.post("/transfer_balance", dependencies=[Depends(enforce_rate_limit)])
+async def transfer_balance_route(request: Request):
+    """
+    একজন ব্যবহারকারী থেকে অন্যজনকে ব্যালেন্স পাঠায় (ফি সহ)।
+    বডি: {init_data (`Telegram.WebApp.initData`), receiver_id, amount}
+    প্রেরক বডির `user_id` থেকে নয়, স্বাক্ষরিত initData থেকে নেওয়া হয়, যাতে কেউ অন্যের ব্যালেন্স পাঠাতে না পারে।
+    """
+    try:
+        _, is_active = bot_settings.get_setting('feature_balance_transfer')
+        if not is_active:
+            return JSONResponse(content={'success': False, 'message': 'ব্যালেন্স ট্রান্সফার এখন বন্ধ আছে।'})
+
+        data = await request.json()
+        try:
+            user_id = webapp_auth.verify_init_data(data.get('init_data'))
+        except webapp_auth.WebAppAuthError as e:
+            return JSONResponse(status_code=403, content={'success': False, 'message': str(e)})
+        # রেট লিমিটার বডির user_id দেখে; সেটি initData এর ব্যবহারকারীর না হলে অনুরোধটি গ্রহণযোগ্য নয়
+        if data.get('user_id') is not None and str(data.get('user_id')) != str(user_id):
+            return JSONResponse(status_code=403, content={'success': False, 'message': 'User ID does not match initData'})
+
+        try:
+            receiver_id, amount = int(data.get('receiver_id')), int(data.get('amount'))
+        except (TypeError, ValueError):
+            return JSONResponse(status_code=400, content={'success': False, 'message': 'Receiver ID and Amount must be integers'})
+
+        result = await run_db(wallet_manager.transfer_balance, user_id, receiver_id, amount)
+        return JSONResponse(content=result)
+
+    except Exception as e:
+        return JSONResponse(status_code=500, content={'success': False, 'message': str(e)})
+
+
+# এখানে অন্যান্য এন্ডপয়েন্ট যোগ করা হবে (যেমন, উইথড্র ইত্যাদি)
 
 # এই ফাইলটি সরাসরি রান করা হবে না। `main.py` থেকে এটি ইম্পোর্ট করে চালানো হবে।
 # উদাহরণ
@@ -0,0 +1,169 @@
+# advanced_earning_bot/benchmarks/ad_selection_benchmark.py
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime
+
+"""
+`ad_manager.get_ad_for_user` (অর্থাৎ `ads.find_unviewed_active` এর `ad_views` অ্যান্টি-জয়েন) এর বেঞ্চমার্ক।
+
+আলাদা ডাটাবেসে ডিফল্টভাবে ১০০০টি সক্রিয় বিজ্ঞাপন এবং ১,০০,০০০ জন ব্যবহারকারী সিড করা হয়। প্রতিটি
+ব্যবহারকারী ad_id ক্রমে প্রথম ০ থেকে `--max-seen` টি বিজ্ঞাপন আগেই দেখেছে (এলোমেলো সংখ্যা), তাই
+পরের উপযুক্ত বিজ্ঞাপন খুঁজতে কুয়েরিকে আগে দেখা বিজ্ঞাপনগুলো পার হতে হয়। `--exhausted-users` জন সব
+বিজ্ঞাপন দেখে ফেলেছে; তাদের জন্য কুয়েরিকে প্রতিটি সক্রিয় বিজ্ঞাপন যাচাই করে None দিতে হয় (সবচেয়ে খারাপ ক্ষেত্র)।
+
+এরপর এলোমেলো ব্যবহারকারীদের জন্য `get_ad_for_user` চালিয়ে প্রতিটি কলের p50/p95/p99 লেটেন্সি এবং
+থ্রুপুট মাপা হয়, এবং যাচাই করা হয় যে প্রতিবার ঠিক পরের না-দেখা বিজ্ঞাপনটিই এসেছে।
+
+ব্যবহার (প্রজেক্টের মূল ফোল্ডার থেকে):
+    python benchmarks/ad_selection_benchmark.py --ads 1000 --users 100000 --max-seen 50
+    STORAGE_BACKEND=memory python benchmarks/ad_selection_benchmark.py
+
+প্রতিটি রানের আগে টেস্ট ডাটাবেস ফাইলটি (ডিফল্ট `ad_selection_bench.db`) মুছে দিন।
+"""
+
+# প্রজেক্টের মডিউলগুলো ইম্পোর্ট করার আগে আলাদা ডাটাবেস ফাইল সেট করুন
+os.environ.setdefault('DATABASE_NAME', 'ad_selection_bench.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# সিড করা ব্যবহারকারী ও বিজ্ঞাপনের আইডি এখান থেকে শুরু হয়, যাতে আসল আইডির সাথে না মেলে
+SEED_USER_ID_START = 9_200_000_000
+SEED_AD_OWNER_ID = 9_199_999_999
+# এতজন ব্যবহারকারীর পর একবার কমিট, যাতে একটি ট্রানজেকশন খুব বড় না হয়
+SEED_CHUNK_USERS = 5000
+
+
+def seed_database(num_users, num_ads, max_seen, exhausted_users, rng):
+    """
+    ব্যবহারকারী, সক্রিয় বিজ্ঞাপন এবং তাদের ভিউ ইতিহাস তৈরি করে।
+    রিটার্ন: (বিজ্ঞাপনের আইডির তালিকা, {user_id: কয়টি বিজ্ঞাপন আগে দেখেছে})
+    """
+    from storage import get_storage
+    from modules.bot_settings import initialize_bot_settings
+
+    storage = get_storage()
+    storage.initialize()
+    initialize_bot_settings()
+
+    started = time.perf_counter()
+    now = datetime.now()
+    with storage.transaction():
+        storage.users.create(SEED_AD_OWNER_ID, 'ad_bench_owner', 'bn', None, now)
+        ad_ids = [
+            storage.ads.create(SEED_AD_OWNER_ID, 'admin_direct_link', 'direct_link_ad',
+                               f'https://example.com/ad/{i}', 1_000_000_000, 0, status='active')
+            for i in range(num_ads)
+        ]
+
+    seen_counts = {}
+    user_ids = [SEED_USER_ID_START + i for i in range(num_users)]
+    exhausted = set(rng.sample(user_ids, min(exhausted_users, num_users)))
+    views = 0
+    for chunk_start in range(0, num_users, SEED_CHUNK_USERS):
+        with storage.transaction():
+            for user_id in user_ids[chunk_start:chunk_start + SEED_CHUNK_USERS]:
+                storage.users.create(user_id, f'ad_bench_{user_id}', 'bn', None, now)
+                seen = num_ads if user_id in exhausted else rng.randint(0, min(max_seen, num_ads))
+                for ad_id in ad_ids[:seen]:
+                    storage.ads.add_view(ad_id, user_id)
+                seen_counts[user_id] = seen
+                views += seen
+    print(f"{num_users} জন ব্যবহারকারী, {num_ads}টি বিজ্ঞাপন এবং {views}টি ভিউ সিড করা হয়েছে "
+          f"({time.perf_counter() - started:.2f}s)।")
+    return ad_ids, seen_counts
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    # nearest-rank পদ্ধতি
+    count = len(sorted_values)
+    return round(sorted_values[min(count - 1, max(0, int(round(p / 100 * count)) - 1))], 4)
+
+
+def summarize(latencies_ms):
+    latencies_ms = sorted(latencies_ms)
+    return {
+        'lookups': len(latencies_ms),
+        'p50_ms': percentile(latencies_ms, 50),
+        'p95_ms': percentile(latencies_ms, 95),
+        'p99_ms': percentile(latencies_ms, 99),
+        'max_ms': round(latencies_ms[-1], 4) if latencies_ms else None,
+    }
+
+
+def run_lookups(user_ids, ad_ids, seen_counts):
+    """প্রতিটি ব্যবহারকারীর জন্য একবার `get_ad_for_user` চালায়; রিটার্ন: (লেটেন্সি, সময়, ভুল ফলাফলের সংখ্যা)।"""
+    from modules.ad_manager import get_ad_for_user
+
+    latencies_ms = []
+    wrong = 0
+    started = time.perf_counter()
+    for user_id in user_ids:
+        call_started = time.perf_counter()
+        ad = get_ad_for_user(user_id)
+        latencies_ms.append((time.perf_counter() - call_started) * 1000)
+        seen = seen_counts[user_id]
+        expected = ad_ids[seen] if seen < len(ad_ids) else None
+        if (ad['ad_id'] if ad else None) != expected:
+            wrong += 1
+    return latencies_ms, time.perf_counter() - started, wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description="বিজ্ঞাপন নির্বাচন (`get_ad_for_user`) বেঞ্চমার্ক")
+    parser.add_argument('--ads', type=int, default=1000, help="সিড করা সক্রিয় বিজ্ঞাপনের সংখ্যা")
+    parser.add_argument('--users', type=int, default=100_000, help="সিড করা ব্যবহারকারীর সংখ্যা")
+    parser.add_argument('--max-seen', type=int, default=50, help="একজন ব্যবহারকারী সর্বোচ্চ কয়টি বিজ্ঞাপন আগে দেখেছে")
+    parser.add_argument('--exhausted-users', type=int, default=100, help="কতজন ব্যবহারকারী সব বিজ্ঞাপন দেখে ফেলেছে")
+    parser.add_argument('--lookups', type=int, default=20_000, help="কতজন এলোমেলো ব্যবহারকারীর জন্য বিজ্ঞাপন খোঁজা হবে")
+    parser.add_argument('--seed', type=int, default=1, help="র‍্যান্ডম সিড")
+    parser.add_argument('--output', default='ad_selection_benchmark_result.json', help="ফলাফলের JSON ফাইল")
+    args = parser.parse_args()
+
+    from config import STORAGE_BACKEND
+
+    rng = random.Random(args.seed)
+    ad_ids, seen_counts = seed_database(args.users, args.ads, args.max_seen, args.exhausted_users, rng)
+
+    all_users = list(seen_counts)
+    sampled = [rng.choice(all_users) for _ in range(args.lookups)]
+    exhausted = [user_id for user_id, seen in seen_counts.items() if seen >= len(ad_ids)]
+
+    print(f"বিজ্ঞাপন খোঁজা শুরু হচ্ছে ({STORAGE_BACKEND}): {len(sampled)}জন এলোমেলো এবং "
+          f"{len(exhausted)}জন সব-দেখা ব্যবহারকারী...")
+    latencies_ms, elapsed, wrong = run_lookups(sampled, ad_ids, seen_counts)
+    exhausted_latencies_ms, _, exhausted_wrong = run_lookups(exhausted, ad_ids, seen_counts)
+
+    result = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'storage': STORAGE_BACKEND,
+        'database': os.environ.get('DATABASE_NAME'),
+        'params': vars(args),
+        'lookups_per_second': round(len(sampled) / elapsed, 2) if elapsed else 0,
+        'random_users': summarize(latencies_ms),
+        'exhausted_users': summarize(exhausted_latencies_ms),
+        'wrong_results': wrong + exhausted_wrong,
+    }
+
+    print(f"\n{result['lookups_per_second']} lookup/s")
+    print(f"{'users':18}{'lookups':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for name in ('random_users', 'exhausted_users'):
+        summary = result[name]
+        print(f"{name:18}{summary['lookups']:>9}{summary['p50_ms'] or 0:>10.3f}{summary['p95_ms'] or 0:>10.3f}"
+              f"{summary['p99_ms'] or 0:>10.3f}{summary['max_ms'] or 0:>10.3f}")
+    print("যাচাই: সব ফলাফল সঠিক।" if not result['wrong_results']
+          else f"যাচাই ব্যর্থ: {result['wrong_results']}টি ভুল বিজ্ঞাপন।")
+
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"\nফলাফল '{args.output}' ফাইলে সংরক্ষণ করা হয়েছে।")
+    return 0 if not result['wrong_results'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
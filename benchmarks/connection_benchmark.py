@@ -0,0 +1,162 @@
+# advanced_earning_bot/benchmarks/connection_benchmark.py
+
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+"""
+SQLite সংযোগ পুনঃব্যবহারের আগে/পরে তুলনা করার বেঞ্চমার্ক (requests/s)।
+
+প্রতিটি "অনুরোধ" একটি সাধারণ বট আপডেটের মতো: ব্যবহারকারীর সারি পড়া, তারপর তার ব্যালেন্স আপডেট করা।
+- `per-call` (আগে): পুরোনো ম্যানেজার ফাংশনগুলোর মতো প্রতিটি কলে `sqlite3.connect` দিয়ে নতুন সংযোগ খোলা,
+  কুয়েরি চালানো (লেখার পর কমিট) এবং সংযোগ বন্ধ করা; অর্থাৎ প্রতি অনুরোধে দুটি সংযোগ।
+- `shared` (পরে): আসল `user_manager.get_user_by_id` এবং `user_manager.update_balance`, যারা
+  `get_connection()` এর থ্রেড-ভিত্তিক দীর্ঘস্থায়ী (PRAGMA টিউন করা) সংযোগ ব্যবহার করে।
+
+দুটো মোড একই ডাটাবেসে, একই এলোমেলো ব্যবহারকারী ক্রমে, `--threads` টি থ্রেডে চলে। শেষে যাচাই করা হয়
+যে প্রতিটি মোডের সব ব্যালেন্স আপডেট প্রয়োগ হয়েছে।
+
+ব্যবহার (প্রজেক্টের মূল ফোল্ডার থেকে):
+    python benchmarks/connection_benchmark.py --users 10000 --requests 20000 --threads 4
+
+প্রতিটি রানের আগে টেস্ট ডাটাবেস ফাইলটি (ডিফল্ট `connection_bench.db`) মুছে দিন।
+"""
+
+# প্রজেক্টের মডিউলগুলো ইম্পোর্ট করার আগে আলাদা ডাটাবেস ফাইল সেট করুন
+os.environ.setdefault('DATABASE_NAME', 'connection_bench.db')
+os.environ['STORAGE_BACKEND'] = 'sqlite' # সংযোগ পুনঃব্যবহার শুধু SQLite ব্যাকএন্ডের বিষয়
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# সিড করা ব্যবহারকারীর আইডি এখান থেকে শুরু হয়, যাতে আসল আইডির সাথে না মেলে
+SEED_USER_ID_START = 9_300_000_000
+# এতজন ব্যবহারকারীর পর একবার কমিট, যাতে একটি ট্রানজেকশন খুব বড় না হয়
+SEED_CHUNK_USERS = 5000
+
+
+def seed_users(num_users):
+    """ব্যবহারকারী তৈরি করে তাদের আইডির তালিকা রিটার্ন করে।"""
+    from storage import get_storage
+
+    storage = get_storage()
+    storage.initialize()
+
+    started = time.perf_counter()
+    now = datetime.now()
+    user_ids = [SEED_USER_ID_START + i for i in range(num_users)]
+    for chunk_start in range(0, num_users, SEED_CHUNK_USERS):
+        with storage.transaction():
+            for user_id in user_ids[chunk_start:chunk_start + SEED_CHUNK_USERS]:
+                storage.users.create(user_id, f'conn_bench_{user_id}', 'bn', None, now)
+    print(f"{num_users} জন ব্যবহারকারী সিড করা হয়েছে ({time.perf_counter() - started:.2f}s)।")
+    return user_ids
+
+
+def per_call_request(user_id):
+    """সংযোগ পুনঃব্যবহারের আগের কোড পথ: প্রতিটি কলে নতুন সংযোগ।"""
+    from config import DATABASE_NAME
+
+    conn = sqlite3.connect(DATABASE_NAME)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
+        columns = [description[0] for description in cursor.description]
+        user = dict(zip(columns, cursor.fetchone()))
+    finally:
+        conn.close()
+
+    conn = sqlite3.connect(DATABASE_NAME)
+    try:
+        conn.execute("UPDATE users SET balance = balance + ? WHERE user_id = ?", (1, user_id))
+        conn.commit()
+    finally:
+        conn.close()
+    return user
+
+
+def shared_request(user_id):
+    """বর্তমান কোড পথ: থ্রেডের শেয়ার করা সংযোগ।"""
+    from modules import user_manager
+
+    user = user_manager.get_user_by_id(user_id)
+    user_manager.update_balance(user_id, 1)
+    return user
+
+
+def run_mode(request, sequence, threads):
+    """`sequence` এর প্রতিটি ব্যবহারকারীর জন্য একটি অনুরোধ চালায়; রিটার্ন: (মোট সময়, ব্যর্থ অনুরোধ)।"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='bench') as executor:
+        users = list(executor.map(request, sequence))
+    return time.perf_counter() - started, sum(1 for user in users if not user)
+
+
+def total_balance(user_ids):
+    from storage import get_storage
+    users = get_storage().users
+    return sum(users.get(user_id)['balance'] for user_id in user_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite সংযোগ পুনঃব্যবহারের আগে/পরে বেঞ্চমার্ক")
+    parser.add_argument('--users', type=int, default=10_000, help="সিড করা ব্যবহারকারীর সংখ্যা")
+    parser.add_argument('--requests', type=int, default=20_000, help="প্রতিটি মোডে কতটি অনুরোধ")
+    parser.add_argument('--threads', type=int, default=4, help="একসাথে কতটি থ্রেড অনুরোধ চালাবে")
+    parser.add_argument('--seed', type=int, default=1, help="র‍্যান্ডম সিড")
+    parser.add_argument('--output', default='connection_benchmark_result.json', help="ফলাফলের JSON ফাইল")
+    args = parser.parse_args()
+
+    from database import close_all_connections
+
+    rng = random.Random(args.seed)
+    user_ids = seed_users(args.users)
+    sequence = [rng.choice(user_ids) for _ in range(args.requests)]
+
+    result = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'database': os.environ.get('DATABASE_NAME'),
+        'params': vars(args),
+        'modes': {},
+        'wrong_results': 0,
+    }
+    for name, request in (('per-call', per_call_request), ('shared', shared_request)):
+        before = total_balance(user_ids)
+        print(f"{name}: {len(sequence)}টি অনুরোধ চালানো হচ্ছে ({args.threads} থ্রেড)...")
+        elapsed, failed = run_mode(request, sequence, args.threads)
+        # প্রতিটি অনুরোধ একজনের ব্যালেন্স ১ বাড়ায়
+        lost_updates = len(sequence) - (total_balance(user_ids) - before)
+        result['wrong_results'] += failed + abs(lost_updates)
+        result['modes'][name] = {
+            'requests': len(sequence),
+            'seconds': round(elapsed, 3),
+            'requests_per_second': round(len(sequence) / elapsed, 2) if elapsed else 0,
+            'failed_requests': failed,
+            'lost_updates': lost_updates,
+        }
+    close_all_connections()
+
+    modes = result['modes']
+    if modes['per-call']['requests_per_second']:
+        result['speedup'] = round(modes['shared']['requests_per_second'] / modes['per-call']['requests_per_second'], 2)
+
+    print(f"\n{'mode':10}{'requests':>10}{'seconds':>10}{'req/s':>12}")
+    for name, summary in modes.items():
+        print(f"{name:10}{summary['requests']:>10}{summary['seconds']:>10.3f}{summary['requests_per_second']:>12.2f}")
+    if 'speedup' in result:
+        print(f"\nশেয়ার করা সংযোগ: {result['speedup']}x")
+    print("যাচাই: সব অনুরোধ সফল এবং সব আপডেট প্রয়োগ হয়েছে।" if not result['wrong_results']
+          else f"যাচাই ব্যর্থ: {result['wrong_results']}টি ব্যর্থ অনুরোধ/হারানো আপডেট।")
+
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"\nফলাফল '{args.output}' ফাইলে সংরক্ষণ করা হয়েছে।")
+    return 0 if not result['wrong_results'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
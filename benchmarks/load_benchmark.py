@@ -0,0 +1,255 @@
+# advanced_earning_bot/benchmarks/load_benchmark.py
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from datetime import datetime
+
+"""
+মিনি অ্যাপ API-এর জন্য এন্ড-টু-এন্ড HTTP লোড টেস্ট।
+
+প্রতিটি ভার্চুয়াল ব্যবহারকারী মিনি অ্যাপের মতো একই ক্রমে অনুরোধ পাঠায়
+(`mini_app/js/main.js` এবং `ad_viewer.js` দেখুন):
+    1. /get_user_data                      (অ্যাপ খোলা)
+    2. /claim_daily_bonus → /get_user_data (বোনাস সফল হলে ব্যালেন্স রিফ্রেশ)
+    3. /get_ad_for_view → /record_ad_view  (প্রতিটি বিজ্ঞাপনের জন্য, --ads-per-user বার)
+
+প্রতিটি রাউটের p50/p95/p99 লেটেন্সি, থ্রুপুট এবং ত্রুটির হার JSON ফাইলে সংরক্ষণ করা হয়,
+যাতে `--baseline` দিয়ে আগের রানের সাথে তুলনা করা যায়।
+
+ব্যবহার (প্রজেক্টের মূল ফোল্ডার থেকে):
+    # একই প্রসেসে (ASGI), আলাদা ডাটাবেস ফাইলে
+    python benchmarks/load_benchmark.py --users 2000 --ads 200 --concurrency 50
+
+    # চালু থাকা সার্ভারের বিরুদ্ধে (সার্ভারটিও একই DATABASE_NAME দিয়ে চালু করতে হবে)
+    DATABASE_NAME=loadtest.db python benchmarks/load_benchmark.py --url http://localhost:8080
+
+প্রয়োজন: `pip install httpx`
+সিড করা ব্যবহারকারীরা প্রথম রানেই দৈনিক বোনাস নিয়ে নেয়, তাই তুলনাযোগ্য ফলাফলের জন্য
+প্রতিটি রানের আগে টেস্ট ডাটাবেস ফাইলটি (ডিফল্ট `loadtest.db`) মুছে দিন।
+"""
+
+# প্রজেক্টের মডিউলগুলো ইম্পোর্ট করার আগে আলাদা ডাটাবেস ফাইল সেট করুন,
+# যাতে আসল `bot_database.db` তে টেস্টের ডাটা না যায়
+os.environ.setdefault('DATABASE_NAME', 'loadtest.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+# সিড করা ব্যবহারকারী ও বিজ্ঞাপনের আইডি এখান থেকে শুরু হয়, যাতে আসল আইডির সাথে না মেলে
+SEED_USER_ID_START = 9_000_000_000
+SEED_AD_OWNER_ID = 8_999_999_999
+
+
+def seed_database(num_users, num_ads, target_views):
+    """
+    টেস্টের জন্য ব্যবহারকারী এবং সক্রিয় বিজ্ঞাপন তৈরি করে।
+    বিজ্ঞাপনের view_duration 0, যাতে ভিউ টিকিট সাথে সাথেই ব্যবহার করা যায়।
+    সবকিছু একটি ট্রানজেকশনে লেখা হয়, তারপর পরিসংখ্যান নতুন করে হিসাব করা হয়।
+    """
+    from storage import get_storage
+    from modules.bot_settings import initialize_bot_settings
+    from modules.stats_manager import recompute_stats
+
+    storage = get_storage()
+    storage.initialize()
+    initialize_bot_settings()
+
+    started = time.perf_counter()
+    now = datetime.now()
+    with storage.transaction():
+        storage.users.create(SEED_AD_OWNER_ID, 'loadtest_owner', 'bn', None, now)
+        for i in range(num_users):
+            storage.users.create(SEED_USER_ID_START + i, f'loadtest_{i}', 'bn', None, now)
+        for i in range(num_ads):
+            storage.ads.create(SEED_AD_OWNER_ID, 'admin_direct_link', 'direct_link_ad',
+                               f'https://example.com/ad/{i}', target_views, 0, status='active')
+    recompute_stats()
+    print(f"{num_users} জন ব্যবহারকারী এবং {num_ads}টি বিজ্ঞাপন সিড করা হয়েছে ({time.perf_counter() - started:.2f}s)।")
+
+
+class RouteStats:
+    """একটি রাউটের লেটেন্সি এবং ফলাফল জমা রাখে।"""
+
+    def __init__(self):
+        self.latencies_ms = []
+        self.errors = 0     # HTTP ত্রুটি বা নেটওয়ার্ক সমস্যা
+        self.rejected = 0   # HTTP 200 কিন্তু success = False (যেমন বোনাস আগেই নেওয়া)
+
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies_ms)
+        count = len(latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            # nearest-rank পদ্ধতি
+            return round(latencies[min(count - 1, max(0, int(round(p / 100 * count)) - 1))], 3)
+
+        return {
+            'requests': count,
+            'errors': self.errors,
+            'error_rate': round(self.errors / count, 4) if count else 0,
+            'rejected': self.rejected,
+            'throughput_rps': round(count / elapsed, 2) if elapsed else 0,
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95),
+            'p99_ms': percentile(99),
+            'max_ms': round(latencies[-1], 3) if latencies else None,
+        }
+
+
+class LoadTest:
+
+    def __init__(self, client, ads_per_user, think_time):
+        self.client = client
+        self.ads_per_user = ads_per_user
+        self.think_time = think_time
+        self.stats = {}
+
+    async def call(self, endpoint, payload):
+        """একটি POST অনুরোধ পাঠায়, সময় মাপে এবং JSON রেসপন্স (ব্যর্থ হলে None) রিটার্ন করে।"""
+        route_stats = self.stats.setdefault(endpoint, RouteStats())
+        started = time.perf_counter()
+        try:
+            response = await self.client.post(endpoint, json=payload)
+            body = response.json()
+        except (httpx.HTTPError, ValueError):
+            route_stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+            route_stats.errors += 1
+            return None
+        route_stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+        if response.status_code != 200:
+            route_stats.errors += 1
+            return None
+        if not body.get('success'):
+            route_stats.rejected += 1
+        return body
+
+    async def think(self):
+        if self.think_time:
+            await asyncio.sleep(random.uniform(0, self.think_time))
+
+    async def run_session(self, user_id):
+        """মিনি অ্যাপে একজন ব্যবহারকারীর একটি সেশন।"""
+        if await self.call('/get_user_data', {'user_id': user_id}) is None:
+            return
+        await self.think()
+
+        bonus = await self.call('/claim_daily_bonus', {'user_id': user_id})
+        if bonus and bonus.get('success'):
+            await self.call('/get_user_data', {'user_id': user_id})
+        await self.think()
+
+        for _ in range(self.ads_per_user):
+            response = await self.call('/get_ad_for_view', {'user_id': user_id})
+            if not response or not response.get('success'):
+                break
+            ad = response['ad']
+            await self.think()
+            await self.call('/record_ad_view', {'user_id': user_id, 'ticket': ad['ticket']})
+
+    async def run(self, user_ids, concurrency):
+        """`concurrency` টি ওয়ার্কার দিয়ে সকল ব্যবহারকারীর সেশন চালায়।"""
+        pending = asyncio.Queue()
+        for user_id in user_ids:
+            pending.put_nowait(user_id)
+
+        async def worker():
+            while True:
+                try:
+                    user_id = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self.run_session(user_id)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+
+def compare_with_baseline(result, baseline_path):
+    """আগের রানের ফলাফলের সাথে প্রতিটি রাউটের p95 এবং থ্রুপুট তুলনা করে প্রিন্ট করে।"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nবেসলাইনের সাথে তুলনা ({baseline_path}):")
+    for route, current in result['routes'].items():
+        previous = baseline.get('routes', {}).get(route)
+        if not previous or not previous.get('p95_ms') or not current.get('p95_ms'):
+            continue
+        change = (current['p95_ms'] - previous['p95_ms']) / previous['p95_ms'] * 100
+        print(f"  {route:22} p95 {previous['p95_ms']:>9.2f} → {current['p95_ms']:>9.2f} ms ({change:+.1f}%), "
+              f"rps {previous['throughput_rps']} → {current['throughput_rps']}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="মিনি অ্যাপ API লোড টেস্ট")
+    parser.add_argument('--url', help="চালু থাকা সার্ভারের URL; না দিলে একই প্রসেসে অ্যাপটি চালানো হবে")
+    parser.add_argument('--users', type=int, default=1000, help="ভার্চুয়াল ব্যবহারকারীর সংখ্যা")
+    parser.add_argument('--ads', type=int, default=100, help="সিড করা সক্রিয় বিজ্ঞাপনের সংখ্যা")
+    parser.add_argument('--target-views', type=int, default=1_000_000, help="প্রতিটি বিজ্ঞাপনের টার্গেট ভিউ")
+    parser.add_argument('--ads-per-user', type=int, default=5, help="প্রতি সেশনে সর্বোচ্চ কয়টি বিজ্ঞাপন দেখা হবে")
+    parser.add_argument('--concurrency', type=int, default=50, help="একসাথে কতজন ব্যবহারকারী সক্রিয়")
+    parser.add_argument('--think-time', type=float, default=0.0, help="অনুরোধের মাঝে সর্বোচ্চ বিরতি (সেকেন্ড)")
+    parser.add_argument('--no-seed', action='store_true', help="ডাটাবেস সিড না করে আগের ডাটা ব্যবহার করুন")
+    parser.add_argument('--output', default='load_benchmark_result.json', help="ফলাফলের JSON ফাইল")
+    parser.add_argument('--baseline', help="তুলনার জন্য আগের রানের JSON ফাইল")
+    args = parser.parse_args()
+
+    if not args.no_seed:
+        seed_database(args.users, args.ads, args.target_views)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30)
+        mode = 'http'
+    else:
+        from api.routes import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://loadtest', timeout=30)
+        mode = 'in-process'
+
+    user_ids = [SEED_USER_ID_START + i for i in range(args.users)]
+    random.shuffle(user_ids)
+
+    print(f"লোড টেস্ট শুরু হচ্ছে ({mode}): {args.users} জন ব্যবহারকারী, concurrency {args.concurrency}...")
+    async with client:
+        load_test = LoadTest(client, args.ads_per_user, args.think_time)
+        elapsed = await load_test.run(user_ids, args.concurrency)
+
+    total_requests = sum(len(s.latencies_ms) for s in load_test.stats.values())
+    result = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'mode': mode,
+        'target': args.url or 'asgi',
+        'database': os.environ.get('DATABASE_NAME'),
+        'params': {
+            'users': args.users, 'ads': args.ads, 'ads_per_user': args.ads_per_user,
+            'concurrency': args.concurrency, 'think_time': args.think_time,
+        },
+        'elapsed_seconds': round(elapsed, 3),
+        'total_requests': total_requests,
+        'throughput_rps': round(total_requests / elapsed, 2) if elapsed else 0,
+        'routes': {route: s.summary(elapsed) for route, s in load_test.stats.items()},
+    }
+
+    print(f"\nমোট {total_requests}টি অনুরোধ, {elapsed:.2f}s, {result['throughput_rps']} req/s")
+    print(f"{'route':24}{'reqs':>8}{'err%':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for route, summary in result['routes'].items():
+        print(f"{route:24}{summary['requests']:>8}{summary['error_rate'] * 100:>7.2f}%"
+              f"{summary['p50_ms'] or 0:>10.2f}{summary['p95_ms'] or 0:>10.2f}{summary['p99_ms'] or 0:>10.2f}")
+
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"\nফলাফল '{args.output}' ফাইলে সংরক্ষণ করা হয়েছে।")
+
+    if args.baseline:
+        compare_with_baseline(result, args.baseline)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,194 @@
+# advanced_earning_bot/benchmarks/payout_benchmark.py
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from datetime import datetime
+
+"""
+পে-আউট ওয়ার্কারের অফলাইন বেঞ্চমার্ক। গেটওয়ে:
+- `mock`: `payment_gateways/mock_gateway.py`, কোনো নেটওয়ার্ক নেই।
+- `stub`: একই প্রসেসে লোকাল HTTP স্টাব সার্ভার (`payment_gateways/stub_server.py`) চালু করে
+  `StubGateway` দিয়ে আসল HTTP পথে (keep-alive সংযোগ পুল, বাল্ক স্ট্যাটাস পোলিং) পরিশোধ করে,
+  এবং কয়টি TCP সংযোগ খোলা হয়েছে তা দেখায়।
+
+আলাদা ডাটাবেসে ব্যবহারকারী এবং উইথড্র অনুরোধ সিড করে, `withdrawal_mode` 'automatic' করে,
+তারপর কিউ খালি না হওয়া পর্যন্ত `run_payout_batch` এবং সব চলমান পে-আউট চূড়ান্ত না হওয়া পর্যন্ত
+`poll_in_flight` চালায়। শেষে থ্রুপুট দেখায় এবং যাচাই করে:
+- কোনো উইথড্র দুইবার পরিশোধ হয়নি (গেটওয়ের সফল পে-আউট সংখ্যা = 'completed' উইথড্রর সংখ্যা),
+- প্রত্যাখ্যাত উইথড্রর টাকা ফেরত এসেছে (সব ব্যালেন্স লেজারের সাথে মেলে),
+- `pending_withdrawals` কাউন্টার আসল সংখ্যার সমান।
+
+ব্যবহার (প্রজেক্টের মূল ফোল্ডার থেকে):
+    python benchmarks/payout_benchmark.py --withdrawals 2000 --latency 0.05 --error-rate 0.05 --failure-rate 0.02
+    python benchmarks/payout_benchmark.py --gateway stub --concurrency 100 --settle 0.5 --late-failure-rate 0.02
+
+প্রতিটি রানের আগে টেস্ট ডাটাবেস ফাইলটি (ডিফল্ট `payout_bench.db`) মুছে দিন।
+"""
+
+# প্রজেক্টের মডিউলগুলো ইম্পোর্ট করার আগে আলাদা ডাটাবেস ফাইল সেট করুন
+os.environ.setdefault('DATABASE_NAME', 'payout_bench.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# সিড করা ব্যবহারকারীর আইডি এখান থেকে শুরু হয়, যাতে আসল আইডির সাথে না মেলে
+SEED_USER_ID_START = 9_100_000_000
+
+
+def seed_withdrawals(num_withdrawals, amount):
+    """প্রতিটি উইথড্রর জন্য একজন ব্যবহারকারী তৈরি করে এবং আসল পথে (`create_withdrawal_request`) অনুরোধ করে।"""
+    from storage import get_storage
+    from modules import wallet_manager
+    from modules.bot_settings import initialize_bot_settings, update_setting
+    from modules.stats_manager import recompute_stats
+
+    storage = get_storage()
+    storage.initialize()
+    initialize_bot_settings()
+    update_setting('withdrawal_mode', 'automatic')
+    update_setting('min_auto_withdraw_amount', str(amount))
+
+    started = time.perf_counter()
+    now = datetime.now()
+    user_ids = [SEED_USER_ID_START + i for i in range(num_withdrawals)]
+    with storage.transaction():
+        for user_id in user_ids:
+            storage.users.create(user_id, f'payout_bench_{user_id}', 'bn', None, now)
+    for user_id in user_ids:
+        wallet_manager.admin_adjust_balance(user_id, amount, 0)
+        wallet_manager.create_withdrawal_request(user_id, amount, 'mock', f'wallet-{user_id}')
+    recompute_stats()
+    print(f"{num_withdrawals}টি উইথড্র সিড করা হয়েছে ({time.perf_counter() - started:.2f}s)।")
+    return user_ids
+
+
+def _count_withdrawals(status):
+    from storage import get_storage
+    return sum(len(rows) for rows in get_storage().transactions.iter_export(1000, trans_type='withdrawal', status=status))
+
+
+def verify(paid_count, user_ids):
+    """ফলাফল যাচাই করে সমস্যার তালিকা রিটার্ন করে (খালি হলে সব ঠিক)। `paid_count`: গেটওয়েতে সফল পে-আউট।"""
+    from storage import get_storage
+    from modules.stats_manager import get_stats
+
+    storage = get_storage()
+    problems = []
+    completed = _count_withdrawals('completed')
+    if paid_count != completed:
+        problems.append(f"গেটওয়েতে {paid_count}টি সফল পে-আউট, কিন্তু {completed}টি উইথড্র 'completed'")
+    processing = _count_withdrawals('processing')
+    if processing:
+        problems.append(f"{processing}টি উইথড্র এখনও 'processing'")
+    mismatches = storage.reconciliation.verify_users(user_ids)
+    if mismatches:
+        problems.append(f"{len(mismatches)} জনের ব্যালেন্স লেজারের সাথে মেলে না, যেমন {mismatches[:3]}")
+    pending_actual = _count_withdrawals('pending')
+    pending_stat = get_stats().get('pending_withdrawals', 0)
+    if pending_actual != pending_stat:
+        problems.append(f"pending_withdrawals কাউন্টার {pending_stat}, আসল {pending_actual}")
+    return problems
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="পে-আউট ওয়ার্কার বেঞ্চমার্ক (মক গেটওয়ে বা লোকাল HTTP স্টাব)")
+    parser.add_argument('--gateway', choices=('mock', 'stub'), default='mock', help="কোন গেটওয়ে দিয়ে পরিশোধ")
+    parser.add_argument('--withdrawals', type=int, default=1000, help="সিড করা উইথড্রর সংখ্যা")
+    parser.add_argument('--amount', type=int, default=500, help="প্রতিটি উইথড্রর পরিমাণ")
+    parser.add_argument('--batch-size', type=int, default=50, help="একবারে কয়টি উইথড্র দাবি করা হবে")
+    parser.add_argument('--concurrency', type=int, default=20, help="গেটওয়েতে একসাথে কয়টি রিকোয়েস্ট")
+    parser.add_argument('--latency', type=float, default=0.05, help="প্রতিটি গেটওয়ে কলের সময় (সেকেন্ড)")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="স্থায়ী প্রত্যাখ্যানের হার (0-1)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="সাময়িক ত্রুটির হার (0-1)")
+    parser.add_argument('--settle', type=float, default=0.0, help="stub: পে-আউট কত সেকেন্ড 'pending' থাকবে")
+    parser.add_argument('--late-failure-rate', type=float, default=0.0, help="stub: 'pending' এর পর ব্যর্থ হওয়ার হার (0-1)")
+    parser.add_argument('--retry-delay', type=float, default=0.05, help="প্রথম রিট্রাইয়ের আগে বিরতি (সেকেন্ড)")
+    parser.add_argument('--seed', type=int, default=1, help="মক গেটওয়ের র‍্যান্ডম সিড")
+    parser.add_argument('--output', default='payout_benchmark_result.json', help="ফলাফলের JSON ফাইল")
+    args = parser.parse_args()
+
+    from modules import payout_worker
+
+    user_ids = seed_withdrawals(args.withdrawals, args.amount)
+    # বেঞ্চমার্কে কনফিগারেশনের ১ সেকেন্ডের বদলে ছোট বিরতি, যাতে রিট্রাই বেশি সময় না নেয়
+    payout_worker.PAYOUT_RETRY_BASE_DELAY_SECONDS = args.retry_delay
+
+    server = None
+    if args.gateway == 'stub':
+        from payment_gateways.stub_server import start_stub_server
+        from payment_gateways.stub_gateway import StubGateway
+        server = start_stub_server(latency=args.latency, failure_rate=args.failure_rate, error_rate=args.error_rate,
+                                   settle_seconds=args.settle, late_failure_rate=args.late_failure_rate, seed=args.seed)
+        gateway = StubGateway(server.url, max_concurrency=args.concurrency)
+    else:
+        from payment_gateways.mock_gateway import MockGateway
+        gateway = MockGateway(latency=args.latency, failure_rate=args.failure_rate,
+                              error_rate=args.error_rate, seed=args.seed, max_concurrency=args.concurrency)
+
+    totals = {'claimed': 0, 'completed': 0, 'processing': 0, 'failed': 0, 'retry': 0}
+    batches = polls = 0
+    print(f"পে-আউট শুরু হচ্ছে ({args.gateway}): batch {args.batch_size}, concurrency {args.concurrency}, "
+          f"latency {args.latency}s...")
+    started = time.perf_counter()
+    try:
+        while True:
+            counts = await payout_worker.run_payout_batch(gateway, args.batch_size)
+            if not counts['claimed']:
+                break
+            batches += 1
+            for key in totals:
+                totals[key] += counts.get(key, 0)
+        # গেটওয়েতে চলমান পে-আউটগুলো চূড়ান্ত না হওয়া পর্যন্ত বাল্ক স্ট্যাটাস পোলিং
+        while True:
+            polled = await payout_worker.poll_in_flight(gateway)
+            polls += 1
+            totals['completed'] += polled['completed']
+            totals['failed'] += polled['failed']
+            if polled['in_flight'] == polled['completed'] + polled['failed']:
+                break
+            await asyncio.sleep(max(args.settle / 4, 0.05))
+        elapsed = time.perf_counter() - started
+
+        if server:
+            stub_stats = server.state.stats()
+            paid_count = sum(1 for payout in server.state.payouts.values() if payout['final_status'] == 'completed')
+        else:
+            stub_stats = None
+            paid_count = len(gateway.payouts)
+        problems = verify(paid_count, user_ids)
+    finally:
+        if server:
+            from payment_gateways.http_client import close_http_client
+            await close_http_client()
+            server.shutdown()
+            server.server_close()
+    result = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'database': os.environ.get('DATABASE_NAME'),
+        'params': vars(args),
+        'elapsed_seconds': round(elapsed, 3),
+        'batches': batches,
+        'status_polls': polls,
+        'stub_server': stub_stats,
+        'totals': totals,
+        'payouts_per_second': round((totals['completed'] + totals['failed']) / elapsed, 2) if elapsed else 0,
+        'problems': problems,
+    }
+
+    print(f"\n{batches}টি ব্যাচ, {elapsed:.2f}s, {result['payouts_per_second']} পে-আউট/সেকেন্ড")
+    print(f"সফল {totals['completed']}, প্রত্যাখ্যাত {totals['failed']}, আবার কিউতে {totals['retry']}, "
+          f"স্ট্যাটাস পোল {polls}")
+    if stub_stats:
+        print(f"স্টাব সার্ভার: {stub_stats['requests']}টি রিকোয়েস্ট, {stub_stats['connections']}টি TCP সংযোগ")
+    print("যাচাই: সব ঠিক আছে।" if not problems else "যাচাই ব্যর্থ:\n  " + "\n  ".join(problems))
+
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"\nফলাফল '{args.output}' ফাইলে সংরক্ষণ করা হয়েছে।")
+    return 0 if not problems else 1
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
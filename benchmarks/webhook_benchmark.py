@@ -0,0 +1,232 @@
+# advanced_earning_bot/benchmarks/webhook_benchmark.py
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from datetime import datetime
+
+"""
+`/telegram/webhook` রাউটের থ্রুপুট মাপার লোকাল বেঞ্চমার্ক।
+
+রেকর্ড করা টেলিগ্রাম আপডেট (JSONL ফাইল, প্রতি লাইনে একটি আপডেট — যেমন `getUpdates` এর `result`
+থেকে নেওয়া) অথবা সেগুলোর মতো দেখতে কৃত্রিম আপডেট (`/start`, বাটন ক্লিক, সাধারণ টেক্সট) একসাথে
+অনেকগুলো করে webhook রাউটে POST করা হয়। দুটি সংখ্যা মাপা হয়:
+    - accepted/s : রাউটটি কত দ্রুত আপডেট নিয়ে 200 দেয় (প্রতিটি POST এর p50/p95/p99 লেটেন্সি সহ)
+    - processed/s: `main.py` এর মতো `concurrent_updates` সহ চালু `Application` কত দ্রুত
+                   `update_queue` থেকে আপডেটগুলো হ্যান্ডলারে পৌঁছে দেয়
+
+বট কোনো নেটওয়ার্ক কল করে না (`_OfflineRequest`), আর হ্যান্ডলারটি শুধু গণনা করে; `--handler-delay`
+দিয়ে প্রতিটি আপডেটে হ্যান্ডলারের I/O সময় অনুকরণ করা যায়। সবকিছু একই প্রসেসে (ASGI) চলে।
+
+ব্যবহার (প্রজেক্টের মূল ফোল্ডার থেকে):
+    python benchmarks/webhook_benchmark.py --updates 20000 --concurrency 100
+    python benchmarks/webhook_benchmark.py --updates-file recorded_updates.jsonl --handler-delay 0.05
+
+প্রয়োজন: `pip install httpx`
+"""
+
+# প্রজেক্টের মডিউলগুলো ইম্পোর্ট করার আগে আলাদা ডাটাবেস ফাইল সেট করুন
+os.environ.setdefault('DATABASE_NAME', 'loadtest.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from telegram import Update
+from telegram.ext import Application, TypeHandler
+from telegram.request import BaseRequest
+
+# কৃত্রিম আপডেটের ব্যবহারকারী আইডি এখান থেকে শুরু হয়, যাতে আসল আইডির সাথে না মেলে
+SEED_USER_ID_START = 9_000_000_000
+BENCH_BOT_TOKEN = '123456789:webhook-benchmark'
+BENCH_BOT_USER = {'id': 123456789, 'is_bot': True, 'first_name': 'Benchmark', 'username': 'benchmark_bot'}
+
+
+class _OfflineRequest(BaseRequest):
+    """বট API তে না গিয়ে `getMe` এর জন্য বেঞ্চমার্ক বটের তথ্য এবং বাকি সব কলে `true` ফেরত দেয়।"""
+
+    @property
+    def read_timeout(self):
+        return None
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, read_timeout=None,
+                         write_timeout=None, connect_timeout=None, pool_timeout=None):
+        result = BENCH_BOT_USER if url.endswith('/getMe') else True
+        return 200, json.dumps({'ok': True, 'result': result}).encode('utf-8')
+
+
+def synthetic_updates(count, num_users):
+    """রেকর্ড করা আপডেটের মতো গঠনের কৃত্রিম আপডেট: ৪০% /start, ৩০% বাটন ক্লিক, ৩০% টেক্সট।"""
+    now = int(time.time())
+    updates = []
+    for i in range(count):
+        user_id = SEED_USER_ID_START + random.randrange(num_users)
+        user = {'id': user_id, 'is_bot': False, 'first_name': f'user_{user_id}', 'language_code': 'bn'}
+        chat = {'id': user_id, 'type': 'private', 'first_name': user['first_name']}
+        kind = random.random()
+        if kind < 0.4:
+            updates.append({'update_id': i + 1, 'message': {
+                'message_id': i + 1, 'date': now, 'chat': chat, 'from': user, 'text': '/start',
+                'entities': [{'type': 'bot_command', 'offset': 0, 'length': 6}],
+            }})
+        elif kind < 0.7:
+            updates.append({'update_id': i + 1, 'callback_query': {
+                'id': str(i + 1), 'from': user, 'chat_instance': str(user_id), 'data': 'verify_membership',
+                'message': {'message_id': i, 'date': now, 'chat': chat, 'text': 'চ্যানেলে যোগ দিন'},
+            }})
+        else:
+            updates.append({'update_id': i + 1, 'message': {
+                'message_id': i + 1, 'date': now, 'chat': chat, 'from': user, 'text': f'hello {i}',
+            }})
+    return updates
+
+
+def load_updates(path, count):
+    """JSONL ফাইল থেকে রেকর্ড করা আপডেট পড়ে; `count` পর্যন্ত পৌঁছাতে প্রয়োজনে বারবার ঘুরিয়ে নেয়।"""
+    with open(path) as f:
+        recorded = [json.loads(line) for line in f if line.strip()]
+    if not recorded:
+        raise SystemExit(f"'{path}' ফাইলে কোনো আপডেট নেই।")
+    updates = []
+    for i in range(count):
+        update = dict(recorded[i % len(recorded)])
+        update['update_id'] = i + 1
+        updates.append(update)
+    return updates
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    # nearest-rank পদ্ধতি
+    count = len(sorted_values)
+    return round(sorted_values[min(count - 1, max(0, int(round(p / 100 * count)) - 1))], 3)
+
+
+async def run_benchmark(updates, concurrency, handler_delay, concurrent_updates):
+    """আপডেটগুলো webhook এ পাঠায় এবং (latencies_ms, errors, accept_elapsed, process_elapsed) রিটার্ন করে।"""
+    from api.routes import app as fastapi_app, set_telegram_application
+    from config import WEBHOOK_SECRET_TOKEN
+
+    application = (
+        Application.builder().token(BENCH_BOT_TOKEN).request(_OfflineRequest())
+        .get_updates_request(_OfflineRequest()).concurrent_updates(concurrent_updates).build()
+    )
+    processed = 0
+    all_processed = asyncio.Event()
+
+    async def count_update(update, context):
+        nonlocal processed
+        if handler_delay:
+            await asyncio.sleep(handler_delay)
+        processed += 1
+        if processed == len(updates):
+            all_processed.set()
+
+    application.add_handler(TypeHandler(Update, count_update))
+
+    headers = {'X-Telegram-Bot-Api-Secret-Token': WEBHOOK_SECRET_TOKEN} if WEBHOOK_SECRET_TOKEN else {}
+    latencies_ms = []
+    errors = 0
+    pending = asyncio.Queue()
+    for update in updates:
+        pending.put_nowait(update)
+
+    async def sender(client):
+        nonlocal errors
+        while True:
+            try:
+                update = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                response = await client.post('/telegram/webhook', json=update, headers=headers)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    transport = httpx.ASGITransport(app=fastapi_app)
+    async with application, httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=30) as client:
+        await application.start()
+        set_telegram_application(application)
+        try:
+            started = time.perf_counter()
+            await asyncio.gather(*(sender(client) for _ in range(concurrency)))
+            accept_elapsed = time.perf_counter() - started
+            if errors == 0:
+                await all_processed.wait()
+            process_elapsed = time.perf_counter() - started
+        finally:
+            set_telegram_application(None)
+            await application.stop()
+
+    return latencies_ms, errors, accept_elapsed, process_elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="টেলিগ্রাম webhook থ্রুপুট বেঞ্চমার্ক")
+    parser.add_argument('--updates', type=int, default=10000, help="মোট কয়টি আপডেট পাঠানো হবে")
+    parser.add_argument('--updates-file', help="রেকর্ড করা আপডেটের JSONL ফাইল; না দিলে কৃত্রিম আপডেট")
+    parser.add_argument('--users', type=int, default=1000, help="কৃত্রিম আপডেটে কতজন আলাদা ব্যবহারকারী")
+    parser.add_argument('--concurrency', type=int, default=100, help="একসাথে কয়টি POST চলবে")
+    parser.add_argument('--concurrent-updates', type=int, default=None,
+                        help="Application এর concurrent_updates (ডিফল্ট: config.CONCURRENT_UPDATES)")
+    parser.add_argument('--handler-delay', type=float, default=0.0, help="প্রতিটি আপডেটে হ্যান্ডলারের অনুকরণ করা সময় (সেকেন্ড)")
+    parser.add_argument('--output', default='webhook_benchmark_result.json', help="ফলাফলের JSON ফাইল")
+    args = parser.parse_args()
+
+    from config import CONCURRENT_UPDATES
+    concurrent_updates = args.concurrent_updates or CONCURRENT_UPDATES
+
+    if args.updates_file:
+        updates = load_updates(args.updates_file, args.updates)
+    else:
+        updates = synthetic_updates(args.updates, args.users)
+
+    print(f"webhook বেঞ্চমার্ক শুরু হচ্ছে: {len(updates)}টি আপডেট, concurrency {args.concurrency}, "
+          f"concurrent_updates {concurrent_updates}...")
+    latencies_ms, errors, accept_elapsed, process_elapsed = await run_benchmark(
+        updates, args.concurrency, args.handler_delay, concurrent_updates
+    )
+
+    latencies_ms.sort()
+    result = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'source': args.updates_file or 'synthetic',
+        'params': {
+            'updates': len(updates), 'concurrency': args.concurrency,
+            'concurrent_updates': concurrent_updates, 'handler_delay': args.handler_delay,
+        },
+        'errors': errors,
+        'accept_seconds': round(accept_elapsed, 3),
+        'accepted_per_second': round(len(updates) / accept_elapsed, 2) if accept_elapsed else 0,
+        'process_seconds': round(process_elapsed, 3),
+        'processed_per_second': round(len(updates) / process_elapsed, 2) if process_elapsed and not errors else None,
+        'p50_ms': percentile(latencies_ms, 50),
+        'p95_ms': percentile(latencies_ms, 95),
+        'p99_ms': percentile(latencies_ms, 99),
+        'max_ms': round(latencies_ms[-1], 3) if latencies_ms else None,
+    }
+
+    print(f"\naccepted : {result['accepted_per_second']} updates/s ({accept_elapsed:.2f}s, ত্রুটি {errors})")
+    print(f"processed: {result['processed_per_second']} updates/s ({process_elapsed:.2f}s)")
+    print(f"POST লেটেন্সি p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms")
+
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"\nফলাফল '{args.output}' ফাইলে সংরক্ষণ করা হয়েছে।")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
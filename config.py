@@ -16,6 +16,19 @@ import os
 # আমরা এটি Replit-এর "Secrets" থেকে লোড করব।
 BOT_TOKEN = os.environ.get('BOT_TOKEN')
 
+# আপডেট গ্রহণের পদ্ধতি: 'polling' অথবা 'webhook'।
+# 'webhook' মোডে টেলিগ্রাম সরাসরি আমাদের FastAPI সার্ভারের `/telegram/webhook` রাউটে আপডেট পাঠায়।
+BOT_UPDATE_MODE = os.environ.get('BOT_UPDATE_MODE', 'polling')
+
+# webhook মোডে সার্ভারের পাবলিক URL (যেমন, https://your-repl-name.replit.dev)।
+WEBHOOK_BASE_URL = os.environ.get('WEBHOOK_BASE_URL', '')
+
+# টেলিগ্রাম প্রতিটি webhook অনুরোধে এই টোকেনটি হেডারে পাঠাবে; না মিললে অনুরোধ বাতিল হবে।
+WEBHOOK_SECRET_TOKEN = os.environ.get('WEBHOOK_SECRET_TOKEN', '')
+
+# একসাথে সর্বোচ্চ কয়টি আপডেট প্রসেস করা হবে।
+CONCURRENT_UPDATES = 16
+
 
 # -------------------------
 # এডমিন কনফিগারেশন
@@ -34,7 +47,29 @@ ADMIN_IDS = [929198867] # অনুগ্রহ করে এই আইডিট
 
 # ডাটাবেস ফাইলের নাম।
 # Replit-এ সহজে ব্যবহার করার জন্য আমরা SQLite ব্যবহার করব।
-DATABASE_NAME = 'bot_database.db'
+# (লোড টেস্টের মতো কাজে আলাদা ফাইল ব্যবহার করতে DATABASE_NAME এনভায়রনমেন্ট ভেরিয়েবল দিন)
+DATABASE_NAME = os.environ.get('DATABASE_NAME', 'bot_database.db')
+
+# ডাটা সংরক্ষণের ব্যাকএন্ড: 'sqlite' (ডিফল্ট) অথবা 'memory'।
+# 'memory' ব্যাকএন্ড কিছুই ফাইলে লেখে না; শুধু টেস্ট এবং বেঞ্চমার্কের জন্য।
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'sqlite')
+
+# async কোড থেকে ডাটাবেস কাজ চালানোর জন্য থ্রেড পুলের আকার।
+# SQLite-এ একসাথে একজনই লিখতে পারে, তাই খুব বড় মান দিয়ে লাভ নেই।
+DB_THREAD_POOL_SIZE = 8
+
+# লেজার (transactions টেবিল) রাইট-বিহাইন্ড মোড।
+# চালু থাকলে বিজ্ঞাপনের পুরস্কার ও বোনাসের লেনদেনগুলো মেমোরিতে জমা রেখে একসাথে
+# একটি ট্রানজেকশনে লেখা হয় (প্রতি LEDGER_FLUSH_INTERVAL_MS মিলিসেকেন্ডে অথবা
+# LEDGER_BATCH_SIZE টি সারি জমা হলে)। বন্ধের সময় বাকি সব সারি লিখে তারপর বন্ধ হয়।
+LEDGER_WRITE_BEHIND = False
+LEDGER_FLUSH_INTERVAL_MS = 50
+LEDGER_BATCH_SIZE = 500
+# বন্ধের সময় শেষ ব্যাচ লিখতে ব্যর্থ হলে কতবার আবার চেষ্টা করা হবে (প্রতিবার আগের চেয়ে দ্বিগুণ বিরতিতে)
+LEDGER_SHUTDOWN_WRITE_ATTEMPTS = 5
+# চলার সময় একটি ব্যাচ পরপর এতবার লিখতে ব্যর্থ হলে সারিগুলো একটি একটি করে লেখা হয়, আর যে সারি একা লিখতেও
+# ব্যর্থ হয় সেটি লগে প্রিন্ট করে বাদ দেওয়া হয় (dead-letter), যাতে একটি খারাপ সারি পরের সব সারি আটকে না রাখে
+LEDGER_MAX_BATCH_ATTEMPTS = 5
 
 
 # -------------------------
@@ -44,3 +79,150 @@ DATABASE_NAME = 'bot_database.db'
 # নতুন ব্যবহারকারীদের জন্য ডিফল্ট ভাষা।
 # 'bn' = বাংলা, 'en' = ইংরেজি।
 DEFAULT_LANGUAGE = 'bn'
+
+
+# -------------------------
+# চ্যানেল মেম্বারশিপ চেক
+# -------------------------
+
+# একসাথে সর্বোচ্চ কয়টি get_chat_member অনুরোধ টেলিগ্রামে পাঠানো হবে (ফ্লাড লিমিট এড়াতে)।
+MEMBERSHIP_CHECK_CONCURRENCY = 5
+
+# কোনো ব্যবহারকারী একটি চ্যানেলের মেম্বার পাওয়া গেলে কত সেকেন্ড পর্যন্ত আবার চেক করা হবে না।
+MEMBERSHIP_CACHE_TTL_SECONDS = 600
+
+# মেমোরিতে সর্বোচ্চ কয়টি (ব্যবহারকারী, চ্যানেল) ফলাফল রাখা হবে।
+MEMBERSHIP_CACHE_MAX_ENTRIES = 100000
+
+
+# -------------------------
+# API রেট লিমিট
+# -------------------------
+
+# মেমোরিতে সর্বোচ্চ কতজন ব্যবহারকারীর রেট লিমিট বাকেট রাখা হবে (পুরনোগুলো বাদ যায়)।
+# প্রতি মিনিটে কয়টি অনুরোধ অনুমোদিত তা এডমিন প্যানেলের সেটিংস থেকে নিয়ন্ত্রণ করা হয়।
+RATE_LIMIT_MAX_BUCKETS = 100000
+
+
+# -------------------------
+# বিজ্ঞাপন দেখার টিকিট
+# -------------------------
+
+# টিকিট স্বাক্ষরের সিক্রেট কী। না দিলে BOT_TOKEN থেকে তৈরি করা হয়।
+# একাধিক সার্ভার প্রসেস চালালে সবগুলোতে একই মান থাকতে হবে।
+AD_TICKET_SECRET = os.environ.get('AD_TICKET_SECRET', '')
+
+# বিজ্ঞাপন দেখা শেষ হওয়ার পর কত সেকেন্ডের মধ্যে পুরস্কার নিতে হবে।
+AD_TICKET_TTL_SECONDS = 600
+
+
+# -------------------------
+# মিনি অ্যাপ প্রমাণীকরণ
+# -------------------------
+
+# টেলিগ্রাম WebApp `initData` কত সেকেন্ড পর্যন্ত গ্রহণযোগ্য (auth_date থেকে)।
+WEBAPP_AUTH_MAX_AGE_SECONDS = 86400
+
+
+# -------------------------
+# বাল্ক এডমিন অপারেশন (CSV)
+# -------------------------
+
+# একটি ট্রানজেকশনে কয়টি সারি প্রয়োগ করা হবে (SQLite এর প্যারামিটার সীমার নিচে রাখুন)।
+BULK_CHUNK_SIZE = 500
+
+# যাচাইয়ের সময় সর্বোচ্চ কয়টি ত্রুটি এডমিনকে দেখানো হবে।
+BULK_MAX_REPORTED_ERRORS = 20
+
+# প্রয়োগ চলার সময় অগ্রগতির মেসেজ কত সেকেন্ড পরপর আপডেট হবে (টেলিগ্রামের ফ্লাড লিমিট এড়াতে)।
+BULK_PROGRESS_INTERVAL_SECONDS = 2
+
+
+# -------------------------
+# ব্রডকাস্ট
+# -------------------------
+
+# সব ব্যবহারকারীকে মিলিয়ে প্রতি সেকেন্ডে সর্বোচ্চ কয়টি মেসেজ (টেলিগ্রামের সীমা প্রায় ৩০/সেকেন্ড)।
+BROADCAST_MESSAGES_PER_SECOND = 25
+
+# একসাথে সর্বোচ্চ কয়টি মেসেজ পাঠানোর অনুরোধ চলবে।
+BROADCAST_CONCURRENCY = 10
+
+# ডাটাবেস থেকে একবারে কয়টি user_id পড়া হবে; প্রতিটি ব্যাচ শেষে অগ্রগতি ডাটাবেসে সংরক্ষিত হয়।
+BROADCAST_BATCH_SIZE = 200
+
+# নেটওয়ার্ক ত্রুটি বা ফ্লাড লিমিটের (RetryAfter) পর একটি মেসেজ সর্বোচ্চ কতবার আবার চেষ্টা করা হবে।
+BROADCAST_MAX_RETRIES = 3
+
+# অগ্রগতির মেসেজ কত সেকেন্ড পরপর আপডেট হবে।
+BROADCAST_PROGRESS_INTERVAL_SECONDS = 5
+
+
+# -------------------------
+# ডাটা এক্সপোর্ট (CSV/JSONL)
+# -------------------------
+
+# `/admin/export/...` API রাউটের জন্য টোকেন (`Authorization: Bearer <token>` হেডারে পাঠাতে হবে)।
+# সেট করা না থাকলে API দিয়ে এক্সপোর্ট বন্ধ থাকে; বটের `/export` কমান্ড তখনও কাজ করে।
+EXPORT_API_TOKEN = os.environ.get('EXPORT_API_TOKEN', '')
+
+# ডাটাবেস কার্সর থেকে একবারে কয়টি সারি পড়া হবে; মেমোরি ব্যবহার শুধু এই সংখ্যার উপর নির্ভর করে।
+EXPORT_BATCH_SIZE = 1000
+
+
+# -------------------------
+# ব্যালেন্স রিকনসিলিয়েশন
+# -------------------------
+
+# প্রতিদিন কখন (সার্ভারের সময়, HH:MM) ব্যালেন্স লেজারের সাথে মিলিয়ে দেখা হবে। খালি রাখলে শুধু `/reconcile` কমান্ডে চলবে।
+RECONCILE_DAILY_AT = os.environ.get('RECONCILE_DAILY_AT', '03:00')
+
+# অমিল পাওয়া ব্যবহারকারীদের কতবার, কত সেকেন্ড পরপর আবার যাচাই করা হবে
+# (চলমান লেনদেন বা লেজার রাইটারের কিউতে থাকা সারির কারণে সাময়িক অমিল বাদ দিতে)।
+RECONCILE_RECHECK_ATTEMPTS = 3
+RECONCILE_RECHECK_DELAY_SECONDS = 2
+
+# একবারে সর্বোচ্চ কতজন অমিল ব্যবহারকারী খোঁজা হবে, এবং এডমিনের রিপোর্টে কতজনের বিস্তারিত দেখানো হবে।
+RECONCILE_MAX_MISMATCHES = 10000
+RECONCILE_MAX_REPORTED = 20
+
+
+# -------------------------
+# স্বয়ংক্রিয় পে-আউট (উইথড্র)
+# -------------------------
+
+# কোন পেমেন্ট গেটওয়ে দিয়ে পে-আউট হবে: 'mock' (অফলাইন, নেটওয়ার্ক ছাড়া), 'stub' (লোকাল HTTP স্টাব সার্ভার,
+# `python -m payment_gateways.stub_server`) অথবা খালি (পে-আউট ওয়ার্কার বন্ধ)।
+# ওয়ার্কার চালু থাকলেও শুধু `withdrawal_mode` সেটিং 'automatic' হলে পে-আউট হয়।
+PAYOUT_GATEWAY = os.environ.get('PAYOUT_GATEWAY', '')
+
+# 'stub' গেটওয়ের সার্ভারের ঠিকানা।
+PAYOUT_GATEWAY_URL = os.environ.get('PAYOUT_GATEWAY_URL', 'http://127.0.0.1:8099')
+
+# গেটওয়েতে পাঠানো কারেন্সি কোড (পয়েন্ট থেকে রূপান্তর গেটওয়ে সাবক্লাসের দায়িত্ব)।
+PAYOUT_CURRENCY = os.environ.get('PAYOUT_CURRENCY', 'POINTS')
+
+# একবারে কয়টি পেন্ডিং উইথড্র নেওয়া হবে, এবং প্রতিটি গেটওয়েতে একসাথে সর্বোচ্চ কয়টি রিকোয়েস্ট চলবে।
+PAYOUT_BATCH_SIZE = 50
+PAYOUT_CONCURRENCY = 50
+
+# গেটওয়ে প্রসেস করছে এমন (in-flight) পে-আউটের স্ট্যাটাস এক রিকোয়েস্টে সর্বোচ্চ কয়টি চেক করা হবে।
+PAYOUT_STATUS_BATCH_SIZE = 100
+
+# সাময়িক ত্রুটিতে একটি পে-আউট সর্বোচ্চ কতবার আবার চেষ্টা করা হবে (বিরতি প্রতিবার দ্বিগুণ হয়)।
+PAYOUT_MAX_RETRIES = 3
+PAYOUT_RETRY_BASE_DELAY_SECONDS = 1
+
+# কোনো পেন্ডিং উইথড্র না থাকলে কত সেকেন্ড পরপর আবার দেখা হবে।
+PAYOUT_POLL_INTERVAL_SECONDS = 30
+
+# গেটওয়ে API কলের শেয়ার করা HTTP সংযোগ পুল (keep-alive, যাতে প্রতিটি পে-আউটে নতুন TLS হ্যান্ডশেক না লাগে)।
+# সব গেটওয়ে মিলিয়ে সর্বোচ্চ খোলা সংযোগ, পুলের প্রতিটি ক্লায়েন্টে কয়টি (বেশি হলে httpcore ধীর হয়ে যায়),
+# এবং অব্যবহৃত সংযোগ কত সেকেন্ড খোলা রাখা হবে।
+PAYOUT_HTTP_MAX_CONNECTIONS = 100
+PAYOUT_HTTP_CONNECTIONS_PER_CLIENT = 10
+PAYOUT_HTTP_KEEPALIVE_SECONDS = 60
+
+# প্রতিটি গেটওয়ে রিকোয়েস্টের ডিফল্ট টাইমআউট (সংযোগ স্থাপন এবং পুরো রিকোয়েস্ট)।
+PAYOUT_HTTP_CONNECT_TIMEOUT_SECONDS = 5
+PAYOUT_HTTP_TIMEOUT_SECONDS = 15
@@ -2,23 +2,207 @@
 
 import sqlite3
 import json
-from config import DATABASE_NAME
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from config import DATABASE_NAME, DB_THREAD_POOL_SIZE
+from metrics import db_query_duration, db_connections_opened, sql_labels
 
 """
 এই ফাইলটি ডাটাবেস সংযোগ স্থাপন এবং প্রয়োজনীয় সকল টেবিল তৈরি করার জন্য দায়ী।
 বট প্রথমবার চালু হলে এই ফাইলটি রান করানো হবে।
+
+সকল মডিউল `get_connection()` থেকে সংযোগ নেয়। প্রতিটি থ্রেডের জন্য একটি
+দীর্ঘস্থায়ী সংযোগ রাখা হয়, তাই প্রতিটি ফাংশন কলে নতুন করে ফাইল খুলতে হয় না।
+
+async কোড (FastAPI রাউট এবং বট হ্যান্ডলার) থেকে ম্যানেজার ফাংশনগুলো সরাসরি কল না করে
+`await run_db(func, ...)` ব্যবহার করতে হবে, যাতে ব্লকিং কোয়েরি ইভেন্ট লুপ আটকে না রাখে।
 """
 
+# প্রতিটি নতুন সংযোগে এই PRAGMA গুলো একবার প্রয়োগ করা হয়।
+# WAL মোডে পাঠক এবং লেখক একে অপরকে ব্লক করে না।
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA mmap_size = 268435456",   # 256 MB
+    "PRAGMA cache_size = -65536",      # 64 MB (নেগেটিভ মান = KiB)
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",      # লক থাকলে ৫ সেকেন্ড পর্যন্ত অপেক্ষা
+)
+
+# থ্রেড-ভিত্তিক সংযোগ সংরক্ষণের জন্য
+_local = threading.local()
+
+# সব থ্রেডের খোলা সংযোগ, যাতে বন্ধের সময় একসাথে বন্ধ করা যায়
+_all_connections = set()
+_all_connections_lock = threading.Lock()
+
+# ডাটাবেস কাজের জন্য নির্দিষ্ট আকারের থ্রেড পুল; প্রতিটি থ্রেড নিজের সংযোগ ব্যবহার করে
+_db_executor = ThreadPoolExecutor(max_workers=DB_THREAD_POOL_SIZE, thread_name_prefix='db')
+
+class TimedCursor(sqlite3.Cursor):
+    """প্রতিটি SQL স্টেটমেন্টের সময় `db_query_duration` হিস্টোগ্রামে রেকর্ড করে।"""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            db_query_duration.observe(time.perf_counter() - started, *sql_labels(sql))
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            db_query_duration.observe(time.perf_counter() - started, *sql_labels(sql))
+
+class TimedConnection(sqlite3.Connection):
+    """`TimedCursor` ব্যবহার করে এমন সংযোগ; কমিটের সময়ও (fsync সহ) মাপা হয়।"""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        with db_query_duration.time('COMMIT', ''):
+            super().commit()
+
 def create_connection():
-    """ডাটাবেসের সাথে একটি সংযোগ তৈরি করে এবং সংযোগ অবজেক্টটি রিটার্ন করে।"""
+    """ডাটাবেসের সাথে একটি নতুন সংযোগ তৈরি করে, PRAGMA প্রয়োগ করে এবং সংযোগ অবজেক্টটি রিটার্ন করে।"""
     conn = None
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
+        # সংযোগটি শুধু তার নিজের থ্রেডেই ব্যবহৃত হয়; check_same_thread=False শুধু
+        # বন্ধের সময় অন্য থ্রেড থেকে close() করার জন্য।
+        conn = sqlite3.connect(DATABASE_NAME, check_same_thread=False, factory=TimedConnection)
+        db_connections_opened.inc()
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         print(f"SQLite DB '{DATABASE_NAME}' এর সাথে সফলভাবে সংযুক্ত।")
     except sqlite3.Error as e:
         print(f"ডাটাবেস সংযোগে ত্রুটি: {e}")
     return conn
 
+def create_read_connection():
+    """
+    লম্বা সময় ধরে পড়ার (যেমন এক্সপোর্ট) জন্য আলাদা একটি রিড-অনলি সংযোগ তৈরি করে।
+    থ্রেডের শেয়ার করা সংযোগ ব্যবহার করা হয় না, কারণ এর কার্সর অনেকগুলো কলে (এবং ভিন্ন থ্রেড থেকে)
+    খোলা থাকে। `query_only` থাকায় এটি কখনো রাইট লক নেয় না, আর WAL মোডে লেখকরাও এর জন্য আটকে থাকে না।
+    কাজ শেষে কলারকেই সংযোগটি বন্ধ করতে হবে।
+    """
+    conn = sqlite3.connect(DATABASE_NAME, check_same_thread=False, factory=TimedConnection)
+    db_connections_opened.inc()
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute("PRAGMA busy_timeout = 5000")
+    return conn
+
+def get_connection():
+    """
+    বর্তমান থ্রেডের জন্য পুনঃব্যবহারযোগ্য সংযোগটি রিটার্ন করে।
+    প্রথমবার কল করা হলে সংযোগ তৈরি হয়; এরপর একই থ্রেডে একই সংযোগ ফেরত দেওয়া হয়।
+    কলারদের এই সংযোগ বন্ধ করা উচিত নয়।
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = create_connection()
+        if conn is None:
+            raise sqlite3.OperationalError(f"'{DATABASE_NAME}' এর সাথে সংযোগ স্থাপন করা যায়নি।")
+        _local.conn = conn
+        with _all_connections_lock:
+            _all_connections.add(conn)
+    return conn
+
+async def run_db(func, *args, **kwargs):
+    """
+    একটি ব্লকিং ডাটাবেস ফাংশন থ্রেড পুলে চালায় এবং তার ফলাফল রিটার্ন করে।
+    উদাহরণ: `user = await run_db(user_manager.get_user_by_id, user_id)`
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, functools.partial(func, *args, **kwargs))
+
+@contextmanager
+def transaction():
+    """
+    একটি লেখার ট্রানজেকশন (unit of work) শুরু করে এবং সংযোগটি yield করে।
+    - ব্লক সফলভাবে শেষ হলে একবারই কমিট হয় (একটি fsync)।
+    - কোনো exception হলে সবকিছু রোলব্যাক হয়।
+    - নেস্টেড অবস্থায় (যেমন `record_ad_view` এর ভেতরে `update_balance`) ভেতরের ব্লক
+      আলাদা কমিট করে না, বাইরের ট্রানজেকশনের অংশ হয়ে যায়। ভেতরের কোনো ব্লক ব্যর্থ হলে
+      পুরো ট্রানজেকশন রোলব্যাক হবে, এমনকি ভেতরের ফাংশন ত্রুটিটি ধরে ফেললেও।
+    """
+    conn = get_connection()
+    depth = getattr(_local, 'tx_depth', 0)
+    if depth == 0:
+        _local.tx_failed = False
+        _local.after_commit = []
+        if not conn.in_transaction:
+            # শুরুতেই রাইট লক নিন, যাতে পরে রিড থেকে রাইটে যেতে গিয়ে SQLITE_BUSY না হয়
+            conn.execute("BEGIN IMMEDIATE")
+    _local.tx_depth = depth + 1
+    try:
+        yield conn
+    except BaseException:
+        if depth == 0:
+            conn.rollback()
+            _local.after_commit = []
+        else:
+            _local.tx_failed = True
+        raise
+    finally:
+        _local.tx_depth = depth
+
+    if depth == 0:
+        try:
+            if _local.tx_failed:
+                raise sqlite3.OperationalError("ট্রানজেকশনের একটি অংশ ব্যর্থ হয়েছে, তাই সবকিছু রোলব্যাক করা হয়েছে।")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            _local.after_commit = []
+            raise
+        callbacks, _local.after_commit = _local.after_commit, []
+        for callback in callbacks:
+            callback()
+
+def on_commit(callback):
+    """
+    বর্তমান ট্রানজেকশন সফলভাবে কমিট হওয়ার পর `callback` চালায়।
+    রোলব্যাক হলে এটি বাদ দেওয়া হয়। কোনো ট্রানজেকশন চালু না থাকলে সাথে সাথেই চালানো হয়।
+    """
+    if getattr(_local, 'tx_depth', 0) > 0:
+        _local.after_commit.append(callback)
+    else:
+        callback()
+
+def close_connection():
+    """বর্তমান থ্রেডের সংযোগটি বন্ধ করে।"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        with _all_connections_lock:
+            _all_connections.discard(conn)
+        conn.close()
+        _local.conn = None
+
+def close_all_connections():
+    """
+    থ্রেড পুল বন্ধ করে এবং সকল থ্রেডের সংযোগ বন্ধ করে (প্রোগ্রাম বন্ধের সময়)।
+    """
+    _db_executor.shutdown(wait=True)
+    with _all_connections_lock:
+        connections = list(_all_connections)
+        _all_connections.clear()
+    for conn in connections:
+        conn.close()
+    _local.conn = None
+
 def create_tables(conn):
     """প্রয়োজনীয় সকল টেবিল তৈরি করে।"""
     cursor = conn.cursor()
@@ -58,11 +242,29 @@ def create_tables(conn):
             target_views INTEGER DEFAULT 0,
             current_views INTEGER DEFAULT 0,
             view_duration_seconds INTEGER DEFAULT 30,
-            viewed_by_users TEXT -- JSON list of user_ids
+            viewed_by_users TEXT, -- পুরনো JSON তালিকা; এখন `ad_views` টেবিল ব্যবহৃত হয়
+            reward_per_view INTEGER, -- NULL হলে বিজ্ঞাপনের ধরন অনুযায়ী ডিফল্ট পুরস্কার
+            budget INTEGER, -- মোট বাজেট; NULL হলে শুধু target_views সীমা
+            budget_spent INTEGER DEFAULT 0
         );
         """)
+        # সক্রিয় বিজ্ঞাপনগুলো ad_id ক্রমে দ্রুত খুঁজে পাওয়ার জন্য
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ads_status ON ads (status, ad_id)")
         print("`ads` টেবিল সফলভাবে তৈরি/লোড হয়েছে।")
 
+        # --- ad_views টেবিল ---
+        # কোন ব্যবহারকারী কোন বিজ্ঞাপন দেখেছে তা প্রতি ভিউ এক সারিতে রাখা হয়।
+        # (ad_id, user_id) ইউনিক ইনডেক্স দিয়ে ডুপ্লিকেট চেক O(log n) এ হয়।
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ad_views (
+            ad_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            viewed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        """)
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_ad_views_ad_user ON ad_views (ad_id, user_id)")
+        print("`ad_views` টেবিল সফলভাবে তৈরি/লোড হয়েছে।")
+
         # --- transactions টেবিল ---
         # সকল আর্থিক লেনদেন এখানে রেকর্ড করা হবে।
         cursor.execute("""
@@ -76,6 +278,15 @@ def create_tables(conn):
             details TEXT -- JSON format for extra data like receiver_id, payment_gateway_id
         );
         """)
+        # ব্যবহারকারীর লেনদেনের ইতিহাস সময় অনুযায়ী পেজ করে দেখানোর জন্য
+        # (transaction_id হলো rowid, তাই এটি ইনডেক্সে স্বয়ংক্রিয়ভাবে যুক্ত থাকে)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_user_time ON transactions (user_id, timestamp)")
+        # পে-আউট ওয়ার্কারের কিউ (পেন্ডিং/প্রসেসিং উইথড্র) পুরো লেজার না পড়েই খোঁজার জন্য;
+        # শুধু উইথড্রর সারিগুলো এই (partial) ইনডেক্সে থাকে, তাই এটি ছোট থাকে
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_transactions_withdrawal_queue ON transactions (status, transaction_id) "
+            "WHERE type = 'withdrawal'"
+        )
         print("`transactions` টেবিল সফলভাবে তৈরি/লোড হয়েছে।")
 
         # --- bot_config টেবিল ---
@@ -90,6 +301,31 @@ def create_tables(conn):
         """)
         print("`bot_config` টেবিল সফলভাবে তৈরি/লোড হয়েছে।")
 
+        # --- bot_config_version টেবিল ---
+        # সেটিংস পরিবর্তন হলে এই সংখ্যাটি বাড়ানো হয়, যাতে অন্য প্রসেসগুলো
+        # পুরো টেবিল না পড়েই বুঝতে পারে যে তাদের ক্যাশ পুরনো হয়ে গেছে।
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS bot_config_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        );
+        """)
+        cursor.execute("INSERT OR IGNORE INTO bot_config_version (id, version) VALUES (1, 0)")
+        print("`bot_config_version` টেবিল সফলভাবে তৈরি/লোড হয়েছে।")
+
+        # --- bot_stats টেবিল ---
+        # পরিসংখ্যানের কাউন্টার। stat_date খালি ('') হলে সার্বিক কাউন্টার,
+        # অন্যথায় সেই দিনের কাউন্টার (যেমন আজকের প্রদত্ত পুরস্কার)।
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS bot_stats (
+            stat_name TEXT NOT NULL,
+            stat_date TEXT NOT NULL DEFAULT '',
+            stat_value INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (stat_name, stat_date)
+        );
+        """)
+        print("`bot_stats` টেবিল সফলভাবে তৈরি/লোড হয়েছে।")
+
         # --- dynamic_buttons টেবিল ---
         # এডমিন প্যানেলের মেনু বিল্ডার দ্বারা তৈরি বাটনগুলো এখানে থাকবে।
         cursor.execute("""
@@ -104,6 +340,66 @@ def create_tables(conn):
         """)
         print("`dynamic_buttons` টেবিল সফলভাবে তৈরি/লোড হয়েছে।")
 
+        # --- broadcasts টেবিল ---
+        # এডমিনের ব্রডকাস্ট এবং তার অগ্রগতি। `last_user_id` পর্যন্ত সবাইকে পাঠানো শেষ,
+        # তাই বট রিস্টার্ট হলে সেখান থেকে আবার শুরু হয়।
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS broadcasts (
+            broadcast_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            admin_id INTEGER NOT NULL,
+            from_chat_id INTEGER NOT NULL, -- যে মেসেজটি কপি করে পাঠানো হবে
+            message_id INTEGER NOT NULL,
+            status TEXT DEFAULT 'running', -- 'running', 'completed', 'cancelled'
+            last_user_id INTEGER DEFAULT 0,
+            sent_count INTEGER DEFAULT 0,
+            failed_count INTEGER DEFAULT 0,
+            blocked_count INTEGER DEFAULT 0,
+            status_chat_id INTEGER, -- অগ্রগতি দেখানোর মেসেজ
+            status_message_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP
+        );
+        """)
+        print("`broadcasts` টেবিল সফলভাবে তৈরি/লোড হয়েছে।")
+
+        # --- bulk_batches টেবিল ---
+        # এডমিনের বাল্ক CSV ফাইলের চেকপয়েন্ট, ফাইলের বিষয়বস্তুর sha256 (`batch_key`) দিয়ে চিহ্নিত।
+        # প্রতিটি টুকরো যে ট্রানজেকশনে প্রয়োগ হয় সেই ট্রানজেকশনেই `last_line` এগোয়, তাই
+        # আবার চেষ্টা করলে বা একই ফাইল আবার আপলোড করলে আগে প্রয়োগ হওয়া সারিগুলো বাদ যায়।
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS bulk_batches (
+            batch_key TEXT PRIMARY KEY,
+            batch_name TEXT,
+            admin_id INTEGER,
+            status TEXT DEFAULT 'running', -- 'running', 'completed'
+            last_line INTEGER DEFAULT 0, -- এই লাইন পর্যন্ত সব সারি প্রয়োগ হয়ে গেছে
+            rows_applied INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP
+        );
+        """)
+        print("`bulk_batches` টেবিল সফলভাবে তৈরি/লোড হয়েছে।")
+
+        # --- ledger_totals এবং reconciliation_state টেবিল ---
+        # প্রতিটি ব্যবহারকারীর লেজারের (transactions.amount) চলমান যোগফল, চেকপয়েন্ট করা
+        # `last_transaction_id` পর্যন্ত। রিকনসিলিয়েশন প্রতিবার শুধু নতুন সারিগুলো যোগ করে।
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ledger_totals (
+            user_id INTEGER PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0
+        );
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS reconciliation_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_transaction_id INTEGER NOT NULL DEFAULT 0,
+            last_run_at TIMESTAMP,
+            last_mismatch_count INTEGER DEFAULT 0
+        );
+        """)
+        cursor.execute("INSERT OR IGNORE INTO reconciliation_state (id, last_transaction_id) VALUES (1, 0)")
+        print("`ledger_totals` এবং `reconciliation_state` টেবিল সফলভাবে তৈরি/লোড হয়েছে।")
+
         conn.commit()
 
     except sqlite3.Error as e:
@@ -112,14 +408,71 @@ def create_tables(conn):
         if cursor:
             cursor.close()
 
+def migrate_viewed_by_users(conn):
+    """
+    পুরনো `ads.viewed_by_users` JSON তালিকাগুলো `ad_views` টেবিলে স্থানান্তর করে।
+    স্থানান্তরের পর কলামটি NULL করে দেওয়া হয়, তাই এটি একাধিকবার চালালেও সমস্যা নেই।
+    """
+    cursor = conn.cursor()
+    migrated_ads = 0
+    try:
+        # শুধু আইডি আগে নিন, যাতে সব বড় JSON একসাথে মেমোরিতে না আসে
+        cursor.execute("SELECT ad_id FROM ads WHERE viewed_by_users IS NOT NULL")
+        for (ad_id,) in cursor.fetchall():
+            viewed_by_str = conn.execute("SELECT viewed_by_users FROM ads WHERE ad_id = ?", (ad_id,)).fetchone()[0]
+            try:
+                viewed_by = json.loads(viewed_by_str) if viewed_by_str else []
+            except json.JSONDecodeError:
+                print(f"Ad ID {ad_id} এর viewed_by_users পড়া যায়নি, বাদ দেওয়া হলো।")
+                viewed_by = []
+            conn.executemany(
+                "INSERT OR IGNORE INTO ad_views (ad_id, user_id) VALUES (?, ?)",
+                ((ad_id, user_id) for user_id in viewed_by)
+            )
+            conn.execute("UPDATE ads SET viewed_by_users = NULL WHERE ad_id = ?", (ad_id,))
+            migrated_ads += 1
+        conn.commit()
+        if migrated_ads:
+            print(f"{migrated_ads}টি বিজ্ঞাপনের ভিউ তালিকা `ad_views` টেবিলে স্থানান্তর করা হয়েছে।")
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"viewed_by_users স্থানান্তরে ত্রুটি: {e}")
+    finally:
+        cursor.close()
+
+# পুরনো ডাটাবেসের `ads` টেবিলে যে কলামগুলো পরে যোগ হয়েছে
+AD_PRICING_COLUMNS = (
+    ('reward_per_view', 'INTEGER'),
+    ('budget', 'INTEGER'),
+    ('budget_spent', 'INTEGER DEFAULT 0'),
+)
+
+def migrate_ad_pricing_columns(conn):
+    """
+    পুরনো `ads` টেবিলে ক্যাম্পেইন প্রাইসিং এর কলামগুলো না থাকলে যোগ করে।
+    বিদ্যমান বিজ্ঞাপনগুলোর পুরস্কার ডিফল্ট থাকে এবং বাজেট সীমাহীন থাকে।
+    """
+    try:
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(ads)")}
+        for column, definition in AD_PRICING_COLUMNS:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE ads ADD COLUMN {column} {definition}")
+                print(f"`ads` টেবিলে `{column}` কলাম যোগ করা হয়েছে।")
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"`ads` টেবিলে প্রাইসিং কলাম যোগ করতে ত্রুটি: {e}")
+
 def initialize_database():
     """ডাটাবেস এবং টেবিল তৈরির মূল ফাংশন।"""
-    conn = create_connection()
-    if conn is not None:
-        create_tables(conn)
-        conn.close()
-    else:
-        print("ডাটাবেস সংযোগ স্থাপন করা সম্ভব হয়নি।")
+    try:
+        conn = get_connection()
+    except sqlite3.Error as e:
+        print(f"ডাটাবেস সংযোগ স্থাপন করা সম্ভব হয়নি: {e}")
+        return
+    create_tables(conn)
+    migrate_ad_pricing_columns(conn)
+    migrate_viewed_by_users(conn)
 
 # এই ফাইলটি সরাসরি রান করা হলে ডাটাবেস ইনিশিয়ালাইজ হবে।
 if __name__ == '__main__':
@@ -1,28 +1,35 @@
 # advanced_earning_bot/handlers/admin_panel_handler.py
 
+import os
+import sys
+import time
 import asyncio
+import tempfile
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 
-from config import ADMIN_IDS
-from modules import user_manager, bot_settings, ad_manager
+from config import ADMIN_IDS, BULK_PROGRESS_INTERVAL_SECONDS
+from database import run_db
+from modules import user_manager, bot_settings, ad_manager, stats_manager, bulk_operations, broadcast_manager, export_manager, wallet_manager, reconciliation
 
 # ConversationHandler এর জন্য স্টেট
-USER_ID_INPUT, BALANCE_CHANGE_INPUT, SETTING_VALUE_INPUT, ADD_AD_CONTENT, ADD_AD_TARGET_VIEWS, ADD_AD_DURATION = range(6)
+USER_ID_INPUT, BALANCE_CHANGE_INPUT, SETTING_VALUE_INPUT, ADD_AD_CONTENT, ADD_AD_TARGET_VIEWS, ADD_AD_DURATION, ADD_AD_PRICING, BULK_FILE_INPUT, BROADCAST_MESSAGE_INPUT = range(9)
 
 
 # --- Helper Functions ---
 async def is_admin(user_id: int) -> bool:
     return user_id in ADMIN_IDS
 
-def build_admin_menu():
-    pending_ads_count = len(ad_manager.get_pending_ads())
+async def build_admin_menu():
+    pending_ads_count = await run_db(ad_manager.count_pending_ads)
     ad_manage_text = f"📢 বিজ্ঞাপন ম্যানেজমেন্ট ({pending_ads_count})" if pending_ads_count > 0 else "📢 বিজ্ঞাপন ম্যানেজমেন্ট"
     keyboard = [
         [InlineKeyboardButton("📊 পরিসংখ্যান", callback_data="admin_stats")],
         [InlineKeyboardButton("⚙️ গ্লোবাল সেটিংস", callback_data="admin_global_settings")],
         [InlineKeyboardButton("🔧 ফিচার কন্ট্রোল", callback_data="admin_feature_control")],
         [InlineKeyboardButton("👤 ব্যবহারকারী ম্যানেজমেন্ট", callback_data="admin_user_manage_start")],
+        [InlineKeyboardButton("📥 বাল্ক অপারেশন (CSV)", callback_data="admin_bulk_upload")],
+        [InlineKeyboardButton("📣 ব্রডকাস্ট", callback_data="admin_broadcast")],
         [InlineKeyboardButton(ad_manage_text, callback_data="admin_ad_manage_menu")],
         [InlineKeyboardButton("❌ প্যানেল বন্ধ করুন", callback_data="admin_close")]
     ]
@@ -54,7 +61,7 @@ async def admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         await update.message.reply_text("দুঃখিত, এই কমান্ডটি শুধুমাত্র এডমিনদের জন্য।")
         return
     text = "👋 এডমিন প্যানেলে স্বাগতম! অনুগ্রহ করে একটি অপশন বেছে নিন:"
-    reply_markup = build_admin_menu()
+    reply_markup = await build_admin_menu()
     if update.callback_query:
         await update.callback_query.edit_message_text(text, reply_markup=reply_markup)
     else:
@@ -70,6 +77,7 @@ async def admin_panel_callback(update: Update, context: ContextTypes.DEFAULT_TYP
     
     data = query.data
     if data == "admin_main_menu":
+        _discard_bulk_file(context) # বাল্ক ফাইল বাতিল করে ফিরে গেলে অস্থায়ী ফাইলটি আর লাগবে না
         await admin_panel(update, context)
     elif data == "admin_stats":
         await show_stats(query)
@@ -85,26 +93,111 @@ async def admin_panel_callback(update: Update, context: ContextTypes.DEFAULT_TYP
         await query.edit_message_text("প্যানেল বন্ধ করা হয়েছে।")
 
 async def show_stats(query):
-    stats_result = user_manager.get_bot_statistics()
+    stats_result = await run_db(user_manager.get_bot_statistics)
     if stats_result['success']:
         stats = stats_result['data']
         text = (f"📊 **বটের বর্তমান পরিসংখ্যান**\n\n"
                 f"👤 মোট ব্যবহারকারী: `{stats['total_users']}`\n"
                 f"✅ ভেরিফাইড ব্যবহারকারী: `{stats['verified_users']}`\n"
                 f"🚫 ব্যানড ব্যবহারকারী: `{stats['banned_users']}`\n\n"
+                f"💰 আজ প্রদত্ত পুরস্কার: `{stats['rewards_paid_today']}`\n"
+                f"📢 সক্রিয় বিজ্ঞাপন: `{stats['active_ads']}`\n"
+                f"⏳ পেন্ডিং উইথড্র: `{stats['pending_withdrawals']}`\n\n"
                 f"_(এই তথ্য রিয়েল-টাইমে আপডেট হয়।)_")
     else:
         text = f"দুঃখিত, পরিসংখ্যান লোড করতে একটি সমস্যা হয়েছে:\n`{stats_result['message']}`"
-    keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("⬅️ ফিরে যান", callback_data="admin_main_menu")]])
+    keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("🔄 পুনরায় হিসাব করুন", callback_data="admin_recompute_stats")],
+                                     [InlineKeyboardButton("⬅️ ফিরে যান", callback_data="admin_main_menu")]])
     await query.edit_message_text(text, reply_markup=keyboard, parse_mode='Markdown')
 
+async def recompute_stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """/recompute_stats কমান্ড বা বাটন: সকল পরিসংখ্যানের কাউন্টার শুরু থেকে আবার হিসাব করে।"""
+    if not await is_admin(update.effective_user.id):
+        if update.message:
+            await update.message.reply_text("দুঃখিত, এই কমান্ডটি শুধুমাত্র এডমিনদের জন্য।")
+        return
+    success = await run_db(stats_manager.recompute_stats)
+    if update.callback_query:
+        await update.callback_query.answer("কাউন্টারগুলো নতুন করে হিসাব করা হয়েছে।" if success else "হিসাব করতে সমস্যা হয়েছে।", show_alert=not success)
+        await show_stats(update.callback_query)
+    else:
+        await update.message.reply_text("✅ পরিসংখ্যানের কাউন্টারগুলো নতুন করে হিসাব করা হয়েছে।" if success else "❌ পরিসংখ্যান হিসাব করতে সমস্যা হয়েছে।")
+
+# বট API দিয়ে সর্বোচ্চ এত বড় ফাইল পাঠানো যায়; এর বড় এক্সপোর্টের জন্য API রাউট ব্যবহার করতে হবে
+EXPORT_MAX_DOCUMENT_BYTES = 50 * 1024 * 1024
+
+EXPORT_USAGE = ("ব্যবহার: `/export <users|transactions> [csv|jsonl] [type=..] [status=..] [from=YYYY-MM-DD] [to=YYYY-MM-DD]`\n"
+                "উদাহরণ: `/export transactions type=withdrawal status=pending from=2024-01-01`")
+
+async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    /export কমান্ড: একটি টেবিলের ডাম্প gzip করা ফাইল হিসেবে এডমিনকে পাঠায়।
+    ফাইলটি মেমোরিতে নয়, ব্যাচে ব্যাচে একটি অস্থায়ী ফাইলে লেখা হয় (ডাটাবেস থ্রেড পুলে)।
+    """
+    if not await is_admin(update.effective_user.id):
+        await update.message.reply_text("দুঃখিত, এই কমান্ডটি শুধুমাত্র এডমিনদের জন্য।")
+        return
+
+    args = context.args or []
+    if not args:
+        await update.message.reply_text(EXPORT_USAGE, parse_mode='Markdown')
+        return
+    fmt, filters = 'csv', {}
+    for arg in args[1:]:
+        key, sep, value = arg.partition('=')
+        if not sep:
+            fmt = arg.lower()
+        elif key in ('type', 'status', 'from', 'to'):
+            filters[key] = value
+        else:
+            await update.message.reply_text(f"অজানা ফিল্টার `{key}`।\n\n{EXPORT_USAGE}", parse_mode='Markdown')
+            return
+
+    try:
+        export = export_manager.build_export(args[0].lower(), fmt, compress=True, trans_type=filters.get('type'),
+                                             status=filters.get('status'), date_from=filters.get('from'),
+                                             date_to=filters.get('to'))
+    except export_manager.ExportError as e:
+        await update.message.reply_text(f"❌ {e}")
+        return
+
+    status_message = await update.message.reply_text("⏳ এক্সপোর্ট তৈরি হচ্ছে...")
+    with tempfile.TemporaryFile() as export_file:
+        row_count = await run_db(export_manager.write_export, export, export_file)
+        if row_count is None:
+            await status_message.edit_text("❌ এক্সপোর্ট করতে একটি সমস্যা হয়েছে।")
+            return
+        size = export_file.tell()
+        if size > EXPORT_MAX_DOCUMENT_BYTES:
+            await status_message.edit_text(f"❌ ফাইলটি অনেক বড় ({size // (1024 * 1024)} MB)। ফিল্টার দিয়ে ছোট করুন "
+                                           f"অথবা /admin/export/{export.table} API ব্যবহার করুন।")
+            return
+        export_file.seek(0, os.SEEK_SET)
+        await update.message.reply_document(document=export_file, filename=export.filename,
+                                            caption=f"✅ {export.table}: {row_count} টি সারি")
+    await status_message.delete()
+
+async def reconcile_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """/reconcile কমান্ড: এখনই ব্যালেন্স এবং লেজার মিলিয়ে দেখে ফলাফল পাঠায়।"""
+    if not await is_admin(update.effective_user.id):
+        await update.message.reply_text("দুঃখিত, এই কমান্ডটি শুধুমাত্র এডমিনদের জন্য।")
+        return
+    status_message = await update.message.reply_text("⏳ ব্যালেন্স এবং লেজার মিলিয়ে দেখা হচ্ছে...")
+    result = await reconciliation.run_reconciliation()
+    await status_message.edit_text(reconciliation.format_report(result), parse_mode='Markdown')
+
 async def show_global_settings(query: Update):
     settings_to_display = {
         'daily_bonus_amount': '💰 দৈনিক বোনাস',
+        'ad_view_reward': '🎬 বিজ্ঞাপন দেখার পুরস্কার',
+        'ad_reward_video_embed': '🎬 ভিডিও বিজ্ঞাপনের পুরস্কার',
+        'ad_reward_direct_link_ad': '🔗 ডিরেক্ট লিঙ্ক বিজ্ঞাপনের পুরস্কার',
         'transfer_fee_percent': '💸 ট্রান্সফার ফি (%)',
         'blogger_page_url': '🌐 ব্লগার URL',
         'withdrawal_mode': '🤖 উইথড্র মোড',
-        'min_auto_withdraw_amount': '➖ সর্বনিম্ন উইথড্র'
+        'min_auto_withdraw_amount': '➖ সর্বনিম্ন উইথড্র',
+        'api_rate_limit_per_minute': '🚦 API রেট লিমিট (প্রতি মিনিট)',
+        'api_rate_limit_burst': '🚦 API বার্স্ট লিমিট'
     }
     text = "⚙️ **গ্লোবাল সেটিংস**\n\n"
     buttons = []
@@ -130,7 +223,7 @@ async def setting_value_input_received(update: Update, context: ContextTypes.DEF
     await update.message.delete()
     setting_key = context.user_data.get('setting_to_edit')
     if not setting_key: return ConversationHandler.END
-    bot_settings.update_setting(setting_key, new_value=new_value)
+    await run_db(bot_settings.update_setting, setting_key, new_value=new_value)
     del context.user_data['setting_to_edit']
     await context.user_data['last_admin_message'].edit_text(f"`{setting_key}`-এর মান সফলভাবে পরিবর্তন করা হয়েছে।")
     await asyncio.sleep(2)
@@ -153,42 +246,63 @@ async def toggle_feature_status(update: Update, context: ContextTypes.DEFAULT_TY
     await query.answer()
     setting_name = query.data.replace("toggle_", "")
     _, current_status = bot_settings.get_setting(setting_name)
-    bot_settings.update_setting(setting_name, new_status=not current_status)
+    await run_db(bot_settings.update_setting, setting_name, new_status=not current_status)
     await show_feature_control(query)
 
 async def show_ad_manage_menu(query: Update):
     text = "📢 **বিজ্ঞাপন ম্যানেজমেন্ট**"
     await query.edit_message_text(text, reply_markup=build_ad_manage_menu())
 
-async def show_pending_ads(query: Update):
-    pending_ads = ad_manager.get_pending_ads()
-    if not pending_ads:
+async def show_pending_ads(query: Update, ad_id=0, forward=True):
+    """
+    একটি পেন্ডিং বিজ্ঞাপন রিভিউয়ের জন্য দেখায়: `ad_id` এর পরেরটি (forward) বা আগেরটি।
+    প্রতিটি স্ক্রিনে শুধু একটি বিজ্ঞাপন লোড হয় (keyset নেভিগেশন); তালিকার শেষে পৌঁছালে অন্য প্রান্ত থেকে শুরু হয়।
+    রিটার্ন: দেখানো বিজ্ঞাপনের ad_id, কোনো পেন্ডিং বিজ্ঞাপন না থাকলে None।
+    """
+    ad = await run_db(ad_manager.get_pending_ad, ad_id, forward)
+    if ad is None and ad_id:
+        ad = await run_db(ad_manager.get_pending_ad, 0 if forward else sys.maxsize, forward)
+    if ad is None:
         text = " পর্যালোচনার জন্য কোনো নতুন বিজ্ঞাপন নেই।"
         keyboard = [[InlineKeyboardButton("⬅️ ফিরে যান", callback_data="admin_ad_manage_menu")]]
         await query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
-        return
-    ad_data = pending_ads[0]
-    columns = ['ad_id', 'owner_user_id', 'ad_source', 'ad_type', 'ad_content', 'status', 'target_views', 'current_views', 'view_duration_seconds', 'viewed_by_users']
-    ad_dict = dict(zip(columns, ad_data))
-    text = (f"**📢 নতুন বিজ্ঞাপন রিভিউ**\n\nAd ID: `{ad_dict['ad_id']}`\nজমা দিয়েছে: `{ad_dict['owner_user_id']}`\n"
-            f"কন্টেন্ট: `{ad_dict['ad_content']}`\nটার্গেট ভিউ: `{ad_dict['target_views']}`")
-    keyboard = [[InlineKeyboardButton("✅ অনুমোদন", callback_data=f"ad_approve_{ad_dict['ad_id']}"),
-                 InlineKeyboardButton("❌ প্রত্যাখ্যান", callback_data=f"ad_reject_{ad_dict['ad_id']}")],
-                [InlineKeyboardButton("➡️ পরবর্তী", callback_data="admin_ad_pending_list")],
+        return None
+    if ad['ad_id'] == ad_id:
+        # এটিই একমাত্র পেন্ডিং বিজ্ঞাপন; স্ক্রিন অপরিবর্তিত থাকবে
+        return ad_id
+
+    pending_count = await run_db(ad_manager.count_pending_ads)
+    text = (f"**📢 নতুন বিজ্ঞাপন রিভিউ** (মোট পেন্ডিং: {pending_count})\n\nAd ID: `{ad['ad_id']}`\nজমা দিয়েছে: `{ad['owner_user_id']}`\n"
+            f"কন্টেন্ট: `{ad['ad_content']}`\nটার্গেট ভিউ: `{ad['target_views']}`")
+    keyboard = [[InlineKeyboardButton("✅ অনুমোদন", callback_data=f"ad_approve_{ad['ad_id']}"),
+                 InlineKeyboardButton("❌ প্রত্যাখ্যান", callback_data=f"ad_reject_{ad['ad_id']}")],
+                [InlineKeyboardButton("⬅️ আগের", callback_data=f"ad_nav_prev_{ad['ad_id']}"),
+                 InlineKeyboardButton("➡️ পরবর্তী", callback_data=f"ad_nav_next_{ad['ad_id']}")],
                 [InlineKeyboardButton("⬅️ ফিরে যান", callback_data="admin_ad_manage_menu")]]
     await query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='Markdown')
+    return ad['ad_id']
+
+async def pending_ads_navigation(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.callback_query
+    if not await is_admin(query.from_user.id):
+        await query.answer("দুঃখিত, আপনি এডমিন নন।", show_alert=True)
+        return
+    _, _, direction, ad_id = query.data.split('_')
+    shown_ad_id = await show_pending_ads(query, int(ad_id), forward=direction == 'next')
+    await query.answer("আর কোনো পেন্ডিং বিজ্ঞাপন নেই।" if shown_ad_id == int(ad_id) else None)
 
 async def ad_review_action(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     data = query.data.split('_')
     action, ad_id = data[1], int(data[2])
     if action == "approve":
-        ad_manager.update_ad_status(ad_id, "approved")
+        await run_db(ad_manager.update_ad_status, ad_id, "approved")
         await query.answer("বিজ্ঞাপনটি অনুমোদন করা হয়েছে!", show_alert=True)
     elif action == "reject":
-        ad_manager.update_ad_status(ad_id, "rejected")
+        await run_db(ad_manager.update_ad_status, ad_id, "rejected")
         await query.answer("বিজ্ঞাপনটি প্রত্যাখ্যান করা হয়েছে।", show_alert=True)
-    await show_pending_ads(query)
+    # এই বিজ্ঞাপনের পরেরটি দেখান (শেষে থাকলে প্রথমটি)
+    await show_pending_ads(query, ad_id)
 
 async def add_new_ad_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
@@ -228,17 +342,40 @@ async def add_ad_duration_received(update: Update, context: ContextTypes.DEFAULT
     try:
         context.user_data['new_ad_duration'] = int(update.message.text)
         await update.message.delete()
+        await context.user_data['last_admin_message'].edit_text(
+            "প্রতি ভিউয়ের পুরস্কার এবং মোট বাজেট দিন (যেমন: `15 5000`)।\n"
+            "ডিফল্ট পুরস্কার বা সীমাহীন বাজেটের জন্য `-` দিন (যেমন: `- 5000` অথবা `-`):",
+            parse_mode='Markdown'
+        )
+        return ADD_AD_PRICING
+    except ValueError:
+        await context.user_data['last_admin_message'].edit_text("সঠিক সংখ্যা দিন। আবার চেষ্টা করুন:")
+        return ADD_AD_DURATION
+
+async def add_ad_pricing_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    try:
+        parts = update.message.text.split()
+        if not 1 <= len(parts) <= 2:
+            raise ValueError
+        parts += ['-'] * (2 - len(parts))
+        reward_per_view, budget = (None if part == '-' else int(part) for part in parts)
+        if (reward_per_view is not None and reward_per_view < 0) or (budget is not None and budget <= 0):
+            raise ValueError
+        await update.message.delete()
         
-        ad_id = ad_manager.submit_ad_by_user(
+        ad_id = await run_db(
+            ad_manager.submit_ad_by_user,
             user_id=update.effective_user.id,
             ad_source='admin_added',
             ad_type=context.user_data['new_ad_type'],
             ad_content=context.user_data['new_ad_content'],
             target_views=context.user_data['new_ad_target_views'],
-            duration=context.user_data['new_ad_duration']
+            duration=context.user_data['new_ad_duration'],
+            reward_per_view=reward_per_view,
+            budget=budget
         )
         if ad_id:
-            ad_manager.update_ad_status(ad_id, 'approved')
+            await run_db(ad_manager.update_ad_status, ad_id, 'approved')
             await context.user_data['last_admin_message'].edit_text("✅ বিজ্ঞাপনটি সফলভাবে যোগ এবং সক্রিয় করা হয়েছে।")
         else:
             await context.user_data['last_admin_message'].edit_text("❌ বিজ্ঞাপন যোগ করতে সমস্যা হয়েছে।")
@@ -248,8 +385,9 @@ async def add_ad_duration_received(update: Update, context: ContextTypes.DEFAULT
         await admin_panel(update, context)
         return ConversationHandler.END
     except ValueError:
-        await context.user_data['last_admin_message'].edit_text("সঠিক সংখ্যা দিন। আবার চেষ্টা করুন:")
-        return ADD_AD_DURATION
+        await context.user_data['last_admin_message'].edit_text("সঠিক মান দিন (যেমন: `15 5000` অথবা `-`)। আবার চেষ্টা করুন:",
+                                                                parse_mode='Markdown')
+        return ADD_AD_PRICING
 
 async def user_manage_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
@@ -262,7 +400,7 @@ async def user_id_input_received(update: Update, context: ContextTypes.DEFAULT_T
     try:
         target_user_id = int(update.message.text)
         await update.message.delete()
-        user_data = user_manager.get_user_by_id(target_user_id)
+        user_data = await run_db(user_manager.get_user_by_id, target_user_id)
         if not user_data:
             await context.user_data['last_admin_message'].edit_text("এই আইডির কোনো ব্যবহারকারী খুঁজে পাওয়া যায়নি।")
             return USER_ID_INPUT
@@ -286,11 +424,11 @@ async def user_manage_actions(update: Update, context: ContextTypes.DEFAULT_TYPE
     data = query.data.split('_')
     action, target_user_id = data[1], int(data[-1])
     if action == "toggle" and data[2] == "ban":
-        user_data = user_manager.get_user_by_id(target_user_id)
+        user_data = await run_db(user_manager.get_user_by_id, target_user_id)
         new_ban_status = not user_data['is_banned']
-        user_manager.set_ban_status(target_user_id, new_ban_status)
+        await run_db(user_manager.set_ban_status, target_user_id, new_ban_status)
         await query.answer(f"ব্যবহারকারীকে {'ব্যান' if new_ban_status else 'আনব্যান'} করা হয়েছে।", show_alert=True)
-        updated_user_data = user_manager.get_user_by_id(target_user_id)
+        updated_user_data = await run_db(user_manager.get_user_by_id, target_user_id)
         await show_user_profile(query.message, updated_user_data)
     elif action in ["add", "deduct"]:
         context.user_data['target_user_id'] = target_user_id
@@ -308,14 +446,182 @@ async def balance_change_input_received(update: Update, context: ContextTypes.DE
         target_user_id = context.user_data['target_user_id']
         action = context.user_data['balance_action']
         amount_to_change = amount if action == "add" else -amount
-        user_manager.update_balance(target_user_id, amount_to_change)
-        user_data = user_manager.get_user_by_id(target_user_id)
+        await run_db(wallet_manager.admin_adjust_balance, target_user_id, amount_to_change, update.effective_user.id)
+        user_data = await run_db(user_manager.get_user_by_id, target_user_id)
         await show_user_profile(context.user_data['last_admin_message'], user_data)
         await context.bot.send_message(chat_id=update.effective_chat.id, text=f"সফলভাবে {amount} পয়েন্ট {'যোগ' if action == 'add' else 'কাটা'} হয়েছে।")
     except (ValueError, KeyError): pass
     return ConversationHandler.END
 
+async def bulk_upload_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    query = update.callback_query
+    await query.answer()
+    if not await is_admin(query.from_user.id):
+        await query.edit_message_text("দুঃখিত, আপনি এডমিন নন।")
+        return ConversationHandler.END
+    text = ("📥 **বাল্ক অপারেশন**\n\nএকটি CSV ফাইল পাঠান। প্রথম লাইনে হেডার থাকবে:\n"
+            "`user_id,action,amount`\n\n"
+            "action: `credit`, `debit` (amount সহ), `ban`, `unban`\n"
+            "বাতিল করতে /cancel দিন।")
+    context.user_data['last_admin_message'] = await query.edit_message_text(text, parse_mode='Markdown')
+    return BULK_FILE_INPUT
+
+def _discard_bulk_file(context):
+    """আগের আপলোড করা (এখনো প্রয়োগ না হওয়া) বাল্ক ফাইলের অস্থায়ী কপি মুছে ফেলে।"""
+    path = context.user_data.pop('bulk_path', None)
+    context.user_data.pop('bulk_rows', None)
+    context.user_data.pop('bulk_name', None)
+    if path:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+async def bulk_file_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    document = update.message.document
+    if not document:
+        await update.message.reply_text("অনুগ্রহ করে একটি CSV ফাইল পাঠান।")
+        return BULK_FILE_INPUT
+    _discard_bulk_file(context)
+    status_message = await update.message.reply_text("⏳ ফাইলটি যাচাই করা হচ্ছে...")
+    # বড় ফাইল মেমোরিতে না রেখে সরাসরি একটি অস্থায়ী ফাইলে নামানো হয়; user_data তে শুধু তার পাথ থাকে
+    fd, path = tempfile.mkstemp(prefix='bulk_', suffix='.csv')
+    os.close(fd)
+    context.user_data['bulk_path'] = path
+    await (await document.get_file()).download_to_drive(path)
+
+    summary = await run_db(bulk_operations.validate_csv, path)
+    if not summary['success']:
+        _discard_bulk_file(context)
+        errors = "\n".join(summary['errors']) or "ফাইলে কোনো সারি নেই।"
+        more = summary['error_count'] - len(summary['errors'])
+        if more > 0:
+            errors += f"\n...এবং আরও {more} টি ত্রুটি"
+        await status_message.edit_text(f"❌ ফাইলটিতে {summary['error_count']} টি ত্রুটি পাওয়া গেছে:\n\n{errors}\n\n"
+                                       "ঠিক করে আবার পাঠান, অথবা /cancel দিন।")
+        return BULK_FILE_INPUT
+
+    context.user_data['bulk_rows'] = summary['rows']
+    context.user_data['bulk_name'] = f"{document.file_name or 'bulk.csv'}@{int(time.time())}"
+    counts = summary['counts']
+    resumed = ""
+    if summary['already_applied']:
+        resumed = (f"♻️ এই ফাইলের {summary['already_applied']} টি সারি আগের চেষ্টায় প্রয়োগ হয়ে গেছে; "
+                   f"সেগুলো বাদ দিয়ে বাকিগুলো প্রয়োগ হবে।\n\n")
+    skipped = ""
+    if summary['skipped']:
+        skipped = (f"⚠️ {summary['skipped']} টি ডেবিট সারি যথেষ্ট ব্যালেন্স না থাকায় বাদ যাবে:\n"
+                   + "\n".join(summary['warnings']) + "\n\n")
+    text = (f"✅ **ফাইলটি বৈধ** ({summary['rows']} টি সারি)\n\n{resumed}"
+            f"💰 ক্রেডিট: `{counts['credit']}` জন, মোট `{summary['total_credit']}` পয়েন্ট\n"
+            f"💸 ডেবিট: `{counts['debit']}` জন, মোট `{summary['total_debit']}` পয়েন্ট\n"
+            f"🚫 ব্যান: `{counts['ban']}` জন\n✅ আনব্যান: `{counts['unban']}` জন\n\n{skipped}"
+            f"প্রয়োগ করতে চান?")
+    keyboard = [[InlineKeyboardButton("✅ প্রয়োগ করুন", callback_data="bulk_apply"),
+                 InlineKeyboardButton("❌ বাতিল", callback_data="admin_main_menu")]]
+    await status_message.edit_text(text, reply_markup=InlineKeyboardMarkup(keyboard), parse_mode='Markdown')
+    return ConversationHandler.END
+
+async def bulk_apply_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    যাচাই করা CSV টুকরো টুকরো করে প্রয়োগ করে এবং কিছুক্ষণ পরপর অগ্রগতির মেসেজ আপডেট করে।
+    মাঝপথে থেমে গেলে ফাইলটি রেখে দেওয়া হয়; আবার চেষ্টা করলে চেকপয়েন্টের পর থেকে শুরু হয়।
+    """
+    query = update.callback_query
+    await query.answer()
+    if not await is_admin(query.from_user.id):
+        await query.edit_message_text("দুঃখিত, আপনি এডমিন নন।")
+        return
+    path = context.user_data.get('bulk_path')
+    if path is None or not os.path.exists(path):
+        await query.edit_message_text("কোনো যাচাই করা ফাইল নেই। আবার আপলোড করুন।")
+        return
+    total = context.user_data.get('bulk_rows', 0)
+    batch_name = context.user_data.get('bulk_name', 'bulk.csv')
+
+    await query.edit_message_text(f"⏳ প্রয়োগ করা হচ্ছে... 0/{total}")
+    # পার্সিং এবং প্রয়োগ পুরোটাই ডাটাবেস থ্রেডে চলে; লুপ শুধু কিছুক্ষণ পরপর অগ্রগতি পড়ে মেসেজ আপডেট করে
+    progress = {'applied': 0}
+    apply_task = asyncio.ensure_future(
+        run_db(bulk_operations.apply_file, path, query.from_user.id, batch_name, progress)
+    )
+    shown = 0
+    while True:
+        done, _ = await asyncio.wait({apply_task}, timeout=BULK_PROGRESS_INTERVAL_SECONDS)
+        if done:
+            break
+        if progress['applied'] != shown:
+            shown = progress['applied']
+            await query.edit_message_text(f"⏳ প্রয়োগ করা হচ্ছে... {shown}/{total}")
+    result = apply_task.result()
+    applied = result['applied']
+
+    if result['failed']:
+        # প্রয়োগ হওয়া টুকরোগুলো চেকপয়েন্টে আছে, তাই আবার চেষ্টা করলে শুধু বাকিগুলো প্রয়োগ হবে
+        context.user_data['bulk_rows'] = max(total - applied, 0)
+        text = (f"❌ ডাটাবেস ত্রুটির কারণে থেমে গেছে। {applied}/{total} টি সারি প্রয়োগ হয়েছে; বাকিগুলো অপরিবর্তিত।\n"
+                "আবার চেষ্টা করলে প্রয়োগ হওয়া সারিগুলো বাদ দিয়ে বাকিগুলো প্রয়োগ হবে।")
+        keyboard = [[InlineKeyboardButton("🔁 আবার চেষ্টা করুন", callback_data="bulk_apply"),
+                     InlineKeyboardButton("⬅️ ফিরে যান", callback_data="admin_main_menu")]]
+    else:
+        _discard_bulk_file(context)
+        text = f"✅ বাল্ক অপারেশন সম্পন্ন: {applied} টি সারি প্রয়োগ হয়েছে।"
+        keyboard = [[InlineKeyboardButton("⬅️ ফিরে যান", callback_data="admin_main_menu")]]
+    if result['skipped']:
+        text += (f"\n\n⚠️ {result['skipped']} টি সারি বাদ গেছে (কোনো পরিবর্তন বা লেজার সারি লেখা হয়নি):\n"
+                 + "\n".join(result['skipped_rows']))
+    await query.edit_message_text(text, reply_markup=InlineKeyboardMarkup(keyboard))
+
+async def broadcast_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    query = update.callback_query
+    await query.answer()
+    if not await is_admin(query.from_user.id):
+        await query.edit_message_text("দুঃখিত, আপনি এডমিন নন।")
+        return ConversationHandler.END
+    text = ("📣 **ব্রডকাস্ট**\n\nসকল ব্যবহারকারীকে যে মেসেজটি পাঠাতে চান সেটি পাঠান "
+            "(টেক্সট, ছবি, ভিডিও ইত্যাদি; হুবহু কপি করে পাঠানো হবে)।\nবাতিল করতে /cancel দিন।")
+    await query.edit_message_text(text, parse_mode='Markdown')
+    return BROADCAST_MESSAGE_INPUT
+
+async def broadcast_message_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    context.user_data['broadcast_source'] = (update.effective_chat.id, update.message.message_id)
+    stats = await run_db(stats_manager.get_stats)
+    recipients = max(stats['total_users'] - stats['banned_users'], 0)
+    keyboard = [[InlineKeyboardButton("✅ পাঠান", callback_data="broadcast_confirm"),
+                 InlineKeyboardButton("❌ বাতিল", callback_data="admin_main_menu")]]
+    await update.message.reply_text(f"উপরের মেসেজটি প্রায় {recipients} জন ব্যবহারকারীকে পাঠানো হবে। নিশ্চিত?",
+                                    reply_markup=InlineKeyboardMarkup(keyboard))
+    return ConversationHandler.END
+
+async def broadcast_confirm_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    await query.answer()
+    if not await is_admin(query.from_user.id):
+        await query.edit_message_text("দুঃখিত, আপনি এডমিন নন।")
+        return
+    source = context.user_data.pop('broadcast_source', None)
+    if source is None:
+        await query.edit_message_text("কোনো মেসেজ নির্বাচন করা হয়নি। আবার শুরু করুন।")
+        return
+    status_message = await query.edit_message_text("📣 ব্রডকাস্ট শুরু হচ্ছে...")
+    broadcast_id = await run_db(broadcast_manager.create_broadcast, query.from_user.id, source[0], source[1],
+                                status_message.chat_id, status_message.message_id)
+    if broadcast_id is None:
+        await query.edit_message_text("❌ ব্রডকাস্ট তৈরি করতে সমস্যা হয়েছে।")
+        return
+    broadcast_manager.start_broadcast(context.bot, broadcast_id)
+
+async def broadcast_cancel_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    query = update.callback_query
+    if not await is_admin(query.from_user.id):
+        await query.answer("দুঃখিত, আপনি এডমিন নন।", show_alert=True)
+        return
+    broadcast_id = int(query.data.split('_')[-1])
+    cancelled = await run_db(broadcast_manager.cancel_broadcast, broadcast_id)
+    await query.answer("ব্রডকাস্ট বাতিল করা হচ্ছে..." if cancelled else "এই ব্রডকাস্টটি আর চলছে না।")
+
 async def cancel_conversation(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    _discard_bulk_file(context)
     context.user_data.clear()
     await update.message.reply_text("অপারেশন বাতিল করা হয়েছে।")
     await admin_panel(update, context)
@@ -2,9 +2,15 @@
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
 from telegram.ext import ContextTypes
+import asyncio
 import json
+import time
+from collections import OrderedDict
 
 # আমাদের মডিউলগুলো ইম্পোর্ট করুন
+from config import MEMBERSHIP_CHECK_CONCURRENCY, MEMBERSHIP_CACHE_TTL_SECONDS, MEMBERSHIP_CACHE_MAX_ENTRIES
+from database import run_db
+from metrics import Counter
 from modules import user_manager, bot_settings
 
 """
@@ -12,6 +18,14 @@ from modules import user_manager, bot_settings
 চ্যানেল জয়েন ভেরিফিকেশন এবং মিনি অ্যাপ লঞ্চার বাটন দেখানো এর প্রধান কাজ।
 """
 
+# সকল চ্যানেল চেকের জন্য একটি সাধারণ সেমাফোর, যাতে একসাথে খুব বেশি API কল না যায়
+_membership_semaphore = asyncio.Semaphore(MEMBERSHIP_CHECK_CONCURRENCY)
+
+# (user_id, channel) -> মেয়াদ শেষের সময়। শুধু সফল (মেম্বার) ফলাফল রাখা হয়।
+_membership_cache = OrderedDict()
+membership_cache_lookups = Counter(
+    'membership_cache_lookups_total', 'চ্যানেল মেম্বারশিপ ক্যাশে খোঁজার ফলাফল', ('result',))
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """/start কমান্ড হ্যান্ডেল করে।"""
     user = update.effective_user
@@ -28,7 +42,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             referrer_id = None
 
     # ব্যবহারকারীকে ডাটাবেসে যোগ বা খুঁজে বের করুন
-    user_data = user_manager.add_or_get_user(user_id, user.username, referrer_id)
+    user_data = await run_db(user_manager.add_or_get_user, user_id, user.username, referrer_id)
 
     if not user_data:
         await update.message.reply_text("দুঃখিত, আপনার প্রোফাইল তৈরি করতে একটি সমস্যা হয়েছে। অনুগ্রহ করে আবার চেষ্টা করুন।")
@@ -96,7 +110,7 @@ async def send_welcome_and_launch_button(update: Update) -> None:
         reply_markup=keyboard
     )
     # ব্যবহারকারীর ভেরিফিকেশন স্ট্যাটাস ডাটাবেসে আপডেট করুন
-    user_manager.set_user_verified(update.effective_user.id, status=True)
+    await run_db(user_manager.set_user_verified, update.effective_user.id, status=True)
 
 
 async def verify_membership_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -113,8 +127,51 @@ async def verify_membership_callback(update: Update, context: ContextTypes.DEFAU
         await query.answer("আপনি এখনও সব প্রয়োজনীয় চ্যানেলে যোগ দেননি।", show_alert=True)
 
 
+def _is_cached_member(user_id, channel):
+    key = (user_id, channel)
+    expires_at = _membership_cache.get(key)
+    if expires_at is not None and expires_at > time.monotonic():
+        membership_cache_lookups.inc('hit')
+        return True
+    if expires_at is not None:
+        del _membership_cache[key]
+    membership_cache_lookups.inc('miss')
+    return False
+
+
+def _remember_member(user_id, channel):
+    key = (user_id, channel)
+    _membership_cache[key] = time.monotonic() + MEMBERSHIP_CACHE_TTL_SECONDS
+    _membership_cache.move_to_end(key)
+    # সীমা ছাড়িয়ে গেলে সবচেয়ে পুরনো এন্ট্রি বাদ দিন
+    while len(_membership_cache) > MEMBERSHIP_CACHE_MAX_ENTRIES:
+        _membership_cache.popitem(last=False)
+
+
+async def _check_single_channel(context: ContextTypes.DEFAULT_TYPE, user_id: int, channel_username: str) -> bool:
+    """একটি চ্যানেলে ব্যবহারকারী মেম্বার কিনা চেক করে (ক্যাশ থাকলে API কল ছাড়াই)।"""
+    channel = channel_username.lstrip('@')
+    if _is_cached_member(user_id, channel):
+        return True
+    try:
+        async with _membership_semaphore:
+            member = await context.bot.get_chat_member(chat_id=f"@{channel}", user_id=user_id)
+    except Exception as e:
+        print(f"চ্যানেল @{channel} চেক করতে সমস্যা: {e}")
+        # যদি বট চ্যানেলের এডমিন না থাকে বা চ্যানেলটি প্রাইভেট হয়, তাহলে ত্রুটি হতে পারে।
+        # এক্ষেত্রে, আমরা ধরে নিচ্ছি ব্যবহারকারী জয়েন করেনি।
+        return False
+    if member.status in ['member', 'administrator', 'creator']:
+        _remember_member(user_id, channel)
+        return True
+    return False
+
+
 async def check_channel_membership(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
-    """ব্যবহারকারী সব প্রয়োজনীয় চ্যানেলে যোগ দিয়েছে কিনা তা চেক করে।"""
+    """
+    ব্যবহারকারী সব প্রয়োজনীয় চ্যানেলে যোগ দিয়েছে কিনা তা চেক করে।
+    সব চ্যানেল একসাথে (সীমিত সংখ্যায়) চেক করা হয়, এবং সফল ফলাফল কিছুক্ষণ ক্যাশে থাকে।
+    """
     user_id = update.effective_user.id
     required_channels_str, _ = bot_settings.get_setting('required_channels')
     
@@ -126,15 +183,5 @@ async def check_channel_membership(update: Update, context: ContextTypes.DEFAULT
     if not channels:
         return True # কোনো চ্যানেল সেট করা না থাকলে সবসময় ভেরিফাইড
 
-    for channel_username in channels:
-        try:
-            member = await context.bot.get_chat_member(chat_id=f"@{channel_username.lstrip('@')}", user_id=user_id)
-            if member.status not in ['member', 'administrator', 'creator']:
-                return False # যদি কোনো একটি চ্যানেলেও মেম্বার না থাকে
-        except Exception as e:
-            print(f"চ্যানেল @{channel_username} চেক করতে সমস্যা: {e}")
-            # যদি বট চ্যানেলের এডমিন না থাকে বা চ্যানেলটি প্রাইভেট হয়, তাহলে ত্রুটি হতে পারে।
-            # এক্ষেত্রে, আমরা ধরে নিচ্ছি ব্যবহারকারী জয়েন করেনি।
-            return False
-            
-    return True
+    results = await asyncio.gather(*(_check_single_channel(context, user_id, channel) for channel in channels))
+    return all(results)
@@ -2,6 +2,7 @@
 
 import asyncio
 import uvicorn
+from telegram import Update
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -11,22 +12,36 @@ from telegram.ext import (
     filters,
 )
 
-from config import BOT_TOKEN
-from database import initialize_database
-from modules.bot_settings import initialize_bot_settings
-from api.routes import app as fastapi_app
+from config import BOT_TOKEN, LEDGER_WRITE_BEHIND, BOT_UPDATE_MODE, WEBHOOK_BASE_URL, WEBHOOK_SECRET_TOKEN, CONCURRENT_UPDATES
+from database import close_all_connections
+from storage import get_storage
+from metrics import instrument_handlers
+from modules.bot_settings import initialize_bot_settings, start_settings_refresher, stop_settings_refresher
+from modules.ledger_writer import start_ledger_writer, stop_ledger_writer
+from modules.stats_manager import initialize_stats
+from modules.broadcast_manager import resume_broadcasts, stop_broadcasts
+from modules.reconciliation import start_reconciliation_scheduler, stop_reconciliation_scheduler
+from modules.payout_worker import start_payout_worker, stop_payout_worker
+from payment_gateways.http_client import close_http_client
+from api.routes import app as fastapi_app, set_telegram_application
 from handlers import start_handler, admin_panel_handler
 
 # main ফাংশনটিকে async হিসেবে ঘোষণা করতে হবে
 async def main() -> None:
     print("ডাটাবেস ইনিশিয়ালাইজ করা হচ্ছে...")
-    initialize_database()
+    get_storage().initialize()
     print("বটের ডিফল্ট সেটিংস লোড করা হচ্ছে...")
     initialize_bot_settings()
+    # অন্য প্রসেসের সেটিংস পরিবর্তন ব্যাকগ্রাউন্ডে ধরে, যাতে `get_setting` কখনো ডাটাবেসে না যায়
+    start_settings_refresher()
+    initialize_stats()
+    if LEDGER_WRITE_BEHIND:
+        start_ledger_writer()
     print("প্রাথমিক সেটআপ সম্পন্ন।")
     
     print("টেলিগ্রাম অ্যাপ্লিকেশন তৈরি করা হচ্ছে...")
-    application = Application.builder().token(BOT_TOKEN).build()
+    # concurrent_updates: একাধিক আপডেট একসাথে প্রসেস হবে, একটি ধীর হ্যান্ডলার অন্যগুলোকে আটকাবে না
+    application = Application.builder().token(BOT_TOKEN).concurrent_updates(CONCURRENT_UPDATES).build()
 
     # --- ConversationHandler সেটআপ (আপনার কোড অপরিবর্তিত) ---
     conv_handler = ConversationHandler(
@@ -35,7 +50,9 @@ async def main() -> None:
             CallbackQueryHandler(admin_panel_handler.user_manage_actions, pattern='^user_(add|deduct)_balance_'),
             CallbackQueryHandler(admin_panel_handler.edit_setting_start, pattern='^edit_setting_'),
             CallbackQueryHandler(admin_panel_handler.add_new_ad_start, pattern='^admin_ad_add_new$'),
-            CallbackQueryHandler(admin_panel_handler.add_ad_type_selected, pattern='^add_ad_type_')
+            CallbackQueryHandler(admin_panel_handler.add_ad_type_selected, pattern='^add_ad_type_'),
+            CallbackQueryHandler(admin_panel_handler.bulk_upload_start, pattern='^admin_bulk_upload$'),
+            CallbackQueryHandler(admin_panel_handler.broadcast_start, pattern='^admin_broadcast$')
         ],
         states={
             admin_panel_handler.USER_ID_INPUT: [MessageHandler(filters.TEXT & ~filters.COMMAND, admin_panel_handler.user_id_input_received)],
@@ -44,6 +61,9 @@ async def main() -> None:
             admin_panel_handler.ADD_AD_CONTENT: [MessageHandler(filters.TEXT & ~filters.COMMAND, admin_panel_handler.add_ad_content_received)],
             admin_panel_handler.ADD_AD_TARGET_VIEWS: [MessageHandler(filters.TEXT & ~filters.COMMAND, admin_panel_handler.add_ad_target_views_received)],
             admin_panel_handler.ADD_AD_DURATION: [MessageHandler(filters.TEXT & ~filters.COMMAND, admin_panel_handler.add_ad_duration_received)],
+            admin_panel_handler.ADD_AD_PRICING: [MessageHandler(filters.TEXT & ~filters.COMMAND, admin_panel_handler.add_ad_pricing_received)],
+            admin_panel_handler.BULK_FILE_INPUT: [MessageHandler(filters.Document.ALL | (filters.TEXT & ~filters.COMMAND), admin_panel_handler.bulk_file_received)],
+            admin_panel_handler.BROADCAST_MESSAGE_INPUT: [MessageHandler(~filters.COMMAND, admin_panel_handler.broadcast_message_received)],
         },
         fallbacks=[
             CommandHandler('cancel', admin_panel_handler.cancel_conversation),
@@ -57,13 +77,25 @@ async def main() -> None:
     # --- হ্যান্ডলার রেজিস্ট্রেশন (আপনার কোড অপরিবর্তিত) ---
     application.add_handler(CommandHandler("start", start_handler.start), group=0)
     application.add_handler(CommandHandler("admin", admin_panel_handler.admin_panel), group=0)
+    application.add_handler(CommandHandler("recompute_stats", admin_panel_handler.recompute_stats_command), group=0)
+    application.add_handler(CommandHandler("export", admin_panel_handler.export_command), group=0)
+    application.add_handler(CommandHandler("reconcile", admin_panel_handler.reconcile_command), group=0)
     application.add_handler(conv_handler, group=1)
     
     application.add_handler(CallbackQueryHandler(start_handler.verify_membership_callback, pattern='^verify_membership$'), group=0)
     application.add_handler(CallbackQueryHandler(admin_panel_handler.admin_panel_callback, pattern='^admin_(stats|global_settings|feature_control|close|main_menu|ad_manage_menu|ad_pending_list)$'), group=0)
+    application.add_handler(CallbackQueryHandler(admin_panel_handler.recompute_stats_command, pattern='^admin_recompute_stats$'), group=0)
     application.add_handler(CallbackQueryHandler(admin_panel_handler.toggle_feature_status, pattern='^toggle_'), group=0)
     application.add_handler(CallbackQueryHandler(admin_panel_handler.ad_review_action, pattern='^ad_(approve|reject)_'), group=0)
+    application.add_handler(CallbackQueryHandler(admin_panel_handler.pending_ads_navigation, pattern='^ad_nav_(next|prev)_'), group=0)
     application.add_handler(CallbackQueryHandler(admin_panel_handler.user_manage_actions, pattern='^user_toggle_ban_'), group=0)
+    application.add_handler(CallbackQueryHandler(admin_panel_handler.bulk_apply_callback, pattern='^bulk_apply$'), group=0)
+    application.add_handler(CallbackQueryHandler(admin_panel_handler.broadcast_confirm_callback, pattern='^broadcast_confirm$'), group=0)
+    application.add_handler(CallbackQueryHandler(admin_panel_handler.broadcast_cancel_callback, pattern='^broadcast_cancel_'), group=0)
+
+    # প্রতিটি হ্যান্ডলারের লেটেন্সি /metrics এ দেখানোর জন্য
+    for handlers in application.handlers.values():
+        instrument_handlers(handlers)
 
     print("সকল হ্যান্ডলার সফলভাবে রেজিস্টার করা হয়েছে।")
 
@@ -74,18 +106,47 @@ async def main() -> None:
     # `async with` ব্যবহার করলে application.initialize() এবং application.shutdown() নিজে থেকেই সঠিকভাবে কল হবে
     async with application:
         print("বট এবং API সার্ভার চালু করা হচ্ছে...")
-        await application.start()  # বটকে ব্যাকগ্রাউন্ডে পোলিং শুরু করার জন্য প্রস্তুত করে
-        await application.updater.start_polling() # পোলিং চালু করে
+        await application.start()  # update_queue থেকে আপডেট প্রসেস করা শুরু করে
+
+        if BOT_UPDATE_MODE == 'webhook':
+            # টেলিগ্রাম সরাসরি FastAPI-এর /telegram/webhook রাউটে আপডেট পাঠাবে
+            set_telegram_application(application)
+            await application.bot.set_webhook(
+                url=f"{WEBHOOK_BASE_URL.rstrip('/')}/telegram/webhook",
+                secret_token=WEBHOOK_SECRET_TOKEN or None,
+                allowed_updates=Update.ALL_TYPES
+            )
+            print("webhook মোড চালু হয়েছে।")
+        else:
+            await application.updater.start_polling() # পোলিং চালু করে (আগের webhook থাকলে মুছে দেয়)
+
+        # রিস্টার্টের আগে অসম্পূর্ণ থাকা ব্রডকাস্টগুলো তাদের চেকপয়েন্ট থেকে আবার শুরু করুন
+        await resume_broadcasts(application.bot)
+        # প্রতিদিনের ব্যালেন্স রিকনসিলিয়েশন
+        start_reconciliation_scheduler(application.bot)
+        # পেন্ডিং উইথড্রগুলোর স্বয়ংক্রিয় পে-আউট (PAYOUT_GATEWAY সেট করা থাকলে)
+        start_payout_worker()
 
         try:
             await server.serve() # API সার্ভার চালু করে এবং প্রোগ্রামটিকে এখানে ধরে রাখে
         except (KeyboardInterrupt, SystemExit):
-            print("সার্ভার বন্ধের অনুরোধ পাওয়া গেছে...")
+            print("সার্ভার বন্ধের অনুরোধ পাওয়া গেছে...")
         finally:
-            print("বটের পোলিং বন্ধ করা হচ্ছে...")
-            await application.updater.stop() # পোলিং বন্ধ করে
+            if BOT_UPDATE_MODE == 'webhook':
+                print("webhook আপডেট গ্রহণ বন্ধ করা হচ্ছে...")
+                set_telegram_application(None)
+            else:
+                print("বটের পোলিং বন্ধ করা হচ্ছে...")
+                await application.updater.stop() # পোলিং বন্ধ করে
+            await stop_broadcasts()        # চলমান ব্রডকাস্ট থামায় (চেকপয়েন্ট থেকে পরে আবার শুরু হবে)
+            await stop_reconciliation_scheduler()  # নির্ধারিত রিকনসিলিয়েশন বন্ধ করে
+            await stop_payout_worker()     # পে-আউট ওয়ার্কার থামায় (অসম্পূর্ণ উইথড্র পরে আবার কিউতে আসবে)
+            await close_http_client()      # গেটওয়ের keep-alive সংযোগগুলো বন্ধ করে
             await application.stop()       # অ্যাপ্লিকেশন ক্লিনার বন্ধ করে
-            print("বট সফলভাবে বন্ধ হয়েছে।")
+            stop_ledger_writer()           # কিউতে থাকা সব লেনদেন ডাটাবেসে লিখে দেয়
+            stop_settings_refresher()      # সেটিংস ভার্সন চেক বন্ধ করে
+            close_all_connections()        # ডাটাবেস থ্রেড পুল এবং সংযোগ বন্ধ করে
+            print("বট সফলভাবে বন্ধ হয়েছে।")
 
 
 if __name__ == "__main__":
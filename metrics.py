@@ -0,0 +1,184 @@
+# advanced_earning_bot/metrics.py
+
+import re
+import time
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+
+"""
+এই ফাইলটি বটের পারফরম্যান্স মাপার জন্য একটি হালকা ইনস্ট্রুমেন্টেশন লেয়ার।
+API রাউট, টেলিগ্রাম হ্যান্ডলার এবং প্রতিটি SQL স্টেটমেন্টের সময় হিস্টোগ্রামে জমা হয়,
+এবং `/metrics` রাউট সবকিছু Prometheus টেক্সট ফরম্যাটে দেখায়।
+কোনো বাইরের লাইব্রেরি লাগে না।
+"""
+
+# সেকেন্ডে হিস্টোগ্রামের বাকেট সীমা
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# নিবন্ধিত সকল মেট্রিক, `render_metrics()` এই ক্রমে দেখায়
+_registry = []
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Counter:
+    """শুধু বাড়তে পারে এমন একটি সংখ্যা (যেমন মোট অনুরোধ)।"""
+
+    def __init__(self, name, description, label_names=()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    """সময়ের বণ্টন (লেটেন্সি) মাপার জন্য ক্রমবর্ধমান বাকেট হিস্টোগ্রাম।"""
+
+    def __init__(self, name, description, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}  # {label_values: [বাকেট গণনা..., +Inf গণনা, যোগফল]}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        """ব্লকটি চলতে কত সময় লাগল তা রেকর্ড করে।"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for label_values, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                labels = _format_labels(self.label_names, label_values, ('le', bound))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render_metrics():
+    """সকল মেট্রিক Prometheus টেক্সট ফরম্যাটে রিটার্ন করে।"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# --- বটের মেট্রিকগুলো ---
+
+http_request_duration = Histogram(
+    'http_request_duration_seconds', 'API অনুরোধের লেটেন্সি', ('method', 'route'))
+http_requests_total = Counter(
+    'http_requests_total', 'মোট API অনুরোধ', ('method', 'route', 'status'))
+telegram_handler_duration = Histogram(
+    'telegram_handler_duration_seconds', 'টেলিগ্রাম হ্যান্ডলারের লেটেন্সি', ('handler', 'pattern'))
+telegram_handler_errors = Counter(
+    'telegram_handler_errors_total', 'ত্রুটিতে শেষ হওয়া হ্যান্ডলার কল', ('handler', 'pattern'))
+db_query_duration = Histogram(
+    'db_query_duration_seconds', 'প্রতিটি SQL স্টেটমেন্টের সময় (COMMIT সহ)', ('operation', 'table'))
+db_connections_opened = Counter(
+    'db_connections_opened_total', 'খোলা ডাটাবেস সংযোগের সংখ্যা')
+
+
+_TABLE_PATTERN = re.compile(r'\b(?:FROM|INTO|UPDATE|TABLE(?: IF NOT EXISTS)?|ON)\s+(\w+)', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
+def sql_labels(sql):
+    """একটি SQL স্টেটমেন্ট থেকে (operation, table) লেবেল বের করে, যেমন ('SELECT', 'users')।"""
+    words = sql.split(None, 1)
+    operation = words[0].upper() if words else ''
+    match = _TABLE_PATTERN.search(sql)
+    return operation, match.group(1) if match else ''
+
+
+def instrument_handlers(handlers):
+    """
+    টেলিগ্রাম হ্যান্ডলারগুলোর callback মোড়ানো হয় যাতে প্রতিটি কলের সময়
+    হ্যান্ডলারের নাম এবং প্যাটার্ন/কমান্ড অনুযায়ী রেকর্ড হয়।
+    ConversationHandler এর ভেতরের হ্যান্ডলারগুলোও মোড়ানো হয়।
+    """
+    for handler in handlers:
+        # ConversationHandler: entry_points, states এবং fallbacks এর হ্যান্ডলারগুলো
+        if hasattr(handler, 'entry_points'):
+            instrument_handlers(handler.entry_points)
+            for state_handlers in handler.states.values():
+                instrument_handlers(state_handlers)
+            instrument_handlers(handler.fallbacks)
+            continue
+
+        callback = getattr(handler, 'callback', None)
+        if callback is None or getattr(callback, '_instrumented', False):
+            continue
+
+        pattern = getattr(handler, 'pattern', None)
+        if pattern is not None:
+            pattern = getattr(pattern, 'pattern', pattern)
+        elif getattr(handler, 'commands', None):
+            pattern = '/' + ','.join(sorted(handler.commands))
+        else:
+            pattern = type(handler).__name__
+        handler.callback = _timed_callback(callback, callback.__name__, str(pattern))
+
+
+def _timed_callback(callback, name, pattern):
+    @functools.wraps(callback)
+    async def wrapper(update, context):
+        started = time.perf_counter()
+        try:
+            return await callback(update, context)
+        except Exception:
+            telegram_handler_errors.inc(name, pattern)
+            raise
+        finally:
+            telegram_handler_duration.observe(time.perf_counter() - started, name, pattern)
+    wrapper._instrumented = True
+    return wrapper
@@ -30,7 +30,8 @@ function onAdViewerReady() {
         reward: parseInt(urlParams.get('reward')),
         adType: urlParams.get('ad_type'),
         adContent: decodeURIComponent(urlParams.get('ad_content')),
-        bloggerBaseUrl: decodeURIComponent(urlParams.get('blogger_base_url'))
+        bloggerBaseUrl: decodeURIComponent(urlParams.get('blogger_base_url')),
+        ticket: urlParams.get('ticket')
     };
 
     if (!adData.adId) {
@@ -95,7 +96,7 @@ claimButton.addEventListener('click', async () => {
     claimButton.textContent = 'প্রসেসিং...';
 
     const userId = tg.initDataUnsafe.user.id;
-    const response = await recordAdView(userId, adData.adId, adData.reward);
+    const response = await recordAdView(userId, adData.ticket);
 
     if (response.success) {
         // সফল হলে একটি বার্তা দেখান এবং অ্যাপটি বন্ধ করুন
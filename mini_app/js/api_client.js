@@ -93,14 +93,44 @@ async function fetchAdForView(userId) {
 /**
  * বিজ্ঞাপন দেখার পর তা রেকর্ড করে।
  * @param {string} userId - টেলিগ্রাম ব্যবহারকারীর আইডি।
- * @param {number} adId - বিজ্ঞাপনের আইডি।
- * @param {number} reward - পুরস্কারের পরিমাণ।
+ * @param {string} ticket - `fetchAdForView` থেকে পাওয়া ভিউ টিকিট (বিজ্ঞাপন ও পুরস্কারের তথ্য এতে থাকে)।
  * @returns {Promise<object>} - সফল বা ব্যর্থতার বার্তা।
  */
-async function recordAdView(userId, adId, reward) {
+async function recordAdView(userId, ticket) {
     return await postRequest('/record_ad_view', { 
         user_id: userId, 
-        ad_id: adId, 
-        reward: reward 
+        ticket: ticket
+    });
+}
+
+/**
+ * ব্যবহারকারীর লেনদেনের ইতিহাস পেজ আকারে নিয়ে আসে।
+ * @param {string} userId - টেলিগ্রাম ব্যবহারকারীর আইডি।
+ * @param {string|null} cursor - আগের পেজের `next_cursor` (প্রথম পেজের জন্য null)।
+ * @param {number} limit - প্রতি পেজে কয়টি লেনদেন।
+ * @returns {Promise<object>} - লেনদেনের তালিকা এবং `next_cursor`।
+ */
+async function fetchTransactions(userId, cursor = null, limit = 20) {
+    return await postRequest('/get_transactions', {
+        user_id: userId,
+        cursor: cursor,
+        limit: limit
+    });
+}
+
+/**
+ * অন্য একজন ব্যবহারকারীকে ব্যালেন্স পাঠায়।
+ * সার্ভার প্রেরককে স্বাক্ষরিত `initData` থেকে চেনে, তাই `initDataUnsafe` নয়, কাঁচা `initData` পাঠাতে হবে।
+ * @param {string} userId - টেলিগ্রাম ব্যবহারকারীর আইডি (রেট লিমিটের জন্য)।
+ * @param {string} receiverId - প্রাপকের টেলিগ্রাম আইডি।
+ * @param {number} amount - কত পয়েন্ট পাঠানো হবে।
+ * @returns {Promise<object>} - সফল বা ব্যর্থতার বার্তা।
+ */
+async function transferBalance(userId, receiverId, amount) {
+    return await postRequest('/transfer_balance', {
+        init_data: window.Telegram.WebApp.initData,
+        user_id: userId,
+        receiver_id: receiverId,
+        amount: amount
     });
 }
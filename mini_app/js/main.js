@@ -87,7 +87,7 @@ function addEventListeners() {
         if (response.success) {
             const ad = response.ad;
             // ad_viewer.html পেজটি বিজ্ঞাপনর ডেটা সহ খুলুন
-            const url = `ad_viewer.html?ad_id=${ad.ad_id}&duration=${ad.duration}&reward=${ad.reward}&ad_type=${ad.ad_type}&ad_content=${encodeURIComponent(ad.ad_content)}&blogger_base_url=${encodeURIComponent(ad.blogger_base_url)}`;
+            const url = `ad_viewer.html?ad_id=${ad.ad_id}&duration=${ad.duration}&reward=${ad.reward}&ad_type=${ad.ad_type}&ad_content=${encodeURIComponent(ad.ad_content)}&blogger_base_url=${encodeURIComponent(ad.blogger_base_url)}&ticket=${encodeURIComponent(ad.ticket)}`;
             
             // মিনি অ্যাপের মধ্যে নতুন পেজ খোলার জন্য
             tg.openLink(url, {try_instant_view: true});
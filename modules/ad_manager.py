@@ -1,10 +1,9 @@
 # advanced_earning_bot/modules/ad_manager.py
 
-import sqlite3
-import json
-from config import DATABASE_NAME
-from modules.wallet_manager import record_transaction
+from storage import get_storage, STORAGE_ERRORS
+from modules.wallet_manager import queue_transaction
 from modules.user_manager import update_balance
+from modules.stats_manager import increment_stat
 
 """
 এই মডিউলটি বিজ্ঞাপন সংক্রান্ত সকল কাজ পরিচালনা করে।
@@ -19,138 +18,123 @@ def get_ad_for_user(user_id):
     - ব্যবহারকারী তার নিজের বিজ্ঞাপন দেখতে পাবে না।
     """
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-
-        # সকল সক্রিয় বিজ্ঞাপন নিয়ে আসুন
-        cursor.execute("SELECT * FROM ads WHERE status = 'active' AND owner_user_id != ?", (user_id,))
-        active_ads = cursor.fetchall()
-
-        if not active_ads:
-            return None # দেখানোর মতো কোনো বিজ্ঞাপন নেই
-
-        columns = [description[0] for description in cursor.description]
-
-        # উপযুক্ত বিজ্ঞাপন খুঁজে বের করুন
-        for ad_data in active_ads:
-            ad_dict = dict(zip(columns, ad_data))
-            viewed_by = json.loads(ad_dict['viewed_by_users']) if ad_dict['viewed_by_users'] else []
-            
-            if user_id not in viewed_by:
-                return ad_dict # উপযুক্ত বিজ্ঞাপন পাওয়া গেছে
-
-        return None # ব্যবহারকারী সব বিজ্ঞাপন দেখে ফেলেছে
-    except sqlite3.Error as e:
+        # দেখানোর মতো কোনো নতুন বিজ্ঞাপন না থাকলে None
+        return get_storage().ads.find_unviewed_active(user_id)
+    except STORAGE_ERRORS as e:
         print(f"বিজ্ঞাপন খুঁজতে ত্রুটি: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
+
+class _AdUnavailable(Exception):
+    """বিজ্ঞাপনটি আর সক্রিয় নেই; ট্রানজেকশন রোলব্যাক করার জন্য ব্যবহৃত।"""
+    pass
 
 def record_ad_view(user_id, ad_id, reward_amount):
     """
     একজন ব্যবহারকারীর বিজ্ঞাপন দেখা সফলভাবে রেকর্ড করে।
-    - `ads` টেবিলে `current_views` এবং `viewed_by_users` আপডেট করে।
+    - একটি ভিউ যোগ করে, `current_views` বাড়ায় এবং একই সাথে বিজ্ঞাপনের বাজেট থেকে পুরস্কার কাটে।
     - ব্যবহারকারীর ব্যালেন্সে পুরস্কার যোগ করে।
     - একটি ট্রানজেকশন রেকর্ড করে।
-    - যদি টার্গেট ভিউ পূর্ণ হয়, বিজ্ঞাপনের স্ট্যাটাস 'completed' করে।
+    - যদি টার্গেট ভিউ পূর্ণ হয় বা বাজেট শেষ হয়, বিজ্ঞাপনের স্ট্যাটাস 'completed' করে।
+    সবকিছু একটি ট্রানজেকশনে হয় এবং একবারই কমিট হয়।
+    `ad_id` এবং `reward_amount` যাচাই করা টিকিট থেকে আসে (`modules/ad_ticket.py`),
+    তাই এখানে বিজ্ঞাপনের সারি আগে পড়া হয় না।
     """
+    storage = get_storage()
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-
-        # বিজ্ঞাপনের বর্তমান তথ্য নিন
-        cursor.execute("SELECT viewed_by_users, target_views, current_views FROM ads WHERE ad_id = ?", (ad_id,))
-        result = cursor.fetchone()
-        if not result:
-            return {'success': False, 'message': 'বিজ্ঞাপন খুঁজে পাওয়া যায়নি।'}
-
-        viewed_by_str, target_views, current_views = result
-        viewed_by_list = json.loads(viewed_by_str) if viewed_by_str else []
-
-        # ব্যবহারকারী ইতিমধ্যে দেখেছে কিনা আবার চেক করুন (নিরাপত্তার জন্য)
-        if user_id in viewed_by_list:
-            return {'success': False, 'message': 'আপনি এই বিজ্ঞাপনটি ইতিমধ্যে দেখেছেন।'}
-
-        # তালিকা আপডেট করুন
-        viewed_by_list.append(user_id)
-        new_viewed_by_str = json.dumps(viewed_by_list)
-        new_current_views = current_views + 1
-        
-        # বিজ্ঞাপনের স্ট্যাটাস নির্ধারণ করুন
-        new_status = 'active'
-        if new_current_views >= target_views:
-            new_status = 'completed'
-
-        # ডাটাবেস আপডেট করুন
-        cursor.execute(
-            "UPDATE ads SET current_views = ?, viewed_by_users = ?, status = ? WHERE ad_id = ?",
-            (new_current_views, new_viewed_by_str, new_status, ad_id)
-        )
-
-        # ব্যবহারকারীর ব্যালেন্সে পুরস্কার যোগ করুন
-        update_balance(user_id, reward_amount)
-        record_transaction(user_id, 'ad_reward', reward_amount, details={'ad_id': ad_id})
+        with storage.transaction():
+            if not storage.ads.add_view(ad_id, user_id):
+                return {'success': False, 'message': 'আপনি এই বিজ্ঞাপনটি ইতিমধ্যে দেখেছেন।'}
+
+            # ভিউ সংখ্যা বাড়ান, বাজেট থেকে পুরস্কার কাটুন এবং টার্গেট/বাজেট শেষ হলে স্ট্যাটাস 'completed' করুন
+            completed = storage.ads.increment_views(ad_id, reward_amount)
+            if completed is None:
+                # টিকিট দেওয়ার পর বিজ্ঞাপনটি বন্ধ বা সম্পূর্ণ হয়ে গেছে, অথবা বাজেটে কুলায় না; যোগ করা ভিউ বাতিল করুন
+                raise _AdUnavailable()
+            if completed:
+                increment_stat('active_ads', -1)
+
+            # ব্যবহারকারীর ব্যালেন্সে পুরস্কার যোগ করুন (একই ট্রানজেকশনের অংশ হিসেবে)
+            update_balance(user_id, reward_amount)
+            queue_transaction(user_id, 'ad_reward', reward_amount, details={'ad_id': ad_id})
+            increment_stat('rewards_paid', reward_amount, daily=True)
         
-        conn.commit()
-        return {'success': True, 'message': f'পুরস্কার হিসেবে {reward_amount} পয়েন্ট যোগ করা হয়েছে।'}
-    except sqlite3.Error as e:
+            return {'success': True, 'message': f'পুরস্কার হিসেবে {reward_amount} পয়েন্ট যোগ করা হয়েছে।'}
+    except _AdUnavailable:
+        _close_exhausted_ad(ad_id, reward_amount)
+        return {'success': False, 'message': 'এই বিজ্ঞাপনটি আর সক্রিয় নেই।'}
+    except STORAGE_ERRORS as e:
         print(f"বিজ্ঞাপন ভিউ রেকর্ড করতে ত্রুটি: {e}")
         return {'success': False, 'message': 'ভিউ রেকর্ড করতে একটি সমস্যা হয়েছে।'}
-    finally:
-        if conn:
-            conn.close()
 
-def submit_ad_by_user(user_id, ad_source, ad_type, ad_content, target_views, duration):
+def _close_exhausted_ad(ad_id, reward_amount):
+    """
+    বাকি বাজেটে এই পুরস্কার না হলে (যেমন টিকিট দেওয়ার পর দাম বেড়েছে) বিজ্ঞাপনটি বন্ধ করে,
+    যাতে এটি আর কাউকে দেখানো না হয়। এটি শুধু বিরল ব্যর্থ ভিউয়ের ক্ষেত্রে চলে।
+    """
+    storage = get_storage()
+    try:
+        with storage.transaction():
+            if storage.ads.complete_if_exhausted(ad_id, reward_amount):
+                increment_stat('active_ads', -1)
+    except STORAGE_ERRORS as e:
+        print(f"বাজেট শেষ হওয়া বিজ্ঞাপন বন্ধ করতে ত্রুটি: {e}")
+
+def submit_ad_by_user(user_id, ad_source, ad_type, ad_content, target_views, duration, reward_per_view=None, budget=None):
     """
     ব্যবহারকারীর জমা দেওয়া বিজ্ঞাপন 'pending' স্ট্যাটাসে ডাটাবেসে যোগ করে।
+    `reward_per_view` না দিলে ধরন অনুযায়ী ডিফল্ট পুরস্কার, `budget` না দিলে বাজেটের সীমা থাকে না।
     """
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO ads (owner_user_id, ad_source, ad_type, ad_content, target_views, view_duration_seconds, status)
-            VALUES (?, ?, ?, ?, ?, ?, 'pending')
-            """,
-            (user_id, ad_source, ad_type, ad_content, target_views, duration)
-        )
-        conn.commit()
-        return cursor.lastrowid
-    except sqlite3.Error as e:
+        return get_storage().ads.create(user_id, ad_source, ad_type, ad_content, target_views, duration, status='pending',
+                                        reward_per_view=reward_per_view, budget=budget)
+    except STORAGE_ERRORS as e:
         print(f"ব্যবহারকারীর বিজ্ঞাপন জমা দিতে ত্রুটি: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
 
 def get_pending_ads():
     """এডমিনের পর্যালোচনার জন্য সকল পেন্ডিং বিজ্ঞাপন নিয়ে আসে।"""
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM ads WHERE status = 'pending'")
-        return cursor.fetchall()
-    except sqlite3.Error as e:
+        return get_storage().ads.list_by_status('pending')
+    except STORAGE_ERRORS as e:
         print(f"পেন্ডিং বিজ্ঞাপন খুঁজতে ত্রুটি: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
+
+def count_pending_ads():
+    """পেন্ডিং বিজ্ঞাপনের সংখ্যা (এডমিন মেনুর জন্য; কোনো সারি লোড করা হয় না)।"""
+    try:
+        return get_storage().ads.count_by_status('pending')
+    except STORAGE_ERRORS as e:
+        print(f"পেন্ডিং বিজ্ঞাপন গুনতে ত্রুটি: {e}")
+        return 0
+
+def get_pending_ad(ad_id=0, forward=True):
+    """
+    রিভিউয়ের জন্য একটি পেন্ডিং বিজ্ঞাপন নিয়ে আসে: `ad_id` এর পরেরটি (forward) অথবা আগেরটি।
+    ad_id=0 দিলে প্রথম পেন্ডিং বিজ্ঞাপন। না থাকলে None।
+    """
+    try:
+        return get_storage().ads.get_adjacent('pending', ad_id, forward)
+    except STORAGE_ERRORS as e:
+        print(f"পেন্ডিং বিজ্ঞাপন খুঁজতে ত্রুটি: {e}")
+        return None
 
 def update_ad_status(ad_id, new_status):
     """বিজ্ঞাপনের স্ট্যাটাস পরিবর্তন করে (approved, rejected, paused ইত্যাদি)।"""
+    storage = get_storage()
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        # 'approved' হলে স্ট্যাটাস 'active' করা হয়
-        status_to_set = 'active' if new_status == 'approved' else new_status
-        cursor.execute("UPDATE ads SET status = ? WHERE ad_id = ?", (status_to_set, ad_id))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
+        with storage.transaction():
+            # 'approved' হলে স্ট্যাটাস 'active' করা হয়
+            status_to_set = 'active' if new_status == 'approved' else new_status
+            old_status = storage.ads.get_status(ad_id)
+            storage.ads.set_status(ad_id, status_to_set)
+
+            # সক্রিয় বিজ্ঞাপনের কাউন্টার আপডেট করুন
+            if old_status != status_to_set:
+                if old_status == 'active':
+                    increment_stat('active_ads', -1)
+                elif status_to_set == 'active' and old_status is not None:
+                    increment_stat('active_ads', 1)
+            return True
+    except STORAGE_ERRORS as e:
         print(f"বিজ্ঞাপনের স্ট্যাটাস আপডেট করতে ত্রুটি: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
@@ -0,0 +1,49 @@
+# advanced_earning_bot/modules/ad_pricing.py
+
+from modules import bot_settings
+
+"""
+এই মডিউলটি বিজ্ঞাপন দেখার পুরস্কার (প্রতি ভিউয়ের দাম) নির্ধারণ করে।
+- বিজ্ঞাপনের নিজস্ব `reward_per_view` থাকলে সেটিই পুরস্কার।
+- না থাকলে বিজ্ঞাপনের ধরন অনুযায়ী `ad_reward_<ad_type>` সেটিং (সক্রিয় এবং খালি না থাকলে)।
+- তাও না থাকলে `ad_view_reward`।
+
+ধরন অনুযায়ী দামগুলো আগে থেকে একটি টেবিলে হিসাব করে মেমোরিতে রাখা হয় এবং শুধু
+সেটিংস ভার্সন বদলালে নতুন করে তৈরি হয়, তাই `/get_ad_for_view` এ দাম বের করতে
+শুধু একটি ডিকশনারি লুকআপ লাগে।
+"""
+
+# ধরন অনুযায়ী ডিফল্ট পুরস্কারের সেটিংগুলোর নামের শুরু, যেমন 'ad_reward_video_embed'
+TYPE_REWARD_PREFIX = 'ad_reward_'
+
+# {ad_type: পুরস্কার} এবং কোনো ধরনের জন্য সেটিং না থাকলে সাধারণ পুরস্কার
+_price_table = {}
+_default_reward = 10
+_table_version = None
+
+
+def _refresh_price_table():
+    """সেটিংস ভার্সন বদলে গেলে প্রাইস টেবিল নতুন করে তৈরি করে।"""
+    global _price_table, _default_reward, _table_version
+    version = bot_settings.get_settings_version()
+    if version == _table_version:
+        return
+
+    table = {}
+    for name, setting in bot_settings.get_all_settings().items():
+        if name.startswith(TYPE_REWARD_PREFIX) and setting['is_active'] and setting['value'].isdigit():
+            table[name[len(TYPE_REWARD_PREFIX):]] = int(setting['value'])
+    _price_table = table
+    _default_reward = bot_settings.get_int_setting('ad_view_reward', 10)
+    _table_version = version
+
+
+def get_reward(ad):
+    """
+    একটি বিজ্ঞাপনের প্রতি ভিউয়ের পুরস্কার রিটার্ন করে।
+    `ad` হলো `ads.find_unviewed_active` এর রিটার্ন করা ডিকশনারি।
+    """
+    if ad.get('reward_per_view') is not None:
+        return ad['reward_per_view']
+    _refresh_price_table()
+    return _price_table.get(ad['ad_type'], _default_reward)
@@ -0,0 +1,125 @@
+# advanced_earning_bot/modules/ad_ticket.py
+
+import hmac
+import time
+import base64
+import hashlib
+import secrets
+import threading
+from config import AD_TICKET_SECRET, AD_TICKET_TTL_SECONDS
+
+"""
+এই মডিউলটি বিজ্ঞাপন দেখার জন্য সার্ভার-স্বাক্ষরিত "টিকিট" তৈরি ও যাচাই করে।
+`/get_ad_for_view` একটি টিকিট দেয় যাতে ব্যবহারকারী, বিজ্ঞাপন, পুরস্কার এবং কখন থেকে
+পুরস্কার নেওয়া যাবে (view_duration_seconds পরে) তা লেখা থাকে।
+`/record_ad_view` শুধু HMAC যাচাই করে এই তথ্য বিশ্বাস করে, তাই ক্লায়েন্ট পুরস্কার বা
+বিজ্ঞাপন বদলাতে পারে না এবং যাচাইয়ের জন্য ডাটাবেস পড়তে হয় না।
+একই টিকিট দ্বিতীয়বার ব্যবহার ঠেকাতে ব্যবহৃত টিকিটগুলোর স্বাক্ষর মেয়াদ শেষ হওয়া পর্যন্ত মেমোরিতে রাখা হয়।
+"""
+
+# স্বাক্ষরের দৈর্ঘ্য (বাইট); ব্যবহৃত টিকিটের তালিকায়ও এটিই রাখা হয়
+SIGNATURE_BYTES = 16
+
+# ব্যবহৃত টিকিটের তালিকা থেকে মেয়াদোত্তীর্ণগুলো কত সেকেন্ড পরপর মুছে ফেলা হবে
+SEEN_SWEEP_INTERVAL = 60
+
+
+class TicketError(Exception):
+    """টিকিট গ্রহণযোগ্য নয়; বার্তাটি সরাসরি ব্যবহারকারীকে দেখানো যায়।"""
+    pass
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _derive_key():
+    """
+    সিক্রেট কী: AD_TICKET_SECRET দেওয়া থাকলে সেটি, না থাকলে BOT_TOKEN থেকে তৈরি
+    (যাতে একাধিক প্রসেস একই কী পায়)। কোনোটিই না থাকলে প্রসেসের জন্য একটি র‍্যান্ডম কী।
+    """
+    if AD_TICKET_SECRET:
+        return AD_TICKET_SECRET.encode()
+    from config import BOT_TOKEN
+    if BOT_TOKEN:
+        return hashlib.sha256(b'ad-view-ticket:' + BOT_TOKEN.encode()).digest()
+    return secrets.token_bytes(32)
+
+
+_key = _derive_key()
+
+# ব্যবহৃত টিকিট: {স্বাক্ষর: মেয়াদ শেষের সময়}
+_seen_tickets = {}
+_seen_lock = threading.Lock()
+_next_sweep = 0.0
+
+
+def _sign(payload):
+    return hmac.new(_key, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+
+def issue_ticket(user_id, ad_id, reward, duration_seconds, now=None):
+    """
+    একটি বিজ্ঞাপন দেখার টিকিট তৈরি করে।
+    টিকিটটি `duration_seconds` পর থেকে `AD_TICKET_TTL_SECONDS` সেকেন্ড পর্যন্ত বৈধ।
+    """
+    now = int(time.time() if now is None else now)
+    not_before = now + int(duration_seconds or 0)
+    expires_at = not_before + AD_TICKET_TTL_SECONDS
+    nonce = secrets.token_hex(4)
+    payload = f"{user_id}:{ad_id}:{reward}:{not_before}:{expires_at}:{nonce}".encode()
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def verify_ticket(ticket, user_id, now=None):
+    """
+    টিকিট যাচাই করে এবং ব্যবহৃত হিসেবে চিহ্নিত করে।
+    রিটার্ন: {'ad_id', 'reward', 'signature'}; গ্রহণযোগ্য না হলে TicketError দেয়।
+    পরবর্তী ধাপ ব্যর্থ হলে `release_ticket(signature)` দিয়ে টিকিটটি আবার ব্যবহারযোগ্য করা যায়।
+    """
+    now = time.time() if now is None else now
+    try:
+        payload_part, signature_part = ticket.split('.', 1)
+        payload = _b64decode(payload_part)
+        signature = _b64decode(signature_part)
+    except (AttributeError, ValueError):
+        raise TicketError('অবৈধ টিকিট।')
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise TicketError('অবৈধ টিকিট।')
+
+    # স্বাক্ষর মিললেও পে-লোডের গঠন ভুল হতে পারে (যেমন সিক্রেট বদলানোর আগের ফরম্যাট); তখনও 500 নয়, TicketError
+    try:
+        ticket_user, ad_id, reward, not_before, expires_at, _ = payload.decode().split(':')
+        ad_id, reward, not_before, expires_at = int(ad_id), int(reward), int(not_before), int(expires_at)
+    except (ValueError, UnicodeDecodeError):
+        raise TicketError('অবৈধ টিকিট।')
+
+    if ticket_user != str(user_id):
+        raise TicketError('এই টিকিটটি আপনার জন্য নয়।')
+    if now < not_before:
+        raise TicketError('বিজ্ঞাপনটি সম্পূর্ণ দেখা হয়নি।')
+    if now > expires_at:
+        raise TicketError('টিকিটের মেয়াদ শেষ হয়ে গেছে। অনুগ্রহ করে আবার বিজ্ঞাপনটি দেখুন।')
+
+    global _next_sweep
+    with _seen_lock:
+        if now >= _next_sweep:
+            for seen_signature in [s for s, expiry in _seen_tickets.items() if expiry < now]:
+                del _seen_tickets[seen_signature]
+            _next_sweep = now + SEEN_SWEEP_INTERVAL
+        if signature in _seen_tickets:
+            raise TicketError('এই বিজ্ঞাপনের পুরস্কার ইতিমধ্যে নেওয়া হয়েছে।')
+        _seen_tickets[signature] = expires_at
+
+    return {'ad_id': ad_id, 'reward': reward, 'signature': signature}
+
+
+def release_ticket(signature):
+    """একটি টিকিটকে আবার ব্যবহারযোগ্য করে (যেমন ডাটাবেস ত্রুটির পর ব্যবহারকারী আবার চেষ্টা করতে পারবে)।"""
+    with _seen_lock:
+        _seen_tickets.pop(signature, None)
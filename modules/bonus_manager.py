@@ -1,11 +1,11 @@
 # advanced_earning_bot/modules/bonus_manager.py
 
-import sqlite3
 from datetime import date, timedelta
-from config import DATABASE_NAME
-from modules.bot_settings import get_setting
-from modules.wallet_manager import record_transaction
+from storage import get_storage, STORAGE_ERRORS
+from modules.bot_settings import get_int_setting
+from modules.wallet_manager import queue_transaction
 from modules.user_manager import update_balance, get_user_by_id
+from modules.stats_manager import increment_stat
 
 """
 এই মডিউলটি সকল প্রকার বোনাস সিস্টেম পরিচালনা করে।
@@ -27,31 +27,23 @@ def claim_daily_bonus(user_id):
             return {'success': False, 'message': 'আপনি আজকের দৈনিক বোনাস ইতিমধ্যে নিয়ে নিয়েছেন।'}
 
     # সেটিংস থেকে বোনাসের পরিমাণ নিন
-    bonus_amount_str, _ = get_setting('daily_bonus_amount')
-    bonus_amount = int(bonus_amount_str) if bonus_amount_str.isdigit() else 10
-
-    # বোনাস প্রদান করুন
-    if update_balance(user_id, bonus_amount):
-        # লেনদেন রেকর্ড করুন
-        record_transaction(user_id, 'bonus', bonus_amount, details={'bonus_type': 'daily'})
-        
-        # ডাটাবেসে শেষ বোনাসের তারিখ আপডেট করুন
-        try:
-            conn = sqlite3.connect(DATABASE_NAME)
-            cursor = conn.cursor()
-            cursor.execute("UPDATE users SET last_daily_bonus = ? WHERE user_id = ?", (today.isoformat(), user_id))
-            conn.commit()
-            return {'success': True, 'message': f'দৈনিক বোনাস হিসেবে আপনি {bonus_amount} পয়েন্ট পেয়েছেন!'}
-        except sqlite3.Error as e:
-            print(f"দৈনিক বোনাসের তারিখ আপডেটে ত্রুটি: {e}")
-            # যদি তারিখ আপডেট ব্যর্থ হয়, বোনাস ফেরত নিন (নিরাপত্তার জন্য)
-            update_balance(user_id, -bonus_amount)
-            return {'success': False, 'message': 'একটি সমস্যা হয়েছে, অনুগ্রহ করে আবার চেষ্টা করুন।'}
-        finally:
-            if conn:
-                conn.close()
-    
-    return {'success': False, 'message': 'বোনাস প্রদান করতে একটি সমস্যা হয়েছে।'}
+    bonus_amount = get_int_setting('daily_bonus_amount', 10)
+
+    # বোনাস প্রদান, লেনদেন রেকর্ড এবং তারিখ আপডেট একটি ট্রানজেকশনে করুন
+    storage = get_storage()
+    try:
+        with storage.transaction():
+            # শর্তসাপেক্ষ আপডেট: একই দিনে দুটি অনুরোধ একসাথে এলেও শুধু একটি সফল হবে
+            if not storage.users.mark_daily_bonus(user_id, today.isoformat()):
+                return {'success': False, 'message': 'আপনি আজকের দৈনিক বোনাস ইতিমধ্যে নিয়ে নিয়েছেন।'}
+
+            update_balance(user_id, bonus_amount)
+            queue_transaction(user_id, 'bonus', bonus_amount, details={'bonus_type': 'daily'})
+            increment_stat('rewards_paid', bonus_amount, daily=True)
+        return {'success': True, 'message': f'দৈনিক বোনাস হিসেবে আপনি {bonus_amount} পয়েন্ট পেয়েছেন!'}
+    except STORAGE_ERRORS as e:
+        print(f"দৈনিক বোনাস প্রদানে ত্রুটি: {e}")
+        return {'success': False, 'message': 'বোনাস প্রদান করতে একটি সমস্যা হয়েছে।'}
 
 
 # সাপ্তাহিক এবং মাসিক বোনাসের জন্য ফাংশনগুলোও একই রকম হবে
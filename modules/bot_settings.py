@@ -1,15 +1,35 @@
 # advanced_earning_bot/modules/bot_settings.py
 
-import sqlite3
 import json
-from config import DATABASE_NAME
+import threading
+from collections import namedtuple
+from storage import get_storage, STORAGE_ERRORS
 
 """
 এই মডিউলটি ডাটাবেসের `bot_config` টেবিল থেকে সকল সেটিংস লোড করা এবং
 সেখানে নতুন সেটিংস যোগ বা আপডেট করার কাজ করে।
 এটি বটের সকল ডাইনামিক নিয়মকানুন পরিচালনা করে।
+
+সকল সেটিংস একবার মেমোরিতে লোড করে রাখা হয়, তাই `get_setting` কখনো স্টোরেজে যায় না
+(প্রথম লোডের আগে ছাড়া) এবং ইভেন্ট লুপ থেকে সরাসরি কল করা যায়।
+`update_setting` ডাটাবেসে লিখে ক্যাশ আপডেট করে এবং `bot_config_version` বাড়ায়;
+অন্য প্রসেসের পরিবর্তন ধরতে `start_settings_refresher` একটি ব্যাকগ্রাউন্ড থ্রেড চালায়, যা
+কিছুক্ষণ পরপর শুধু এই সংখ্যাটি চেক করে এবং বদলে গেলে নতুন স্ন্যাপশট লোড করে বসিয়ে দেয়।
 """
 
+# একটি সেটিং এর মান এবং স্ট্যাটাস। পুরনো কোডের মতো `value, is_active = ...` আনপ্যাক করা যায়।
+Setting = namedtuple('Setting', ['value', 'is_active'])
+
+# অন্য প্রসেস সেটিংস পরিবর্তন করেছে কিনা তা কত সেকেন্ড পরপর চেক করা হবে
+SETTINGS_VERSION_CHECK_INTERVAL = 5
+
+# মেমোরিতে রাখা সেটিংস: {setting_name: Setting}
+_settings_cache = {}
+_cache_version = -1 # -1 মানে ক্যাশ এখনও লোড হয়নি
+
+_refresher_thread = None
+_refresher_stopping = threading.Event()
+
 # ডিফল্ট সেটিংস যা ডাটাবেসে না থাকলে যোগ করা হবে।
 # এডমিন প্যানেল থেকে এই মানগুলো পরিবর্তন করা যাবে।
 DEFAULT_SETTINGS = {
@@ -23,103 +43,160 @@ DEFAULT_SETTINGS = {
     'daily_auto_withdraw_limit': ('5000', True, 'প্রতি ইউজারের দৈনিক স্বয়ংক্রিয় উইথড্র লিমিট'),
     'transfer_fee_percent': ('5', True, 'ব্যালেন্স ট্রান্সফারের জন্য শতকরা ফি'),
     'daily_bonus_amount': ('10', True, 'দৈনিক বোনাসের পরিমাণ'),
+    'ad_view_reward': ('10', True, 'প্রতিটি বিজ্ঞাপন দেখার পুরস্কার'),
+    'ad_reward_video_embed': ('', True, 'ভিডিও বিজ্ঞাপনের ডিফল্ট পুরস্কার (খালি থাকলে ad_view_reward)'),
+    'ad_reward_direct_link_ad': ('', True, 'ডিরেক্ট লিঙ্ক বিজ্ঞাপনের ডিফল্ট পুরস্কার (খালি থাকলে ad_view_reward)'),
     'weekly_bonus_amount': ('100', True, 'সাপ্তাহিক বোনাসের পরিমাণ'),
     'monthly_bonus_amount': ('500', True, 'মাসিক বোনাসের পরিমাণ'),
     'blogger_page_url': ('', True, 'বিজ্ঞাপন দেখানোর জন্য ব্লগার পেজের URL'),
     'required_channels': ('[]', True, 'বাধ্যতামূলক চ্যানেলগুলোর তালিকা (JSON format)'),
-    'welcome_message': ('স্বাগতম!', True, 'নতুন ব্যবহারকারীদের জন্য ওয়েলকাম মেসেজ')
+    'welcome_message': ('স্বাগতম!', True, 'নতুন ব্যবহারকারীদের জন্য ওয়েলকাম মেসেজ'),
+    'api_rate_limit_per_minute': ('60', True, 'মিনি অ্যাপ API-তে প্রতি ব্যবহারকারীর প্রতি মিনিটে অনুরোধের সীমা (নিষ্ক্রিয় করলে সীমা থাকবে না)'),
+    'api_rate_limit_burst': ('10', True, 'একসাথে সর্বোচ্চ কয়টি অনুরোধ অনুমোদিত (burst)')
 }
 
 def initialize_bot_settings():
     """
-    ডাটাবেসে ডিফল্ট সেটিংসগুলো যোগ করে যদি সেগুলো আগে থেকে না থাকে।
+    ডাটাবেসে ডিফল্ট সেটিংসগুলো যোগ করে যদি সেগুলো আগে থেকে না থাকে,
+    তারপর সকল সেটিংস মেমোরিতে লোড করে।
+    """
+    try:
+        get_storage().settings.insert_defaults(DEFAULT_SETTINGS)
+        print("বটের ডিফল্ট সেটিংস সফলভাবে ইনিশিয়ালাইজ হয়েছে।")
+    except STORAGE_ERRORS as e:
+        print(f"ডিফল্ট সেটিংস ইনিশিয়ালাইজ করতে ত্রুটি: {e}")
+    reload_settings()
+
+
+def reload_settings():
     """
+    সকল সেটিংস নতুন করে মেমোরিতে লোড করে।
+    """
+    global _settings_cache, _cache_version
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-
-        for key, value_tuple in DEFAULT_SETTINGS.items():
-            value, is_active, description = value_tuple
-            cursor.execute("SELECT * FROM bot_config WHERE setting_name = ?", (key,))
-            if cursor.fetchone() is None:
-                cursor.execute(
-                    "INSERT INTO bot_config (setting_name, setting_value, is_active, description) VALUES (?, ?, ?, ?)",
-                    (key, value, is_active, description)
-                )
-        conn.commit()
-        print("বটের ডিফল্ট সেটিংস সফলভাবে ইনিশিয়ালাইজ হয়েছে।")
-    except sqlite3.Error as e:
-        print(f"ডিফল্ট সেটিংস ইনিশিয়ালাইজ করতে ত্রুটি: {e}")
+        version, settings = get_storage().settings.load_all()
+        # পুরো ডিকশনারিটি একবারে বদলানো হয়, আর ভার্সন পরে, যাতে ভার্সন দেখে তৈরি ক্যাশগুলো
+        # (যেমন `ad_pricing`) কখনো নতুন ভার্সনের সাথে পুরনো সেটিংস না পায়
+        _settings_cache = {name: Setting(value, bool(is_active)) for name, (value, is_active) in settings.items()}
+        _cache_version = version
+        return True
+    except STORAGE_ERRORS as e:
+        print(f"সেটিংস ক্যাশ লোড করতে ত্রুটি: {e}")
+        return False
+
+
+def _ensure_loaded():
+    """ক্যাশ এখনও লোড না হয়ে থাকলে একবার লোড করে। এরপর আর কখনো স্টোরেজে যায় না।"""
+    if _cache_version < 0:
+        reload_settings()
+
+
+def check_for_updates():
+    """
+    স্টোরেজের সেটিংস ভার্সন চেক করে, অন্য প্রসেস পরিবর্তন করে থাকলে ক্যাশ রিলোড করে।
+    ব্লকিং কল; রিফ্রেশার থ্রেড থেকে চলে। রিলোড হলে True রিটার্ন করে।
+    """
+    try:
+        version = get_storage().settings.get_version()
+    except STORAGE_ERRORS as e:
+        print(f"সেটিংস ভার্সন চেক করতে ত্রুটি: {e}")
+        return False
+    if version == _cache_version:
+        return False
+    return reload_settings()
+
+
+def _refresh_loop(interval):
+    try:
+        while not _refresher_stopping.wait(interval):
+            check_for_updates()
     finally:
-        if conn:
-            conn.close()
+        get_storage().close_connection()
+
+
+def start_settings_refresher(interval=SETTINGS_VERSION_CHECK_INTERVAL):
+    """প্রতি `interval` সেকেন্ডে `check_for_updates` চালানোর ব্যাকগ্রাউন্ড থ্রেড চালু করে।"""
+    global _refresher_thread
+    if _refresher_thread is not None and _refresher_thread.is_alive():
+        return
+    _refresher_stopping.clear()
+    _refresher_thread = threading.Thread(target=_refresh_loop, args=(interval,), name='settings-refresher', daemon=True)
+    _refresher_thread.start()
+
+
+def stop_settings_refresher():
+    """রিফ্রেশার থ্রেড বন্ধ করে।"""
+    global _refresher_thread
+    if _refresher_thread is None:
+        return
+    _refresher_stopping.set()
+    _refresher_thread.join()
+    _refresher_thread = None
 
 
 def get_setting(setting_name):
     """
-    ডাটাবেস থেকে একটি নির্দিষ্ট সেটিং এর মান এবং স্ট্যাটাস নিয়ে আসে।
+    মেমোরি ক্যাশ থেকে একটি নির্দিষ্ট সেটিং এর মান এবং স্ট্যাটাস নিয়ে আসে।
     """
-    try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT setting_value, is_active FROM bot_config WHERE setting_name = ?", (setting_name,))
-        result = cursor.fetchone()
-        if result:
-            return result[0], result[1] # (value, is_active)
+    _ensure_loaded()
+    setting = _settings_cache.get(setting_name)
+    if setting is None:
         return None, False
-    except sqlite3.Error as e:
-        print(f"সেটিং '{setting_name}' লোড করতে ত্রুটি: {e}")
-        return None, False
-    finally:
-        if conn:
-            conn.close()
+    return setting # (value, is_active)
+
+
+def get_int_setting(setting_name, default):
+    """
+    একটি সেটিং এর মান পূর্ণসংখ্যা হিসেবে রিটার্ন করে।
+    মান না থাকলে বা সংখ্যা না হলে `default` রিটার্ন করে।
+    """
+    value, _ = get_setting(setting_name)
+    return int(value) if value and value.isdigit() else default
+
+
+def get_settings_version():
+    """
+    বর্তমান ক্যাশের ভার্সন রিটার্ন করে। সেটিংস থেকে তৈরি অন্য ক্যাশগুলো
+    (যেমন বিজ্ঞাপনের প্রাইস টেবিল) এটি দেখে বোঝে কখন নতুন করে তৈরি করতে হবে।
+    """
+    _ensure_loaded()
+    return _cache_version
 
 
 def get_all_settings():
     """
-    ডাটাবেস থেকে সকল সেটিংস একটি ডিকশনারি হিসেবে নিয়ে আসে।
+    সকল সেটিংস একটি ডিকশনারি হিসেবে নিয়ে আসে।
     """
-    settings = {}
-    try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT setting_name, setting_value, is_active FROM bot_config")
-        all_rows = cursor.fetchall()
-        for row in all_rows:
-            settings[row[0]] = {'value': row[1], 'is_active': bool(row[2])}
-        return settings
-    except sqlite3.Error as e:
-        print(f"সকল সেটিংস লোড করতে ত্রুটি: {e}")
-        return {}
-    finally:
-        if conn:
-            conn.close()
+    _ensure_loaded()
+    return {name: {'value': s.value, 'is_active': s.is_active} for name, s in _settings_cache.items()}
 
 
 def update_setting(setting_name, new_value=None, new_status=None):
     """
-    ডাটাবেসে একটি নির্দিষ্ট সেটিং এর মান বা স্ট্যাটাস আপডেট করে।
+    ডাটাবেসে একটি নির্দিষ্ট সেটিং এর মান বা স্ট্যাটাস আপডেট করে (write-through)।
+    একই কমিটে সেটিংস ভার্সন বাড়ানো হয়, যাতে অন্য প্রসেসগুলো রিলোড করে।
     """
+    global _cache_version
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        
-        if new_value is not None and new_status is not None:
-            cursor.execute("UPDATE bot_config SET setting_value = ?, is_active = ? WHERE setting_name = ?", (new_value, new_status, setting_name))
-        elif new_value is not None:
-            cursor.execute("UPDATE bot_config SET setting_value = ? WHERE setting_name = ?", (new_value, setting_name))
-        elif new_status is not None:
-            cursor.execute("UPDATE bot_config SET is_active = ? WHERE setting_name = ?", (new_status, setting_name))
-        
-        conn.commit()
-        print(f"সেটিং '{setting_name}' সফলভাবে আপডেট হয়েছে।")
-        return True
-    except sqlite3.Error as e:
+        new_version = get_storage().settings.update(setting_name, new_value, new_status)
+    except STORAGE_ERRORS as e:
         print(f"সেটিং '{setting_name}' আপডেট করতে ত্রুটি: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
+
+    # নিজের ক্যাশ সরাসরি আপডেট করুন
+    current = _settings_cache.get(setting_name)
+    if current is not None and new_version == _cache_version + 1:
+        _settings_cache[setting_name] = Setting(
+            new_value if new_value is not None else current.value,
+            bool(new_status) if new_status is not None else current.is_active
+        )
+        _cache_version = new_version
+    else:
+        # অন্য কোনো প্রসেসও এর মধ্যে পরিবর্তন করেছে, তাই পুরোটা রিলোড করুন
+        reload_settings()
+
+    print(f"সেটিং '{setting_name}' সফলভাবে আপডেট হয়েছে।")
+    return True
 
 # ডাটাবেস ইনিশিয়ালাইজেশনের অংশ হিসেবে এই ফাংশনটি কল করা হবে।
 if __name__ == '__main__':
@@ -0,0 +1,233 @@
+# advanced_earning_bot/modules/broadcast_manager.py
+
+import time
+import asyncio
+from datetime import datetime
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import RetryAfter, Forbidden, BadRequest, TimedOut, NetworkError, TelegramError
+
+from config import (
+    BROADCAST_MESSAGES_PER_SECOND, BROADCAST_CONCURRENCY, BROADCAST_BATCH_SIZE,
+    BROADCAST_MAX_RETRIES, BROADCAST_PROGRESS_INTERVAL_SECONDS
+)
+from database import run_db
+from storage import get_storage, STORAGE_ERRORS
+from modules.stats_manager import get_stats
+
+"""
+এই মডিউলটি এডমিনের একটি মেসেজ সকল (ব্যান না হওয়া) ব্যবহারকারীকে পাঠায়।
+
+- ব্যবহারকারীদের আইডি `users` টেবিল থেকে ছোট ছোট পেজে (user_id ক্রমে, keyset) পড়া হয়,
+  তাই লাখ লাখ ব্যবহারকারী থাকলেও মেমোরিতে একটি ব্যাচের বেশি থাকে না।
+- মেসেজগুলো একসাথে (BROADCAST_CONCURRENCY) পাঠানো হয়, কিন্তু সবাই মিলে একটি রেট লিমিটার
+  ভাগ করে নেয় (BROADCAST_MESSAGES_PER_SECOND)। টেলিগ্রাম RetryAfter দিলে সবাই একসাথে থামে।
+  প্রতিটি ব্যবহারকারী একটিই মেসেজ পায়, তাই প্রতি-চ্যাট সীমা এমনিতেই মানা হয়।
+- প্রতিটি ব্যাচ শেষে অগ্রগতি (`last_user_id` এবং গণনা) `broadcasts` টেবিলে সংরক্ষিত হয়;
+  বট রিস্টার্ট হলে `resume_broadcasts` সেখান থেকে আবার শুরু করে।
+  (রিস্টার্টের সময় চলমান ব্যাচের কিছু ব্যবহারকারী মেসেজটি দুইবার পেতে পারেন।)
+- অগ্রগতির মেসেজে পাঠানো/ব্যর্থ/ব্লক সংখ্যা এবং গতি কিছুক্ষণ পরপর আপডেট হয়।
+"""
+
+# চলমান ব্রডকাস্ট টাস্ক: {broadcast_id: asyncio.Task}
+_running_tasks = {}
+
+# যেসব চলমান ব্রডকাস্ট বাতিলের অনুরোধ এসেছে
+_cancel_requests = set()
+
+
+class _SendRateLimiter:
+    """সব সেন্ডারের জন্য একটি সাধারণ রেট লিমিটার: প্রতিটি মেসেজ নির্দিষ্ট বিরতিতে শুরু হয়।"""
+
+    def __init__(self, per_second):
+        self.interval = 1 / per_second
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds):
+        """টেলিগ্রামের ফ্লাড লিমিট (RetryAfter): পরের সব মেসেজ `seconds` পর্যন্ত পিছিয়ে দেয়।"""
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+def create_broadcast(admin_id, from_chat_id, message_id, status_chat_id, status_message_id):
+    """নতুন ব্রডকাস্ট ডাটাবেসে যোগ করে তার আইডি রিটার্ন করে।"""
+    try:
+        return get_storage().broadcasts.create(admin_id, from_chat_id, message_id,
+                                               status_chat_id, status_message_id, datetime.now())
+    except STORAGE_ERRORS as e:
+        print(f"ব্রডকাস্ট তৈরি করতে ত্রুটি: {e}")
+        return None
+
+
+def cancel_broadcast(broadcast_id):
+    """চলমান ব্রডকাস্ট বাতিল করে। পরের মেসেজ পাঠানোর আগেই এটি থেমে যাবে।"""
+    try:
+        cancelled = get_storage().broadcasts.finish(broadcast_id, 'cancelled', datetime.now())
+    except STORAGE_ERRORS as e:
+        print(f"ব্রডকাস্ট {broadcast_id} বাতিল করতে ত্রুটি: {e}")
+        return False
+    _cancel_requests.add(broadcast_id)
+    return cancelled
+
+
+def _retry_seconds(error):
+    # নতুন PTB সংস্করণে retry_after একটি timedelta
+    retry_after = error.retry_after
+    return retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else retry_after
+
+
+async def _send_one(bot, broadcast, user_id, limiter):
+    """একজন ব্যবহারকারীকে মেসেজটি পাঠায়। রিটার্ন: 'sent', 'blocked' অথবা 'failed'।"""
+    for attempt in range(BROADCAST_MAX_RETRIES + 1):
+        await limiter.wait()
+        try:
+            await bot.copy_message(chat_id=user_id, from_chat_id=broadcast['from_chat_id'],
+                                   message_id=broadcast['message_id'])
+            return 'sent'
+        except RetryAfter as e:
+            limiter.pause(_retry_seconds(e))
+        except Forbidden:
+            # ব্যবহারকারী বট ব্লক করেছেন বা অ্যাকাউন্ট মুছে ফেলেছেন
+            return 'blocked'
+        except BadRequest:
+            # chat not found ইত্যাদি; আবার চেষ্টা করে লাভ নেই
+            return 'failed'
+        except (TimedOut, NetworkError):
+            await asyncio.sleep(2 ** attempt)
+        except TelegramError:
+            return 'failed'
+    return 'failed'
+
+
+def _progress_text(broadcast, counts, processed_total, target, started, processed_this_run, finished_status=None):
+    elapsed = max(time.monotonic() - started, 0.001)
+    rate = processed_this_run / elapsed
+    header = {
+        None: "📣 **ব্রডকাস্ট চলছে...**",
+        'completed': "✅ **ব্রডকাস্ট সম্পন্ন**",
+        'cancelled': "⏹️ **ব্রডকাস্ট বাতিল করা হয়েছে**",
+    }[finished_status]
+    text = (f"{header} (#{broadcast['broadcast_id']})\n\n"
+            f"📬 পাঠানো হয়েছে: `{counts['sent']}`\n"
+            f"🚫 ব্লক করেছে: `{counts['blocked']}`\n"
+            f"❌ ব্যর্থ: `{counts['failed']}`\n"
+            f"📊 অগ্রগতি: `{processed_total}/{target}`\n"
+            f"⚡ গতি: `{rate:.1f}` মেসেজ/সেকেন্ড")
+    if finished_status is None and rate > 0 and target > processed_total:
+        text += f"\n⏳ আনুমানিক বাকি সময়: `{int((target - processed_total) / rate)}` সেকেন্ড"
+    return text
+
+
+async def _show_progress(bot, broadcast, text, running):
+    if not broadcast['status_chat_id']:
+        return
+    keyboard = None
+    if running:
+        keyboard = InlineKeyboardMarkup([[InlineKeyboardButton(
+            "⏹️ বাতিল করুন", callback_data=f"broadcast_cancel_{broadcast['broadcast_id']}")]])
+    try:
+        await bot.edit_message_text(text, chat_id=broadcast['status_chat_id'], message_id=broadcast['status_message_id'],
+                                    reply_markup=keyboard, parse_mode='Markdown')
+    except TelegramError as e:
+        # "message is not modified" বা মুছে ফেলা মেসেজ; ব্রডকাস্ট চলতে থাকবে
+        print(f"ব্রডকাস্টের অগ্রগতি দেখাতে ত্রুটি: {e}")
+
+
+async def run_broadcast(bot, broadcast_id):
+    """
+    একটি ব্রডকাস্ট তার শেষ চেকপয়েন্ট থেকে শেষ পর্যন্ত চালায়।
+    প্রতিটি ব্যাচ একসাথে পাঠানো হয়, তারপর চেকপয়েন্ট সংরক্ষণ করে পরের ব্যাচ পড়া হয়।
+    """
+    storage = get_storage()
+    broadcast = await run_db(storage.broadcasts.get, broadcast_id)
+    if not broadcast or broadcast['status'] != 'running':
+        return
+
+    limiter = _SendRateLimiter(BROADCAST_MESSAGES_PER_SECOND)
+    semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+    counts = {'sent': broadcast['sent_count'], 'failed': broadcast['failed_count'], 'blocked': broadcast['blocked_count']}
+    last_user_id = broadcast['last_user_id']
+
+    # মোট লক্ষ্য আনুমানিক: পরিসংখ্যানের কাউন্টার থেকে, কোনো COUNT(*) ছাড়া
+    stats = await run_db(get_stats)
+    target = max(stats['total_users'] - stats['banned_users'], 0)
+    started = time.monotonic()
+    processed_this_run = 0
+    last_progress = 0.0
+
+    async def send_limited(user_id):
+        async with semaphore:
+            return await _send_one(bot, broadcast, user_id, limiter)
+
+    finished_status = 'completed'
+    try:
+        while True:
+            if broadcast_id in _cancel_requests:
+                _cancel_requests.discard(broadcast_id)
+                finished_status = 'cancelled'
+                break
+            user_ids = await run_db(storage.users.list_unbanned_ids_after, last_user_id, BROADCAST_BATCH_SIZE)
+            if not user_ids:
+                break
+
+            for result in await asyncio.gather(*(send_limited(user_id) for user_id in user_ids)):
+                counts[result] += 1
+            last_user_id = user_ids[-1]
+            processed_this_run += len(user_ids)
+            await run_db(storage.broadcasts.save_progress, broadcast_id, last_user_id,
+                         counts['sent'], counts['failed'], counts['blocked'], datetime.now())
+
+            if time.monotonic() - last_progress >= BROADCAST_PROGRESS_INTERVAL_SECONDS:
+                last_progress = time.monotonic()
+                processed_total = counts['sent'] + counts['failed'] + counts['blocked']
+                await _show_progress(bot, broadcast, _progress_text(
+                    broadcast, counts, processed_total, max(target, processed_total), started, processed_this_run), True)
+
+        if finished_status == 'completed':
+            await run_db(storage.broadcasts.finish, broadcast_id, 'completed', datetime.now())
+        processed_total = counts['sent'] + counts['failed'] + counts['blocked']
+        await _show_progress(bot, broadcast, _progress_text(
+            broadcast, counts, processed_total, max(target, processed_total), started, processed_this_run,
+            finished_status), False)
+        print(f"ব্রডকাস্ট {broadcast_id} শেষ ({finished_status}): {counts}")
+    except STORAGE_ERRORS as e:
+        # স্ট্যাটাস 'running' থাকে, তাই পরের রিস্টার্টে শেষ চেকপয়েন্ট থেকে আবার শুরু হবে
+        print(f"ব্রডকাস্ট {broadcast_id} চালাতে ডাটাবেস ত্রুটি: {e}")
+
+
+def start_broadcast(bot, broadcast_id):
+    """ব্রডকাস্টটি ব্যাকগ্রাউন্ড টাস্ক হিসেবে চালু করে।"""
+    if broadcast_id in _running_tasks:
+        return _running_tasks[broadcast_id]
+    task = asyncio.create_task(run_broadcast(bot, broadcast_id))
+    _running_tasks[broadcast_id] = task
+    task.add_done_callback(lambda _: _running_tasks.pop(broadcast_id, None))
+    return task
+
+
+async def resume_broadcasts(bot):
+    """বট চালুর সময়: আগের 'running' ব্রডকাস্টগুলো তাদের চেকপয়েন্ট থেকে আবার শুরু করে।"""
+    try:
+        running = await run_db(get_storage().broadcasts.list_running)
+    except STORAGE_ERRORS as e:
+        print(f"চলমান ব্রডকাস্ট খুঁজতে ত্রুটি: {e}")
+        return 0
+    for broadcast in running:
+        print(f"ব্রডকাস্ট {broadcast['broadcast_id']} ব্যবহারকারী {broadcast['last_user_id']} এর পর থেকে আবার শুরু হচ্ছে।")
+        start_broadcast(bot, broadcast['broadcast_id'])
+    return len(running)
+
+
+async def stop_broadcasts():
+    """বট বন্ধের সময়: চলমান টাস্কগুলো থামায়। সেগুলোর স্ট্যাটাস 'running' থাকে, তাই পরে আবার শুরু হবে।"""
+    tasks = list(_running_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
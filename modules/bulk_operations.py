@@ -0,0 +1,280 @@
+# advanced_earning_bot/modules/bulk_operations.py
+
+import csv
+import json
+import hashlib
+from datetime import datetime
+from collections import namedtuple
+from config import BULK_CHUNK_SIZE, BULK_MAX_REPORTED_ERRORS
+from storage import get_storage, STORAGE_ERRORS, StorageError
+from modules.stats_manager import increment_stat
+
+"""
+এই মডিউলটি এডমিনের আপলোড করা CSV ফাইল থেকে একসাথে অনেক ব্যবহারকারীর
+ব্যালেন্স পরিবর্তন বা ব্যান/আনব্যান করার কাজ পরিচালনা করে।
+
+ফাইলের ফরম্যাট (প্রথম লাইনে হেডার, `amount` শুধু credit/debit এর জন্য):
+    user_id,action,amount
+    123456789,credit,100
+    987654321,ban,
+
+আপলোড করা ফাইলটি মেমোরিতে না রেখে একটি অস্থায়ী ফাইলে রাখা হয়, আর সেটি টুকরো (chunk) আকারে পড়া হয়:
+- `validate_csv` প্রথমে পুরো ফাইল যাচাই করে (প্রতি টুকরোর জন্য একটি কোয়েরিতে ব্যবহারকারী আছে কিনা দেখা হয়)।
+- `apply_file` ফাইলটি আবার টুকরো করে পড়ে এবং `apply_chunk` দিয়ে প্রতিটি টুকরো একটি ট্রানজেকশনে
+  `executemany` দিয়ে প্রয়োগ করে, ব্যালেন্স পরিবর্তনের লেজার সারিগুলোও একই ট্রানজেকশনে লেখে।
+দুটোই ব্লকিং (পার্সিং সহ), তাই হ্যান্ডলার এগুলো `run_db` দিয়ে চালায়।
+
+ডেবিট শুধু ব্যালেন্স যথেষ্ট থাকলেই হয়: যাচাইয়ের সময় এমন সারিগুলো সতর্কতা হিসেবে দেখানো হয়, আর প্রয়োগের সময়
+ট্রানজেকশনের ভেতরে পড়া ব্যালেন্স দিয়ে আবার হিসাব করে সেগুলো (এবং ইতিমধ্যে মুছে যাওয়া ব্যবহারকারীর সারি)
+বাদ দেওয়া হয়; বাদ যাওয়া সারির কোনো লেজার সারি লেখা হয় না।
+
+প্রতিটি ফাইল তার বিষয়বস্তুর sha256 (`batch_key`) দিয়ে চিহ্নিত হয় এবং প্রতিটি টুকরোর সাথে একই ট্রানজেকশনে
+`bulk_batches` এ চেকপয়েন্ট (শেষ প্রয়োগ করা লাইন) লেখা হয়। তাই মাঝপথে থেমে গেলে আবার চেষ্টা করলে
+আগে প্রয়োগ হওয়া টুকরোগুলো বাদ যায়, আর একই ফাইল দুবার আপলোড করলে কাউকে দুবার ক্রেডিট দেওয়া হয় না।
+"""
+
+# সমর্থিত অ্যাকশন
+BULK_ACTIONS = ('credit', 'debit', 'ban', 'unban')
+
+# যে অ্যাকশনগুলোর জন্য amount লাগে
+BALANCE_ACTIONS = ('credit', 'debit')
+
+# CSV ফাইলের একটি যাচাই করা সারি
+BulkOperation = namedtuple('BulkOperation', ['line', 'user_id', 'action', 'amount'])
+
+
+class BulkFileError(Exception):
+    """পুরো ফাইলটিই পড়া যায় না (যেমন হেডার নেই বা এনকোডিং ভুল)।"""
+    pass
+
+
+def _parse_row(row):
+    """একটি CSV সারি যাচাই করে (user_id, action, amount) রিটার্ন করে; ভুল হলে ValueError দেয়।"""
+    user_id_text = (row.get('user_id') or '').strip()
+    action = (row.get('action') or '').strip().lower()
+    amount_text = (row.get('amount') or '').strip()
+
+    if not user_id_text.isdigit():
+        raise ValueError(f"অবৈধ user_id '{user_id_text}'")
+    if action not in BULK_ACTIONS:
+        raise ValueError(f"অজানা action '{action}'")
+
+    amount = None
+    if action in BALANCE_ACTIONS:
+        if not amount_text.isdigit() or int(amount_text) <= 0:
+            raise ValueError(f"অবৈধ amount '{amount_text}'")
+        amount = int(amount_text)
+    return int(user_id_text), action, amount
+
+
+def _insufficient_balance(op, balance):
+    return f"ব্যবহারকারী {op.user_id} এর ব্যালেন্স ({balance}) {op.amount} পয়েন্ট ডেবিটের জন্য যথেষ্ট নয়"
+
+
+def batch_key_for_file(path):
+    """ফাইলের বিষয়বস্তুর sha256 রিটার্ন করে; একই ফাইল আবার আপলোড হলে একই চেকপয়েন্ট পাওয়া যায়।"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_chunks(path, chunk_size=BULK_CHUNK_SIZE):
+    """
+    CSV ফাইল থেকে টুকরো টুকরো করে (operations, errors) রিটার্ন করে।
+    operations: `BulkOperation` এর তালিকা, errors: (লাইন নম্বর, কারণ) এর তালিকা।
+    হেডার বা এনকোডিং ভুল হলে BulkFileError দেয়।
+    """
+    with open(path, encoding='utf-8-sig', newline='') as text:
+        try:
+            reader = csv.DictReader(text)
+            if not reader.fieldnames or not {'user_id', 'action'} <= {name.strip() for name in reader.fieldnames}:
+                raise BulkFileError("ফাইলের প্রথম লাইনে `user_id,action,amount` হেডার থাকতে হবে।")
+            reader.fieldnames = [name.strip() for name in reader.fieldnames]
+
+            operations, errors = [], []
+            for row in reader:
+                try:
+                    operations.append(BulkOperation(reader.line_num, *_parse_row(row)))
+                except ValueError as e:
+                    errors.append((reader.line_num, str(e)))
+                if len(operations) + len(errors) >= chunk_size:
+                    yield operations, errors
+                    operations, errors = [], []
+            if operations or errors:
+                yield operations, errors
+        except UnicodeDecodeError:
+            raise BulkFileError("ফাইলটি UTF-8 CSV নয়।")
+        except csv.Error as e:
+            raise BulkFileError(f"CSV পড়তে ত্রুটি (লাইন {reader.line_num}): {e}")
+
+
+def validate_csv(path):
+    """
+    পুরো ফাইলটি একবার পড়ে যাচাই করে, কিছুই পরিবর্তন করে না।
+    ফাইলটি আগে আংশিক প্রয়োগ হয়ে থাকলে চেকপয়েন্ট পর্যন্ত সারিগুলো গোনা হয় না (সেগুলো আবার প্রয়োগ হবে না),
+    আর পুরোটা আগেই প্রয়োগ হয়ে থাকলে এটি একটি ত্রুটি।
+    যথেষ্ট ব্যালেন্স নেই এমন ডেবিট (ফাইলের আগের সারিগুলো প্রয়োগের পরের ব্যালেন্স ধরে) ত্রুটি নয়,
+    প্রয়োগের সময় বাদ যাবে; সেগুলো `skipped` এ গোনা হয় এবং `warnings` এ দেখানো হয়।
+    রিটার্ন: {'success', 'rows', 'counts': {action: সংখ্যা}, 'total_credit', 'total_debit',
+             'already_applied': আগের চেষ্টায় প্রয়োগ হওয়া সারি, 'skipped', 'warnings': [প্রথম কয়েকটি সতর্কতা],
+             'error_count', 'errors': [প্রথম কয়েকটি ত্রুটির বার্তা]}
+    """
+    summary = {'success': False, 'rows': 0, 'counts': {action: 0 for action in BULK_ACTIONS},
+               'total_credit': 0, 'total_debit': 0, 'already_applied': 0, 'skipped': 0, 'warnings': [],
+               'error_count': 0, 'errors': []}
+
+    def add_error(line, reason):
+        summary['error_count'] += 1
+        if len(summary['errors']) < BULK_MAX_REPORTED_ERRORS:
+            summary['errors'].append(f"লাইন {line}: {reason}" if line else reason)
+
+    def add_skipped(line, reason):
+        summary['skipped'] += 1
+        if len(summary['warnings']) < BULK_MAX_REPORTED_ERRORS:
+            summary['warnings'].append(f"লাইন {line}: {reason}")
+
+    storage = get_storage()
+    balances = {} # ফাইলে আসা ব্যবহারকারীদের ব্যালেন্স, ফাইলের আগের সারিগুলো প্রয়োগের পর যেমন হবে
+    try:
+        checkpoint = storage.bulk_batches.get(batch_key_for_file(path))
+        last_line = 0
+        if checkpoint:
+            if checkpoint['status'] == 'completed':
+                add_error(None, f"এই ফাইলটি আগেই প্রয়োগ করা হয়েছে ({checkpoint['batch_name']}, "
+                                f"{checkpoint['rows_applied']} টি সারি)।")
+                return summary
+            last_line = checkpoint['last_line']
+            summary['already_applied'] = checkpoint['rows_applied']
+
+        for operations, errors in iter_chunks(path):
+            for line, reason in errors:
+                add_error(line, reason)
+            operations = [op for op in operations if op.line > last_line]
+
+            # এই টুকরোর নতুন ব্যবহারকারীদের ব্যালেন্স একটি কোয়েরিতে আনুন (না থাকলে ব্যবহারকারী নেই)
+            balances.update(storage.users.get_balances({op.user_id for op in operations} - balances.keys()))
+            for op in operations:
+                if op.user_id not in balances:
+                    add_error(op.line, f"ব্যবহারকারী {op.user_id} খুঁজে পাওয়া যায়নি")
+                    continue
+                if op.action == 'debit' and balances[op.user_id] < op.amount:
+                    add_skipped(op.line, _insufficient_balance(op, balances[op.user_id]))
+                    continue
+                summary['rows'] += 1
+                summary['counts'][op.action] += 1
+                if op.action == 'credit':
+                    summary['total_credit'] += op.amount
+                    balances[op.user_id] += op.amount
+                elif op.action == 'debit':
+                    summary['total_debit'] += op.amount
+                    balances[op.user_id] -= op.amount
+    except (BulkFileError, OSError) as e:
+        add_error(None, str(e))
+    except STORAGE_ERRORS as e:
+        print(f"বাল্ক ফাইল যাচাই করতে ত্রুটি: {e}")
+        add_error(None, "ডাটাবেস ত্রুটি")
+
+    summary['success'] = summary['error_count'] == 0 and summary['rows'] > 0
+    return summary
+
+
+def apply_chunk(operations, admin_id, batch_name, batch_key=None):
+    """
+    একটি টুকরোর সব অপারেশন একটি ট্রানজেকশনে প্রয়োগ করে।
+    - ব্যবহারকারীদের ব্যালেন্স ট্রানজেকশনের ভেতরে পড়ে ফাইলের ক্রমে হিসাব করা হয়: যথেষ্ট ব্যালেন্স নেই এমন
+      ডেবিট এবং (যাচাইয়ের পর মুছে যাওয়া) অনুপস্থিত ব্যবহারকারীর সারি বাদ যায়, সেগুলোর কোনো লেজার সারি লেখা হয় না।
+    - ব্যালেন্স পরিবর্তন শর্তযুক্ত `executemany` দিয়ে, লেজার সারিগুলো `executemany` দিয়ে লেখা হয়।
+    - ব্যান/আনব্যানের ফলে `banned_users` কাউন্টারও একই ট্রানজেকশনে আপডেট হয়।
+    - `batch_key` দিলে ব্যাচের চেকপয়েন্টও একই ট্রানজেকশনে এই টুকরোর শেষ লাইনে এগোয়।
+    সফল হলে {'applied': প্রয়োগ করা সারি, 'skipped': [(লাইন, কারণ)]}, ব্যর্থ হলে None রিটার্ন করে
+    (তখন কিছুই পরিবর্তন হয় না)।
+    """
+    now = datetime.now()
+    details_json = json.dumps({'admin_id': admin_id, 'batch': batch_name, 'batch_key': batch_key})
+    storage = get_storage()
+    try:
+        with storage.transaction():
+            # ট্রানজেকশনের ভেতরে পড়া, তাই এই টুকরো প্রয়োগ শেষ না হওয়া পর্যন্ত অন্য কেউ এগুলো বদলাতে পারে না
+            balances = storage.users.get_balances({op.user_id for op in operations})
+            balance_changes, ledger_rows, skipped = [], [], []
+            ban_status = {} # একই ব্যবহারকারীর একাধিক ban/unban থাকলে ফাইলের শেষটিই কার্যকর
+            for op in operations:
+                if op.user_id not in balances:
+                    skipped.append((op.line, f"ব্যবহারকারী {op.user_id} খুঁজে পাওয়া যায়নি"))
+                    continue
+                if op.action in BALANCE_ACTIONS:
+                    amount = op.amount if op.action == 'credit' else -op.amount
+                    if amount < 0 and balances[op.user_id] < op.amount:
+                        skipped.append((op.line, _insufficient_balance(op, balances[op.user_id])))
+                        continue
+                    balances[op.user_id] += amount
+                    balance_changes.append((op.user_id, amount))
+                    ledger_rows.append((op.user_id, f'admin_{op.action}', amount, 'completed', now, details_json))
+                else:
+                    ban_status[op.user_id] = op.action == 'ban'
+            to_ban = [user_id for user_id, status in ban_status.items() if status]
+            to_unban = [user_id for user_id, status in ban_status.items() if not status]
+
+            if balance_changes:
+                matched = storage.users.apply_balance_changes(balance_changes)
+                if matched != len(balance_changes):
+                    # পড়া ব্যালেন্সের সাথে মেলেনি; কোন লেজার সারি সঠিক তা নিশ্চিত নয়, তাই পুরো টুকরোটি বাতিল
+                    raise StorageError(f"{len(balance_changes)} টি ব্যালেন্স পরিবর্তনের মধ্যে {matched} টি প্রয়োগ হয়েছে")
+                storage.transactions.insert_many(ledger_rows)
+            banned = storage.users.set_banned_many(to_ban, True) if to_ban else 0
+            unbanned = storage.users.set_banned_many(to_unban, False) if to_unban else 0
+            if banned != unbanned:
+                increment_stat('banned_users', banned - unbanned)
+            applied = len(operations) - len(skipped)
+            if batch_key:
+                storage.bulk_batches.save_progress(batch_key, batch_name, admin_id, operations[-1].line, applied, now)
+        return {'applied': applied, 'skipped': skipped}
+    except STORAGE_ERRORS as e:
+        print(f"বাল্ক অপারেশন প্রয়োগ করতে ত্রুটি ({batch_name}): {e}")
+        return None
+
+
+def apply_file(path, admin_id, batch_name, progress=None, chunk_size=BULK_CHUNK_SIZE):
+    """
+    যাচাই করা ফাইলটি টুকরো টুকরো করে পড়ে এবং প্রতিটি টুকরো `apply_chunk` দিয়ে প্রয়োগ করে।
+    ফাইলের চেকপয়েন্ট পর্যন্ত সারিগুলো (আগের চেষ্টায় প্রয়োগ হয়ে গেছে) বাদ দেওয়া হয়।
+    পার্সিং এবং প্রয়োগ দুটোই কলারের থ্রেডে হয়, তাই এটি `run_db` দিয়ে চালাতে হবে।
+    `progress` ডিকশনারি দিলে প্রতিটি টুকরোর পর `progress['applied']` আপডেট হয়, যা ইভেন্ট লুপ থেকে
+    পড়ে অগ্রগতির মেসেজ দেখানো যায়।
+    রিটার্ন: {'applied': এবার প্রয়োগ করা সারি, 'skipped': বাদ যাওয়া সারি,
+             'skipped_rows': [প্রথম কয়েকটি বাদ যাওয়া সারির কারণ], 'failed': মাঝপথে থেমে গেছে কিনা}
+    """
+    result = {'applied': 0, 'skipped': 0, 'skipped_rows': [], 'failed': False}
+    storage = get_storage()
+    try:
+        batch_key = batch_key_for_file(path)
+        checkpoint = storage.bulk_batches.get(batch_key)
+        last_line = checkpoint['last_line'] if checkpoint else 0
+
+        for operations, _ in iter_chunks(path, chunk_size):
+            operations = [op for op in operations if op.line > last_line]
+            if not operations:
+                continue
+            chunk_result = apply_chunk(operations, admin_id, batch_name, batch_key)
+            if chunk_result is None:
+                result['failed'] = True
+                break
+            result['applied'] += chunk_result['applied']
+            result['skipped'] += len(chunk_result['skipped'])
+            for line, reason in chunk_result['skipped']:
+                if len(result['skipped_rows']) < BULK_MAX_REPORTED_ERRORS:
+                    result['skipped_rows'].append(f"লাইন {line}: {reason}")
+            if progress is not None:
+                progress['applied'] = result['applied']
+
+        if not result['failed']:
+            storage.bulk_batches.finish(batch_key, datetime.now())
+    except (BulkFileError, OSError) as e:
+        print(f"বাল্ক ফাইল পড়তে ত্রুটি ({batch_name}): {e}")
+        result['failed'] = True
+    except STORAGE_ERRORS as e:
+        print(f"বাল্ক ব্যাচের চেকপয়েন্ট পড়তে/লিখতে ত্রুটি ({batch_name}): {e}")
+        result['failed'] = True
+    return result
@@ -0,0 +1,163 @@
+# advanced_earning_bot/modules/export_manager.py
+
+import io
+import csv
+import json
+import zlib
+from datetime import datetime, timedelta
+from collections import namedtuple
+from config import EXPORT_BATCH_SIZE
+from storage import get_storage, STORAGE_ERRORS
+from storage.base import USER_EXPORT_COLUMNS, TRANSACTION_EXPORT_COLUMNS
+
+"""
+এই মডিউলটি `users` এবং `transactions` টেবিলের সম্পূর্ণ ডাম্প CSV বা JSONL ফরম্যাটে তৈরি করে
+(হিসাব বিভাগ এবং অ্যান্টি-ফ্রড টিমের জন্য), যাতে চলমান বটের ডাটাবেস ফাইল কপি করতে না হয়।
+
+- সারিগুলো স্টোরেজের `iter_export` থেকে ব্যাচ আকারে আসে এবং সাথে সাথে লেখা হয়, তাই
+  টেবিল যত বড়ই হোক মেমোরিতে একবারে শুধু একটি ব্যাচ থাকে।
+- পড়া হয় একটি আলাদা রিড-অনলি সংযোগ থেকে; কোনো রাইট লক নেওয়া হয় না, বট স্বাভাবিকভাবে লিখতে থাকে।
+- `compress=True` হলে আউটপুট gzip করে পাঠানো হয় (এটিও ধাপে ধাপে)।
+
+API রাউট `iter_export` দিয়ে সরাসরি রেসপন্সে স্ট্রিম করে, আর বটের `/export` কমান্ড
+`write_export` দিয়ে একটি অস্থায়ী ফাইলে লিখে ডকুমেন্ট হিসেবে পাঠায়।
+"""
+
+# কোন টেবিল কোন কলামে এক্সপোর্ট হয়
+EXPORT_TABLES = {
+    'transactions': TRANSACTION_EXPORT_COLUMNS,
+    'users': USER_EXPORT_COLUMNS,
+}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson',
+}
+
+# যাচাই করা একটি এক্সপোর্ট অনুরোধ; `filters` এর কী গুলো `transactions.iter_export` এর আর্গুমেন্ট
+ExportRequest = namedtuple('ExportRequest', ['table', 'format', 'compress', 'filters', 'filename', 'media_type'])
+
+
+class ExportError(Exception):
+    """এক্সপোর্টের অনুরোধটি ভুল (যেমন অজানা টেবিল বা অবৈধ তারিখ); বার্তাটি সরাসরি দেখানো যায়।"""
+    pass
+
+
+def _parse_date(text, end=False):
+    """
+    'YYYY-MM-DD' বা 'YYYY-MM-DD HH:MM:SS' কে ডাটাবেসের timestamp স্ট্রিংয়ের ফরম্যাটে রূপান্তর করে।
+    `end=True` এবং শুধু তারিখ দেওয়া থাকলে পরের দিনের শুরু রিটার্ন করে, যাতে পুরো দিনটি অন্তর্ভুক্ত হয়।
+    """
+    text = text.strip()
+    try:
+        value = datetime.fromisoformat(text)
+    except ValueError:
+        raise ExportError(f"অবৈধ তারিখ '{text}' (YYYY-MM-DD ফরম্যাটে দিন)।")
+    if end and len(text) == 10:
+        value += timedelta(days=1)
+    return str(value.replace(tzinfo=None))
+
+
+def build_export(table, fmt='csv', compress=False, trans_type=None, status=None, date_from=None, date_to=None):
+    """
+    এক্সপোর্টের অনুরোধ যাচাই করে একটি `ExportRequest` রিটার্ন করে; ভুল হলে ExportError দেয়।
+    ফিল্টারগুলো (type, status, তারিখের সীমা) শুধু `transactions` এর জন্য প্রযোজ্য।
+    `date_to` এর দিনটিও অন্তর্ভুক্ত থাকে।
+    """
+    if table not in EXPORT_TABLES:
+        raise ExportError(f"অজানা টেবিল '{table}' (সমর্থিত: {', '.join(EXPORT_TABLES)})।")
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"অজানা ফরম্যাট '{fmt}' (সমর্থিত: {', '.join(EXPORT_FORMATS)})।")
+
+    filters = {}
+    if table == 'transactions':
+        filters = {
+            'trans_type': trans_type or None,
+            'status': status or None,
+            'date_from': _parse_date(date_from) if date_from else None,
+            'date_to': _parse_date(date_to, end=True) if date_to else None,
+        }
+        if filters['date_from'] and filters['date_to'] and filters['date_from'] >= filters['date_to']:
+            raise ExportError("শুরুর তারিখ শেষের তারিখের আগে হতে হবে।")
+    elif any((trans_type, status, date_from, date_to)):
+        raise ExportError("ফিল্টার শুধু `transactions` এক্সপোর্টের জন্য প্রযোজ্য।")
+
+    filename = f"{table}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+    media_type = EXPORT_FORMATS[fmt]
+    if compress:
+        filename += '.gz'
+        media_type = 'application/gzip'
+    return ExportRequest(table, fmt, bool(compress), filters, filename, media_type)
+
+
+def _iter_batches(export, batch_size):
+    """স্টোরেজ থেকে সারিগুলোর ব্যাচ (টাপলের তালিকা) নিয়ে আসে।"""
+    storage = get_storage()
+    if export.table == 'transactions':
+        return storage.transactions.iter_export(batch_size, **export.filters)
+    return storage.users.iter_export(batch_size)
+
+
+def _encode(export, batches):
+    """সারির ব্যাচগুলোকে CSV/JSONL বাইটে (এবং প্রয়োজনে gzip করে) রূপান্তর করে yield করে।"""
+    columns = EXPORT_TABLES[export.table]
+    # wbits=31: zlib হেডারের বদলে gzip হেডার ও ফুটার
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if export.compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export.format == 'csv' else None
+
+    def emit(text):
+        data = text.encode('utf-8')
+        return compressor.compress(data) if compressor else data
+
+    if writer:
+        writer.writerow(columns)
+        chunk = emit(buffer.getvalue())
+        if chunk:
+            yield chunk
+
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        if writer:
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                buffer.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+                buffer.write('\n')
+        chunk = emit(buffer.getvalue())
+        if chunk:
+            yield chunk
+
+    if compressor:
+        yield compressor.flush()
+
+
+def iter_export(export, batch_size=EXPORT_BATCH_SIZE):
+    """
+    এক্সপোর্টের ফাইলটি বাইটের টুকরো হিসেবে yield করে (স্ট্রিমিং রেসপন্সের জন্য)।
+    মাঝপথে স্টোরেজ ত্রুটি হলে তা উঠে আসে; জেনারেটর বন্ধ করলে ডাটাবেস সংযোগও বন্ধ হয়।
+    """
+    return _encode(export, _iter_batches(export, batch_size))
+
+
+def write_export(export, fileobj, batch_size=EXPORT_BATCH_SIZE):
+    """
+    এক্সপোর্টটি একটি বাইনারি ফাইলে লেখে এবং কয়টি সারি লেখা হয়েছে তা রিটার্ন করে।
+    স্টোরেজ ত্রুটি হলে None রিটার্ন করে।
+    """
+    row_count = 0
+
+    def counted(batches):
+        nonlocal row_count
+        for rows in batches:
+            row_count += len(rows)
+            yield rows
+
+    try:
+        for chunk in _encode(export, counted(_iter_batches(export, batch_size))):
+            fileobj.write(chunk)
+        return row_count
+    except STORAGE_ERRORS as e:
+        print(f"{export.table} এক্সপোর্ট করতে ত্রুটি: {e}")
+        return None
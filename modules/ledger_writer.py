@@ -0,0 +1,190 @@
+# advanced_earning_bot/modules/ledger_writer.py
+
+import queue
+import threading
+import time
+from config import LEDGER_FLUSH_INTERVAL_MS, LEDGER_BATCH_SIZE, LEDGER_SHUTDOWN_WRITE_ATTEMPTS, LEDGER_MAX_BATCH_ATTEMPTS
+from storage import get_storage, STORAGE_ERRORS
+
+"""
+এই মডিউলটি `transactions` টেবিলের জন্য একটি রাইট-বিহাইন্ড লেজার রাইটার দেয়।
+সারিগুলো মেমোরির একটি কিউতে জমা হয় এবং একটি ব্যাকগ্রাউন্ড থ্রেড সেগুলোকে
+একটি মাল্টি-রো ট্রানজেকশনে লিখে দেয় (group commit), ফলে প্রতিটি সারির জন্য আলাদা fsync লাগে না।
+কোনো ব্যাচ বারবার লিখতে ব্যর্থ হলে সারিগুলো একটি একটি করে লেখা হয় এবং যে সারি তবুও লেখা যায় না
+সেটি লগে প্রিন্ট করে বাদ দেওয়া হয় (dead-letter), যাতে একটি খারাপ সারির জন্য পরের সব সারি আটকে না থাকে।
+যেসব কলারের সাথে সাথে `transaction_id` প্রয়োজন, তারা `wallet_manager.record_transaction` ব্যবহার করবে।
+"""
+
+class LedgerWriter:
+
+    def __init__(self, flush_interval_ms=LEDGER_FLUSH_INTERVAL_MS, batch_size=LEDGER_BATCH_SIZE,
+                 max_batch_attempts=LEDGER_MAX_BATCH_ATTEMPTS):
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_batch_attempts = max_batch_attempts
+        self._queue = queue.Queue()
+        self._thread = None
+        self._stopping = threading.Event()
+        # লেখা ব্যর্থ হলে সারিগুলো এখানে থাকে এবং পরের বার আবার চেষ্টা করা হয়
+        self._retry_rows = []
+        # `_retry_rows` এর ব্যাচটি পরপর কতবার লেখা যায়নি
+        self._failed_attempts = 0
+        self.rows_written = 0
+        self.batches_written = 0
+        self.rows_dead_lettered = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """ব্যাকগ্রাউন্ড ফ্লাশ থ্রেড চালু করে।"""
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='ledger-writer', daemon=True)
+        self._thread.start()
+        print("লেজার রাইটার চালু হয়েছে।")
+
+    def enqueue(self, row):
+        """
+        একটি লেনদেনের সারি কিউতে যোগ করে।
+        row: (user_id, type, amount, status, timestamp, details_json)
+        """
+        self._queue.put(row)
+
+    def stop(self):
+        """কিউতে থাকা সব সারি ডাটাবেসে লিখে থ্রেডটি বন্ধ করে।"""
+        if not self.running:
+            # থ্রেড না চললেও কিউতে কিছু থাকলে লিখে দিন
+            self._drain_and_write(attempts=LEDGER_SHUTDOWN_WRITE_ATTEMPTS)
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        print(f"লেজার রাইটার বন্ধ হয়েছে। মোট {self.rows_written}টি সারি, {self.batches_written}টি ব্যাচে লেখা হয়েছে।")
+
+    def _collect_batch(self):
+        """প্রথম সারির জন্য অপেক্ষা করে, তারপর সময়সীমা বা ব্যাচের আকার পূর্ণ হওয়া পর্যন্ত সারি জমা করে।"""
+        batch = self._retry_rows
+        self._retry_rows = []
+        if not batch:
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                return batch
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """একটি ব্যাচ একটি ট্রানজেকশনে (একবার কমিট) লেখে।"""
+        try:
+            get_storage().transactions.insert_many(batch)
+            self.rows_written += len(batch)
+            self.batches_written += 1
+            return True
+        except STORAGE_ERRORS as e:
+            print(f"লেজার ব্যাচ ({len(batch)}টি সারি) লিখতে ত্রুটি: {e}")
+            self._retry_rows = batch
+            return False
+
+    def _dead_letter(self, rows):
+        """লেখা যায়নি এমন সারিগুলো হাতে যোগ করার জন্য একটি একটি করে লগে প্রিন্ট করে।"""
+        for row in rows:
+            print(f"!!! অলিখিত লেজার সারি: {row!r}")
+        self.rows_dead_lettered += len(rows)
+
+    def _write_rows_individually(self, batch):
+        """
+        বারবার ব্যর্থ হওয়া ব্যাচের সারিগুলো একটি একটি করে লেখে। যে সারিগুলো একা লিখতেও ব্যর্থ হয়
+        সেগুলো আর আবার চেষ্টা করা হয় না, লগে প্রিন্ট করে বাদ দেওয়া হয়। লেখা সারির সংখ্যা রিটার্ন করে।
+        """
+        failed = []
+        for row in batch:
+            try:
+                get_storage().transactions.insert_many([row])
+                self.rows_written += 1
+            except STORAGE_ERRORS as e:
+                print(f"লেজার সারি আলাদাভাবে লিখতে ত্রুটি: {e}")
+                failed.append(row)
+        if failed:
+            print(f"!!! গুরুতর: লেজারের {len(failed)}টি সারি {self.max_batch_attempts} বার ব্যাচে এবং একবার আলাদাভাবে "
+                  f"লেখা যায়নি, তাই বাদ দেওয়া হলো। এই লেনদেনগুলো transactions টেবিলে হাতে যোগ করতে হবে "
+                  f"(user_id, type, amount, status, timestamp, details):")
+            self._dead_letter(failed)
+        return len(batch) - len(failed)
+
+    def _drain_and_write(self, attempts=1):
+        """
+        কিউ এবং রিট্রাই তালিকার সব সারি লিখে দেয়। লেখা ব্যর্থ হলে মোট `attempts` বার পর্যন্ত
+        (প্রতিবার দ্বিগুণ বিরতিতে) চেষ্টা করে। শেষ পর্যন্ত ব্যর্থ হলে সারিগুলো `_retry_rows` এ থেকে যায়
+        এবং হাতে যোগ করার জন্য প্রতিটি সারি লগে প্রিন্ট হয়, কারণ এরপর প্রসেস বন্ধ হলে সেগুলো হারিয়ে যাবে।
+        """
+        batch, self._retry_rows = self._retry_rows, []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return True
+
+        delay = self.flush_interval
+        for attempt in range(1, attempts + 1):
+            # ব্যর্থ হলে `_write` ব্যাচটি `_retry_rows` এ রাখে; আবার চেষ্টার আগে সরিয়ে নিন, যাতে দুইবার লেখা না হয়
+            self._retry_rows = []
+            if self._write(batch):
+                return True
+            if attempt < attempts:
+                time.sleep(delay)
+                delay *= 2
+
+        print(f"!!! গুরুতর: {attempts} বার চেষ্টার পরও লেজারের {len(batch)}টি সারি ডাটাবেসে লেখা যায়নি। "
+              f"এই লেনদেনগুলো transactions টেবিলে হাতে যোগ করতে হবে "
+              f"(user_id, type, amount, status, timestamp, details):")
+        self._dead_letter(batch)
+        return False
+
+    def _run(self):
+        try:
+            while not self._stopping.is_set():
+                batch = self._collect_batch()
+                if not batch:
+                    continue
+                if self._write(batch):
+                    self._failed_attempts = 0
+                    continue
+                self._failed_attempts += 1
+                if self._failed_attempts >= self.max_batch_attempts:
+                    # সম্ভবত একটি খারাপ সারি পুরো ব্যাচ আটকে রাখছে; আলাদাভাবে লিখে সেটিকে বাদ দিন
+                    self._retry_rows = []
+                    self._failed_attempts = 0
+                    self._write_rows_individually(batch)
+                else:
+                    # ডাটাবেস ব্যস্ত থাকলে একটু অপেক্ষা করে আবার চেষ্টা করুন
+                    time.sleep(self.flush_interval)
+            # বন্ধের আগে বাকি সব কিছু লিখে দিন; এটিই শেষ সুযোগ, তাই ব্যর্থ হলে কয়েকবার চেষ্টা করুন
+            self._drain_and_write(attempts=LEDGER_SHUTDOWN_WRITE_ATTEMPTS)
+        finally:
+            get_storage().close_connection()
+
+
+# পুরো প্রোগ্রামে একটিই লেজার রাইটার ব্যবহৃত হয়
+ledger_writer = LedgerWriter()
+
+
+def start_ledger_writer():
+    ledger_writer.start()
+
+
+def stop_ledger_writer():
+    ledger_writer.stop()
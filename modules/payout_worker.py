@@ -0,0 +1,325 @@
+# advanced_earning_bot/modules/payout_worker.py
+
+import json
+import time
+import asyncio
+from datetime import datetime
+from collections import namedtuple
+
+from config import (
+    PAYOUT_GATEWAY, PAYOUT_GATEWAY_URL, PAYOUT_CURRENCY, PAYOUT_BATCH_SIZE,
+    PAYOUT_MAX_RETRIES, PAYOUT_RETRY_BASE_DELAY_SECONDS, PAYOUT_POLL_INTERVAL_SECONDS
+)
+from database import run_db
+from metrics import Counter, Histogram
+from storage import get_storage, STORAGE_ERRORS
+from modules.bot_settings import get_setting, get_int_setting
+from modules.stats_manager import increment_stat
+from payment_gateways.base_gateway import GatewayError
+
+"""
+এই মডিউলটি পেন্ডিং উইথড্রগুলো পেমেন্ট গেটওয়ে দিয়ে স্বয়ংক্রিয়ভাবে পরিশোধ করে।
+
+প্রতিটি চক্রে:
+1. `withdrawal_mode` সেটিং 'automatic' হলে সবচেয়ে পুরনো PAYOUT_BATCH_SIZE টি পেন্ডিং উইথড্র
+   (পরিমাণ অন্তত `min_auto_withdraw_amount`) একটি ট্রানজেকশনে 'processing' করে দাবি করা হয়।
+   এর চেয়ে ছোট উইথড্রগুলো এডমিনের হাতে পরিশোধের জন্য 'pending' থাকে।
+2. গেটওয়ে কলগুলো (async, ইভেন্ট লুপেই) একসাথে চলে; গেটওয়ে নিজেই তার `max_concurrency` সীমা
+   এবং টাইমআউট মেনে চলে। প্রতিটি পে-আউটের idempotency key লেনদেনের আইডি থেকে তৈরি হয়, তাই
+   সাময়িক ত্রুটির পর আবার চেষ্টা করলে বা রিস্টার্টের পর একই উইথড্র আবার পাঠালেও গেটওয়ে
+   দ্বিতীয়বার টাকা পাঠায় না।
+3. সব ফলাফল একটি ট্রানজেকশনে লেখা হয়:
+   - সফল: স্ট্যাটাস 'completed', details এ গেটওয়ের পে-আউট আইডি।
+   - গেটওয়ে গ্রহণ করেছে কিন্তু এখনও প্রসেস করছে: 'processing' থাকে, details এ পে-আউট আইডি।
+   - গেটওয়ে প্রত্যাখ্যান করলে: স্ট্যাটাস 'failed' এবং হোল্ড করা টাকা ফেরত দেওয়া হয়
+     (ব্যালেন্সে যোগ এবং একটি 'withdrawal_refund' লেজার সারি, যাতে রিকনসিলিয়েশন মেলে)।
+   - সব চেষ্টার পরও সাময়িক ত্রুটি থাকলে: আবার 'pending', পরের চক্রে চেষ্টা হবে।
+4. প্রতিটি চক্রে (মোড 'automatic' না থাকলেও) গেটওয়েতে চলমান পে-আউটগুলোর স্ট্যাটাস
+   `check_payout_statuses` দিয়ে বাল্কে চেক করে চূড়ান্তগুলো 'completed'/'failed' করা হয়।
+
+ওয়ার্কারটি একটি প্রসেসেই চলে ধরে নেওয়া হয়েছে; চালুর সময় আগের রানের যে 'processing' উইথড্রগুলোর
+পে-আউট আইডি নেই সেগুলো আবার 'pending' করা হয় (idempotency key এর কারণে এতে দ্বিগুণ পে-আউট হয় না)।
+"""
+
+payouts_total = Counter(
+    'payouts_total', 'গেটওয়েতে পাঠানো পে-আউটের ফলাফল', ('gateway', 'result'))
+payout_gateway_duration = Histogram(
+    'payout_gateway_duration_seconds', 'প্রতিটি create_payout কলের সময়', ('gateway',))
+
+# একটি উইথড্রর গেটওয়ে ফলাফল; status: 'completed', 'processing', 'failed' অথবা 'retry'
+PayoutResult = namedtuple('PayoutResult', ['withdrawal', 'status', 'payout_id', 'message'])
+
+# স্ট্যাটাস পোলিংয়ে ডাটাবেস থেকে একবারে কয়টি চলমান পে-আউট পড়া হবে
+_POLL_PAGE_SIZE = 1000
+
+_worker_task = None
+
+
+def idempotency_key(transaction_id):
+    """একটি উইথড্রর জন্য স্থায়ী idempotency key (সব চেষ্টা এবং রিস্টার্টে একই থাকে)।"""
+    return f"withdrawal-{transaction_id}"
+
+
+def build_gateway(name=PAYOUT_GATEWAY):
+    """
+    কনফিগারেশনের নাম থেকে গেটওয়ে অবজেক্ট তৈরি করে; খালি হলে None।
+    (`cryptomus_api` এখনও একটি প্লেসহোল্ডার যা সবসময় সফল রিটার্ন করে, তাই এটি এখানে যুক্ত করা হয়নি।)
+    """
+    if not name:
+        return None
+    if name == 'mock':
+        from payment_gateways.mock_gateway import MockGateway
+        return MockGateway()
+    if name == 'stub':
+        from payment_gateways.stub_gateway import StubGateway
+        return StubGateway(PAYOUT_GATEWAY_URL)
+    raise ValueError(f"অজানা পেমেন্ট গেটওয়ে '{name}'")
+
+
+def is_auto_mode():
+    """`withdrawal_mode` সেটিং 'automatic' কিনা (মেমোরি ক্যাশ থেকে, ডাটাবেস কল নেই)।"""
+    value, is_active = get_setting('withdrawal_mode')
+    return bool(is_active) and (value or '').strip().lower() == 'automatic'
+
+
+def claim_batch(limit=PAYOUT_BATCH_SIZE):
+    """পেন্ডিং উইথড্রগুলো দাবি করে; `pending_withdrawals` কাউন্টারও একই ট্রানজেকশনে কমে।"""
+    min_amount = get_int_setting('min_auto_withdraw_amount', 500)
+    storage = get_storage()
+    try:
+        with storage.transaction():
+            claimed = storage.transactions.claim_withdrawals(limit, min_amount)
+            if claimed:
+                increment_stat('pending_withdrawals', -len(claimed))
+        return claimed
+    except STORAGE_ERRORS as e:
+        print(f"পেন্ডিং উইথড্র দাবি করতে ত্রুটি: {e}")
+        return []
+
+
+def requeue_interrupted():
+    """আগের রানে অসম্পূর্ণ থাকা ('processing') উইথড্রগুলো আবার 'pending' করে।"""
+    storage = get_storage()
+    try:
+        with storage.transaction():
+            count = storage.transactions.requeue_processing_withdrawals()
+            if count:
+                increment_stat('pending_withdrawals', count)
+        if count:
+            print(f"{count}টি অসম্পূর্ণ উইথড্র আবার পে-আউট কিউতে রাখা হয়েছে।")
+        return count
+    except STORAGE_ERRORS as e:
+        print(f"অসম্পূর্ণ উইথড্র কিউতে ফেরত দিতে ত্রুটি: {e}")
+        return 0
+
+
+def _details(withdrawal):
+    try:
+        return json.loads(withdrawal['details']) if withdrawal['details'] else {}
+    except ValueError:
+        return {}
+
+
+def write_results(results, gateway_name):
+    """
+    একটি ব্যাচের সব ফলাফল একটি ট্রানজেকশনে লেখে।
+    রিটার্ন: {'completed', 'processing', 'failed', 'retry'} সংখ্যা; ডাটাবেস ত্রুটিতে None
+    (তখন উইথড্রগুলো 'processing' থেকে যায় এবং পরের রিস্টার্টে আবার কিউতে আসে)।
+    """
+    now = datetime.now()
+    status_rows, refunds = [], {}
+    for result in results:
+        withdrawal = result.withdrawal
+        transaction_id = withdrawal['transaction_id']
+        details = _details(withdrawal)
+        if result.status in ('completed', 'processing'):
+            details.update(gateway=gateway_name, payout_id=result.payout_id, idempotency_key=idempotency_key(transaction_id))
+            status_rows.append((transaction_id, result.status, json.dumps(details)))
+        elif result.status == 'failed':
+            details.update(gateway=gateway_name, failure_reason=result.message)
+            status_rows.append((transaction_id, 'failed', json.dumps(details)))
+            refunds[transaction_id] = (withdrawal['user_id'], -withdrawal['amount'])
+        else:
+            details['last_error'] = result.message
+            status_rows.append((transaction_id, 'pending', json.dumps(details)))
+
+    storage = get_storage()
+    try:
+        with storage.transaction():
+            finished = storage.transactions.finish_withdrawals(status_rows)
+            # শুধু যেগুলোর স্ট্যাটাস সত্যিই বদলেছে সেগুলোর টাকা ফেরত (দুইবার ফেরত এড়াতে)
+            refunded = [(transaction_id, *refunds[transaction_id]) for transaction_id in finished if transaction_id in refunds]
+            if refunded:
+                storage.users.add_balance_many([(user_id, amount) for _, user_id, amount in refunded])
+                storage.transactions.insert_many([
+                    (user_id, 'withdrawal_refund', amount, 'completed', now, json.dumps({'withdrawal_id': transaction_id}))
+                    for transaction_id, user_id, amount in refunded
+                ])
+            requeued = sum(1 for transaction_id, status, _ in status_rows if status == 'pending' and transaction_id in finished)
+            if requeued:
+                increment_stat('pending_withdrawals', requeued)
+    except STORAGE_ERRORS as e:
+        print(f"পে-আউটের ফলাফল লিখতে ত্রুটি: {e}")
+        return None
+
+    counts = {'completed': 0, 'processing': 0, 'failed': 0, 'retry': 0}
+    for result in results:
+        counts[result.status] += 1
+    return counts
+
+
+async def _pay_one(gateway, withdrawal):
+    """একটি উইথড্র গেটওয়েতে পাঠায়; সাময়িক ত্রুটিতে বিরতি দিয়ে আবার চেষ্টা করে।"""
+    address = _details(withdrawal).get('address')
+    if not address:
+        return PayoutResult(withdrawal, 'failed', None, 'প্রাপকের ঠিকানা নেই')
+
+    key = idempotency_key(withdrawal['transaction_id'])
+    last_error = None
+    for attempt in range(PAYOUT_MAX_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(PAYOUT_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+        started = time.perf_counter()
+        try:
+            response = await gateway.create_payout(-withdrawal['amount'], PAYOUT_CURRENCY, address, idempotency_key=key)
+        except Exception as e:
+            # GatewayError বা অপ্রত্যাশিত ত্রুটি: টাকা গেছে কিনা নিশ্চিত নয়, তাই একই কী দিয়ে আবার চেষ্টা
+            last_error = str(e) if isinstance(e, GatewayError) else f"{type(e).__name__}: {e}"
+            continue
+        finally:
+            payout_gateway_duration.observe(time.perf_counter() - started, gateway.name)
+
+        if response.get('success'):
+            status = 'processing' if response.get('status') == 'pending' else 'completed'
+            return PayoutResult(withdrawal, status, response.get('transaction_id'), None)
+        return PayoutResult(withdrawal, 'failed', None, response.get('message') or 'গেটওয়ে প্রত্যাখ্যান করেছে')
+    return PayoutResult(withdrawal, 'retry', None, last_error)
+
+
+def _record_counts(gateway, counts):
+    for status, count in counts.items():
+        if count:
+            payouts_total.inc(gateway.name, status, amount=count)
+
+
+async def run_payout_batch(gateway, batch_size=PAYOUT_BATCH_SIZE):
+    """
+    একটি ব্যাচ দাবি করে, পরিশোধ করে এবং ফলাফল লেখে।
+    রিটার্ন: {'claimed', 'completed', 'processing', 'failed', 'retry'} (ফলাফল লেখা ব্যর্থ হলে শুধু 'claimed')
+    """
+    claimed = await run_db(claim_batch, batch_size)
+    if not claimed:
+        return {'claimed': 0, 'completed': 0, 'processing': 0, 'failed': 0, 'retry': 0}
+
+    results = await asyncio.gather(*(_pay_one(gateway, withdrawal) for withdrawal in claimed))
+    counts = await run_db(write_results, results, gateway.name)
+    if counts is None:
+        return {'claimed': len(claimed)}
+    _record_counts(gateway, counts)
+    return {'claimed': len(claimed), **counts}
+
+
+async def poll_in_flight(gateway, page_size=_POLL_PAGE_SIZE):
+    """
+    গেটওয়ে গ্রহণ করেছে কিন্তু এখনও চূড়ান্ত হয়নি এমন উইথড্রগুলোর স্ট্যাটাস বাল্কে চেক করে এবং
+    যেগুলো 'completed' বা 'failed' হয়েছে সেগুলোর ফলাফল লেখে (ব্যর্থগুলোর টাকা ফেরত সহ)।
+    রিটার্ন: {'in_flight', 'completed', 'failed'}
+    """
+    totals = {'in_flight': 0, 'completed': 0, 'failed': 0}
+    transactions = get_storage().transactions
+    after_id = 0
+    while True:
+        try:
+            rows = await run_db(transactions.list_processing_withdrawals, after_id, page_size)
+        except STORAGE_ERRORS as e:
+            print(f"চলমান পে-আউটগুলো পড়তে ত্রুটি: {e}")
+            break
+        if not rows:
+            break
+        after_id = rows[-1]['transaction_id']
+
+        # পে-আউট আইডি নেই মানে এই প্রসেসই এখন সেটি পাঠাচ্ছে (বা লেখা ব্যর্থ হয়েছিল); অন্য গেটওয়েরগুলোও বাদ
+        in_flight = {}
+        for withdrawal in rows:
+            details = _details(withdrawal)
+            if details.get('payout_id') and details.get('gateway') == gateway.name:
+                in_flight[details['payout_id']] = withdrawal
+        if not in_flight:
+            continue
+        totals['in_flight'] += len(in_flight)
+
+        try:
+            statuses = await gateway.check_payout_statuses(list(in_flight))
+        except GatewayError as e:
+            print(f"পে-আউটের স্ট্যাটাস চেক করতে ত্রুটি: {e}")
+            break
+        results = [
+            PayoutResult(in_flight[payout_id], status, payout_id,
+                         'গেটওয়েতে পে-আউট ব্যর্থ হয়েছে' if status == 'failed' else None)
+            for payout_id, status in statuses.items()
+            if payout_id in in_flight and status in ('completed', 'failed')
+        ]
+        if not results:
+            continue
+        counts = await run_db(write_results, results, gateway.name)
+        if counts is None:
+            break
+        _record_counts(gateway, counts)
+        totals['completed'] += counts['completed']
+        totals['failed'] += counts['failed']
+    return totals
+
+
+async def _worker_loop(gateway):
+    await run_db(requeue_interrupted)
+    while True:
+        drained = True
+        try:
+            # মোড বদলালেও গেটওয়েতে চলে যাওয়া পে-আউটগুলোর ফলাফল লিখতে হবে
+            polled = await poll_in_flight(gateway)
+            if polled['completed'] or polled['failed']:
+                print(f"চলমান পে-আউটের স্ট্যাটাস: {polled}")
+            if is_auto_mode():
+                counts = await run_payout_batch(gateway)
+                if counts['claimed']:
+                    print(f"পে-আউট ব্যাচ: {counts}")
+                # পুরো ব্যাচ সফলভাবে শেষ হলে আরও বাকি থাকতে পারে, তাই অপেক্ষা না করে পরের ব্যাচ;
+                # সাময়িক ত্রুটি বা লেখায় সমস্যা থাকলে গেটওয়ে/ডাটাবেসকে একটু সময় দেওয়া হয়
+                full_batch = counts['claimed'] == PAYOUT_BATCH_SIZE
+                drained = not (full_batch and 'retry' in counts and counts['retry'] == 0)
+        except Exception as e:
+            print(f"পে-আউট ওয়ার্কারে অপ্রত্যাশিত ত্রুটি: {e}")
+        if drained:
+            await asyncio.sleep(PAYOUT_POLL_INTERVAL_SECONDS)
+
+
+def start_payout_worker():
+    """কনফিগারেশনে গেটওয়ে দেওয়া থাকলে পে-আউট ওয়ার্কার টাস্ক চালু করে।"""
+    global _worker_task
+    if _worker_task is not None:
+        return
+    try:
+        gateway = build_gateway()
+    except ValueError as e:
+        print(f"{e}; পে-আউট ওয়ার্কার চালু হয়নি।")
+        return
+    if gateway is None:
+        return
+    _worker_task = asyncio.create_task(_worker_loop(gateway))
+    print(f"পে-আউট ওয়ার্কার চালু হয়েছে (গেটওয়ে: {gateway.name})।")
+
+
+async def stop_payout_worker():
+    """
+    ওয়ার্কার বন্ধ করে। চলমান ব্যাচের উইথড্রগুলো 'processing' থেকে যায় এবং
+    পরের চালুর সময় আবার কিউতে আসে।
+    """
+    global _worker_task
+    if _worker_task is None:
+        return
+    _worker_task.cancel()
+    try:
+        await _worker_task
+    except asyncio.CancelledError:
+        pass
+    _worker_task = None
@@ -0,0 +1,166 @@
+# advanced_earning_bot/modules/reconciliation.py
+
+import time
+import asyncio
+from datetime import datetime, timedelta
+from telegram.error import TelegramError
+
+from config import (
+    ADMIN_IDS, RECONCILE_DAILY_AT, RECONCILE_RECHECK_ATTEMPTS, RECONCILE_RECHECK_DELAY_SECONDS,
+    RECONCILE_MAX_MISMATCHES, RECONCILE_MAX_REPORTED
+)
+from database import run_db
+from storage import get_storage, STORAGE_ERRORS
+
+"""
+এই মডিউলটি ব্যবহারকারীদের ব্যালেন্স (`users.balance`) লেজারের (`transactions`) সাথে মিলিয়ে দেখে।
+
+নিয়ম: প্রতিটি ব্যবহারকারীর ব্যালেন্স = তার সকল লেজার সারির `amount` এর যোগফল, স্ট্যাটাস যাই হোক।
+তাই কোনো লেনদেন উল্টাতে হলে (যেমন ব্যর্থ উইথড্র ফেরত) পুরনো সারির স্ট্যাটাস বদলালেই হবে না,
+একটি নতুন বিপরীত সারি লিখতে হবে।
+
+প্রতিবার পুরো লেজারে `SUM` না চালিয়ে:
+1. চেকপয়েন্টের (`last_transaction_id`) পরের নতুন সারিগুলোর প্রতি-ব্যবহারকারী যোগফল বের করে
+   `ledger_totals` এর চলমান যোগফলে যোগ করা হয় (পড়া লক ছাড়া, লেখা একটি ছোট ট্রানজেকশনে)।
+   প্রথম রানে পুরো লেজার একবার পড়া হয়, এরপর শুধু নতুন সারি।
+2. `users.balance` এবং চলমান যোগফল একটি স্ক্যানে তুলনা করা হয়।
+3. অমিল পাওয়া ব্যবহারকারীদের পুরো লেজার একই স্ন্যাপশটে আবার যোগ করে যাচাই করা হয়, কয়েক সেকেন্ড
+   পরপর কয়েকবার। চলমান লেনদেন বা লেজার রাইটারের কিউর কারণে হওয়া সাময়িক অমিল এতে বাদ পড়ে।
+   যারা তখনও মেলে না, শুধু তাদের কথা এডমিনদের জানানো হয়।
+"""
+
+# একসাথে একটির বেশি রিকনসিলিয়েশন চলবে না (নির্ধারিত সময় এবং `/reconcile` কমান্ড একসাথে এলে)
+_run_lock = asyncio.Lock()
+
+# প্রতিদিনের নির্ধারিত রানের টাস্ক
+_scheduler_task = None
+
+
+def advance_totals():
+    """
+    চেকপয়েন্টের পরের লেজার সারিগুলো চলমান যোগফলে যোগ করে চেকপয়েন্ট এগিয়ে নেয়।
+    রিটার্ন: {'success', 'from_id', 'to_id', 'users_updated'} অথবা ব্যর্থ হলে {'success': False, 'message'}
+    """
+    reconciliation = get_storage().reconciliation
+    checkpoint = reconciliation.get_state()['last_transaction_id']
+    upto, deltas = reconciliation.collect_deltas(checkpoint)
+    if upto > checkpoint and not reconciliation.apply_deltas(checkpoint, upto, deltas):
+        return {'success': False, 'message': 'অন্য একটি প্রসেস একই সময়ে চেকপয়েন্ট পরিবর্তন করেছে। পরে আবার চেষ্টা করুন।'}
+    return {'success': True, 'from_id': checkpoint, 'to_id': upto, 'users_updated': len(deltas)}
+
+
+async def run_reconciliation():
+    """
+    একটি সম্পূর্ণ রিকনসিলিয়েশন চালায়।
+    রিটার্ন: {'success', 'from_id', 'to_id', 'users_updated', 'mismatches': [(user_id, balance, ledger_total)],
+             'truncated', 'duration'} অথবা ব্যর্থ হলে {'success': False, 'message'}
+    """
+    started = time.monotonic()
+    reconciliation = get_storage().reconciliation
+    async with _run_lock:
+        try:
+            result = await run_db(advance_totals)
+            if not result['success']:
+                return result
+
+            mismatches = await run_db(reconciliation.find_mismatches, RECONCILE_MAX_MISMATCHES)
+            result['truncated'] = len(mismatches) >= RECONCILE_MAX_MISMATCHES
+            for attempt in range(RECONCILE_RECHECK_ATTEMPTS):
+                if not mismatches:
+                    break
+                if attempt:
+                    await asyncio.sleep(RECONCILE_RECHECK_DELAY_SECONDS)
+                mismatches = await run_db(reconciliation.verify_users, [row[0] for row in mismatches])
+
+            await run_db(reconciliation.record_run, datetime.now(), len(mismatches))
+        except STORAGE_ERRORS as e:
+            print(f"ব্যালেন্স রিকনসিলিয়েশনে ত্রুটি: {e}")
+            return {'success': False, 'message': 'ডাটাবেস ত্রুটির কারণে রিকনসিলিয়েশন সম্পন্ন হয়নি।'}
+
+    result['mismatches'] = mismatches
+    result['duration'] = time.monotonic() - started
+    return result
+
+
+def format_report(result):
+    """রিকনসিলিয়েশনের ফলাফল এডমিনদের জন্য মেসেজ আকারে সাজায় (Markdown)।"""
+    if not result['success']:
+        return f"⚖️ **ব্যালেন্স রিকনসিলিয়েশন ব্যর্থ**\n\n{result['message']}"
+
+    mismatches = result['mismatches']
+    if result['to_id'] > result['from_id']:
+        new_rows = f"`#{result['from_id'] + 1}` – `#{result['to_id']}` ({result['users_updated']} জন ব্যবহারকারী)"
+    else:
+        new_rows = "নেই"
+    text = (f"⚖️ **ব্যালেন্স রিকনসিলিয়েশন**\n\n"
+            f"নতুন লেনদেন: {new_rows}\n"
+            f"অমিল: `{len(mismatches)}{'+' if result['truncated'] else ''}` জন\n"
+            f"সময়: `{result['duration']:.1f}` সেকেন্ড\n")
+    if mismatches:
+        text += "\n"
+        for user_id, balance, ledger_total in mismatches[:RECONCILE_MAX_REPORTED]:
+            text += f"`{user_id}`: ব্যালেন্স `{balance}`, লেজার `{ledger_total}` (পার্থক্য `{balance - ledger_total:+}`)\n"
+        if len(mismatches) > RECONCILE_MAX_REPORTED:
+            text += f"...এবং আরও {len(mismatches) - RECONCILE_MAX_REPORTED} জন\n"
+    return text
+
+
+async def notify_admins(bot, text):
+    """সকল এডমিনকে মেসেজটি পাঠায়।"""
+    for admin_id in ADMIN_IDS:
+        try:
+            await bot.send_message(chat_id=admin_id, text=text, parse_mode='Markdown')
+        except TelegramError as e:
+            print(f"এডমিন {admin_id} কে রিকনসিলিয়েশন রিপোর্ট পাঠাতে ত্রুটি: {e}")
+
+
+def _seconds_until(daily_at, now=None):
+    """পরবর্তী 'HH:MM' পর্যন্ত কত সেকেন্ড বাকি।"""
+    hour, minute = (int(part) for part in daily_at.split(':'))
+    now = now or datetime.now()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+async def _scheduler_loop(bot):
+    while True:
+        await asyncio.sleep(_seconds_until(RECONCILE_DAILY_AT))
+        try:
+            result = await run_reconciliation()
+            if result['success']:
+                print(f"ব্যালেন্স রিকনসিলিয়েশন সম্পন্ন: {len(result['mismatches'])} জনের অমিল।")
+            # সব ঠিক থাকলে এডমিনদের বিরক্ত করা হয় না
+            if not result['success'] or result['mismatches']:
+                await notify_admins(bot, format_report(result))
+        except Exception as e:
+            # একটি রান ব্যর্থ হলেও পরের দিনের রান যেন বন্ধ না হয়
+            print(f"নির্ধারিত রিকনসিলিয়েশনে অপ্রত্যাশিত ত্রুটি: {e}")
+
+
+def start_reconciliation_scheduler(bot):
+    """প্রতিদিন `RECONCILE_DAILY_AT` সময়ে রিকনসিলিয়েশন চালানোর টাস্ক চালু করে।"""
+    global _scheduler_task
+    if not RECONCILE_DAILY_AT or _scheduler_task is not None:
+        return
+    try:
+        _seconds_until(RECONCILE_DAILY_AT)
+    except ValueError:
+        print(f"RECONCILE_DAILY_AT '{RECONCILE_DAILY_AT}' সঠিক নয় (HH:MM হতে হবে); নির্ধারিত রিকনসিলিয়েশন বন্ধ থাকবে।")
+        return
+    _scheduler_task = asyncio.create_task(_scheduler_loop(bot))
+    print(f"ব্যালেন্স রিকনসিলিয়েশন প্রতিদিন {RECONCILE_DAILY_AT} এ চলবে।")
+
+
+async def stop_reconciliation_scheduler():
+    """নির্ধারিত রানের টাস্ক বন্ধ করে (চলমান রান থাকলে সেটিও বাতিল হয়; চেকপয়েন্ট অক্ষত থাকে)।"""
+    global _scheduler_task
+    if _scheduler_task is None:
+        return
+    _scheduler_task.cancel()
+    try:
+        await _scheduler_task
+    except asyncio.CancelledError:
+        pass
+    _scheduler_task = None
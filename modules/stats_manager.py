@@ -0,0 +1,60 @@
+# advanced_earning_bot/modules/stats_manager.py
+
+from datetime import date
+from storage import get_storage, STORAGE_ERRORS
+
+"""
+এই মডিউলটি বটের পরিসংখ্যানের কাউন্টারগুলো পরিচালনা করে।
+প্রতিবার COUNT(*) চালানোর বদলে, যেখানে পরিবর্তন হয় সেখানেই (একই ট্রানজেকশনে)
+কাউন্টার বাড়ানো/কমানো হয়, তাই পরিসংখ্যান পড়া O(1)।
+কাউন্টার কখনও ভুল হয়ে গেলে `recompute_stats()` দিয়ে শুরু থেকে আবার হিসাব করা যায়।
+"""
+
+# সার্বিক কাউন্টারগুলো (stat_date = '')
+GLOBAL_STATS = ('total_users', 'verified_users', 'banned_users', 'active_ads', 'pending_withdrawals')
+
+# দৈনিক কাউন্টারগুলো (stat_date = আজকের তারিখ)
+DAILY_STATS = ('rewards_paid',)
+
+# যেসব লেনদেন "পুরস্কার" হিসেবে গণ্য হয়
+REWARD_TRANSACTION_TYPES = ('ad_reward', 'bonus')
+
+
+def increment_stat(stat_name, delta=1, daily=False):
+    """
+    একটি কাউন্টারের মান `delta` পরিমাণ পরিবর্তন করে।
+    চলমান ট্রানজেকশনের ভেতরে কল করা হলে তার অংশ হয়ে যায়।
+    """
+    stat_date = date.today().isoformat() if daily else ''
+    get_storage().stats.increment(stat_name, stat_date, delta)
+
+
+def get_stats():
+    """সকল সার্বিক কাউন্টার এবং আজকের দৈনিক কাউন্টারগুলো একটি ডিকশনারি হিসেবে রিটার্ন করে।"""
+    stats = {name: 0 for name in GLOBAL_STATS}
+    stats.update({f'{name}_today': 0 for name in DAILY_STATS})
+    for stat_name, stat_date, stat_value in get_storage().stats.get_for_dates(('', date.today().isoformat())):
+        key = f'{stat_name}_today' if stat_date else stat_name
+        if key in stats:
+            stats[key] = stat_value
+    return stats
+
+
+def recompute_stats():
+    """
+    সকল কাউন্টার মূল টেবিলগুলো থেকে শুরু থেকে আবার হিসাব করে।
+    এটি পূর্ণ টেবিল স্ক্যান করে, তাই শুধু প্রয়োজনে (যেমন এডমিন কমান্ড থেকে) চালানো উচিত।
+    """
+    try:
+        get_storage().stats.recompute(date.today().isoformat(), REWARD_TRANSACTION_TYPES)
+        print("পরিসংখ্যানের কাউন্টারগুলো নতুন করে হিসাব করা হয়েছে।")
+        return True
+    except STORAGE_ERRORS as e:
+        print(f"পরিসংখ্যান পুনরায় হিসাব করতে ত্রুটি: {e}")
+        return False
+
+
+def initialize_stats():
+    """কাউন্টারগুলো আগে কখনও তৈরি না হয়ে থাকলে (যেমন পুরনো ডাটাবেসে) একবার হিসাব করে।"""
+    if not get_storage().stats.has_global():
+        recompute_stats()
@@ -1,8 +1,9 @@
 # advanced_earning_bot/modules/user_manager.py
 
-import sqlite3
 from datetime import datetime
-from config import DATABASE_NAME, DEFAULT_LANGUAGE
+from config import DEFAULT_LANGUAGE
+from storage import get_storage, STORAGE_ERRORS
+from modules.stats_manager import increment_stat, get_stats
 
 """
 এই মডিউলটি ব্যবহারকারী সংক্রান্ত সকল কাজ পরিচালনা করে।
@@ -14,63 +15,33 @@ def add_or_get_user(user_id, username, referrer_id=None):
     যদি ব্যবহারকারী ডাটাবেসে না থাকে, তাকে যোগ করে।
     সবসময় ব্যবহারকারীর তথ্য রিটার্ন করে।
     """
-    try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-
-        # ব্যবহারকারী আগে থেকেই আছে কিনা চেক করুন
-        cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-        user_data = cursor.fetchone()
+    # বেশিরভাগ ক্ষেত্রে ব্যবহারকারী আগে থেকেই থাকে, তাই রাইট লক না নিয়ে আগে পড়ে দেখুন
+    user_data = get_user_by_id(user_id)
+    if user_data:
+        return user_data
 
-        if user_data is None:
+    storage = get_storage()
+    try:
+        with storage.transaction():
             # নতুন ব্যবহারকারী, ডাটাবেসে যোগ করুন
-            cursor.execute(
-                """
-                INSERT INTO users (user_id, username, language, referrer_id, join_date)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (user_id, username, DEFAULT_LANGUAGE, referrer_id, datetime.now())
-            )
-            conn.commit()
-            print(f"নতুন ব্যবহারকারী যোগ করা হয়েছে: ID {user_id}, Username: {username}")
-            
-            # নতুন করে তথ্য নিয়ে আসুন
-            cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-            user_data = cursor.fetchone()
-
-        # কলামের নাম সহ ডিকশনারি হিসেবে রিটার্ন করুন
-        if user_data:
-            columns = [description[0] for description in cursor.description]
-            return dict(zip(columns, user_data))
-        
-        return None
-
-    except sqlite3.Error as e:
+            # (একই সময়ে অন্য কোনো অনুরোধ যোগ করে ফেললে কিছু যোগ হবে না)
+            if storage.users.create(user_id, username, DEFAULT_LANGUAGE, referrer_id, datetime.now()):
+                increment_stat('total_users')
+                print(f"নতুন ব্যবহারকারী যোগ করা হয়েছে: ID {user_id}, Username: {username}")
+    except STORAGE_ERRORS as e:
         print(f"ব্যবহারকারী যোগ বা খুঁজে বের করতে ত্রুটি: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
+
+    # নতুন করে তথ্য নিয়ে আসুন
+    return get_user_by_id(user_id)
 
 def get_user_by_id(user_id):
     """নির্দিষ্ট আইডি দিয়ে ব্যবহারকারীর তথ্য খুঁজে বের করে।"""
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-        user_data = cursor.fetchone()
-        
-        if user_data:
-            columns = [description[0] for description in cursor.description]
-            return dict(zip(columns, user_data))
-        
-        return None
-    except sqlite3.Error as e:
+        return get_storage().users.get(user_id)
+    except STORAGE_ERRORS as e:
         print(f"ID {user_id} এর ব্যবহারকারী খুঁজতে ত্রুটি: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
 
 def update_balance(user_id, amount_change):
     """
@@ -78,104 +49,63 @@ def update_balance(user_id, amount_change):
     amount_change পজিটিভ হলে যোগ হবে, নেগেটিভ হলে বিয়োগ হবে।
     """
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE users SET balance = balance + ? WHERE user_id = ?", (amount_change, user_id))
-        conn.commit()
+        get_storage().users.add_balance(user_id, amount_change)
         return True
-    except sqlite3.Error as e:
+    except STORAGE_ERRORS as e:
         print(f"ID {user_id} এর ব্যালেন্স আপডেট করতে ত্রুটি: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def set_user_verified(user_id, status=True):
     """ব্যবহারকারীর ভেরিফিকেশন স্ট্যাটাস পরিবর্তন করে।"""
+    storage = get_storage()
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE users SET is_verified = ? WHERE user_id = ?", (status, user_id))
-        conn.commit()
-        return True
-    except sqlite3.Error as e:
+        with storage.transaction():
+            # শুধু স্ট্যাটাস সত্যিই বদলালে কাউন্টার পরিবর্তন করুন
+            if storage.users.set_verified(user_id, status):
+                increment_stat('verified_users', 1 if status else -1)
+            return True
+    except STORAGE_ERRORS as e:
         print(f"ID {user_id} এর ভেরিফিকেশন স্ট্যাটাস পরিবর্তনে ত্রুটি: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def set_ban_status(user_id, status=True):
     """ব্যবহারকারীকে ব্যান বা আনব্যান করে।"""
+    storage = get_storage()
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE users SET is_banned = ? WHERE user_id = ?", (status, user_id))
-        conn.commit()
-        print(f"ব্যবহারকারী ID {user_id} এর ব্যান স্ট্যাটাস '{status}' করা হয়েছে।")
-        return True
-    except sqlite3.Error as e:
+        with storage.transaction():
+            if storage.users.set_banned(user_id, status):
+                increment_stat('banned_users', 1 if status else -1)
+            print(f"ব্যবহারকারী ID {user_id} এর ব্যান স্ট্যাটাস '{status}' করা হয়েছে।")
+            return True
+    except STORAGE_ERRORS as e:
         print(f"ID {user_id} এর ব্যান স্ট্যাটাস পরিবর্তনে ত্রুটি: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def update_warning_count(user_id, increment=1):
-    """ব্যবহারকারীর ওয়ার্নিং সংখ্যা বাড়ায়।"""
+    """ব্যবহারকারীর ওয়ার্নিং সংখ্যা বাড়ায় এবং নতুন সংখ্যা রিটার্ন করে।"""
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE users SET warning_count = warning_count + ? WHERE user_id = ?", (increment, user_id))
-        conn.commit()
-        # নতুন ওয়ার্নিং সংখ্যা রিটার্ন করতে পারি
-        cursor.execute("SELECT warning_count FROM users WHERE user_id = ?", (user_id,))
-        new_count = cursor.fetchone()
-        return new_count[0] if new_count else 0
-    except sqlite3.Error as e:
+        return get_storage().users.add_warnings(user_id, increment)
+    except STORAGE_ERRORS as e:
         print(f"ID {user_id} এর ওয়ার্নিং সংখ্যা আপডেটে ত্রুটি: {e}")
         return -1
-    finally:
-        if conn:
-            conn.close()
 
 
 def update_user_language(user_id, lang_code):
     """ব্যবহারকারীর ভাষা পরিবর্তন করে।"""
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE users SET language = ? WHERE user_id = ?", (lang_code, user_id))
-        conn.commit()
+        get_storage().users.set_language(user_id, lang_code)
         return True
-    except sqlite3.Error as e:
+    except STORAGE_ERRORS as e:
         print(f"ID {user_id} এর ভাষা পরিবর্তনে ত্রুটি: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def get_bot_statistics():
     """
     বটের সার্বিক পরিসংখ্যান নিয়ে আসে।
+    কাউন্টারগুলো আগে থেকেই হিসাব করা থাকে, তাই এটি কোনো টেবিল স্ক্যান করে না।
     """
-    stats = {
-        'total_users': 0,
-        'verified_users': 0,
-        'banned_users': 0
-    }
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        
-        stats['total_users'] = cursor.execute("SELECT COUNT(*) FROM users").fetchone()[0]
-        stats['verified_users'] = cursor.execute("SELECT COUNT(*) FROM users WHERE is_verified = TRUE").fetchone()[0]
-        stats['banned_users'] = cursor.execute("SELECT COUNT(*) FROM users WHERE is_banned = TRUE").fetchone()[0]
-        
-        return {'success': True, 'data': stats}
-    except sqlite3.Error as e:
+        return {'success': True, 'data': get_stats()}
+    except STORAGE_ERRORS as e:
         print(f"পরিসংখ্যান নিয়ে আসতে ত্রুটি: {e}")
         return {'success': False, 'message': str(e)}
-    finally:
-        if conn:
-            conn.close()
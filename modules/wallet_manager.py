@@ -1,11 +1,12 @@
 # advanced_earning_bot/modules/wallet_manager.py
 
-import sqlite3
 import json
 from datetime import datetime
-from config import DATABASE_NAME
-from modules.user_manager import update_balance, get_user_by_id
-from modules.bot_settings import get_setting
+from storage import get_storage, STORAGE_ERRORS
+from modules.user_manager import update_balance
+from modules.bot_settings import get_int_setting
+from modules.ledger_writer import ledger_writer
+from modules.stats_manager import increment_stat
 
 """
 এই মডিউলটি ওয়ালেট এবং আর্থিক লেনদেন সংক্রান্ত সকল কাজ পরিচালনা করে।
@@ -16,132 +17,154 @@ def record_transaction(user_id, trans_type, amount, status='completed', details=
     """
     `transactions` টেবিলে একটি নতুন লেনদেন রেকর্ড করে।
     """
+    # details যদি ডিকশনারি হয়, তাকে JSON স্ট্রিং-এ রূপান্তর করুন
+    details_json = json.dumps(details) if details else None
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        
-        # details যদি ডিকশনারি হয়, তাকে JSON স্ট্রিং-এ রূপান্তর করুন
-        details_json = json.dumps(details) if details else None
-        
-        cursor.execute(
-            """
-            INSERT INTO transactions (user_id, type, amount, status, timestamp, details)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (user_id, trans_type, amount, status, datetime.now(), details_json)
-        )
-        conn.commit()
-        return cursor.lastrowid # নতুন ট্রানজেকশন আইডি রিটার্ন করে
-    except sqlite3.Error as e:
+        # নতুন ট্রানজেকশন আইডি রিটার্ন করে
+        return get_storage().transactions.insert(user_id, trans_type, amount, status, datetime.now(), details_json)
+    except STORAGE_ERRORS as e:
         print(f"লেনদেন রেকর্ড করতে ত্রুটি: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
+
+def queue_transaction(user_id, trans_type, amount, status='completed', details=None):
+    """
+    যেসব লেনদেনের `transaction_id` সাথে সাথে প্রয়োজন নেই (যেমন বিজ্ঞাপনের পুরস্কার, বোনাস),
+    সেগুলো রেকর্ড করার জন্য।
+    লেজার রাইটার চালু থাকলে বর্তমান ট্রানজেকশন কমিট হওয়ার পর সারিটি কিউতে যায় এবং
+    ব্যাচে লেখা হয়; রোলব্যাক হলে সারিটি বাদ যায়। রাইটার বন্ধ থাকলে সাথে সাথেই লেখা হয়।
+    """
+    if not ledger_writer.running:
+        return record_transaction(user_id, trans_type, amount, status=status, details=details) is not None
+
+    details_json = json.dumps(details) if details else None
+    row = (user_id, trans_type, amount, status, datetime.now(), details_json)
+    get_storage().on_commit(lambda: ledger_writer.enqueue(row))
+    return True
 
 def transfer_balance(sender_id, receiver_id, amount):
     """
     একজন ব্যবহারকারী থেকে অন্য ব্যবহারকারীকে ব্যালেন্স ট্রান্সফার করে।
+    পুরো কাজটি একটি ট্রানজেকশনে হয়: প্রেরকের ব্যালেন্স শর্তযুক্ত আপডেটে (`balance >= মোট`) কাটা হয়,
+    তারপর প্রাপকের ব্যালেন্স এবং দুটি লেজার সারি লেখা হয়। আগে পড়ে পরে কাটা হয় না,
+    তাই একসাথে অনেক ট্রান্সফার এলেও প্রেরকের ব্যালেন্স নেগেটিভ হতে পারে না।
     """
     if sender_id == receiver_id:
         return {'success': False, 'message': 'আপনি নিজেকে পয়েন্ট পাঠাতে পারবেন না।'}
+    if amount <= 0:
+        return {'success': False, 'message': 'ট্রান্সফারের পরিমাণ শূন্যের বেশি হতে হবে।'}
 
     # ট্রান্সফার ফি কত শতাংশ তা সেটিংস থেকে নিন
-    fee_percent_str, _ = get_setting('transfer_fee_percent')
-    fee_percent = int(fee_percent_str) if fee_percent_str.isdigit() else 5
+    fee_percent = get_int_setting('transfer_fee_percent', 5)
 
     fee = (amount * fee_percent) // 100
     total_deduction = amount + fee
 
-    sender = get_user_by_id(sender_id)
-    receiver = get_user_by_id(receiver_id)
-
-    if not sender:
-        return {'success': False, 'message': 'প্রেরকের অ্যাকাউন্ট খুঁজে পাওয়া যায়নি।'}
-    if not receiver:
-        return {'success': False, 'message': 'প্রাপকের অ্যাকাউন্ট খুঁজে পাওয়া যায়নি।'}
-    if sender['balance'] < total_deduction:
-        return {'success': False, 'message': f'আপনার অ্যাকাউন্টে পর্যাপ্ত ব্যালেন্স নেই। মোট প্রয়োজন: {total_deduction} পয়েন্ট।'}
-
-    # লেনদেন শুরু করুন
+    storage = get_storage()
     try:
-        # প্রেরকের ব্যালেন্স কমান
-        if not update_balance(sender_id, -total_deduction):
-            raise Exception("প্রেরকের ব্যালেন্স আপডেট ব্যর্থ হয়েছে।")
-
-        # প্রাপকের ব্যালেন্স বাড়ান
-        if not update_balance(receiver_id, amount):
-            # যদি প্রাপকের ব্যালেন্স আপডেট ব্যর্থ হয়, প্রেরকের টাকা ফেরত দিন
-            update_balance(sender_id, total_deduction)
-            raise Exception("প্রাপকের ব্যালেন্স আপডেট ব্যর্থ হয়েছে।")
-
-        # লেনদেন রেকর্ড করুন
-        record_transaction(sender_id, 'transfer_sent', -total_deduction, details={'receiver_id': receiver_id, 'amount': amount, 'fee': fee})
-        record_transaction(receiver_id, 'transfer_received', amount, details={'sender_id': sender_id})
-        
+        with storage.transaction():
+            # রাইট লক নেওয়ার পর পড়া হচ্ছে, তাই কমিট পর্যন্ত প্রাপক মুছে যেতে পারে না
+            if not storage.users.existing_ids((receiver_id,)):
+                return {'success': False, 'message': 'প্রাপকের অ্যাকাউন্ট খুঁজে পাওয়া যায়নি।'}
+            if not storage.users.debit_if_sufficient(sender_id, total_deduction):
+                if storage.users.get(sender_id) is None:
+                    return {'success': False, 'message': 'প্রেরকের অ্যাকাউন্ট খুঁজে পাওয়া যায়নি।'}
+                return {'success': False, 'message': f'আপনার অ্যাকাউন্টে পর্যাপ্ত ব্যালেন্স নেই। মোট প্রয়োজন: {total_deduction} পয়েন্ট।'}
+
+            storage.users.add_balance(receiver_id, amount)
+            now = datetime.now()
+            storage.transactions.insert_many([
+                (sender_id, 'transfer_sent', -total_deduction, 'completed', now,
+                 json.dumps({'receiver_id': receiver_id, 'amount': amount, 'fee': fee})),
+                (receiver_id, 'transfer_received', amount, 'completed', now, json.dumps({'sender_id': sender_id})),
+            ])
+
         return {'success': True, 'message': f'{amount} পয়েন্ট সফলভাবে পাঠানো হয়েছে। ফি: {fee} পয়েন্ট।'}
-    except Exception as e:
+    except STORAGE_ERRORS as e:
         print(f"ট্রান্সফারে ত্রুটি: {e}")
         return {'success': False, 'message': 'লেনদেন প্রক্রিয়া করার সময় একটি সমস্যা হয়েছে।'}
 
+def admin_adjust_balance(user_id, amount_change, admin_id):
+    """
+    এডমিন প্যানেল থেকে একজন ব্যবহারকারীর ব্যালেন্স পরিবর্তন করে, লেজারে
+    'admin_credit'/'admin_debit' সারিসহ একই ট্রানজেকশনে (বাল্ক অপারেশনের মতো),
+    যাতে রিকনসিলিয়েশনে এটি অমিল হিসেবে না আসে।
+    """
+    trans_type = 'admin_credit' if amount_change > 0 else 'admin_debit'
+    try:
+        with get_storage().transaction():
+            update_balance(user_id, amount_change)
+            record_transaction(user_id, trans_type, amount_change, details={'admin_id': admin_id})
+        return True
+    except STORAGE_ERRORS as e:
+        print(f"ID {user_id} এর ব্যালেন্স এডমিন হিসেবে পরিবর্তন করতে ত্রুটি: {e}")
+        return False
+
 def create_withdrawal_request(user_id, amount, method, address):
     """
     একটি উইথড্র অনুরোধ তৈরি করে এবং এটিকে 'pending' স্ট্যাটাসে রাখে।
+    ট্রান্সফারের মতোই ব্যালেন্স শর্তযুক্ত আপডেটে কাটা হয়, তাই একসাথে অনেক অনুরোধে ওভারড্রাফট হয় না।
     """
-    user = get_user_by_id(user_id)
-    if not user:
-        return {'success': False, 'message': 'আপনার অ্যাকাউন্ট খুঁজে পাওয়া যায়নি।'}
-    if user['balance'] < amount:
-        return {'success': False, 'message': 'আপনার অ্যাকাউন্টে পর্যাপ্ত ব্যালেন্স নেই।'}
-
-    # ব্যবহারকারীর ব্যালেন্স থেকে টাকা হোল্ড করুন (কেটে নিন)
-    if not update_balance(user_id, -amount):
-         return {'success': False, 'message': 'ব্যালেন্স আপডেট করতে সমস্যা হয়েছে।'}
+    if amount <= 0:
+        return {'success': False, 'message': 'উইথড্রর পরিমাণ শূন্যের বেশি হতে হবে।'}
 
-    # পেন্ডিং ট্রানজেকশন রেকর্ড করুন
+    # ব্যালেন্স থেকে টাকা হোল্ড করা (কেটে নেওয়া) এবং পেন্ডিং ট্রানজেকশন রেকর্ড একসাথে করুন
     details = {'method': method, 'address': address}
-    trans_id = record_transaction(user_id, 'withdrawal', -amount, status='pending', details=details)
-
-    if trans_id:
+    storage = get_storage()
+    try:
+        with storage.transaction():
+            if not storage.users.debit_if_sufficient(user_id, amount):
+                if storage.users.get(user_id) is None:
+                    return {'success': False, 'message': 'আপনার অ্যাকাউন্ট খুঁজে পাওয়া যায়নি।'}
+                return {'success': False, 'message': 'আপনার অ্যাকাউন্টে পর্যাপ্ত ব্যালেন্স নেই।'}
+            trans_id = record_transaction(user_id, 'withdrawal', -amount, status='pending', details=details)
+            increment_stat('pending_withdrawals')
         return {'success': True, 'message': 'আপনার উইথড্র অনুরোধটি প্রক্রিয়া করা হচ্ছে।', 'transaction_id': trans_id}
-    else:
-        # যদি ট্রানজেকশন রেকর্ড ব্যর্থ হয়, টাকা ফেরত দিন
-        update_balance(user_id, amount)
+    except STORAGE_ERRORS as e:
+        print(f"উইথড্র অনুরোধ তৈরিতে ত্রুটি: {e}")
         return {'success': False, 'message': 'উইথড্র অনুরোধ তৈরি করতে সমস্যা হয়েছে।'}
 
-def process_auto_withdrawal(transaction_id):
-    """
-    স্বয়ংক্রিয় উইথড্র প্রক্রিয়া পরিচালনা করে (ভবিষ্যতের জন্য)।
-    এখানে পেমেন্ট গেটওয়ের API কল করা হবে।
-    """
-    # ধাপ ১: ট্রানজেকশনের তথ্য ডাটাবেস থেকে নিন।
-    # ধাপ ২: পেমেন্ট গেটওয়ের সাথে সংযোগ স্থাপন করুন।
-    # ধাপ ৩: টাকা পাঠান।
-    # ধাপ ৪: সফল হলে, ট্রানজেকশনের স্ট্যাটাস 'completed' করুন।
-    # ধাপ ৫: ব্যর্থ হলে, স্ট্যাটাস 'failed' করুন এবং এডমিনকে নোটিফাই করুন।
-    
-    print(f"ট্রানজেকশন আইডি {transaction_id} স্বয়ংক্রিয়ভাবে প্রক্রিয়া করা হচ্ছে (এখনও ইমপ্লিমেন্ট করা হয়নি)।")
-    # আপাতত, আমরা এটিকে ম্যানুয়ালি সম্পন্ন করব।
-    pass
-
 def get_user_transactions(user_id, limit=20):
     """
     একজন ব্যবহারকারীর সাম্প্রতিক লেনদেনের তালিকা নিয়ে আসে।
     """
     try:
-        conn = sqlite3.connect(DATABASE_NAME)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT type, amount, status, timestamp FROM transactions WHERE user_id = ? ORDER BY timestamp DESC LIMIT ?",
-            (user_id, limit)
-        )
-        return cursor.fetchall()
-    except sqlite3.Error as e:
+        return get_storage().transactions.list_recent(user_id, limit)
+    except STORAGE_ERRORS as e:
         print(f"ID {user_id} এর লেনদেন খুঁজতে ত্রুটি: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
+
+def _encode_cursor(timestamp, transaction_id):
+    """পেজিনেশন কার্সর তৈরি করে (শেষ সারির timestamp এবং transaction_id থেকে)।"""
+    return f"{timestamp}|{transaction_id}"
+
+def _decode_cursor(cursor_str):
+    """কার্সর স্ট্রিং থেকে (timestamp, transaction_id) বের করে। ভুল হলে ValueError দেয়।"""
+    timestamp, transaction_id = cursor_str.rsplit('|', 1)
+    return timestamp, int(transaction_id)
+
+def get_user_transactions_page(user_id, limit=20, cursor=None):
+    """
+    একজন ব্যবহারকারীর লেনদেনের ইতিহাস পেজ আকারে (keyset pagination) নিয়ে আসে।
+    - `cursor` না দিলে সবচেয়ে নতুন লেনদেন থেকে শুরু হয়।
+    - পরের পেজের জন্য রিটার্ন করা `next_cursor` পাঠাতে হবে; শেষ পেজে এটি None।
+    """
+    try:
+        before = _decode_cursor(cursor) if cursor else None
+        # একটি অতিরিক্ত সারি নিয়ে দেখা হয় পরের পেজ আছে কিনা
+        rows = get_storage().transactions.page(user_id, limit + 1, before=before)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor(last['timestamp'], last['transaction_id'])
+
+        return {'success': True, 'transactions': rows, 'next_cursor': next_cursor}
+    except ValueError:
+        return {'success': False, 'message': 'অবৈধ কার্সর।'}
+    except STORAGE_ERRORS as e:
+        print(f"ID {user_id} এর লেনদেন পেজ খুঁজতে ত্রুটি: {e}")
+        return {'success': False, 'message': 'লেনদেনের তালিকা লোড করতে সমস্যা হয়েছে।'}
 
 # উদাহরণ
 if __name__ == '__main__':
@@ -0,0 +1,54 @@
+# advanced_earning_bot/modules/webapp_auth.py
+
+import hmac
+import json
+import time
+import hashlib
+from urllib.parse import parse_qsl
+from config import BOT_TOKEN, WEBAPP_AUTH_MAX_AGE_SECONDS
+
+"""
+এই মডিউলটি টেলিগ্রাম মিনি অ্যাপের `Telegram.WebApp.initData` যাচাই করে।
+টেলিগ্রাম initData তে বটের টোকেন থেকে তৈরি কী দিয়ে একটি HMAC (`hash`) দেয়, তাই সার্ভার
+কোনো ডাটাবেস বা নেটওয়ার্ক কল ছাড়াই নিশ্চিত হতে পারে যে অনুরোধটি সত্যিই ওই ব্যবহারকারীর।
+যেসব রাউট অন্যের ব্যালেন্সে হাত দেয় (যেমন `/transfer_balance`), সেখানে ব্যবহারকারীর আইডি
+বডির `user_id` থেকে নয়, এখান থেকে নিতে হবে।
+(https://core.telegram.org/bots/webapps#validating-data-received-via-the-mini-app)
+"""
+
+
+class WebAppAuthError(Exception):
+    """initData গ্রহণযোগ্য নয়; বার্তাটি সরাসরি দেখানো যায়।"""
+    pass
+
+
+def _secret_key():
+    return hmac.new(b'WebAppData', BOT_TOKEN.encode(), hashlib.sha256).digest()
+
+
+def verify_init_data(init_data, now=None):
+    """
+    initData স্ট্রিং যাচাই করে ব্যবহারকারীর টেলিগ্রাম আইডি (int) রিটার্ন করে।
+    স্বাক্ষর না মিললে, মেয়াদ শেষ হলে বা ব্যবহারকারী না থাকলে WebAppAuthError দেয়।
+    """
+    if not BOT_TOKEN:
+        raise WebAppAuthError('সার্ভারে BOT_TOKEN সেট করা নেই।')
+    if not isinstance(init_data, str) or not init_data:
+        raise WebAppAuthError('initData প্রয়োজন।')
+
+    fields = dict(parse_qsl(init_data, keep_blank_values=True))
+    received_hash = fields.pop('hash', '')
+    data_check_string = '\n'.join(f"{key}={value}" for key, value in sorted(fields.items()))
+    expected_hash = hmac.new(_secret_key(), data_check_string.encode(), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(received_hash.encode(), expected_hash.encode()):
+        raise WebAppAuthError('অবৈধ initData।')
+
+    now = time.time() if now is None else now
+    try:
+        auth_date = int(fields.get('auth_date', ''))
+        user_id = int(json.loads(fields['user'])['id'])
+    except (KeyError, TypeError, ValueError):
+        raise WebAppAuthError('অবৈধ initData।')
+    if now - auth_date > WEBAPP_AUTH_MAX_AGE_SECONDS:
+        raise WebAppAuthError('সেশনের মেয়াদ শেষ হয়ে গেছে। অনুগ্রহ করে মিনি অ্যাপটি আবার খুলুন।')
+    return user_id
@@ -1,50 +1,110 @@
 # advanced_earning_bot/payment_gateways/base_gateway.py
 
+import asyncio
 from abc import ABC, abstractmethod
+from config import PAYOUT_CONCURRENCY, PAYOUT_HTTP_TIMEOUT_SECONDS
 
 """
 এটি সকল পেমেন্ট গেটওয়ের জন্য একটি অ্যাবস্ট্রাক্ট বেস ক্লাস (টেমপ্লেট)।
 ভবিষ্যতে নতুন পেমেন্ট গেটওয়ে যোগ করতে হলে এই ক্লাসটিকে ইনহেরিট করতে হবে।
+
+সব মেথড async এবং বটের ইভেন্ট লুপেই চলে, তাই কোনো মেথডে ব্লকিং কল (যেমন `requests`,
+`time.sleep`) করা যাবে না। HTTP API এর জন্য `http_gateway.HttpGateway` ইনহেরিট করুন; এটি শেয়ার করা
+keep-alive সংযোগ পুল, এই গেটওয়ের একসাথে চলা রিকোয়েস্টের সীমা (`max_concurrency`) এবং `timeout` মেনে চলে।
 """
 
+class GatewayError(Exception):
+    """
+    সাময়িক ত্রুটি (নেটওয়ার্ক, টাইমআউট, গেটওয়ের 5xx)। পে-আউট হয়েছে কিনা নিশ্চিত নয়, তাই
+    একই idempotency key দিয়ে আবার চেষ্টা করা হবে। স্থায়ী প্রত্যাখ্যানের জন্য এটি না দিয়ে
+    {'success': False, 'message': ...} রিটার্ন করতে হবে।
+    """
+    pass
+
+
 class BaseGateway(ABC):
-    
-    def __init__(self, api_key, api_secret=None):
+
+    # মেট্রিক এবং লেনদেনের details এ গেটওয়ের নাম হিসেবে ব্যবহৃত হয়
+    name = 'base'
+
+    def __init__(self, api_key, api_secret=None, max_concurrency=PAYOUT_CONCURRENCY, timeout=PAYOUT_HTTP_TIMEOUT_SECONDS):
         """
-        প্রতিটি গেটওয়ের জন্য প্রয়োজনীয় API কী এবং অন্যান্য তথ্য দিয়ে ইনিশিয়ালাইজ করা হবে।
+        প্রতিটি গেটওয়ের জন্য প্রয়োজনীয় API কী এবং অন্যান্য তথ্য দিয়ে ইনিশিয়ালাইজ করা হবে।
+        `max_concurrency`: এই গেটওয়েতে একসাথে সর্বোচ্চ কয়টি রিকোয়েস্ট চলবে।
+        `timeout`: প্রতিটি রিকোয়েস্টের সর্বোচ্চ সময় (সেকেন্ড)।
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = ""
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._limiter = asyncio.Semaphore(max_concurrency)
 
     @abstractmethod
-    def create_payout(self, amount, currency, address, memo=None):
+    async def create_payout(self, amount, currency, address, memo=None, idempotency_key=None):
         """
         একটি নতুন উইথড্র বা পে-আউট তৈরি করার জন্য এই মেথডটি ইমপ্লিমেন্ট করতে হবে।
-        
+
         Args:
             amount (float): পাঠানোর অর্থের পরিমাণ।
             currency (str): কারেন্সির কোড (যেমন, 'USDT', 'BDT')।
             address (str): প্রাপকের ওয়ালেট বা অ্যাকাউন্ট অ্যাড্রেস।
             memo (str, optional): কিছু ক্রিপ্টোকারেন্সির জন্য প্রয়োজনীয় ট্যাগ বা মেমো।
+            idempotency_key (str, optional): একই কী দিয়ে আবার ডাকলে নতুন পে-আউট না করে
+                আগেরটির ফলাফল দিতে হবে (গেটওয়ের idempotency হেডার/ফিল্ডে পাঠাতে হবে)।
+
+        Raises:
+            GatewayError: সাময়িক ত্রুটি হলে (আবার চেষ্টা করা হবে)।
 
         Returns:
             dict: একটি ডিকশনারি যাতে লেনদেনের স্ট্যাটাস এবং আইডি থাকবে।
-                  {'success': True, 'transaction_id': 'xyz123'} অথবা
+                  {'success': True, 'transaction_id': 'xyz123', 'status': 'completed' / 'pending'} অথবা
                   {'success': False, 'message': 'Error message'}
+                  গেটওয়ে পে-আউট গ্রহণ করে পরে প্রসেস করলে 'status' হবে 'pending'; তখন
+                  `check_payout_statuses` দিয়ে চূড়ান্ত ফলাফল জানা হয়। 'status' না থাকলে 'completed' ধরা হয়।
         """
         pass
 
     @abstractmethod
-    def check_payout_status(self, transaction_id):
+    async def check_payout_status(self, transaction_id):
         """
         একটি নির্দিষ্ট পে-আউটের স্ট্যাটাস চেক করার জন্য এই মেথডটি ইমপ্লিমেন্ট করতে হবে।
-        
+
         Args:
             transaction_id (str): চেক করার জন্য লেনদেনের আইডি।
 
+        Raises:
+            GatewayError: সাময়িক ত্রুটি বা স্ট্যাটাস জানা না গেলে।
+
         Returns:
             dict: একটি ডিকশনারি যাতে স্ট্যাটাস থাকবে।
                   {'status': 'completed' / 'pending' / 'failed'}
         """
         pass
+
+    async def check_payout_statuses(self, transaction_ids):
+        """
+        অনেকগুলো পে-আউটের স্ট্যাটাস একসাথে চেক করে।
+
+        Args:
+            transaction_ids (list): গেটওয়ের পে-আউট আইডির তালিকা।
+
+        Returns:
+            dict: {transaction_id: 'completed' / 'pending' / 'failed'}। যেগুলোর স্ট্যাটাস জানা যায়নি
+                  (সাময়িক ত্রুটি) সেগুলো বাদ থাকে এবং পরের বার আবার চেক করা হয়।
+
+        ডিফল্টভাবে প্রতিটির জন্য `check_payout_status` একসাথে ডাকা হয় (`max_concurrency` এর মধ্যে)।
+        গেটওয়ের বাল্ক স্ট্যাটাস API থাকলে সাবক্লাসে এটি ওভাররাইড করুন।
+        """
+        responses = await asyncio.gather(
+            *(self.check_payout_status(transaction_id) for transaction_id in transaction_ids),
+            return_exceptions=True
+        )
+        statuses = {}
+        for transaction_id, response in zip(transaction_ids, responses):
+            if isinstance(response, GatewayError):
+                continue
+            if isinstance(response, BaseException):
+                raise response
+            statuses[transaction_id] = response['status']
+        return statuses
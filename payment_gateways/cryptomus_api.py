@@ -1,28 +1,30 @@
 # advanced_earning_bot/payment_gateways/cryptomus_api.py
 
-from .base_gateway import BaseGateway
+from .http_gateway import HttpGateway
 
 """
 Cryptomus পেমেন্ট গেটওয়ের জন্য একটি উদাহরণ ইমপ্লিমেন্টেশন।
 এই ফাইলটি এখন একটি প্লেসহোল্ডার।
 """
 
-class CryptomusGateway(BaseGateway):
+class CryptomusGateway(HttpGateway):
+
+    name = 'cryptomus'
     
-    def __init__(self, api_key, merchant_id):
-        super().__init__(api_key)
+    def __init__(self, api_key, merchant_id, **kwargs):
+        super().__init__(api_key, base_url="https://api.cryptomus.com/v1", **kwargs)
         self.merchant_id = merchant_id
-        self.base_url = "https://api.cryptomus.com/v1"
 
-    def create_payout(self, amount, currency, address, memo=None):
+    async def create_payout(self, amount, currency, address, memo=None, idempotency_key=None):
         # TODO: Cryptomus API-তে পে-আউট তৈরি করার জন্য রিকোয়েস্ট পাঠানোর কোড এখানে লেখা হবে।
-        # এটি একটি API কল করবে এবং ফলাফল রিটার্ন করবে।
+        # `self._request('POST', '/payout', {...})` দিয়ে পাঠাতে হবে (শেয়ার করা সংযোগ পুল);
+        # সিগনেচার হেডার `_headers` এ, এবং idempotency_key কে order_id হিসেবে পাঠাতে হবে।
         print(f"Cryptomus: {amount} {currency} পাঠানোর অনুরোধ করা হচ্ছে {address}-এ।")
         
         # উদাহরণ রেসপন্স
         return {'success': True, 'transaction_id': 'crypto_payout_12345'}
 
-    def check_payout_status(self, transaction_id):
+    async def check_payout_status(self, transaction_id):
         # TODO: Cryptomus API থেকে একটি নির্দিষ্ট পে-আউটের স্ট্যাটাস চেক করার কোড।
         print(f"Cryptomus: ট্রানজেকশন {transaction_id}-এর স্ট্যাটাস চেক করা হচ্ছে।")
         
@@ -0,0 +1,68 @@
+# advanced_earning_bot/payment_gateways/http_client.py
+
+import httpx
+from config import PAYOUT_HTTP_MAX_CONNECTIONS, PAYOUT_HTTP_CONNECTIONS_PER_CLIENT, PAYOUT_HTTP_KEEPALIVE_SECONDS
+
+"""
+সব পেমেন্ট গেটওয়ের জন্য শেয়ার করা async HTTP সংযোগ পুল (httpx, python-telegram-bot এর সাথেই ইনস্টল হয়)।
+
+সংযোগগুলো keep-alive রেখে পুনরায় ব্যবহার করা হয়, তাই একই হোস্টে শত শত পে-আউট পাঠালেও শুধু প্রথম
+কয়েকটি রিকোয়েস্টে TCP/TLS হ্যান্ডশেক হয়। `PAYOUT_HTTP_MAX_CONNECTIONS` সব গেটওয়ে মিলিয়ে সর্বোচ্চ খোলা
+সংযোগ; প্রতিটি গেটওয়ের নিজের সীমা ও টাইমআউট `HttpGateway` এ থাকে।
+
+পুলটি একটি বড় `AsyncClient` না হয়ে কয়েকটি ছোট ক্লায়েন্টে (প্রতিটিতে সর্বোচ্চ
+`PAYOUT_HTTP_CONNECTIONS_PER_CLIENT` টি সংযোগ) ভাগ করা। httpcore প্রতিটি রিকোয়েস্ট শুরু ও শেষে
+পুলের সব সংযোগ × অপেক্ষমাণ রিকোয়েস্ট ঘুরে দেখে, তাই একটি ক্লায়েন্টে ~২০ টির বেশি সমান্তরাল
+রিকোয়েস্ট হলে CPU খরচ বর্গাকারে বাড়ে (৮০ টি সংযোগের এক ক্লায়েন্ট ১০ টির ৮ ক্লায়েন্টের চেয়ে ~৯ গুণ ধীর)।
+প্রতিটি রিকোয়েস্ট সবচেয়ে কম ব্যস্ত ক্লায়েন্টে যায়।
+
+ক্লায়েন্টগুলো প্রথম ব্যবহারের সময় চলমান ইভেন্ট লুপে তৈরি হয়; বট বন্ধের সময় `close_http_client()` ডাকতে হবে।
+"""
+
+_clients = []
+# প্রতিটি ক্লায়েন্টে এই মুহূর্তে কয়টি রিকোয়েস্ট চলছে
+_in_flight = []
+
+
+def _create_clients():
+    global _clients, _in_flight
+    per_client = min(PAYOUT_HTTP_CONNECTIONS_PER_CLIENT, PAYOUT_HTTP_MAX_CONNECTIONS)
+    count = max(1, PAYOUT_HTTP_MAX_CONNECTIONS // per_client)
+    _clients = [
+        httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=per_client,
+                max_keepalive_connections=per_client,
+                keepalive_expiry=PAYOUT_HTTP_KEEPALIVE_SECONDS
+            ),
+            headers={'User-Agent': 'advanced-earning-bot'}
+        )
+        for _ in range(count)
+    ]
+    _in_flight = [0] * count
+
+
+async def request(method, url, **kwargs):
+    """
+    পুলের সবচেয়ে কম ব্যস্ত ক্লায়েন্ট দিয়ে একটি রিকোয়েস্ট পাঠায় এবং `httpx.Response` রিটার্ন করে।
+    `kwargs` সরাসরি `httpx.AsyncClient.request` এ যায়; ত্রুটি হলে httpx এর exception ওঠে।
+    """
+    if not _clients:
+        _create_clients()
+    # পুলটি মাঝপথে বন্ধ হয়ে নতুন তৈরি হলেও যেন পুরনো তালিকার গণনাই কমে
+    clients, in_flight = _clients, _in_flight
+    index = min(range(len(clients)), key=in_flight.__getitem__)
+    in_flight[index] += 1
+    try:
+        return await clients[index].request(method, url, **kwargs)
+    finally:
+        in_flight[index] -= 1
+
+
+async def close_http_client():
+    """পুলের সব খোলা সংযোগ বন্ধ করে।"""
+    global _clients, _in_flight
+    clients = _clients
+    _clients, _in_flight = [], []
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,58 @@
+# advanced_earning_bot/payment_gateways/http_gateway.py
+
+import json
+import httpx
+from config import PAYOUT_HTTP_CONNECT_TIMEOUT_SECONDS
+from .base_gateway import BaseGateway, GatewayError
+from . import http_client
+
+"""
+JSON HTTP API ভিত্তিক গেটওয়েগুলোর বেস ক্লাস।
+
+`_request` শেয়ার করা keep-alive সংযোগ পুল (`http_client`) ব্যবহার করে, এই গেটওয়ের `max_concurrency` এর বেশি
+রিকোয়েস্ট একসাথে পাঠায় না এবং `timeout` মেনে চলে। নেটওয়ার্ক ত্রুটি, টাইমআউট, 429 এবং 5xx
+রেসপন্স GatewayError হিসেবে আসে (আবার চেষ্টা করা হবে); বাকি রেসপন্সের অর্থ বের করা সাবক্লাসের কাজ।
+"""
+
+class HttpGateway(BaseGateway):
+
+    def __init__(self, api_key, api_secret=None, base_url="", **kwargs):
+        super().__init__(api_key, api_secret, **kwargs)
+        self.base_url = base_url.rstrip('/')
+        self._timeout = httpx.Timeout(self.timeout, connect=min(PAYOUT_HTTP_CONNECT_TIMEOUT_SECONDS, self.timeout))
+
+    def _headers(self, body):
+        """
+        প্রতিটি রিকোয়েস্টের অতিরিক্ত হেডার (যেমন API কী বা বডির সিগনেচার)।
+        `body` হলো পাঠানো JSON বডির বাইট (GET এ b'')।
+        """
+        return {}
+
+    async def _request(self, method, path, payload=None, headers=None):
+        """
+        গেটওয়েতে একটি রিকোয়েস্ট পাঠায় এবং (status_code, JSON বডি) রিটার্ন করে।
+        বডি খালি হলে JSON এর বদলে {} আসে।
+        """
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8') if payload is not None else b''
+        request_headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        request_headers.update(self._headers(body))
+        if headers:
+            request_headers.update(headers)
+
+        async with self._limiter:
+            try:
+                response = await http_client.request(
+                    method, f"{self.base_url}{path}", content=body or None,
+                    headers=request_headers, timeout=self._timeout
+                )
+            except httpx.HTTPError as e:
+                raise GatewayError(f"{self.name}: {type(e).__name__}: {e}")
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise GatewayError(f"{self.name}: HTTP {response.status_code}")
+        if not response.content:
+            return response.status_code, {}
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            raise GatewayError(f"{self.name}: HTTP {response.status_code} রেসপন্সটি JSON নয়")
@@ -0,0 +1,48 @@
+# advanced_earning_bot/payment_gateways/mock_gateway.py
+
+import random
+import asyncio
+from uuid import uuid4
+from .base_gateway import BaseGateway, GatewayError
+
+"""
+অফলাইন টেস্ট এবং বেঞ্চমার্কের জন্য একটি নকল পেমেন্ট গেটওয়ে; কোনো নেটওয়ার্ক কল করে না।
+`latency` দিয়ে প্রতিটি কলের সময়, `failure_rate` দিয়ে স্থায়ী প্রত্যাখ্যানের হার এবং
+`error_rate` দিয়ে সাময়িক ত্রুটির (GatewayError) হার ঠিক করা যায়।
+আসল গেটওয়ের মতোই একই idempotency key দিয়ে আবার ডাকলে নতুন পে-আউট হয় না।
+"""
+
+class MockGateway(BaseGateway):
+
+    name = 'mock'
+
+    def __init__(self, latency=0.05, failure_rate=0.0, error_rate=0.0, seed=None, **kwargs):
+        super().__init__(api_key='mock', **kwargs)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.payouts = {}            # {payout_id: {'amount', 'currency', 'address'}}
+        self._keys = {}              # {idempotency_key: payout_id}
+        self.calls = 0
+
+    async def create_payout(self, amount, currency, address, memo=None, idempotency_key=None):
+        async with self._limiter:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            self.calls += 1
+            if idempotency_key in self._keys:
+                return {'success': True, 'transaction_id': self._keys[idempotency_key]}
+            roll = self._random.random()
+            if roll < self.error_rate:
+                raise GatewayError("mock: সাময়িক নেটওয়ার্ক ত্রুটি")
+            if roll < self.error_rate + self.failure_rate:
+                return {'success': False, 'message': 'mock: প্রাপকের ঠিকানা গ্রহণযোগ্য নয়'}
+            payout_id = f"mock_{uuid4().hex[:16]}"
+            self.payouts[payout_id] = {'amount': amount, 'currency': currency, 'address': address}
+            if idempotency_key is not None:
+                self._keys[idempotency_key] = payout_id
+            return {'success': True, 'transaction_id': payout_id}
+
+    async def check_payout_status(self, transaction_id):
+        return {'status': 'completed' if transaction_id in self.payouts else 'failed'}
@@ -0,0 +1,56 @@
+# advanced_earning_bot/payment_gateways/stub_gateway.py
+
+import asyncio
+from config import PAYOUT_STATUS_BATCH_SIZE
+from .base_gateway import GatewayError
+from .http_gateway import HttpGateway
+
+"""
+লোকাল স্টাব সার্ভারের (`stub_server.py`) ক্লায়েন্ট। আসল HTTP গেটওয়ের পুরো পথ (সংযোগ পুল, সীমা,
+টাইমআউট, idempotency হেডার, বাল্ক স্ট্যাটাস) অফলাইনে পরীক্ষা করার জন্য।
+"""
+
+class StubGateway(HttpGateway):
+
+    name = 'stub'
+
+    def __init__(self, base_url, api_key='stub', **kwargs):
+        super().__init__(api_key, base_url=base_url, **kwargs)
+
+    def _headers(self, body):
+        return {'X-Api-Key': self.api_key}
+
+    async def create_payout(self, amount, currency, address, memo=None, idempotency_key=None):
+        status_code, data = await self._request(
+            'POST', '/payouts',
+            {'amount': amount, 'currency': currency, 'address': address, 'memo': memo},
+            headers={'Idempotency-Key': idempotency_key} if idempotency_key else None
+        )
+        if status_code in (200, 201):
+            # একই কী দিয়ে আবার পাঠালে আগের পে-আউটের বর্তমান অবস্থা আসে, যা এর মধ্যে ব্যর্থও হয়ে থাকতে পারে
+            if data['status'] == 'failed':
+                return {'success': False, 'message': f"পে-আউট {data['id']} গেটওয়েতে ব্যর্থ হয়েছে"}
+            return {'success': True, 'transaction_id': data['id'], 'status': data['status']}
+        return {'success': False, 'message': data.get('error') or f"HTTP {status_code}"}
+
+    async def check_payout_status(self, transaction_id):
+        status_code, data = await self._request('GET', f"/payouts/{transaction_id}")
+        if status_code != 200:
+            # অজানা পে-আউটকে ব্যর্থ ধরে টাকা ফেরত দেওয়া ঝুঁকিপূর্ণ, তাই এটি পরে আবার চেক হবে
+            raise GatewayError(f"{self.name}: পে-আউট {transaction_id} এর স্ট্যাটাস পাওয়া যায়নি (HTTP {status_code})")
+        return {'status': data['status']}
+
+    async def _check_chunk(self, transaction_ids):
+        try:
+            status_code, data = await self._request('POST', '/payouts/status', {'ids': transaction_ids})
+        except GatewayError:
+            return {}
+        return data.get('statuses', {}) if status_code == 200 else {}
+
+    async def check_payout_statuses(self, transaction_ids):
+        chunks = [transaction_ids[i:i + PAYOUT_STATUS_BATCH_SIZE]
+                  for i in range(0, len(transaction_ids), PAYOUT_STATUS_BATCH_SIZE)]
+        statuses = {}
+        for result in await asyncio.gather(*(self._check_chunk(chunk) for chunk in chunks)):
+            statuses.update(result)
+        return statuses
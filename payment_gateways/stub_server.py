@@ -0,0 +1,209 @@
+# advanced_earning_bot/payment_gateways/stub_server.py
+
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+from uuid import uuid4
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+"""
+টেস্ট এবং বেঞ্চমার্কের জন্য একটি লোকাল HTTP পেমেন্ট গেটওয়ে (শুধু স্ট্যান্ডার্ড লাইব্রেরি), যা
+`stub_gateway.StubGateway` এর প্রোটোকল বোঝে। আসল গেটওয়ের মতোই HTTP/1.1 keep-alive সমর্থন করে,
+এবং কয়টি TCP সংযোগ খোলা হয়েছে তা গোনে, যাতে সংযোগ পুল কাজ করছে কিনা দেখা যায়।
+
+API:
+    POST /payouts             {amount, currency, address, memo}, হেডার `Idempotency-Key`
+                              -> 201 {id, status} (নতুন), 200 {id, status} (একই কী আগে এসেছে),
+                                 422 {error} (প্রত্যাখ্যান), 503 (সাময়িক ত্রুটি)
+    GET  /payouts/<id>        -> 200 {id, status} অথবা 404
+    POST /payouts/status      {ids: [...]} -> 200 {statuses: {id: status}} (অজানা আইডি বাদ থাকে)
+    GET  /stats               -> {connections, requests, payouts}
+
+নতুন পে-আউট `settle_seconds` পর্যন্ত 'pending' থাকে, তারপর 'completed' (অথবা `late_failure_rate`
+হারে 'failed')। `error_rate` হারে পে-আউট তৈরি হওয়ার পরও 503 দেওয়া হয় (রেসপন্স হারিয়ে যাওয়ার মতো),
+যাতে idempotency key ছাড়া আবার চেষ্টা করলে দ্বিগুণ পে-আউট ধরা পড়ে।
+
+চালানো (প্রজেক্টের মূল ফোল্ডার থেকে):
+    python -m payment_gateways.stub_server --port 8099 --latency 0.05 --settle 2
+তারপর বটে PAYOUT_GATEWAY=stub এবং PAYOUT_GATEWAY_URL=http://127.0.0.1:8099 দিন।
+"""
+
+class StubGatewayState:
+    """স্টাব সার্ভারের সব পে-আউট এবং কাউন্টার (হ্যান্ডলার থ্রেডগুলোর মধ্যে শেয়ার করা)।"""
+
+    def __init__(self, latency=0.0, failure_rate=0.0, error_rate=0.0, settle_seconds=0.0,
+                 late_failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.error_rate = error_rate
+        self.settle_seconds = settle_seconds
+        self.late_failure_rate = late_failure_rate
+        self.lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.payouts = {}            # {payout_id: {'amount', 'currency', 'address', 'final_status', 'settle_at'}}
+        self._keys = {}              # {idempotency_key: payout_id}
+        self.connections = 0
+        self.requests = 0
+
+    def _status(self, payout):
+        return payout['final_status'] if time.monotonic() >= payout['settle_at'] else 'pending'
+
+    def create(self, payload, key):
+        """রিটার্ন: (HTTP status, বডি)"""
+        with self.lock:
+            if key and key in self._keys:
+                payout_id = self._keys[key]
+                return 200, {'id': payout_id, 'status': self._status(self.payouts[payout_id])}
+            if not payload.get('address') or not payload.get('amount'):
+                return 422, {'error': 'amount এবং address প্রয়োজন'}
+            roll = self._random.random()
+            if roll < self.failure_rate:
+                return 422, {'error': 'প্রাপকের ঠিকানা গ্রহণযোগ্য নয়'}
+            payout_id = f"stub_{uuid4().hex[:16]}"
+            self.payouts[payout_id] = {
+                'amount': payload['amount'], 'currency': payload.get('currency'), 'address': payload['address'],
+                'final_status': 'failed' if self._random.random() < self.late_failure_rate else 'completed',
+                'settle_at': time.monotonic() + self.settle_seconds,
+            }
+            if key:
+                self._keys[key] = payout_id
+            if roll < self.failure_rate + self.error_rate:
+                return 503, {'error': 'সাময়িক ত্রুটি'}
+            return 201, {'id': payout_id, 'status': self._status(self.payouts[payout_id])}
+
+    def status(self, payout_id):
+        with self.lock:
+            payout = self.payouts.get(payout_id)
+            return self._status(payout) if payout else None
+
+    def statuses(self, payout_ids):
+        with self.lock:
+            return {payout_id: self._status(self.payouts[payout_id])
+                    for payout_id in payout_ids if payout_id in self.payouts}
+
+    def stats(self):
+        with self.lock:
+            return {'connections': self.connections, 'requests': self.requests, 'payouts': len(self.payouts)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    # HTTP/1.1: একটি সংযোগে অনেকগুলো রিকোয়েস্ট (keep-alive)
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # হেডার ও বডি আলাদা write এ যায়; Nagle বন্ধ না করলে keep-alive সংযোগে প্রতিটি রেসপন্সে ~40ms দেরি হয়
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.state.lock:
+            self.server.state.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, code, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _begin(self):
+        """প্রতিটি রিকোয়েস্টের বডি পড়ে (সংযোগটি পরের রিকোয়েস্টের জন্য প্রস্তুত রাখতে) এবং কৃত্রিম দেরি করে।"""
+        state = self.server.state
+        with state.lock:
+            state.requests += 1
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if state.latency:
+            time.sleep(state.latency)
+        try:
+            return json.loads(body) if body else {}
+        except ValueError:
+            return None
+
+    def do_GET(self):
+        self._begin()
+        state = self.server.state
+        if self.path == '/stats':
+            self._send(200, state.stats())
+        elif self.path.startswith('/payouts/'):
+            payout_id = self.path[len('/payouts/'):]
+            status = state.status(payout_id)
+            if status is None:
+                self._send(404, {'error': 'পে-আউট পাওয়া যায়নি'})
+            else:
+                self._send(200, {'id': payout_id, 'status': status})
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        payload = self._begin()
+        state = self.server.state
+        if not isinstance(payload, dict):
+            self._send(400, {'error': 'বডি JSON অবজেক্ট হতে হবে'})
+        elif self.path == '/payouts':
+            self._send(*state.create(payload, self.headers.get('Idempotency-Key')))
+        elif self.path == '/payouts/status':
+            self._send(200, {'statuses': state.statuses(payload.get('ids') or [])})
+        else:
+            self._send(404, {'error': 'not found'})
+
+
+class StubGatewayServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+    # অনেকগুলো সংযোগ একসাথে খোলা হলে যেন ফেরত না যায়
+    request_queue_size = 256
+
+    def __init__(self, address, state):
+        super().__init__(address, _Handler)
+        self.state = state
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(host='127.0.0.1', port=0, **options):
+    """
+    একটি ব্যাকগ্রাউন্ড থ্রেডে স্টাব সার্ভার চালু করে সার্ভারটি রিটার্ন করে (`port=0` হলে যেকোনো খালি পোর্ট)।
+    `options` সরাসরি `StubGatewayState` এ যায়। বন্ধ করতে `server.shutdown()` এবং `server.server_close()`।
+    """
+    server = StubGatewayServer((host, port), StubGatewayState(**options))
+    threading.Thread(target=server.serve_forever, name='stub-gateway', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="লোকাল পেমেন্ট গেটওয়ে স্টাব সার্ভার")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency', type=float, default=0.05, help="প্রতিটি রিকোয়েস্টের দেরি (সেকেন্ড)")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="সাথে সাথে প্রত্যাখ্যানের হার (0-1)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="পে-আউট তৈরির পরও 503 দেওয়ার হার (0-1)")
+    parser.add_argument('--settle', type=float, default=0.0, help="পে-আউট কত সেকেন্ড 'pending' থাকবে")
+    parser.add_argument('--late-failure-rate', type=float, default=0.0, help="'pending' এর পর 'failed' হওয়ার হার (0-1)")
+    parser.add_argument('--seed', type=int, default=None, help="র‍্যান্ডম সিড")
+    args = parser.parse_args()
+
+    server = StubGatewayServer((args.host, args.port), StubGatewayState(
+        latency=args.latency, failure_rate=args.failure_rate, error_rate=args.error_rate,
+        settle_seconds=args.settle, late_failure_rate=args.late_failure_rate, seed=args.seed
+    ))
+    print(f"স্টাব গেটওয়ে চালু হয়েছে: {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+# advanced_earning_bot/storage/__init__.py
+
+import sqlite3
+from config import STORAGE_BACKEND
+from .base import StorageBackend, StorageError
+
+"""
+বটের স্টোরেজ ব্যাকএন্ড নির্বাচন করে। ম্যানেজার মডিউলগুলো `get_storage()` থেকে
+বর্তমান ব্যাকএন্ড নেয় এবং ত্রুটি ধরার জন্য `STORAGE_ERRORS` ব্যবহার করে।
+টেস্ট বা বেঞ্চমার্কে `set_storage(MemoryStorage())` দিয়ে ব্যাকএন্ড বদলানো যায়।
+"""
+
+# যেকোনো ব্যাকএন্ডের ডাটাবেস ত্রুটি
+STORAGE_ERRORS = (sqlite3.Error, StorageError)
+
+_storage = None
+
+
+def create_storage(backend_name):
+    """নাম ('sqlite' অথবা 'memory') অনুযায়ী একটি নতুন স্টোরেজ ব্যাকএন্ড তৈরি করে।"""
+    if backend_name == 'sqlite':
+        from .sqlite_storage import SQLiteStorage
+        return SQLiteStorage()
+    if backend_name == 'memory':
+        from .memory_storage import MemoryStorage
+        return MemoryStorage()
+    raise ValueError(f"অজানা স্টোরেজ ব্যাকএন্ড: {backend_name}")
+
+
+def get_storage():
+    """বর্তমান স্টোরেজ ব্যাকএন্ড রিটার্ন করে (প্রথমবার কনফিগারেশন অনুযায়ী তৈরি হয়)।"""
+    global _storage
+    if _storage is None:
+        _storage = create_storage(STORAGE_BACKEND)
+    return _storage
+
+
+def set_storage(storage):
+    """স্টোরেজ ব্যাকএন্ড বদলায় (যেমন টেস্টে মেমোরি ব্যাকএন্ড ব্যবহারের জন্য)।"""
+    global _storage
+    _storage = storage
@@ -0,0 +1,484 @@
+# advanced_earning_bot/storage/base.py
+
+from abc import ABC, abstractmethod
+
+"""
+এটি বটের ডাটা সংরক্ষণের জন্য অ্যাবস্ট্রাক্ট ইন্টারফেস (রিপোজিটরি)।
+ম্যানেজার মডিউলগুলো (user_manager, ad_manager ইত্যাদি) সরাসরি SQL না লিখে এই
+মেথডগুলো ব্যবহার করে, তাই স্টোরেজ (SQLite, মেমোরি, ভবিষ্যতে সার্ভার ডাটাবেস) বদলালে
+বিজনেস লজিক বদলাতে হয় না। নতুন স্টোরেজ যোগ করতে হলে `StorageBackend` এবং
+প্রতিটি রিপোজিটরি ক্লাস ইনহেরিট করতে হবে।
+
+সারিগুলো SQLite এর মতো একই আকারে রিটার্ন হয়: সময় (timestamp) স্ট্রিং হিসেবে
+('YYYY-MM-DD HH:MM:SS.ffffff') এবং বুলিয়ান কলাম 0/1 হিসেবে।
+"""
+
+# `ads` টেবিলের কলামগুলোর ক্রম (`list_by_status` এই ক্রমে টাপল রিটার্ন করে)
+AD_COLUMNS = ('ad_id', 'owner_user_id', 'ad_source', 'ad_type', 'ad_content', 'status',
+              'target_views', 'current_views', 'view_duration_seconds', 'viewed_by_users',
+              'reward_per_view', 'budget', 'budget_spent')
+
+# `viewed_by_users` (পুরনো বড় JSON) বাদে সব কলাম; এডমিনের রিভিউ স্ক্রিনের জন্য
+AD_REVIEW_COLUMNS = tuple(column for column in AD_COLUMNS if column != 'viewed_by_users')
+
+# `find_unviewed_active` যে কলামগুলো রিটার্ন করে
+AD_VIEW_COLUMNS = ('ad_id', 'owner_user_id', 'ad_source', 'ad_type', 'ad_content', 'status',
+                   'target_views', 'current_views', 'view_duration_seconds', 'reward_per_view')
+
+# এক্সপোর্টে `users` এবং `transactions` টেবিলের কলামগুলোর ক্রম (`iter_export` এই ক্রমে টাপল রিটার্ন করে)
+USER_EXPORT_COLUMNS = ('user_id', 'username', 'balance', 'is_verified', 'is_banned', 'warning_count',
+                       'language', 'timezone', 'join_date', 'referrer_id', 'last_daily_bonus',
+                       'last_weekly_bonus', 'last_monthly_bonus')
+TRANSACTION_EXPORT_COLUMNS = ('transaction_id', 'user_id', 'type', 'amount', 'status', 'timestamp', 'details')
+
+# `dynamic_buttons` টেবিলের কলামগুলোর ক্রম
+BUTTON_COLUMNS = ('button_id', 'button_text', 'parent_id', 'action_type', 'action_value', 'position')
+
+
+class StorageError(Exception):
+    """স্টোরেজ সংক্রান্ত ত্রুটি (SQLite ছাড়া অন্য ব্যাকএন্ডগুলো এটি ব্যবহার করে)।"""
+    pass
+
+
+class UserRepository(ABC):
+
+    @abstractmethod
+    def get(self, user_id):
+        """ব্যবহারকারীর সকল তথ্য ডিকশনারি হিসেবে রিটার্ন করে, না থাকলে None।"""
+        pass
+
+    @abstractmethod
+    def create(self, user_id, username, language, referrer_id, join_date):
+        """নতুন ব্যবহারকারী যোগ করে। আগে থেকে থাকলে কিছু করে না এবং False রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def add_balance(self, user_id, amount_change):
+        """ব্যালেন্সে `amount_change` যোগ করে (নেগেটিভ হলে বিয়োগ)।"""
+        pass
+
+    @abstractmethod
+    def debit_if_sufficient(self, user_id, amount):
+        """
+        ব্যালেন্স অন্তত `amount` থাকলে তা একটি শর্তযুক্ত আপডেটে কেটে নেয় এবং True রিটার্ন করে;
+        না থাকলে (বা ব্যবহারকারী না থাকলে) কিছুই না করে False। যাচাই এবং কাটা একসাথে হয়,
+        তাই একসাথে অনেক অনুরোধ এলেও ব্যালেন্স নেগেটিভ হয় না।
+        """
+        pass
+
+    @abstractmethod
+    def set_verified(self, user_id, status):
+        """ভেরিফিকেশন স্ট্যাটাস সেট করে। স্ট্যাটাস সত্যিই বদলালে True রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def set_banned(self, user_id, status):
+        """ব্যান স্ট্যাটাস সেট করে। স্ট্যাটাস সত্যিই বদলালে True রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def list_unbanned_ids_after(self, after_user_id, limit):
+        """
+        `after_user_id` এর চেয়ে বড় আইডির, ব্যান না হওয়া সর্বোচ্চ `limit` জন ব্যবহারকারীর আইডি
+        ক্রমানুসারে রিটার্ন করে (keyset পেজিনেশন, পুরো টেবিল মেমোরিতে আনা হয় না)।
+        """
+        pass
+
+    @abstractmethod
+    def iter_export(self, batch_size):
+        """
+        সব ব্যবহারকারীকে user_id এর ক্রমে `USER_EXPORT_COLUMNS` টাপলের তালিকা (ব্যাচ) হিসেবে yield করে।
+        একবারে শুধু একটি ব্যাচ মেমোরিতে থাকে এবং কোনো লক বা ট্রানজেকশন নেওয়া হয় না।
+        """
+        pass
+
+    @abstractmethod
+    def existing_ids(self, user_ids):
+        """প্রদত্ত আইডিগুলোর মধ্যে যেগুলোর ব্যবহারকারী আছে সেগুলোর set রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def add_balance_many(self, changes):
+        """
+        অনেক ব্যবহারকারীর ব্যালেন্স একসাথে পরিবর্তন করে।
+        changes: (user_id, amount_change) টাপলের তালিকা
+        """
+        pass
+
+    @abstractmethod
+    def get_balances(self, user_ids):
+        """প্রদত্ত আইডিগুলোর মধ্যে যেগুলোর ব্যবহারকারী আছে তাদের {user_id: balance} রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def apply_balance_changes(self, changes):
+        """
+        `add_balance_many` এর মতো, তবে ডেবিট (ঋণাত্মক পরিবর্তন) শুধু ব্যালেন্স অন্তত ততটা থাকলেই হয়,
+        `debit_if_sufficient` এর মতো শর্তযুক্ত আপডেটে। কতগুলো পরিবর্তন সত্যিই প্রয়োগ হয়েছে তা রিটার্ন করে।
+        changes: (user_id, amount_change) টাপলের তালিকা
+        """
+        pass
+
+    @abstractmethod
+    def set_banned_many(self, user_ids, status):
+        """অনেক ব্যবহারকারীর ব্যান স্ট্যাটাস সেট করে। কতজনের স্ট্যাটাস সত্যিই বদলেছে তা রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def add_warnings(self, user_id, increment):
+        """ওয়ার্নিং সংখ্যা বাড়িয়ে নতুন সংখ্যা রিটার্ন করে (ব্যবহারকারী না থাকলে 0)।"""
+        pass
+
+    @abstractmethod
+    def set_language(self, user_id, lang_code):
+        pass
+
+    @abstractmethod
+    def mark_daily_bonus(self, user_id, day):
+        """
+        `last_daily_bonus` কে `day` (ISO তারিখ) করে, যদি আগের মান তার চেয়ে পুরনো হয়।
+        আপডেট হলে True, আজ আগেই নেওয়া হয়ে থাকলে False রিটার্ন করে।
+        """
+        pass
+
+
+class AdRepository(ABC):
+
+    @abstractmethod
+    def find_unviewed_active(self, user_id):
+        """
+        ব্যবহারকারী আগে দেখেনি এবং তার নিজের নয় এমন প্রথম 'active' বিজ্ঞাপন
+        (ad_id ক্রমে) `AD_VIEW_COLUMNS` এর ডিকশনারি হিসেবে রিটার্ন করে, না থাকলে None।
+        """
+        pass
+
+    @abstractmethod
+    def add_view(self, ad_id, user_id):
+        """একটি ভিউ যোগ করে। ব্যবহারকারী আগে দেখে থাকলে False রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def increment_views(self, ad_id, cost=0):
+        """
+        একটি 'active' বিজ্ঞাপনের `current_views` এক বাড়ায় এবং একই সাথে বাজেট থেকে `cost` খরচ করে।
+        টার্গেট পূর্ণ হলে, অথবা বাকি বাজেটে আরেকটি ভিউয়ের খরচ না হলে, স্ট্যাটাস 'completed' করে।
+        রিটার্ন: বিজ্ঞাপনটি সক্রিয় না থাকলে বা বাজেটে `cost` না হলে None,
+        এই ভিউতে বিজ্ঞাপনটি সম্পূর্ণ হলে True, অন্যথায় False।
+        """
+        pass
+
+    @abstractmethod
+    def complete_if_exhausted(self, ad_id, cost):
+        """
+        বাকি বাজেটে `cost` এর একটি ভিউ না হলে সক্রিয় বিজ্ঞাপনটি 'completed' করে।
+        স্ট্যাটাস বদলালে True রিটার্ন করে।
+        """
+        pass
+
+    @abstractmethod
+    def create(self, owner_user_id, ad_source, ad_type, ad_content, target_views, duration, status='pending',
+               reward_per_view=None, budget=None):
+        """
+        নতুন বিজ্ঞাপন যোগ করে তার ad_id রিটার্ন করে।
+        `reward_per_view` None হলে ধরন অনুযায়ী ডিফল্ট পুরস্কার, `budget` None হলে বাজেটের সীমা নেই।
+        """
+        pass
+
+    @abstractmethod
+    def list_by_status(self, status):
+        """নির্দিষ্ট স্ট্যাটাসের সকল বিজ্ঞাপন `AD_COLUMNS` ক্রমের টাপল হিসেবে রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def count_by_status(self, status):
+        """নির্দিষ্ট স্ট্যাটাসের বিজ্ঞাপনের সংখ্যা রিটার্ন করে (সারিগুলো লোড না করে)।"""
+        pass
+
+    @abstractmethod
+    def get_adjacent(self, status, ad_id, forward=True):
+        """
+        নির্দিষ্ট স্ট্যাটাসের, `ad_id` এর ঠিক পরের (forward) বা আগের একটি বিজ্ঞাপন
+        `AD_REVIEW_COLUMNS` এর ডিকশনারি হিসেবে রিটার্ন করে, না থাকলে None (keyset নেভিগেশন)।
+        """
+        pass
+
+    @abstractmethod
+    def get_status(self, ad_id):
+        """বিজ্ঞাপনের স্ট্যাটাস রিটার্ন করে, না থাকলে None।"""
+        pass
+
+    @abstractmethod
+    def set_status(self, ad_id, status):
+        pass
+
+
+class TransactionRepository(ABC):
+
+    @abstractmethod
+    def insert(self, user_id, trans_type, amount, status, timestamp, details_json):
+        """একটি লেনদেন যোগ করে তার transaction_id রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def insert_many(self, rows):
+        """
+        অনেকগুলো লেনদেন একসাথে যোগ করে।
+        rows: (user_id, type, amount, status, timestamp, details_json) টাপলের তালিকা
+        """
+        pass
+
+    @abstractmethod
+    def list_recent(self, user_id, limit):
+        """সবচেয়ে নতুন `limit` টি লেনদেন (type, amount, status, timestamp) টাপল হিসেবে রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def page(self, user_id, limit, before=None):
+        """
+        (timestamp, transaction_id) এর উল্টো ক্রমে সর্বোচ্চ `limit` টি লেনদেন ডিকশনারি হিসেবে রিটার্ন করে।
+        `before` = (timestamp, transaction_id) দিলে শুধু তার চেয়ে পুরনোগুলো আসে।
+        """
+        pass
+
+
+    @abstractmethod
+    def iter_export(self, batch_size, trans_type=None, status=None, date_from=None, date_to=None):
+        """
+        লেনদেনগুলো transaction_id এর ক্রমে `TRANSACTION_EXPORT_COLUMNS` টাপলের ব্যাচ হিসেবে yield করে।
+        ফিল্টার: `trans_type`, `status`, এবং timestamp >= `date_from` ও < `date_to` (স্ট্রিং)।
+        `UserRepository.iter_export` এর মতোই কোনো লক নেওয়া হয় না।
+        """
+        pass
+
+    @abstractmethod
+    def claim_withdrawals(self, limit, min_amount):
+        """
+        সবচেয়ে পুরনো সর্বোচ্চ `limit` টি পেন্ডিং উইথড্র (পরিমাণ অন্তত `min_amount`) 'processing' করে
+        একটি ট্রানজেকশনে দাবি করে এবং {'transaction_id', 'user_id', 'amount', 'details'} এর তালিকা রিটার্ন করে।
+        (লেজারে উইথড্রর amount নেগেটিভ থাকে।)
+        """
+        pass
+
+    @abstractmethod
+    def finish_withdrawals(self, rows):
+        """
+        rows: (transaction_id, status, details_json) এর তালিকা। শুধু 'processing' অবস্থার উইথড্রগুলোর
+        স্ট্যাটাস বদলায় এবং যেগুলো বদলেছে তাদের transaction_id এর তালিকা রিটার্ন করে।
+        """
+        pass
+
+    @abstractmethod
+    def list_processing_withdrawals(self, after_id, limit):
+        """
+        transaction_id > `after_id` এমন সর্বোচ্চ `limit` টি 'processing' উইথড্র transaction_id এর ক্রমে
+        {'transaction_id', 'user_id', 'amount', 'details'} হিসেবে রিটার্ন করে (স্ট্যাটাস পোলিংয়ের পাতা)।
+        """
+        pass
+
+    @abstractmethod
+    def requeue_processing_withdrawals(self):
+        """
+        'processing' উইথড্রগুলো আবার 'pending' করে (যেমন রিস্টার্টের পর) এবং সংখ্যা রিটার্ন করে।
+        যেগুলোর details এ `payout_id` আছে (গেটওয়ে গ্রহণ করেছে, ফলাফলের অপেক্ষা) সেগুলো বাদ থাকে।
+        """
+        pass
+
+class SettingsRepository(ABC):
+
+    @abstractmethod
+    def get_version(self):
+        """সেটিংসের বর্তমান ভার্সন নম্বর রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def load_all(self):
+        """(version, {setting_name: (value, is_active)}) রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def insert_defaults(self, defaults):
+        """
+        `defaults` ({name: (value, is_active, description)}) থেকে যেগুলো নেই সেগুলো যোগ করে।
+        কিছু যোগ হলে ভার্সন বাড়ায়। কয়টি যোগ হয়েছে তা রিটার্ন করে।
+        """
+        pass
+
+    @abstractmethod
+    def update(self, setting_name, new_value=None, new_status=None):
+        """একটি সেটিং আপডেট করে, ভার্সন বাড়ায় এবং নতুন ভার্সন রিটার্ন করে।"""
+        pass
+
+
+class ButtonRepository(ABC):
+
+    @abstractmethod
+    def list_children(self, parent_id=None):
+        """একটি মেনুর (parent_id) বাটনগুলো position ক্রমে ডিকশনারি হিসেবে রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def add(self, button_text, action_type, action_value=None, parent_id=None, position=0):
+        """নতুন বাটন যোগ করে তার button_id রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def delete(self, button_id):
+        """বাটনটি মুছে ফেলে। মুছে থাকলে True রিটার্ন করে।"""
+        pass
+
+
+class BroadcastRepository(ABC):
+
+    @abstractmethod
+    def create(self, admin_id, from_chat_id, message_id, status_chat_id, status_message_id, created_at):
+        """নতুন 'running' ব্রডকাস্ট যোগ করে তার broadcast_id রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def get(self, broadcast_id):
+        """ব্রডকাস্টের সকল তথ্য ডিকশনারি হিসেবে রিটার্ন করে, না থাকলে None।"""
+        pass
+
+    @abstractmethod
+    def list_running(self):
+        """সকল 'running' ব্রডকাস্ট (রিস্টার্টের পর আবার শুরু করার জন্য) ডিকশনারি হিসেবে রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def save_progress(self, broadcast_id, last_user_id, sent_count, failed_count, blocked_count, updated_at):
+        """চেকপয়েন্ট সংরক্ষণ করে: `last_user_id` পর্যন্ত সবাইকে পাঠানো শেষ।"""
+        pass
+
+    @abstractmethod
+    def finish(self, broadcast_id, status, updated_at):
+        """'running' ব্রডকাস্টের স্ট্যাটাস বদলায় ('completed' বা 'cancelled')। বদলালে True রিটার্ন করে।"""
+        pass
+
+
+class BulkBatchRepository(ABC):
+
+    @abstractmethod
+    def get(self, batch_key):
+        """বাল্ক ফাইলের চেকপয়েন্ট ডিকশনারি হিসেবে রিটার্ন করে, না থাকলে None।"""
+        pass
+
+    @abstractmethod
+    def save_progress(self, batch_key, batch_name, admin_id, last_line, rows_applied, updated_at):
+        """
+        চেকপয়েন্ট এগিয়ে নেয় (না থাকলে 'running' হিসেবে তৈরি করে): `last_line` পর্যন্ত সব সারি প্রয়োগ হয়ে গেছে।
+        `rows_applied` আগের সংখ্যার সাথে যোগ হয়। টুকরো প্রয়োগের ট্রানজেকশনের ভেতরেই কল করতে হবে।
+        """
+        pass
+
+    @abstractmethod
+    def finish(self, batch_key, updated_at):
+        """'running' ব্যাচকে 'completed' করে। বদলালে True রিটার্ন করে।"""
+        pass
+
+
+class StatsRepository(ABC):
+
+    @abstractmethod
+    def increment(self, stat_name, stat_date, delta):
+        pass
+
+    @abstractmethod
+    def get_for_dates(self, stat_dates):
+        """নির্দিষ্ট তারিখগুলোর (সার্বিক কাউন্টারের জন্য '') (stat_name, stat_date, stat_value) সারি রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def has_global(self):
+        """কোনো সার্বিক কাউন্টার সংরক্ষিত আছে কিনা।"""
+        pass
+
+    @abstractmethod
+    def recompute(self, today, reward_types):
+        """
+        মূল ডাটা থেকে সকল সার্বিক কাউন্টার এবং আজকের 'rewards_paid' নতুন করে হিসাব করে সংরক্ষণ করে।
+        """
+        pass
+
+
+class ReconciliationRepository(ABC):
+
+    @abstractmethod
+    def get_state(self):
+        """{'last_transaction_id', 'last_run_at', 'last_mismatch_count'} রিটার্ন করে।"""
+        pass
+
+    @abstractmethod
+    def collect_deltas(self, after_transaction_id):
+        """
+        `after_transaction_id` এর পরের সব লেজার সারির প্রতি-ব্যবহারকারী যোগফল বের করে।
+        রিটার্ন: (সর্বশেষ transaction_id, [(user_id, যোগফল), ...])। কোনো লক নেওয়া হয় না।
+        """
+        pass
+
+    @abstractmethod
+    def apply_deltas(self, expected_checkpoint, new_checkpoint, deltas):
+        """
+        চলমান যোগফলে `deltas` যোগ করে চেকপয়েন্ট `new_checkpoint` এ সরায়, একটি ট্রানজেকশনে।
+        এর মধ্যে অন্য কেউ চেকপয়েন্ট সরিয়ে থাকলে কিছুই না করে False রিটার্ন করে।
+        """
+        pass
+
+    @abstractmethod
+    def find_mismatches(self, limit):
+        """
+        যেসব ব্যবহারকারীর ব্যালেন্স চলমান লেজার যোগফলের সাথে মেলে না, তাদের সর্বোচ্চ `limit` জনের
+        (user_id, balance, ledger_total) রিটার্ন করে।
+        """
+        pass
+
+    @abstractmethod
+    def verify_users(self, user_ids):
+        """
+        প্রদত্ত ব্যবহারকারীদের ব্যালেন্স তাদের সম্পূর্ণ লেজারের যোগফলের সাথে একই স্ন্যাপশটে মিলিয়ে দেখে।
+        যাদের এখনও মেলে না তাদের (user_id, balance, ledger_total) রিটার্ন করে।
+        """
+        pass
+
+    @abstractmethod
+    def record_run(self, run_at, mismatch_count):
+        """শেষ রানের সময় এবং অমিলের সংখ্যা সংরক্ষণ করে।"""
+        pass
+
+
+class StorageBackend(ABC):
+    """
+    একটি সম্পূর্ণ স্টোরেজ। এতে `users`, `ads`, `transactions`, `settings`,
+    `buttons`, `broadcasts`, `bulk_batches`, `stats` এবং `reconciliation` রিপোজিটরি থাকে।
+    """
+
+    users = None
+    ads = None
+    transactions = None
+    settings = None
+    buttons = None
+    broadcasts = None
+    bulk_batches = None
+    stats = None
+    reconciliation = None
+
+    @abstractmethod
+    def initialize(self):
+        """প্রয়োজনীয় টেবিল/কাঠামো তৈরি করে (বট চালুর সময় একবার)।"""
+        pass
+
+    @abstractmethod
+    def transaction(self):
+        """
+        একটি unit of work এর context manager। ব্লক সফল হলে সবকিছু একসাথে সংরক্ষিত হয়,
+        exception হলে সবকিছু বাতিল হয়। নেস্টেড ব্লক বাইরের ট্রানজেকশনের অংশ হয়ে যায়।
+        """
+        pass
+
+    @abstractmethod
+    def on_commit(self, callback):
+        """বর্তমান ট্রানজেকশন সফলভাবে সংরক্ষিত হওয়ার পর `callback` চালায়।"""
+        pass
+
+    def close_connection(self):
+        """বর্তমান থ্রেডের সংযোগ (যদি থাকে) বন্ধ করে।"""
+        pass
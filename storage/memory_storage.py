@@ -0,0 +1,678 @@
+# advanced_earning_bot/storage/memory_storage.py
+
+import json
+import heapq
+import threading
+from contextlib import contextmanager
+from .base import (
+    StorageBackend, UserRepository, AdRepository, TransactionRepository,
+    SettingsRepository, ButtonRepository, BroadcastRepository, BulkBatchRepository, StatsRepository, ReconciliationRepository,
+    StorageError,
+    AD_COLUMNS, AD_REVIEW_COLUMNS, AD_VIEW_COLUMNS, BUTTON_COLUMNS, USER_EXPORT_COLUMNS, TRANSACTION_EXPORT_COLUMNS
+)
+
+"""
+স্টোরেজ ইন্টারফেসের সম্পূর্ণ মেমোরি-ভিত্তিক ইমপ্লিমেন্টেশন।
+কোনো ফাইল বা নেটওয়ার্ক I/O নেই, তাই টেস্ট এবং বিজনেস লজিকের বেঞ্চমার্কের জন্য উপযোগী।
+প্রোগ্রাম বন্ধ হলে সব ডাটা হারিয়ে যায়, এবং একাধিক প্রসেস একই ডাটা দেখতে পায় না।
+
+ট্রানজেকশন: একবারে একটি থ্রেডই লিখতে পারে (SQLite এর BEGIN IMMEDIATE এর মতো)।
+প্রতিটি পরিবর্তনের একটি "undo" ফাংশন রাখা হয়; ব্যর্থ হলে উল্টো ক্রমে সেগুলো চালিয়ে
+আগের অবস্থায় ফেরত যাওয়া হয়।
+"""
+
+# users টেবিলের কলামের ক্রম এবং ডিফল্ট মান (SQLite টেবিলের মতো)
+USER_DEFAULTS = {
+    'user_id': None, 'username': None, 'balance': 0, 'is_verified': 0, 'is_banned': 0,
+    'warning_count': 0, 'language': 'bn', 'timezone': None, 'join_date': None,
+    'referrer_id': None, 'last_daily_bonus': None, 'last_weekly_bonus': None, 'last_monthly_bonus': None
+}
+
+
+def _as_text(value):
+    """datetime মানকে SQLite এর মতো স্ট্রিং হিসেবে সংরক্ষণ করে।"""
+    return value if value is None or isinstance(value, (str, int, float)) else str(value)
+
+
+class _MemoryRepository:
+
+    def __init__(self, store):
+        self._store = store
+
+    def _set(self, row, field, value):
+        """একটি সারির একটি ফিল্ড পরিবর্তন করে এবং undo রেকর্ড রাখে।"""
+        old_value = row[field]
+        row[field] = value
+        self._store._record_undo(lambda: row.__setitem__(field, old_value))
+
+    def _insert(self, table, key, row):
+        table[key] = row
+        self._store._record_undo(lambda: table.pop(key, None))
+
+    def _next_id(self, name):
+        new_id = self._store._sequences[name] + 1
+        self._store._sequences[name] = new_id
+        self._store._record_undo(lambda: self._store._sequences.__setitem__(name, new_id - 1))
+        return new_id
+
+    def _iter_batches(self, table, columns, batch_size, predicate=None):
+        """
+        keyset পেজিং দিয়ে টেবিলের সারিগুলো কী এর ক্রমে ব্যাচ আকারে yield করে।
+        লক শুধু একটি ব্যাচ পড়ার সময় নেওয়া হয়, তাই লম্বা এক্সপোর্টের মাঝে লেখকরা আটকে থাকে না।
+        """
+        last_key = None
+        while True:
+            with self._store._lock:
+                keys = heapq.nsmallest(batch_size, (key for key, row in table.items()
+                                                    if (last_key is None or key > last_key)
+                                                    and (predicate is None or predicate(row))))
+                batch = [tuple(table[key][column] for column in columns) for key in keys]
+            if not batch:
+                return
+            yield batch
+            last_key = keys[-1]
+
+class MemoryUserRepository(_MemoryRepository, UserRepository):
+
+    def get(self, user_id):
+        with self._store._lock:
+            row = self._store.users_data.get(user_id)
+            return dict(row) if row else None
+
+    def create(self, user_id, username, language, referrer_id, join_date):
+        with self._store.transaction():
+            if user_id in self._store.users_data:
+                return False
+            row = dict(USER_DEFAULTS)
+            row.update(user_id=user_id, username=username, language=language,
+                       referrer_id=referrer_id, join_date=_as_text(join_date))
+            self._insert(self._store.users_data, user_id, row)
+            return True
+
+    def add_balance(self, user_id, amount_change):
+        with self._store.transaction():
+            row = self._store.users_data.get(user_id)
+            if row:
+                self._set(row, 'balance', row['balance'] + amount_change)
+
+    def debit_if_sufficient(self, user_id, amount):
+        with self._store.transaction():
+            row = self._store.users_data.get(user_id)
+            if row is None or row['balance'] < amount:
+                return False
+            self._set(row, 'balance', row['balance'] - amount)
+            return True
+
+    def _set_flag(self, user_id, field, status):
+        with self._store.transaction():
+            row = self._store.users_data.get(user_id)
+            if row is None or row[field] == int(bool(status)):
+                return False
+            self._set(row, field, int(bool(status)))
+            return True
+
+    def set_verified(self, user_id, status):
+        return self._set_flag(user_id, 'is_verified', status)
+
+    def set_banned(self, user_id, status):
+        return self._set_flag(user_id, 'is_banned', status)
+
+    def list_unbanned_ids_after(self, after_user_id, limit):
+        with self._store._lock:
+            return heapq.nsmallest(limit, (user_id for user_id, row in self._store.users_data.items()
+                                           if user_id > after_user_id and not row['is_banned']))
+
+    def iter_export(self, batch_size):
+        return self._iter_batches(self._store.users_data, USER_EXPORT_COLUMNS, batch_size)
+
+    def existing_ids(self, user_ids):
+        with self._store._lock:
+            return {user_id for user_id in user_ids if user_id in self._store.users_data}
+
+    def add_balance_many(self, changes):
+        with self._store.transaction():
+            for user_id, amount_change in changes:
+                self.add_balance(user_id, amount_change)
+
+    def get_balances(self, user_ids):
+        with self._store._lock:
+            users = self._store.users_data
+            return {user_id: users[user_id]['balance'] for user_id in user_ids if user_id in users}
+
+    def apply_balance_changes(self, changes):
+        with self._store.transaction():
+            applied = 0
+            for user_id, amount_change in changes:
+                row = self._store.users_data.get(user_id)
+                if row is None or (amount_change < 0 and row['balance'] < -amount_change):
+                    continue
+                self._set(row, 'balance', row['balance'] + amount_change)
+                applied += 1
+            return applied
+
+    def set_banned_many(self, user_ids, status):
+        with self._store.transaction():
+            return sum(1 for user_id in user_ids if self._set_flag(user_id, 'is_banned', status))
+
+    def add_warnings(self, user_id, increment):
+        with self._store.transaction():
+            row = self._store.users_data.get(user_id)
+            if row is None:
+                return 0
+            self._set(row, 'warning_count', row['warning_count'] + increment)
+            return row['warning_count']
+
+    def set_language(self, user_id, lang_code):
+        with self._store.transaction():
+            row = self._store.users_data.get(user_id)
+            if row:
+                self._set(row, 'language', lang_code)
+
+    def mark_daily_bonus(self, user_id, day):
+        with self._store.transaction():
+            row = self._store.users_data.get(user_id)
+            if row is None or (row['last_daily_bonus'] is not None and row['last_daily_bonus'] >= day):
+                return False
+            self._set(row, 'last_daily_bonus', day)
+            return True
+
+
+class MemoryAdRepository(_MemoryRepository, AdRepository):
+
+    def find_unviewed_active(self, user_id):
+        with self._store._lock:
+            # ad_id সবসময় বাড়ে, তাই ডিকশনারির ক্রমই ad_id ক্রম
+            for ad in self._store.ads_data.values():
+                if (ad['status'] == 'active' and ad['owner_user_id'] != user_id
+                        and (ad['ad_id'], user_id) not in self._store.ad_views):
+                    return {column: ad[column] for column in AD_VIEW_COLUMNS}
+            return None
+
+    def add_view(self, ad_id, user_id):
+        with self._store.transaction():
+            key = (ad_id, user_id)
+            if key in self._store.ad_views:
+                return False
+            self._store.ad_views.add(key)
+            self._store._record_undo(lambda: self._store.ad_views.discard(key))
+            return True
+
+    def increment_views(self, ad_id, cost=0):
+        with self._store.transaction():
+            ad = self._store.ads_data.get(ad_id)
+            if ad is None or ad['status'] != 'active':
+                return None
+            budget = ad['budget']
+            if budget is not None and ad['budget_spent'] + cost > budget:
+                return None
+            self._set(ad, 'current_views', ad['current_views'] + 1)
+            self._set(ad, 'budget_spent', ad['budget_spent'] + cost)
+            if ad['current_views'] >= ad['target_views'] or (budget is not None and ad['budget_spent'] + cost > budget):
+                self._set(ad, 'status', 'completed')
+                return True
+            return False
+
+    def complete_if_exhausted(self, ad_id, cost):
+        with self._store.transaction():
+            ad = self._store.ads_data.get(ad_id)
+            if (ad is None or ad['status'] != 'active' or ad['budget'] is None
+                    or ad['budget_spent'] + cost <= ad['budget']):
+                return False
+            self._set(ad, 'status', 'completed')
+            return True
+
+    def create(self, owner_user_id, ad_source, ad_type, ad_content, target_views, duration, status='pending',
+               reward_per_view=None, budget=None):
+        with self._store.transaction():
+            ad_id = self._next_id('ads')
+            self._insert(self._store.ads_data, ad_id, {
+                'ad_id': ad_id, 'owner_user_id': owner_user_id, 'ad_source': ad_source, 'ad_type': ad_type,
+                'ad_content': ad_content, 'status': status, 'target_views': target_views, 'current_views': 0,
+                'view_duration_seconds': duration, 'viewed_by_users': None,
+                'reward_per_view': reward_per_view, 'budget': budget, 'budget_spent': 0
+            })
+            return ad_id
+
+    def list_by_status(self, status):
+        with self._store._lock:
+            return [tuple(ad[column] for column in AD_COLUMNS)
+                    for ad in self._store.ads_data.values() if ad['status'] == status]
+
+    def count_by_status(self, status):
+        with self._store._lock:
+            return sum(1 for ad in self._store.ads_data.values() if ad['status'] == status)
+
+    def get_adjacent(self, status, ad_id, forward=True):
+        with self._store._lock:
+            # ad_id সবসময় বাড়ে, তাই ডিকশনারির ক্রমই ad_id ক্রম
+            ads = self._store.ads_data.values() if forward else reversed(list(self._store.ads_data.values()))
+            for ad in ads:
+                if ad['status'] == status and (ad['ad_id'] > ad_id if forward else ad['ad_id'] < ad_id):
+                    return {column: ad[column] for column in AD_REVIEW_COLUMNS}
+            return None
+
+    def get_status(self, ad_id):
+        with self._store._lock:
+            ad = self._store.ads_data.get(ad_id)
+            return ad['status'] if ad else None
+
+    def set_status(self, ad_id, status):
+        with self._store.transaction():
+            ad = self._store.ads_data.get(ad_id)
+            if ad:
+                self._set(ad, 'status', status)
+
+
+class MemoryTransactionRepository(_MemoryRepository, TransactionRepository):
+
+    def insert(self, user_id, trans_type, amount, status, timestamp, details_json):
+        with self._store.transaction():
+            transaction_id = self._next_id('transactions')
+            self._insert(self._store.transactions_data, transaction_id, {
+                'transaction_id': transaction_id, 'user_id': user_id, 'type': trans_type, 'amount': amount,
+                'status': status, 'timestamp': _as_text(timestamp), 'details': details_json
+            })
+            user_ids = self._store.user_transactions.setdefault(user_id, [])
+            user_ids.append(transaction_id)
+            self._store._record_undo(user_ids.pop)
+            return transaction_id
+
+    def insert_many(self, rows):
+        with self._store.transaction():
+            for row in rows:
+                self.insert(*row)
+
+    def _user_rows(self, user_id):
+        """একজন ব্যবহারকারীর লেনদেনগুলো (timestamp, transaction_id) এর উল্টো ক্রমে।"""
+        rows = [self._store.transactions_data[t_id] for t_id in self._store.user_transactions.get(user_id, [])]
+        rows.sort(key=lambda row: (row['timestamp'], row['transaction_id']), reverse=True)
+        return rows
+
+    def list_recent(self, user_id, limit):
+        with self._store._lock:
+            return [(row['type'], row['amount'], row['status'], row['timestamp'])
+                    for row in self._user_rows(user_id)[:limit]]
+
+    def page(self, user_id, limit, before=None):
+        with self._store._lock:
+            rows = self._user_rows(user_id)
+            if before:
+                rows = [row for row in rows if (row['timestamp'], row['transaction_id']) < tuple(before)]
+            return [{key: row[key] for key in ('transaction_id', 'type', 'amount', 'status', 'timestamp')}
+                    for row in rows[:limit]]
+
+
+    def iter_export(self, batch_size, trans_type=None, status=None, date_from=None, date_to=None):
+        def matches(row):
+            # SQLite এর মতো NULL timestamp কোনো তারিখ ফিল্টারের সাথে মেলে না
+            timestamp = row['timestamp']
+            return ((trans_type is None or row['type'] == trans_type)
+                    and (status is None or row['status'] == status)
+                    and (date_from is None or (timestamp is not None and timestamp >= date_from))
+                    and (date_to is None or (timestamp is not None and timestamp < date_to)))
+        return self._iter_batches(self._store.transactions_data, TRANSACTION_EXPORT_COLUMNS, batch_size, matches)
+
+    def _withdrawals(self, status):
+        return [row for row in self._store.transactions_data.values()
+                if row['type'] == 'withdrawal' and row['status'] == status]
+
+    def claim_withdrawals(self, limit, min_amount):
+        with self._store.transaction():
+            rows = [row for row in self._withdrawals('pending') if row['amount'] <= -min_amount][:limit]
+            for row in rows:
+                self._set(row, 'status', 'processing')
+            return [{key: row[key] for key in ('transaction_id', 'user_id', 'amount', 'details')} for row in rows]
+
+    def finish_withdrawals(self, rows):
+        finished = []
+        with self._store.transaction():
+            for transaction_id, status, details_json in rows:
+                row = self._store.transactions_data.get(transaction_id)
+                if row and row['type'] == 'withdrawal' and row['status'] == 'processing':
+                    self._set(row, 'status', status)
+                    self._set(row, 'details', details_json)
+                    finished.append(transaction_id)
+        return finished
+
+    def list_processing_withdrawals(self, after_id, limit):
+        with self._store._lock:
+            rows = heapq.nsmallest(limit, (row for row in self._withdrawals('processing') if row['transaction_id'] > after_id),
+                                   key=lambda row: row['transaction_id'])
+            return [{key: row[key] for key in ('transaction_id', 'user_id', 'amount', 'details')} for row in rows]
+
+    def requeue_processing_withdrawals(self):
+        def in_flight(row):
+            try:
+                return bool(json.loads(row['details'] or '{}').get('payout_id'))
+            except (ValueError, AttributeError):
+                return False
+
+        with self._store.transaction():
+            rows = [row for row in self._withdrawals('processing') if not in_flight(row)]
+            for row in rows:
+                self._set(row, 'status', 'pending')
+            return len(rows)
+
+class MemorySettingsRepository(_MemoryRepository, SettingsRepository):
+
+    def _bump_version(self):
+        old_version = self._store.settings_version
+        self._store.settings_version = old_version + 1
+        self._store._record_undo(lambda: setattr(self._store, 'settings_version', old_version))
+
+    def get_version(self):
+        return self._store.settings_version
+
+    def load_all(self):
+        with self._store._lock:
+            return self._store.settings_version, {
+                name: (row['value'], row['is_active']) for name, row in self._store.settings_data.items()
+            }
+
+    def insert_defaults(self, defaults):
+        with self._store.transaction():
+            inserted = 0
+            for key, (value, is_active, description) in defaults.items():
+                if key not in self._store.settings_data:
+                    self._insert(self._store.settings_data, key,
+                                 {'value': value, 'is_active': int(bool(is_active)), 'description': description})
+                    inserted += 1
+            if inserted:
+                self._bump_version()
+            return inserted
+
+    def update(self, setting_name, new_value=None, new_status=None):
+        with self._store.transaction():
+            row = self._store.settings_data.get(setting_name)
+            if row is not None:
+                if new_value is not None:
+                    self._set(row, 'value', new_value)
+                if new_status is not None:
+                    self._set(row, 'is_active', int(bool(new_status)))
+            self._bump_version()
+            return self._store.settings_version
+
+
+class MemoryButtonRepository(_MemoryRepository, ButtonRepository):
+
+    def list_children(self, parent_id=None):
+        with self._store._lock:
+            rows = [dict(row) for row in self._store.buttons_data.values() if row['parent_id'] == parent_id]
+            rows.sort(key=lambda row: (row['position'], row['button_id']))
+            return rows
+
+    def add(self, button_text, action_type, action_value=None, parent_id=None, position=0):
+        with self._store.transaction():
+            button_id = self._next_id('buttons')
+            values = (button_id, button_text, parent_id, action_type, action_value, position)
+            self._insert(self._store.buttons_data, button_id, dict(zip(BUTTON_COLUMNS, values)))
+            return button_id
+
+    def delete(self, button_id):
+        with self._store.transaction():
+            row = self._store.buttons_data.pop(button_id, None)
+            if row is None:
+                return False
+            self._store._record_undo(lambda: self._store.buttons_data.__setitem__(button_id, row))
+            return True
+
+
+class MemoryBroadcastRepository(_MemoryRepository, BroadcastRepository):
+
+    def create(self, admin_id, from_chat_id, message_id, status_chat_id, status_message_id, created_at):
+        with self._store.transaction():
+            broadcast_id = self._next_id('broadcasts')
+            self._insert(self._store.broadcasts_data, broadcast_id, {
+                'broadcast_id': broadcast_id, 'admin_id': admin_id, 'from_chat_id': from_chat_id,
+                'message_id': message_id, 'status': 'running', 'last_user_id': 0, 'sent_count': 0,
+                'failed_count': 0, 'blocked_count': 0, 'status_chat_id': status_chat_id,
+                'status_message_id': status_message_id, 'created_at': _as_text(created_at),
+                'updated_at': _as_text(created_at)
+            })
+            return broadcast_id
+
+    def get(self, broadcast_id):
+        with self._store._lock:
+            row = self._store.broadcasts_data.get(broadcast_id)
+            return dict(row) if row else None
+
+    def list_running(self):
+        with self._store._lock:
+            return [dict(row) for row in self._store.broadcasts_data.values() if row['status'] == 'running']
+
+    def save_progress(self, broadcast_id, last_user_id, sent_count, failed_count, blocked_count, updated_at):
+        with self._store.transaction():
+            row = self._store.broadcasts_data.get(broadcast_id)
+            if row:
+                for field, value in (('last_user_id', last_user_id), ('sent_count', sent_count),
+                                     ('failed_count', failed_count), ('blocked_count', blocked_count),
+                                     ('updated_at', _as_text(updated_at))):
+                    self._set(row, field, value)
+
+    def finish(self, broadcast_id, status, updated_at):
+        with self._store.transaction():
+            row = self._store.broadcasts_data.get(broadcast_id)
+            if row is None or row['status'] != 'running':
+                return False
+            self._set(row, 'status', status)
+            self._set(row, 'updated_at', _as_text(updated_at))
+            return True
+
+
+class MemoryBulkBatchRepository(_MemoryRepository, BulkBatchRepository):
+
+    def get(self, batch_key):
+        with self._store._lock:
+            row = self._store.bulk_batches_data.get(batch_key)
+            return dict(row) if row else None
+
+    def save_progress(self, batch_key, batch_name, admin_id, last_line, rows_applied, updated_at):
+        with self._store.transaction():
+            row = self._store.bulk_batches_data.get(batch_key)
+            if row is None:
+                self._insert(self._store.bulk_batches_data, batch_key, {
+                    'batch_key': batch_key, 'batch_name': batch_name, 'admin_id': admin_id, 'status': 'running',
+                    'last_line': last_line, 'rows_applied': rows_applied, 'created_at': _as_text(updated_at),
+                    'updated_at': _as_text(updated_at)
+                })
+                return
+            for field, value in (('batch_name', batch_name), ('admin_id', admin_id), ('last_line', last_line),
+                                 ('rows_applied', row['rows_applied'] + rows_applied),
+                                 ('updated_at', _as_text(updated_at))):
+                self._set(row, field, value)
+
+    def finish(self, batch_key, updated_at):
+        with self._store.transaction():
+            row = self._store.bulk_batches_data.get(batch_key)
+            if row is None or row['status'] != 'running':
+                return False
+            self._set(row, 'status', 'completed')
+            self._set(row, 'updated_at', _as_text(updated_at))
+            return True
+
+
+class MemoryStatsRepository(_MemoryRepository, StatsRepository):
+
+    def _put(self, key, value):
+        stats = self._store.stats_data
+        if key in stats:
+            old_value = stats[key]
+            self._store._record_undo(lambda: stats.__setitem__(key, old_value))
+        else:
+            self._store._record_undo(lambda: stats.pop(key, None))
+        stats[key] = value
+
+    def increment(self, stat_name, stat_date, delta):
+        with self._store.transaction():
+            key = (stat_name, stat_date)
+            self._put(key, self._store.stats_data.get(key, 0) + delta)
+
+    def get_for_dates(self, stat_dates):
+        with self._store._lock:
+            return [(name, stat_date, value) for (name, stat_date), value in self._store.stats_data.items()
+                    if stat_date in stat_dates]
+
+    def has_global(self):
+        with self._store._lock:
+            return any(stat_date == '' for _, stat_date in self._store.stats_data)
+
+    def recompute(self, today, reward_types):
+        with self._store.transaction():
+            users = self._store.users_data.values()
+            transactions = self._store.transactions_data.values()
+            values = {
+                'total_users': len(users),
+                'verified_users': sum(1 for user in users if user['is_verified']),
+                'banned_users': sum(1 for user in users if user['is_banned']),
+                'active_ads': sum(1 for ad in self._store.ads_data.values() if ad['status'] == 'active'),
+                'pending_withdrawals': sum(1 for row in transactions
+                                           if row['type'] == 'withdrawal' and row['status'] == 'pending'),
+            }
+            rewards_today = sum(row['amount'] for row in transactions
+                                if row['type'] in reward_types and str(row['timestamp'])[:10] == today)
+
+            for key in [key for key in self._store.stats_data if key[1] == '']:
+                old_value = self._store.stats_data.pop(key)
+                self._store._record_undo(lambda key=key, old_value=old_value: self._store.stats_data.__setitem__(key, old_value))
+            for name, value in values.items():
+                self._put((name, ''), value)
+            self._put(('rewards_paid', today), rewards_today)
+
+
+class MemoryReconciliationRepository(_MemoryRepository, ReconciliationRepository):
+
+    def get_state(self):
+        with self._store._lock:
+            return dict(self._store.reconciliation_state)
+
+    def collect_deltas(self, after_transaction_id):
+        with self._store._lock:
+            upto = self._store._sequences['transactions']
+            deltas = {}
+            # transaction_id ক্রমিক, তাই শুধু নতুন আইডিগুলো দেখা হয়
+            for transaction_id in range(after_transaction_id + 1, upto + 1):
+                row = self._store.transactions_data.get(transaction_id)
+                if row:
+                    deltas[row['user_id']] = deltas.get(row['user_id'], 0) + row['amount']
+            return max(upto, after_transaction_id), list(deltas.items())
+
+    def apply_deltas(self, expected_checkpoint, new_checkpoint, deltas):
+        with self._store.transaction():
+            state = self._store.reconciliation_state
+            if state['last_transaction_id'] != expected_checkpoint:
+                return False
+            self._set(state, 'last_transaction_id', new_checkpoint)
+            totals = self._store.ledger_totals
+            for user_id, delta in deltas:
+                old_total = totals.get(user_id)
+                totals[user_id] = (old_total or 0) + delta
+                if old_total is None:
+                    self._store._record_undo(lambda user_id=user_id: totals.pop(user_id, None))
+                else:
+                    self._store._record_undo(lambda user_id=user_id, old_total=old_total: totals.__setitem__(user_id, old_total))
+            return True
+
+    def find_mismatches(self, limit):
+        with self._store._lock:
+            totals = self._store.ledger_totals
+            return heapq.nsmallest(limit, ((user_id, row['balance'], totals.get(user_id, 0))
+                                           for user_id, row in self._store.users_data.items()
+                                           if row['balance'] != totals.get(user_id, 0)))
+
+    def verify_users(self, user_ids):
+        with self._store._lock:
+            mismatched = []
+            for user_id in sorted(set(user_ids)):
+                row = self._store.users_data.get(user_id)
+                if row is None:
+                    continue
+                ledger_total = sum(self._store.transactions_data[t_id]['amount']
+                                   for t_id in self._store.user_transactions.get(user_id, []))
+                if row['balance'] != ledger_total:
+                    mismatched.append((user_id, row['balance'], ledger_total))
+            return mismatched
+
+    def record_run(self, run_at, mismatch_count):
+        with self._store.transaction():
+            state = self._store.reconciliation_state
+            self._set(state, 'last_run_at', _as_text(run_at))
+            self._set(state, 'last_mismatch_count', mismatch_count)
+
+class MemoryStorage(StorageBackend):
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._sequences = {'ads': 0, 'transactions': 0, 'buttons': 0, 'broadcasts': 0}
+
+        self.users_data = {}          # {user_id: সারি}
+        self.ads_data = {}            # {ad_id: সারি}
+        self.ad_views = set()         # {(ad_id, user_id)}
+        self.transactions_data = {}   # {transaction_id: সারি}
+        self.user_transactions = {}   # {user_id: [transaction_id, ...]}
+        self.settings_data = {}       # {setting_name: সারি}
+        self.settings_version = 0
+        self.buttons_data = {}        # {button_id: সারি}
+        self.broadcasts_data = {}     # {broadcast_id: সারি}
+        self.bulk_batches_data = {}   # {batch_key: সারি}
+        self.stats_data = {}          # {(stat_name, stat_date): মান}
+        self.ledger_totals = {}       # {user_id: চলমান লেজার যোগফল}
+        self.reconciliation_state = {'last_transaction_id': 0, 'last_run_at': None, 'last_mismatch_count': 0}
+
+        self.users = MemoryUserRepository(self)
+        self.ads = MemoryAdRepository(self)
+        self.transactions = MemoryTransactionRepository(self)
+        self.settings = MemorySettingsRepository(self)
+        self.buttons = MemoryButtonRepository(self)
+        self.broadcasts = MemoryBroadcastRepository(self)
+        self.bulk_batches = MemoryBulkBatchRepository(self)
+        self.stats = MemoryStatsRepository(self)
+        self.reconciliation = MemoryReconciliationRepository(self)
+
+    def initialize(self):
+        print("মেমোরি স্টোরেজ ব্যবহার করা হচ্ছে (ডাটা স্থায়ীভাবে সংরক্ষিত হবে না)।")
+
+    def _record_undo(self, undo):
+        self._local.undo.append(undo)
+
+    @contextmanager
+    def transaction(self):
+        depth = getattr(self._local, 'depth', 0)
+        if depth > 0:
+            # নেস্টেড ব্লক: বাইরের ট্রানজেকশনের অংশ; ব্যর্থ হলে পুরোটা রোলব্যাক হবে
+            self._local.depth = depth + 1
+            try:
+                yield self
+            except BaseException:
+                self._local.failed = True
+                raise
+            finally:
+                self._local.depth = depth
+            return
+
+        with self._lock:
+            self._local.undo = []
+            self._local.failed = False
+            self._local.after_commit = []
+            self._local.depth = 1
+            try:
+                yield self
+                if self._local.failed:
+                    raise StorageError("ট্রানজেকশনের একটি অংশ ব্যর্থ হয়েছে, তাই সবকিছু রোলব্যাক করা হয়েছে।")
+            except BaseException:
+                for undo in reversed(self._local.undo):
+                    undo()
+                self._local.after_commit = []
+                raise
+            finally:
+                self._local.depth = 0
+                self._local.undo = []
+            callbacks, self._local.after_commit = self._local.after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def on_commit(self, callback):
+        if getattr(self._local, 'depth', 0) > 0:
+            self._local.after_commit.append(callback)
+        else:
+            callback()
@@ -0,0 +1,671 @@
+# advanced_earning_bot/storage/sqlite_storage.py
+
+from database import get_connection, create_read_connection, transaction, on_commit, close_connection, initialize_database
+from .base import (
+    AD_REVIEW_COLUMNS, USER_EXPORT_COLUMNS, TRANSACTION_EXPORT_COLUMNS, StorageBackend, UserRepository, AdRepository, TransactionRepository,
+    SettingsRepository, ButtonRepository, BroadcastRepository, BulkBatchRepository, StatsRepository,
+    ReconciliationRepository
+)
+
+"""
+স্টোরেজ ইন্টারফেসের SQLite ইমপ্লিমেন্টেশন।
+সংযোগ, PRAGMA এবং ট্রানজেকশন `database.py` থেকে আসে; এখানে শুধু কোয়েরিগুলো থাকে।
+ত্রুটি হলে `sqlite3.Error` উঠে আসে, যা ম্যানেজার মডিউলগুলো ধরে।
+"""
+
+
+def _row_to_dict(cursor, row):
+    columns = [description[0] for description in cursor.description]
+    return dict(zip(columns, row))
+
+
+def _iter_batches(sql, params, batch_size):
+    """
+    একটি লম্বা SELECT নিজস্ব রিড-অনলি সংযোগে চালায় এবং ফলাফল `fetchmany` দিয়ে ব্যাচ আকারে yield করে।
+    SQLite সারিগুলো ধাপে ধাপে তৈরি করে, তাই পুরো ফলাফল কখনো মেমোরিতে আসে না; পুরো সময়টা একটি
+    রিড স্ন্যাপশট থেকে পড়া হয়। জেনারেটর শেষ বা বন্ধ হলে (যেমন ক্লায়েন্ট চলে গেলে) সংযোগও বন্ধ হয়।
+    """
+    conn = create_read_connection()
+    try:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        conn.close()
+
+class SQLiteUserRepository(UserRepository):
+
+    def get(self, user_id):
+        cursor = get_connection().cursor()
+        cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
+        row = cursor.fetchone()
+        return _row_to_dict(cursor, row) if row else None
+
+    def create(self, user_id, username, language, referrer_id, join_date):
+        with transaction() as conn:
+            cursor = conn.execute(
+                """
+                INSERT OR IGNORE INTO users (user_id, username, language, referrer_id, join_date)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (user_id, username, language, referrer_id, join_date)
+            )
+            return cursor.rowcount > 0
+
+    def add_balance(self, user_id, amount_change):
+        with transaction() as conn:
+            conn.execute("UPDATE users SET balance = balance + ? WHERE user_id = ?", (amount_change, user_id))
+
+    def debit_if_sufficient(self, user_id, amount):
+        with transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE users SET balance = balance - ? WHERE user_id = ? AND balance >= ?", (amount, user_id, amount)
+            )
+            return cursor.rowcount > 0
+
+    def set_verified(self, user_id, status):
+        with transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE users SET is_verified = ? WHERE user_id = ? AND is_verified IS NOT ?", (status, user_id, status)
+            )
+            return cursor.rowcount > 0
+
+    def set_banned(self, user_id, status):
+        with transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE users SET is_banned = ? WHERE user_id = ? AND is_banned IS NOT ?", (status, user_id, status)
+            )
+            return cursor.rowcount > 0
+
+    def list_unbanned_ids_after(self, after_user_id, limit):
+        # প্রাইমারি কী এর উপর রেঞ্জ স্ক্যান; প্রতিটি পেজ একই সময়ে আসে, টেবিল যত বড়ই হোক
+        rows = get_connection().execute(
+            "SELECT user_id FROM users WHERE user_id > ? AND NOT is_banned ORDER BY user_id LIMIT ?",
+            (after_user_id, limit)
+        )
+        return [row[0] for row in rows]
+
+    def iter_export(self, batch_size):
+        sql = f"SELECT {', '.join(USER_EXPORT_COLUMNS)} FROM users ORDER BY user_id"
+        return _iter_batches(sql, (), batch_size)
+
+    def existing_ids(self, user_ids):
+        user_ids = list(user_ids)
+        found = set()
+        # SQLite এর প্যারামিটার সংখ্যার সীমার নিচে থাকতে টুকরো করে খোঁজা হয়
+        for start in range(0, len(user_ids), 500):
+            chunk = user_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = get_connection().execute(f"SELECT user_id FROM users WHERE user_id IN ({placeholders})", chunk)
+            found.update(row[0] for row in rows)
+        return found
+
+    def add_balance_many(self, changes):
+        with transaction() as conn:
+            conn.executemany("UPDATE users SET balance = balance + ? WHERE user_id = ?",
+                             ((amount_change, user_id) for user_id, amount_change in changes))
+
+    def get_balances(self, user_ids):
+        user_ids = list(user_ids)
+        balances = {}
+        for start in range(0, len(user_ids), 500):
+            chunk = user_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = get_connection().execute(f"SELECT user_id, balance FROM users WHERE user_id IN ({placeholders})", chunk)
+            balances.update(rows)
+        return balances
+
+    def apply_balance_changes(self, changes):
+        with transaction() as conn:
+            cursor = conn.executemany(
+                "UPDATE users SET balance = balance + ? WHERE user_id = ? AND (? > 0 OR balance >= -?)",
+                ((amount_change, user_id, amount_change, amount_change) for user_id, amount_change in changes)
+            )
+            return cursor.rowcount
+
+    def set_banned_many(self, user_ids, status):
+        with transaction() as conn:
+            cursor = conn.executemany(
+                "UPDATE users SET is_banned = ? WHERE user_id = ? AND is_banned IS NOT ?",
+                ((status, user_id, status) for user_id in user_ids)
+            )
+            return cursor.rowcount
+
+    def add_warnings(self, user_id, increment):
+        with transaction() as conn:
+            conn.execute("UPDATE users SET warning_count = warning_count + ? WHERE user_id = ?", (increment, user_id))
+            row = conn.execute("SELECT warning_count FROM users WHERE user_id = ?", (user_id,)).fetchone()
+            return row[0] if row else 0
+
+    def set_language(self, user_id, lang_code):
+        with transaction() as conn:
+            conn.execute("UPDATE users SET language = ? WHERE user_id = ?", (lang_code, user_id))
+
+    def mark_daily_bonus(self, user_id, day):
+        with transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE users SET last_daily_bonus = ? WHERE user_id = ? AND (last_daily_bonus IS NULL OR last_daily_bonus < ?)",
+                (day, user_id, day)
+            )
+            return cursor.rowcount > 0
+
+
+class SQLiteAdRepository(AdRepository):
+
+    def find_unviewed_active(self, user_id):
+        # NOT EXISTS অংশটি (ad_id, user_id) ইনডেক্স ব্যবহার করে, তাই অন্য বিজ্ঞাপনের
+        # ভিউ ইতিহাস লোড করতে হয় না।
+        cursor = get_connection().cursor()
+        cursor.execute(
+            """
+            SELECT ad_id, owner_user_id, ad_source, ad_type, ad_content, status,
+                   target_views, current_views, view_duration_seconds, reward_per_view
+            FROM ads
+            WHERE status = 'active' AND owner_user_id != ?
+              AND NOT EXISTS (
+                  SELECT 1 FROM ad_views WHERE ad_views.ad_id = ads.ad_id AND ad_views.user_id = ?
+              )
+            ORDER BY ad_id
+            LIMIT 1
+            """,
+            (user_id, user_id)
+        )
+        row = cursor.fetchone()
+        return _row_to_dict(cursor, row) if row else None
+
+    def add_view(self, ad_id, user_id):
+        # ইউনিক ইনডেক্সের কারণে আগে দেখে থাকলে কোনো সারি যোগ হবে না
+        with transaction() as conn:
+            cursor = conn.execute("INSERT OR IGNORE INTO ad_views (ad_id, user_id) VALUES (?, ?)", (ad_id, user_id))
+            return cursor.rowcount > 0
+
+    def increment_views(self, ad_id, cost=0):
+        # ভিউ এবং বাজেট একই UPDATE এ বদলায়, তাই একসাথে অনেক ভিউ এলেও বাজেটের বেশি খরচ হয় না।
+        # সাধারণ ক্ষেত্রে (টার্গেট এবং পরের ভিউয়ের বাজেট বাকি) একটিই UPDATE লাগে।
+        with transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE ads SET current_views = current_views + 1, budget_spent = budget_spent + ?
+                WHERE ad_id = ? AND status = 'active' AND current_views + 1 < target_views
+                  AND (budget IS NULL OR budget_spent + 2 * ? <= budget)
+                """,
+                (cost, ad_id, cost)
+            )
+            if cursor.rowcount:
+                return False
+            cursor = conn.execute(
+                """
+                UPDATE ads SET current_views = current_views + 1, budget_spent = budget_spent + ?, status = 'completed'
+                WHERE ad_id = ? AND status = 'active' AND (budget IS NULL OR budget_spent + ? <= budget)
+                """,
+                (cost, ad_id, cost)
+            )
+            return True if cursor.rowcount else None
+
+    def complete_if_exhausted(self, ad_id, cost):
+        with transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE ads SET status = 'completed'
+                WHERE ad_id = ? AND status = 'active' AND budget IS NOT NULL AND budget_spent + ? > budget
+                """,
+                (ad_id, cost)
+            )
+            return cursor.rowcount > 0
+
+    def create(self, owner_user_id, ad_source, ad_type, ad_content, target_views, duration, status='pending',
+               reward_per_view=None, budget=None):
+        with transaction() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO ads (owner_user_id, ad_source, ad_type, ad_content, target_views, view_duration_seconds,
+                                 status, reward_per_view, budget)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (owner_user_id, ad_source, ad_type, ad_content, target_views, duration, status, reward_per_view, budget)
+            )
+            return cursor.lastrowid
+
+    def list_by_status(self, status):
+        return get_connection().execute("SELECT * FROM ads WHERE status = ?", (status,)).fetchall()
+
+    def count_by_status(self, status):
+        # (status, ad_id) ইনডেক্স থেকেই গোনা হয়, টেবিলের সারি পড়তে হয় না
+        return get_connection().execute("SELECT COUNT(*) FROM ads WHERE status = ?", (status,)).fetchone()[0]
+
+    def get_adjacent(self, status, ad_id, forward=True):
+        # (status, ad_id) ইনডেক্সে সরাসরি সেই জায়গায় গিয়ে একটি সারি পড়া হয়
+        comparison, order = ('>', 'ASC') if forward else ('<', 'DESC')
+        cursor = get_connection().cursor()
+        cursor.execute(
+            f"SELECT {', '.join(AD_REVIEW_COLUMNS)} FROM ads WHERE status = ? AND ad_id {comparison} ? "
+            f"ORDER BY ad_id {order} LIMIT 1",
+            (status, ad_id)
+        )
+        row = cursor.fetchone()
+        return _row_to_dict(cursor, row) if row else None
+
+    def get_status(self, ad_id):
+        row = get_connection().execute("SELECT status FROM ads WHERE ad_id = ?", (ad_id,)).fetchone()
+        return row[0] if row else None
+
+    def set_status(self, ad_id, status):
+        with transaction() as conn:
+            conn.execute("UPDATE ads SET status = ? WHERE ad_id = ?", (status, ad_id))
+
+
+class SQLiteTransactionRepository(TransactionRepository):
+
+    INSERT_SQL = """
+        INSERT INTO transactions (user_id, type, amount, status, timestamp, details)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+
+    def insert(self, user_id, trans_type, amount, status, timestamp, details_json):
+        with transaction() as conn:
+            cursor = conn.execute(self.INSERT_SQL, (user_id, trans_type, amount, status, timestamp, details_json))
+            return cursor.lastrowid
+
+    def insert_many(self, rows):
+        with transaction() as conn:
+            conn.executemany(self.INSERT_SQL, rows)
+
+    def list_recent(self, user_id, limit):
+        return get_connection().execute(
+            "SELECT type, amount, status, timestamp FROM transactions WHERE user_id = ? ORDER BY timestamp DESC LIMIT ?",
+            (user_id, limit)
+        ).fetchall()
+
+    def page(self, user_id, limit, before=None):
+        # (user_id, timestamp) ইনডেক্সের কারণে প্রতিটি পেজ একই সময়ে লোড হয়, ইতিহাস যত বড়ই হোক
+        cursor = get_connection().cursor()
+        if before:
+            cursor.execute(
+                """
+                SELECT transaction_id, type, amount, status, timestamp FROM transactions
+                WHERE user_id = ? AND (timestamp, transaction_id) < (?, ?)
+                ORDER BY timestamp DESC, transaction_id DESC LIMIT ?
+                """,
+                (user_id, before[0], before[1], limit)
+            )
+        else:
+            cursor.execute(
+                """
+                SELECT transaction_id, type, amount, status, timestamp FROM transactions
+                WHERE user_id = ?
+                ORDER BY timestamp DESC, transaction_id DESC LIMIT ?
+                """,
+                (user_id, limit)
+            )
+        return [_row_to_dict(cursor, row) for row in cursor.fetchall()]
+
+
+    def iter_export(self, batch_size, trans_type=None, status=None, date_from=None, date_to=None):
+        conditions, params = [], []
+        for condition, value in (("type = ?", trans_type), ("status = ?", status),
+                                 ("timestamp >= ?", date_from), ("timestamp < ?", date_to)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # rowid এর ক্রমে পড়া হয়, তাই কোনো সর্টিং (এবং অস্থায়ী B-tree) লাগে না
+        sql = f"SELECT {', '.join(TRANSACTION_EXPORT_COLUMNS)} FROM transactions {where} ORDER BY transaction_id"
+        return _iter_batches(sql, params, batch_size)
+
+    def claim_withdrawals(self, limit, min_amount):
+        with transaction() as conn:
+            cursor = conn.cursor()
+            # withdrawal_queue ইনডেক্স ব্যবহার করে, পুরো লেজার স্ক্যান হয় না
+            cursor.execute(
+                """
+                SELECT transaction_id, user_id, amount, details FROM transactions
+                WHERE type = 'withdrawal' AND status = 'pending' AND amount <= ?
+                ORDER BY transaction_id LIMIT ?
+                """,
+                (-min_amount, limit)
+            )
+            claimed = [_row_to_dict(cursor, row) for row in cursor.fetchall()]
+            cursor.executemany(
+                "UPDATE transactions SET status = 'processing' WHERE transaction_id = ?",
+                [(row['transaction_id'],) for row in claimed]
+            )
+            return claimed
+
+    def finish_withdrawals(self, rows):
+        finished = []
+        with transaction() as conn:
+            for transaction_id, status, details_json in rows:
+                cursor = conn.execute(
+                    """
+                    UPDATE transactions SET status = ?, details = ?
+                    WHERE transaction_id = ? AND type = 'withdrawal' AND status = 'processing'
+                    """,
+                    (status, details_json, transaction_id)
+                )
+                if cursor.rowcount:
+                    finished.append(transaction_id)
+        return finished
+
+    def list_processing_withdrawals(self, after_id, limit):
+        cursor = get_connection().cursor()
+        cursor.execute(
+            """
+            SELECT transaction_id, user_id, amount, details FROM transactions
+            WHERE type = 'withdrawal' AND status = 'processing' AND transaction_id > ?
+            ORDER BY transaction_id LIMIT ?
+            """,
+            (after_id, limit)
+        )
+        return [_row_to_dict(cursor, row) for row in cursor.fetchall()]
+
+    def requeue_processing_withdrawals(self):
+        with transaction() as conn:
+            return conn.execute(
+                """
+                UPDATE transactions SET status = 'pending'
+                WHERE type = 'withdrawal' AND status = 'processing'
+                  AND (CASE WHEN json_valid(details) THEN json_extract(details, '$.payout_id') END) IS NULL
+                """
+            ).rowcount
+
+class SQLiteSettingsRepository(SettingsRepository):
+
+    def get_version(self):
+        row = get_connection().execute("SELECT version FROM bot_config_version WHERE id = 1").fetchone()
+        return row[0] if row else 0
+
+    def load_all(self):
+        conn = get_connection()
+        # ভার্সন আগে পড়া হয়; এর মধ্যে কেউ লিখলে পরের চেকে আবার রিলোড হবে
+        version = self.get_version()
+        rows = conn.execute("SELECT setting_name, setting_value, is_active FROM bot_config").fetchall()
+        return version, {name: (value, is_active) for name, value, is_active in rows}
+
+    def insert_defaults(self, defaults):
+        with transaction() as conn:
+            inserted = 0
+            for key, (value, is_active, description) in defaults.items():
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO bot_config (setting_name, setting_value, is_active, description) VALUES (?, ?, ?, ?)",
+                    (key, value, is_active, description)
+                )
+                inserted += cursor.rowcount
+            if inserted:
+                conn.execute("UPDATE bot_config_version SET version = version + 1 WHERE id = 1")
+            return inserted
+
+    def update(self, setting_name, new_value=None, new_status=None):
+        with transaction() as conn:
+            if new_value is not None and new_status is not None:
+                conn.execute("UPDATE bot_config SET setting_value = ?, is_active = ? WHERE setting_name = ?", (new_value, new_status, setting_name))
+            elif new_value is not None:
+                conn.execute("UPDATE bot_config SET setting_value = ? WHERE setting_name = ?", (new_value, setting_name))
+            elif new_status is not None:
+                conn.execute("UPDATE bot_config SET is_active = ? WHERE setting_name = ?", (new_status, setting_name))
+
+            conn.execute("UPDATE bot_config_version SET version = version + 1 WHERE id = 1")
+            return self.get_version()
+
+
+class SQLiteButtonRepository(ButtonRepository):
+
+    def list_children(self, parent_id=None):
+        cursor = get_connection().cursor()
+        cursor.execute(
+            "SELECT * FROM dynamic_buttons WHERE parent_id IS ? ORDER BY position, button_id", (parent_id,)
+        )
+        return [_row_to_dict(cursor, row) for row in cursor.fetchall()]
+
+    def add(self, button_text, action_type, action_value=None, parent_id=None, position=0):
+        with transaction() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO dynamic_buttons (button_text, parent_id, action_type, action_value, position)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (button_text, parent_id, action_type, action_value, position)
+            )
+            return cursor.lastrowid
+
+    def delete(self, button_id):
+        with transaction() as conn:
+            cursor = conn.execute("DELETE FROM dynamic_buttons WHERE button_id = ?", (button_id,))
+            return cursor.rowcount > 0
+
+
+class SQLiteBroadcastRepository(BroadcastRepository):
+
+    def create(self, admin_id, from_chat_id, message_id, status_chat_id, status_message_id, created_at):
+        with transaction() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO broadcasts (admin_id, from_chat_id, message_id, status_chat_id, status_message_id,
+                                        created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (admin_id, from_chat_id, message_id, status_chat_id, status_message_id, created_at, created_at)
+            )
+            return cursor.lastrowid
+
+    def get(self, broadcast_id):
+        cursor = get_connection().cursor()
+        cursor.execute("SELECT * FROM broadcasts WHERE broadcast_id = ?", (broadcast_id,))
+        row = cursor.fetchone()
+        return _row_to_dict(cursor, row) if row else None
+
+    def list_running(self):
+        cursor = get_connection().cursor()
+        cursor.execute("SELECT * FROM broadcasts WHERE status = 'running' ORDER BY broadcast_id")
+        return [_row_to_dict(cursor, row) for row in cursor.fetchall()]
+
+    def save_progress(self, broadcast_id, last_user_id, sent_count, failed_count, blocked_count, updated_at):
+        with transaction() as conn:
+            conn.execute(
+                """
+                UPDATE broadcasts SET last_user_id = ?, sent_count = ?, failed_count = ?, blocked_count = ?, updated_at = ?
+                WHERE broadcast_id = ?
+                """,
+                (last_user_id, sent_count, failed_count, blocked_count, updated_at, broadcast_id)
+            )
+
+    def finish(self, broadcast_id, status, updated_at):
+        with transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE broadcasts SET status = ?, updated_at = ? WHERE broadcast_id = ? AND status = 'running'",
+                (status, updated_at, broadcast_id)
+            )
+            return cursor.rowcount > 0
+
+
+class SQLiteBulkBatchRepository(BulkBatchRepository):
+
+    def get(self, batch_key):
+        cursor = get_connection().cursor()
+        cursor.execute("SELECT * FROM bulk_batches WHERE batch_key = ?", (batch_key,))
+        row = cursor.fetchone()
+        return _row_to_dict(cursor, row) if row else None
+
+    def save_progress(self, batch_key, batch_name, admin_id, last_line, rows_applied, updated_at):
+        with transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO bulk_batches (batch_key, batch_name, admin_id, last_line, rows_applied, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (batch_key) DO UPDATE SET batch_name = excluded.batch_name, admin_id = excluded.admin_id,
+                    last_line = excluded.last_line, rows_applied = rows_applied + excluded.rows_applied,
+                    updated_at = excluded.updated_at
+                """,
+                (batch_key, batch_name, admin_id, last_line, rows_applied, updated_at, updated_at)
+            )
+
+    def finish(self, batch_key, updated_at):
+        with transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE bulk_batches SET status = 'completed', updated_at = ? WHERE batch_key = ? AND status = 'running'",
+                (updated_at, batch_key)
+            )
+            return cursor.rowcount > 0
+
+
+class SQLiteStatsRepository(StatsRepository):
+
+    def increment(self, stat_name, stat_date, delta):
+        with transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO bot_stats (stat_name, stat_date, stat_value) VALUES (?, ?, ?)
+                ON CONFLICT (stat_name, stat_date) DO UPDATE SET stat_value = stat_value + excluded.stat_value
+                """,
+                (stat_name, stat_date, delta)
+            )
+
+    def get_for_dates(self, stat_dates):
+        return get_connection().execute(
+            f"SELECT stat_name, stat_date, stat_value FROM bot_stats WHERE stat_date IN ({', '.join('?' * len(stat_dates))})",
+            tuple(stat_dates)
+        ).fetchall()
+
+    def has_global(self):
+        return get_connection().execute("SELECT 1 FROM bot_stats WHERE stat_date = '' LIMIT 1").fetchone() is not None
+
+    def recompute(self, today, reward_types):
+        with transaction() as conn:
+            cursor = conn.cursor()
+            values = {
+                'total_users': cursor.execute("SELECT COUNT(*) FROM users").fetchone()[0],
+                'verified_users': cursor.execute("SELECT COUNT(*) FROM users WHERE is_verified = TRUE").fetchone()[0],
+                'banned_users': cursor.execute("SELECT COUNT(*) FROM users WHERE is_banned = TRUE").fetchone()[0],
+                'active_ads': cursor.execute("SELECT COUNT(*) FROM ads WHERE status = 'active'").fetchone()[0],
+                'pending_withdrawals': cursor.execute(
+                    "SELECT COUNT(*) FROM transactions WHERE type = 'withdrawal' AND status = 'pending'"
+                ).fetchone()[0],
+            }
+            rewards_today = cursor.execute(
+                f"""
+                SELECT COALESCE(SUM(amount), 0) FROM transactions
+                WHERE type IN ({', '.join('?' * len(reward_types))}) AND date(timestamp) = ?
+                """,
+                (*reward_types, today)
+            ).fetchone()[0]
+
+            cursor.execute("DELETE FROM bot_stats WHERE stat_date = ''")
+            cursor.executemany(
+                "INSERT INTO bot_stats (stat_name, stat_date, stat_value) VALUES (?, '', ?)",
+                values.items()
+            )
+            cursor.execute(
+                """
+                INSERT INTO bot_stats (stat_name, stat_date, stat_value) VALUES ('rewards_paid', ?, ?)
+                ON CONFLICT (stat_name, stat_date) DO UPDATE SET stat_value = excluded.stat_value
+                """,
+                (today, rewards_today)
+            )
+
+
+class SQLiteReconciliationRepository(ReconciliationRepository):
+
+    def get_state(self):
+        cursor = get_connection().cursor()
+        cursor.execute("SELECT last_transaction_id, last_run_at, last_mismatch_count FROM reconciliation_state WHERE id = 1")
+        row = cursor.fetchone()
+        return _row_to_dict(cursor, row) if row else {'last_transaction_id': 0, 'last_run_at': None, 'last_mismatch_count': 0}
+
+    def collect_deltas(self, after_transaction_id):
+        conn = get_connection()
+        # SQLite এ একসাথে একজনই লেখে, তাই MAX পর্যন্ত সব সারি কমিট হয়ে গেছে এবং সেগুলো আর বদলায় না;
+        # rowid রেঞ্জ স্ক্যান শুধু নতুন সারিগুলো পড়ে, লেজার যত বড়ই হোক
+        upto = conn.execute("SELECT COALESCE(MAX(transaction_id), 0) FROM transactions").fetchone()[0]
+        if upto <= after_transaction_id:
+            return after_transaction_id, []
+        deltas = conn.execute(
+            """
+            SELECT user_id, SUM(amount) FROM transactions
+            WHERE transaction_id > ? AND transaction_id <= ?
+            GROUP BY user_id
+            """,
+            (after_transaction_id, upto)
+        ).fetchall()
+        return upto, deltas
+
+    def apply_deltas(self, expected_checkpoint, new_checkpoint, deltas):
+        with transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE reconciliation_state SET last_transaction_id = ? WHERE id = 1 AND last_transaction_id = ?",
+                (new_checkpoint, expected_checkpoint)
+            )
+            if cursor.rowcount == 0:
+                return False
+            conn.executemany(
+                """
+                INSERT INTO ledger_totals (user_id, total) VALUES (?, ?)
+                ON CONFLICT (user_id) DO UPDATE SET total = total + excluded.total
+                """,
+                deltas
+            )
+            return True
+
+    def find_mismatches(self, limit):
+        # দুটি টেবিলই user_id প্রাইমারি কী তে সাজানো, তাই এটি একটি সরল স্ক্যান + কী লুকআপ
+        return get_connection().execute(
+            """
+            SELECT u.user_id, u.balance, COALESCE(l.total, 0) FROM users u
+            LEFT JOIN ledger_totals l ON l.user_id = u.user_id
+            WHERE u.balance != COALESCE(l.total, 0)
+            ORDER BY u.user_id LIMIT ?
+            """,
+            (limit,)
+        ).fetchall()
+
+    def verify_users(self, user_ids):
+        user_ids = list(user_ids)
+        mismatched = []
+        # একটি স্টেটমেন্ট = একটি স্ন্যাপশট, তাই ব্যালেন্স এবং লেজার একই মুহূর্তের
+        for start in range(0, len(user_ids), 500):
+            chunk = user_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            mismatched.extend(get_connection().execute(
+                f"""
+                SELECT user_id, balance, ledger_total FROM (
+                    SELECT u.user_id, u.balance,
+                           (SELECT COALESCE(SUM(t.amount), 0) FROM transactions t WHERE t.user_id = u.user_id) AS ledger_total
+                    FROM users u WHERE u.user_id IN ({placeholders})
+                ) WHERE balance != ledger_total ORDER BY user_id
+                """,
+                chunk
+            ).fetchall())
+        return mismatched
+
+    def record_run(self, run_at, mismatch_count):
+        with transaction() as conn:
+            conn.execute(
+                "UPDATE reconciliation_state SET last_run_at = ?, last_mismatch_count = ? WHERE id = 1",
+                (run_at, mismatch_count)
+            )
+
+class SQLiteStorage(StorageBackend):
+
+    def __init__(self):
+        self.users = SQLiteUserRepository()
+        self.ads = SQLiteAdRepository()
+        self.transactions = SQLiteTransactionRepository()
+        self.settings = SQLiteSettingsRepository()
+        self.buttons = SQLiteButtonRepository()
+        self.broadcasts = SQLiteBroadcastRepository()
+        self.bulk_batches = SQLiteBulkBatchRepository()
+        self.stats = SQLiteStatsRepository()
+        self.reconciliation = SQLiteReconciliationRepository()
+
+    def initialize(self):
+        initialize_database()
+
+    def transaction(self):
+        return transaction()
+
+    def on_commit(self, callback):
+        on_commit(callback)
+
+    def close_connection(self):
+        close_connection()
@@ -0,0 +1,46 @@
+# advanced_earning_bot/tests/conftest.py
+
+import os
+import sys
+import tempfile
+import itertools
+import pytest
+
+# প্রজেক্টের মডিউলগুলো ইম্পোর্ট করার আগে আলাদা ডাটাবেস ফাইল সেট করুন (config ইম্পোর্টের সময় পড়ে)
+_tmp_dir = tempfile.mkdtemp(prefix='earning_bot_tests_')
+os.environ['DATABASE_NAME'] = os.path.join(_tmp_dir, 'test.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+"""
+টেস্টের সাধারণ ফিক্সচার। `storage` ফিক্সচার প্রতিটি টেস্ট SQLite এবং মেমোরি দুই ব্যাকএন্ডেই চালায়।
+SQLite ফাইলটি পুরো সেশনে একটিই থাকে, তাই টেস্টগুলো `new_user_id()` দিয়ে নতুন ব্যবহারকারী আইডি নেয়।
+"""
+
+_user_ids = itertools.count(9_000_000_000)
+
+
+def new_user_id():
+    """সেশনে আগে ব্যবহার হয়নি এমন একটি ব্যবহারকারী আইডি।"""
+    return next(_user_ids)
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def storage(request):
+    from storage import create_storage, set_storage
+    from modules.bot_settings import initialize_bot_settings
+
+    backend = create_storage(request.param)
+    set_storage(backend)
+    backend.initialize()
+    initialize_bot_settings()
+    yield backend
+    set_storage(None)
+
+
+def forbid_settings_storage(monkeypatch, storage):
+    """এরপর সেটিংস স্টোরেজ থেকে পড়ার চেষ্টা করলে টেস্ট ব্যর্থ হবে (শুধু মেমোরি ক্যাশ চলবে)।"""
+    def fail(*args, **kwargs):
+        raise AssertionError('সেটিংস পড়তে স্টোরেজে যাওয়া হয়েছে')
+
+    monkeypatch.setattr(storage.settings, 'get_version', fail)
+    monkeypatch.setattr(storage.settings, 'load_all', fail)
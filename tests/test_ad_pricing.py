@@ -0,0 +1,32 @@
+# advanced_earning_bot/tests/test_ad_pricing.py
+
+from conftest import forbid_settings_storage
+from modules import ad_pricing, bot_settings
+
+"""
+`/get_ad_for_view` ইভেন্ট লুপে `ad_pricing.get_reward` কল করে, তাই এটি কোনো স্টোরেজ কুয়েরি
+ছাড়াই দাম দেয়, আর সেটিংস বদলালে (রিফ্রেশার নতুন স্ন্যাপশট বসানোর পর) নতুন দাম দেখায়।
+"""
+
+
+def _ad(ad_type, reward_per_view=None):
+    return {'ad_id': 1, 'ad_type': ad_type, 'reward_per_view': reward_per_view}
+
+
+def test_get_reward_does_no_storage_io(storage, monkeypatch):
+    bot_settings.update_setting('ad_reward_video_embed', '25')
+    forbid_settings_storage(monkeypatch, storage)
+
+    assert ad_pricing.get_reward(_ad('video_embed')) == 25
+    assert ad_pricing.get_reward(_ad('direct_link_ad')) == bot_settings.get_int_setting('ad_view_reward', 10)
+    assert ad_pricing.get_reward(_ad('video_embed', reward_per_view=3)) == 3
+
+
+def test_get_reward_follows_refreshed_settings(storage):
+    bot_settings.update_setting('ad_reward_direct_link_ad', '')
+    assert ad_pricing.get_reward(_ad('direct_link_ad')) == bot_settings.get_int_setting('ad_view_reward', 10)
+
+    storage.settings.update('ad_reward_direct_link_ad', '40', None)
+    bot_settings.check_for_updates()
+
+    assert ad_pricing.get_reward(_ad('direct_link_ad')) == 40
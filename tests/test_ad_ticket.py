@@ -0,0 +1,46 @@
+# advanced_earning_bot/tests/test_ad_ticket.py
+
+import time
+import pytest
+
+from modules import ad_ticket
+from modules.ad_ticket import TicketError, issue_ticket, verify_ticket
+
+"""
+স্বাক্ষর সঠিক কিন্তু পে-লোডের গঠন ভুল এমন টিকিটেও `verify_ticket` শুধু TicketError দেয়,
+অন্য কোনো exception (যা API তে 500 হয়ে যেত) নয়।
+"""
+
+USER_ID = 42
+
+
+def _signed_ticket(payload):
+    return f"{ad_ticket._b64encode(payload)}.{ad_ticket._b64encode(ad_ticket._sign(payload))}"
+
+
+def test_valid_ticket_round_trip():
+    now = time.time()
+    ticket = issue_ticket(USER_ID, 7, 15, 0, now=now)
+
+    result = verify_ticket(ticket, USER_ID, now=now)
+
+    assert (result['ad_id'], result['reward']) == (7, 15)
+    with pytest.raises(TicketError):
+        verify_ticket(ticket, USER_ID, now=now)
+
+
+@pytest.mark.parametrize('payload', [
+    b'42:7:15:0',                          # ঘর কম
+    b'42:7:15:0:9999999999:abcd:extra',    # ঘর বেশি
+    b'42:seven:15:0:9999999999:abcd',      # সংখ্যা নয়
+    b'42:7:15:0:\xff\xfe:abcd',            # UTF-8 নয়
+])
+def test_malformed_signed_payload_is_ticket_error(payload):
+    with pytest.raises(TicketError):
+        verify_ticket(_signed_ticket(payload), USER_ID)
+
+
+@pytest.mark.parametrize('ticket', [None, '', 'no-dot', 'abc.@@@', 'ক.খ'])
+def test_garbage_ticket_is_ticket_error(ticket):
+    with pytest.raises(TicketError):
+        verify_ticket(ticket, USER_ID)
@@ -0,0 +1,48 @@
+# advanced_earning_bot/tests/test_bot_settings.py
+
+import time
+
+from conftest import forbid_settings_storage
+from modules import bot_settings
+
+"""
+`get_setting` শুধু মেমোরি ক্যাশ পড়ে; অন্য প্রসেসের পরিবর্তন (এখানে সরাসরি স্টোরেজে লেখা)
+ব্যাকগ্রাউন্ড রিফ্রেশার ভার্সন চেক করে ধরে এবং নতুন স্ন্যাপশট বসায়।
+"""
+
+
+def _update_from_another_process(storage, name, value):
+    """ক্যাশ না ছুঁয়ে শুধু স্টোরেজে লেখে, যেমনটা অন্য কোনো প্রসেস করত।"""
+    storage.settings.update(name, value, None)
+
+
+def test_get_setting_never_touches_storage(storage, monkeypatch):
+    forbid_settings_storage(monkeypatch, storage)
+
+    for _ in range(3):
+        assert bot_settings.get_setting('welcome_message').value
+        assert bot_settings.get_all_settings()
+        assert bot_settings.get_settings_version() >= 0
+
+
+def test_check_for_updates_picks_up_external_change(storage):
+    _update_from_another_process(storage, 'daily_bonus_amount', '77')
+    assert bot_settings.get_int_setting('daily_bonus_amount', 0) != 77
+
+    assert bot_settings.check_for_updates()
+
+    assert bot_settings.get_int_setting('daily_bonus_amount', 0) == 77
+    assert not bot_settings.check_for_updates()
+
+
+def test_refresher_thread_swaps_in_new_snapshot(storage):
+    bot_settings.start_settings_refresher(interval=0.01)
+    try:
+        _update_from_another_process(storage, 'weekly_bonus_amount', '123')
+        deadline = time.monotonic() + 5
+        while bot_settings.get_int_setting('weekly_bonus_amount', 0) != 123 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        bot_settings.stop_settings_refresher()
+
+    assert bot_settings.get_int_setting('weekly_bonus_amount', 0) == 123
@@ -0,0 +1,120 @@
+# advanced_earning_bot/tests/test_bulk_operations.py
+
+from datetime import datetime
+
+from conftest import new_user_id
+from modules import bulk_operations
+
+"""
+বাল্ক CSV অপারেশন: যাচাই, টুকরো করে প্রয়োগ, অগ্রগতি, ব্যাচ চেকপয়েন্ট (মাঝপথে থামলে আবার চেষ্টা করলে
+বা একই ফাইল আবার দিলে কোনো সারি দুবার প্রয়োগ হয় না) এবং বাদ যাওয়া সারি (যথেষ্ট ব্যালেন্স নেই এমন ডেবিট
+বা অনুপস্থিত ব্যবহারকারী; এদের কোনো লেজার সারি লেখা হয় না)।
+"""
+
+ADMIN_ID = 1
+
+
+def _create_users(storage, count):
+    user_ids = [new_user_id() for _ in range(count)]
+    with storage.transaction():
+        for user_id in user_ids:
+            storage.users.create(user_id, f'test_{user_id}', 'bn', None, datetime.now())
+    return user_ids
+
+
+def _csv(tmp_path, lines):
+    path = tmp_path / f'bulk_{new_user_id()}.csv'
+    path.write_text('user_id,action,amount\n' + '\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def _credit_file(storage, tmp_path, count):
+    user_ids = _create_users(storage, count)
+    path = _csv(tmp_path, [f'{user_id},credit,{10 + i}' for i, user_id in enumerate(user_ids)])
+    return user_ids, path
+
+
+def _assert_credited_once(storage, user_ids):
+    for i, user_id in enumerate(user_ids):
+        assert storage.users.get(user_id)['balance'] == 10 + i
+    assert storage.reconciliation.verify_users(user_ids) == []
+
+
+def test_apply_file_applies_every_chunk_and_reports_progress(storage, tmp_path):
+    user_ids, path = _credit_file(storage, tmp_path, 7)
+    progress = {'applied': 0}
+
+    assert bulk_operations.validate_csv(path)['success']
+    result = bulk_operations.apply_file(path, ADMIN_ID, 'contest.csv', progress, chunk_size=3)
+
+    assert result == {'applied': 7, 'skipped': 0, 'skipped_rows': [], 'failed': False}
+    assert progress['applied'] == 7
+    _assert_credited_once(storage, user_ids)
+    batch = storage.bulk_batches.get(bulk_operations.batch_key_for_file(path))
+    assert batch['status'] == 'completed' and batch['rows_applied'] == 7
+
+
+def test_retry_after_failure_skips_committed_chunks(storage, tmp_path, monkeypatch):
+    user_ids, path = _credit_file(storage, tmp_path, 7)
+    apply_chunk = bulk_operations.apply_chunk
+    calls = []
+
+    def fail_second_chunk(*args):
+        calls.append(args)
+        return None if len(calls) == 2 else apply_chunk(*args)
+
+    monkeypatch.setattr(bulk_operations, 'apply_chunk', fail_second_chunk)
+    result = bulk_operations.apply_file(path, ADMIN_ID, 'contest.csv', chunk_size=3)
+    assert result['applied'] == 3 and result['failed']
+    monkeypatch.setattr(bulk_operations, 'apply_chunk', apply_chunk)
+
+    summary = bulk_operations.validate_csv(path)
+    assert summary['success'] and summary['rows'] == 4 and summary['already_applied'] == 3
+
+    result = bulk_operations.apply_file(path, ADMIN_ID, 'contest.csv', chunk_size=3)
+    assert result['applied'] == 4 and not result['failed']
+    _assert_credited_once(storage, user_ids)
+
+
+def test_reuploading_an_applied_file_does_not_credit_twice(storage, tmp_path):
+    user_ids, path = _credit_file(storage, tmp_path, 4)
+    assert bulk_operations.apply_file(path, ADMIN_ID, 'contest.csv')['applied'] == 4
+
+    copy = tmp_path / 'same_contents.csv'
+    copy.write_bytes(open(path, 'rb').read())
+    summary = bulk_operations.validate_csv(str(copy))
+    assert not summary['success'] and summary['error_count'] == 1
+
+    result = bulk_operations.apply_file(str(copy), ADMIN_ID, 'again.csv')
+    assert result['applied'] == 0 and not result['failed']
+    _assert_credited_once(storage, user_ids)
+
+
+def test_debit_without_sufficient_balance_is_skipped(storage, tmp_path):
+    user_id, = _create_users(storage, 1)
+    path = _csv(tmp_path, [f'{user_id},credit,5', f'{user_id},debit,20', f'{user_id},debit,3'])
+
+    summary = bulk_operations.validate_csv(path)
+    assert summary['success'] and summary['rows'] == 2 and summary['skipped'] == 1
+    assert summary['warnings'][0].startswith('লাইন 3:')
+
+    result = bulk_operations.apply_file(path, ADMIN_ID, 'fines.csv')
+
+    assert result['applied'] == 2 and result['skipped'] == 1 and result['skipped_rows'][0].startswith('লাইন 3:')
+    assert storage.users.get(user_id)['balance'] == 2
+    assert [(row[0], row[1]) for row in storage.transactions.list_recent(user_id, 10)] == \
+        [('admin_debit', -3), ('admin_credit', 5)]
+    assert storage.reconciliation.verify_users([user_id]) == []
+
+
+def test_missing_user_gets_no_ledger_row(storage):
+    user_id, = _create_users(storage, 1)
+    missing_id = new_user_id()
+    operations = [bulk_operations.BulkOperation(2, missing_id, 'credit', 10),
+                  bulk_operations.BulkOperation(3, user_id, 'credit', 10)]
+
+    result = bulk_operations.apply_chunk(operations, ADMIN_ID, 'contest.csv')
+
+    assert result['applied'] == 1 and [line for line, _ in result['skipped']] == [2]
+    assert storage.transactions.list_recent(missing_id, 10) == []
+    assert storage.users.get(user_id)['balance'] == 10
@@ -0,0 +1,89 @@
+# advanced_earning_bot/tests/test_export_stream.py
+
+import asyncio
+import threading
+import time
+import pytest
+
+pytest.importorskip('fastapi')
+
+from api import routes
+from modules import export_manager
+
+"""
+এক্সপোর্ট স্ট্রিম চলার মাঝে ক্লায়েন্ট সংযোগ ছিন্ন করলেও এক্সপোর্ট জেনারেটরটি (এবং তার রিড সংযোগ)
+বন্ধ হয়, এবং বন্ধ করার কাজটি ইভেন্ট লুপে নয়, ডাটাবেস থ্রেডে চলে।
+"""
+
+EXPORT_TOKEN = 'test-export-token'
+
+
+class _EndlessExport:
+    """কখনো শেষ না হওয়া একটি এক্সপোর্ট; কোন থ্রেড থেকে বন্ধ হলো তা মনে রাখে।"""
+
+    def __init__(self):
+        self.closed_on = None
+        self.chunks_sent = 0
+
+    def __call__(self, export):
+        return self._chunks()
+
+    def _chunks(self):
+        try:
+            while True:
+                time.sleep(0.001)
+                self.chunks_sent += 1
+                yield b'user_id,username\n'
+        finally:
+            self.closed_on = threading.current_thread()
+
+
+async def _request_then_disconnect(path):
+    """প্রথম টুকরো পাওয়ার পর ক্লায়েন্ট সংযোগ ছিন্ন করে; পাঠানো ASGI মেসেজগুলো রিটার্ন করে।"""
+    first_body = asyncio.Event()
+    requested = False
+    messages = []
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await first_body.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+        if message['type'] == 'http.response.body' and message.get('body'):
+            first_body.set()
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': b'',
+        'headers': [(b'host', b'test'), (b'authorization', f'Bearer {EXPORT_TOKEN}'.encode())],
+        'client': ('127.0.0.1', 1234), 'server': ('test', 80),
+    }
+    await asyncio.wait_for(routes.app(scope, receive, send), timeout=10)
+    return messages
+
+
+def test_export_generator_is_closed_when_client_disconnects(monkeypatch):
+    export = _EndlessExport()
+    monkeypatch.setattr(routes, 'EXPORT_API_TOKEN', EXPORT_TOKEN)
+    monkeypatch.setattr(export_manager, 'iter_export', export)
+
+    async def run():
+        messages = await _request_then_disconnect('/admin/export/users')
+        # BackgroundTask/shield করা বন্ধ করার কাজটি শেষ হওয়ার সুযোগ দিন
+        for _ in range(100):
+            if export.closed_on is not None:
+                break
+            await asyncio.sleep(0.01)
+        return messages
+
+    messages = asyncio.run(run())
+
+    assert messages[0]['type'] == 'http.response.start' and messages[0]['status'] == 200
+    assert export.chunks_sent >= 1
+    assert export.closed_on is not None
+    assert export.closed_on is not threading.main_thread()
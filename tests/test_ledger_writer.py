@@ -0,0 +1,98 @@
+# advanced_earning_bot/tests/test_ledger_writer.py
+
+import sqlite3
+import time
+from datetime import datetime
+
+from conftest import new_user_id
+from modules.ledger_writer import LedgerWriter
+
+"""
+বন্ধের সময় শেষ ব্যাচ লিখতে ব্যর্থ হলে লেজার রাইটার কয়েকবার আবার চেষ্টা করে এবং প্রতিটি সারি
+ঠিক একবার লেখে; সব চেষ্টা ব্যর্থ হলে সারিগুলো নিঃশব্দে হারায় না, লগে প্রিন্ট হয়।
+চলার সময় একটি খারাপ সারি বারবার ব্যাচ ব্যর্থ করলে শুধু সেটিই বাদ (dead-letter) যায়, বাকিগুলো লেখা হয়।
+"""
+
+ROWS = 3
+
+
+def _failing_insert_many(monkeypatch, storage, failures):
+    """প্রথম `failures` বার `insert_many` ডাটাবেস লকের ত্রুটি দেয়, তারপর আসলটি চালায়।"""
+    original = storage.transactions.insert_many
+    calls = []
+
+    def insert_many(rows):
+        calls.append(len(rows))
+        if len(calls) <= failures:
+            raise sqlite3.OperationalError('database is locked')
+        return original(rows)
+
+    monkeypatch.setattr(storage.transactions, 'insert_many', insert_many)
+    return calls
+
+
+def _enqueue_rows(writer, user_id):
+    for i in range(ROWS):
+        writer.enqueue((user_id, 'ad_reward', 10 + i, 'completed', datetime.now(), None))
+
+
+def test_stop_retries_failed_final_write(storage, monkeypatch):
+    user_id = new_user_id()
+    writer = LedgerWriter(flush_interval_ms=1)
+    calls = _failing_insert_many(monkeypatch, storage, failures=2)
+    _enqueue_rows(writer, user_id)
+
+    writer.stop()
+
+    assert calls == [ROWS, ROWS, ROWS]
+    assert writer.rows_written == ROWS
+    assert writer._retry_rows == []
+    assert sorted(amount for _, amount, _, _ in storage.transactions.list_recent(user_id, 10)) == [10, 11, 12]
+
+
+def test_stop_logs_rows_it_could_not_write(storage, monkeypatch, capsys):
+    user_id = new_user_id()
+    writer = LedgerWriter(flush_interval_ms=1)
+    calls = _failing_insert_many(monkeypatch, storage, failures=100)
+    _enqueue_rows(writer, user_id)
+
+    writer.stop()
+
+    assert len(calls) > 1
+    assert len(writer._retry_rows) == ROWS
+    assert storage.transactions.list_recent(user_id, 10) == []
+    output = capsys.readouterr().out
+    assert output.count('অলিখিত লেজার সারি') == ROWS
+
+
+def test_poison_row_is_dead_lettered_without_blocking_the_rest(storage, monkeypatch, capsys):
+    user_id = new_user_id()
+    poison = (user_id, 'ad_reward', 999, 'completed', datetime.now(), None)
+    original = storage.transactions.insert_many
+    calls = []
+
+    def insert_many(rows):
+        calls.append(len(rows))
+        if poison in rows:
+            raise sqlite3.IntegrityError('poison row')
+        return original(rows)
+
+    monkeypatch.setattr(storage.transactions, 'insert_many', insert_many)
+    writer = LedgerWriter(flush_interval_ms=1, max_batch_attempts=3)
+    _enqueue_rows(writer, user_id)
+    writer.enqueue(poison)
+
+    writer.start()
+    try:
+        deadline = time.monotonic() + 5
+        while writer.rows_dead_lettered == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.enqueue((user_id, 'ad_reward', 20, 'completed', datetime.now(), None))
+    finally:
+        writer.stop()
+
+    assert calls[:3] == [ROWS + 1] * 3
+    assert writer.rows_dead_lettered == 1
+    assert writer._retry_rows == []
+    assert sorted(amount for _, amount, _, _ in storage.transactions.list_recent(user_id, 10)) == [10, 11, 12, 20]
+    assert capsys.readouterr().out.count('অলিখিত লেজার সারি') == 1
@@ -0,0 +1,36 @@
+# advanced_earning_bot/tests/test_rate_limiter.py
+
+import pytest
+
+pytest.importorskip('fastapi')
+
+from api.rate_limiter import TokenBucketLimiter
+from conftest import forbid_settings_storage
+from modules import bot_settings
+
+"""
+রেট লিমিটারের সীমা রিফ্রেশ শুধু `bot_settings` এর মেমোরি ক্যাশ পড়ে (ইভেন্ট লুপ থেকে কল হয়),
+কোনো স্টোরেজ কুয়েরি করে না, আর নতুন সীমাগুলো ঠিকমতো বসে।
+"""
+
+
+def test_refresh_limits_reads_only_the_memory_cache(storage, monkeypatch):
+    bot_settings.update_setting('api_rate_limit_burst', '3')
+    forbid_settings_storage(monkeypatch, storage)
+
+    limiter = TokenBucketLimiter(per_minute=1, burst=1)
+    limiter.refresh_limits()
+
+    assert limiter.enabled
+    assert limiter.burst == 3
+    assert limiter.per_minute == bot_settings.get_int_setting('api_rate_limit_per_minute', 0)
+
+
+def test_refresh_limits_is_throttled(storage):
+    limiter = TokenBucketLimiter(per_minute=1, burst=1)
+    limiter.refresh_limits()
+    limiter.burst = 99
+
+    limiter.refresh_limits()
+
+    assert limiter.burst == 99
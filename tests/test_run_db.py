@@ -0,0 +1,65 @@
+# advanced_earning_bot/tests/test_run_db.py
+
+import time
+import asyncio
+
+from database import run_db, get_connection
+
+"""
+`run_db` দিয়ে চালানো ধীর কুয়েরির সময় ইভেন্ট লুপ আটকে থাকে না: একটি প্রোব টাস্ক প্রতি ১০ms এ
+জেগে ওঠে এবং দুইবার জাগার মধ্যে সবচেয়ে বড় ফাঁক মাপে। তুলনার জন্য একই কুয়েরি সরাসরি লুপে চালালে
+ফাঁকটি কুয়েরির পুরো সময়ের সমান হয়, তাই প্রোবটি সত্যিই আটকে যাওয়া ধরতে পারে।
+"""
+
+PROBE_INTERVAL = 0.01
+
+# প্রায় আধা সেকেন্ডের একটি CPU-ভারী কুয়েরি (কোনো টেবিল লাগে না)
+SLOW_QUERY = """
+    WITH RECURSIVE counter(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM counter WHERE x < ?)
+    SELECT count(*) FROM counter
+"""
+SLOW_QUERY_ROWS = 2_000_000
+
+
+def _slow_query():
+    started = time.perf_counter()
+    count = get_connection().execute(SLOW_QUERY, (SLOW_QUERY_ROWS,)).fetchone()[0]
+    return count, time.perf_counter() - started
+
+
+async def _probe(stop):
+    """লুপ কতক্ষণ সাড়া দেয়নি (দুটি টিকের মধ্যে সবচেয়ে বড় বাড়তি দেরি) তা রিটার্ন করে।"""
+    worst = 0.0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(PROBE_INTERVAL)
+        now = time.perf_counter()
+        worst = max(worst, now - last - PROBE_INTERVAL)
+        last = now
+    return worst
+
+
+async def _measure(call):
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(stop))
+    await asyncio.sleep(PROBE_INTERVAL * 3)
+    count, duration = await call()
+    stop.set()
+    return count, duration, await probe
+
+
+def test_slow_query_on_run_db_does_not_block_loop():
+    count, duration, worst_stall = asyncio.run(_measure(lambda: run_db(_slow_query)))
+
+    assert count == SLOW_QUERY_ROWS
+    assert duration > 0.1
+    assert worst_stall < min(0.05, duration / 4)
+
+
+def test_probe_detects_blocking_call():
+    async def blocking():
+        return _slow_query()
+
+    _, duration, worst_stall = asyncio.run(_measure(blocking))
+
+    assert worst_stall > duration / 2
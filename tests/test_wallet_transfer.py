@@ -0,0 +1,64 @@
+# advanced_earning_bot/tests/test_wallet_transfer.py
+
+import threading
+from datetime import datetime
+
+from conftest import new_user_id
+from modules import wallet_manager
+from modules.bot_settings import get_int_setting
+
+"""
+একই ব্যালেন্স থেকে একসাথে অনেকগুলো ট্রান্সফার এলে প্রেরকের ব্যালেন্স কখনও নেগেটিভ হবে না,
+এবং সবার ব্যালেন্স লেজারের যোগফলের সমান থাকবে (`debit_if_sufficient` এর শর্তযুক্ত কাটা)।
+"""
+
+THREADS = 40
+START_BALANCE = 1000
+AMOUNT = 100
+
+
+def _create_users(storage, count):
+    user_ids = [new_user_id() for _ in range(count)]
+    with storage.transaction():
+        for user_id in user_ids:
+            storage.users.create(user_id, f'test_{user_id}', 'bn', None, datetime.now())
+    return user_ids
+
+
+def test_parallel_transfers_never_overdraw(storage):
+    sender_id, *receiver_ids = _create_users(storage, THREADS + 1)
+    assert wallet_manager.admin_adjust_balance(sender_id, START_BALANCE, 0)
+
+    barrier = threading.Barrier(THREADS)
+    results = [None] * THREADS
+
+    def transfer(index):
+        barrier.wait()
+        results[index] = wallet_manager.transfer_balance(sender_id, receiver_ids[index], AMOUNT)
+
+    threads = [threading.Thread(target=transfer, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    fee = AMOUNT * get_int_setting('transfer_fee_percent', 5) // 100
+    succeeded = [i for i, result in enumerate(results) if result['success']]
+    sender_balance = storage.users.get(sender_id)['balance']
+
+    assert sender_balance >= 0
+    assert len(succeeded) == START_BALANCE // (AMOUNT + fee)
+    assert sender_balance == START_BALANCE - len(succeeded) * (AMOUNT + fee)
+    for i, receiver_id in enumerate(receiver_ids):
+        assert storage.users.get(receiver_id)['balance'] == (AMOUNT if i in succeeded else 0)
+    assert storage.reconciliation.verify_users([sender_id, *receiver_ids]) == []
+
+
+def test_transfer_rejects_non_positive_amount(storage):
+    sender_id, receiver_id = _create_users(storage, 2)
+    assert wallet_manager.admin_adjust_balance(sender_id, START_BALANCE, 0)
+
+    for amount in (0, -50):
+        assert not wallet_manager.transfer_balance(sender_id, receiver_id, amount)['success']
+    assert storage.users.get(sender_id)['balance'] == START_BALANCE
+    assert storage.users.get(receiver_id)['balance'] == 0